@@ -61,6 +61,15 @@ class BatchJob:
     completed_at: Optional[float] = None
     status: BatchStatus = BatchStatus.PENDING
     default_provider: Optional[str] = None
+    _index: Dict[str, BatchTask] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def get_task(self, task_id: str) -> Optional[BatchTask]:
+        """Look up a task by id (index rebuilt when tasks are added or replaced)."""
+        task = self._index.get(task_id)
+        if task is None or len(self._index) != len(self.tasks):
+            self._index = {t.id: t for t in self.tasks}
+            task = self._index.get(task_id)
+        return task
 
     @property
     def progress(self) -> float:
@@ -95,14 +104,18 @@ class BatchJob:
 try:
     from .batch_processor_core import BatchProcessorCoreMixin
     from .batch_processor_exec import BatchProcessorExecMixin
+    from .provider_commands import PROVIDER_COMMANDS
 except ImportError:  # pragma: no cover - script mode
     from batch_processor_core import BatchProcessorCoreMixin
     from batch_processor_exec import BatchProcessorExecMixin
+    from provider_commands import PROVIDER_COMMANDS
 
 
 class BatchProcessor(BatchProcessorCoreMixin, BatchProcessorExecMixin):
     """Processes batch jobs with persistent storage and worker pools."""
 
+    PROVIDER_COMMANDS = PROVIDER_COMMANDS
+
 
 def format_batch_status(job: BatchJob, verbose: bool = False) -> str:
     """Format batch job status for display."""
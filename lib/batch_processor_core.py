@@ -1,14 +1,12 @@
 """Auto-split mixins for BatchProcessor."""
 from __future__ import annotations
 
-import json
+import shlex
 import sqlite3
-import subprocess
 import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 try:
     from .batch_processor import BatchJob, BatchStatus, BatchTask, HANDLED_EXCEPTIONS
@@ -25,6 +23,10 @@ class BatchProcessorCoreMixin:
         default_provider: Optional[str] = None,
         timeout_s: float = 60.0,
         db_path: Optional[str] = None,
+        provider_limits: Optional[Dict[str, int]] = None,
+        provider_commands: Optional[Dict[str, Union[str, Sequence[str]]]] = None,
+        flush_interval_s: float = 0.5,
+        flush_rows: int = 500,
     ):
         """
         Initialize the batch processor.
@@ -34,11 +36,20 @@ class BatchProcessorCoreMixin:
             default_provider: Default provider for tasks without explicit provider
             timeout_s: Timeout per task in seconds
             db_path: Path to SQLite database for persistence
+            provider_limits: Per-provider concurrency caps (within max_concurrent)
+            provider_commands: Command overrides per provider, as a string or argv
+            flush_interval_s: Maximum age of unsaved task results
+            flush_rows: Flush early once this many task results are pending
         """
         self.max_concurrent = max_concurrent
         self.default_provider = default_provider
         self.timeout_s = timeout_s
+        self.provider_limits: Dict[str, int] = dict(provider_limits or {})
+        self.provider_commands: Dict[str, Union[str, Sequence[str]]] = dict(provider_commands or {})
+        self.flush_interval_s = flush_interval_s
+        self.flush_rows = flush_rows
         self._cancelled: set = set()
+        self._running: set = set()
 
         # Setup database
         if db_path is None:
@@ -55,6 +66,8 @@ class BatchProcessorCoreMixin:
     def _init_db(self):
         """Initialize the SQLite database."""
         with sqlite3.connect(self.db_path) as conn:
+            # Task results are flushed while readers (ccb-batch status) poll.
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS batch_jobs (
                     id TEXT PRIMARY KEY,
@@ -94,74 +107,102 @@ class BatchProcessorCoreMixin:
             """, (limit,))
 
             for row in cursor.fetchall():
-                job_id = row["id"]
-                # Load tasks for this job
-                task_cursor = conn.execute("""
-                    SELECT * FROM batch_tasks WHERE job_id = ?
-                """, (job_id,))
-
-                tasks = []
-                for task_row in task_cursor.fetchall():
-                    task = BatchTask(
-                        id=task_row["id"],
-                        message=task_row["message"],
-                        provider=task_row["provider"],
-                        status=BatchStatus(task_row["status"]),
-                        result=task_row["result"],
-                        error=task_row["error"],
-                        latency_ms=task_row["latency_ms"] or 0.0,
-                    )
-                    tasks.append(task)
-
-                job = BatchJob(
-                    id=job_id,
-                    tasks=tasks,
-                    created_at=row["created_at"],
-                    completed_at=row["completed_at"],
-                    status=BatchStatus(row["status"]),
-                    default_provider=row["default_provider"],
-                )
-                self._jobs[job_id] = job
+                job = self._job_from_row(conn, row)
+                self._jobs[job.id] = job
+
+    def _job_from_row(self, conn: sqlite3.Connection, row: sqlite3.Row) -> BatchJob:
+        """Build a job from its batch_jobs row, loading tasks in creation order."""
+        task_cursor = conn.execute("""
+            SELECT * FROM batch_tasks WHERE job_id = ? ORDER BY rowid
+        """, (row["id"],))
+        tasks = [
+            BatchTask(
+                id=task_row["id"],
+                message=task_row["message"],
+                provider=task_row["provider"],
+                status=BatchStatus(task_row["status"]),
+                result=task_row["result"],
+                error=task_row["error"],
+                latency_ms=task_row["latency_ms"] or 0.0,
+            )
+            for task_row in task_cursor.fetchall()
+        ]
+        return BatchJob(
+            id=row["id"],
+            tasks=tasks,
+            created_at=row["created_at"],
+            completed_at=row["completed_at"],
+            status=BatchStatus(row["status"]),
+            default_provider=row["default_provider"],
+        )
 
     def _save_job(self, job: BatchJob):
-        """Save a job and its tasks to the database."""
+        """Save a job and all of its tasks to the database in one transaction."""
         with sqlite3.connect(self.db_path) as conn:
-            # Upsert job
-            conn.execute("""
-                INSERT OR REPLACE INTO batch_jobs
-                (id, status, default_provider, created_at, completed_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                job.id,
-                job.status.value,
-                job.default_provider,
-                job.created_at,
-                job.completed_at,
-            ))
-
-            # Upsert tasks
-            for task in job.tasks:
-                conn.execute("""
-                    INSERT OR REPLACE INTO batch_tasks
-                    (id, job_id, message, provider, status, result, error, latency_ms)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    task.id,
-                    job.id,
-                    task.message,
-                    task.provider,
-                    task.status.value,
-                    task.result,
-                    task.error,
-                    task.latency_ms,
-                ))
+            self._write_job_row(conn, job)
+            # Upsert rather than REPLACE so rowids (task order) stay stable.
+            conn.executemany("""
+                INSERT INTO batch_tasks
+                (id, job_id, message, provider, status, result, error, latency_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    provider = excluded.provider,
+                    status = excluded.status,
+                    result = excluded.result,
+                    error = excluded.error,
+                    latency_ms = excluded.latency_ms
+            """, [
+                (task.id, job.id, task.message, task.provider, task.status.value,
+                 task.result, task.error, task.latency_ms)
+                for task in job.tasks
+            ])
+            conn.commit()
 
+    def _save_job_status(self, job: BatchJob):
+        """Persist only the job row (status and timestamps)."""
+        with sqlite3.connect(self.db_path) as conn:
+            self._write_job_row(conn, job)
+            conn.commit()
+
+    @staticmethod
+    def _write_job_row(conn: sqlite3.Connection, job: BatchJob):
+        conn.execute("""
+            INSERT INTO batch_jobs (id, status, default_provider, created_at, completed_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                status = excluded.status,
+                default_provider = excluded.default_provider,
+                completed_at = excluded.completed_at
+        """, (job.id, job.status.value, job.default_provider, job.created_at, job.completed_at))
+
+    def _save_task_updates(self, rows: List[Tuple]):
+        """
+        Write finished task results in a single transaction.
+
+        Args:
+            rows: (status, result, error, latency_ms, provider, task_id) tuples
+        """
+        if not rows:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany("""
+                UPDATE batch_tasks
+                SET status = ?, result = ?, error = ?, latency_ms = ?, provider = ?
+                WHERE id = ?
+            """, rows)
             conn.commit()
 
     def _get_ask_command(self, provider: str) -> str:
         """Get the ask command for a provider."""
         return self.PROVIDER_COMMANDS.get(provider, "lask")
 
+    def _task_argv(self, provider: str) -> List[str]:
+        """Argument vector for a provider's ask command (message goes to stdin)."""
+        command = self.provider_commands.get(provider) or self._get_ask_command(provider)
+        if isinstance(command, str):
+            return shlex.split(command)
+        return list(command)
+
     def create_batch(
         self,
         messages: List[str],
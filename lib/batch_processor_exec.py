@@ -1,14 +1,11 @@
 """Auto-split mixins for BatchProcessor."""
 from __future__ import annotations
 
-import json
+import asyncio
+import contextlib
 import sqlite3
-import subprocess
 import time
-import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 try:
     from .batch_processor import BatchJob, BatchStatus, BatchTask, HANDLED_EXCEPTIONS
@@ -16,56 +13,120 @@ except ImportError:  # pragma: no cover - script mode
     from batch_processor import BatchJob, BatchStatus, BatchTask, HANDLED_EXCEPTIONS
 
 
+_RUNNABLE = (BatchStatus.PENDING, BatchStatus.RUNNING)
+
+
+class _TaskRowWriter:
+    """Coalesces finished tasks and writes them in periodic transactions."""
+
+    def __init__(self, save: Callable[[List[tuple]], None], interval_s: float, max_rows: int):
+        self._save = save
+        self._interval_s = max(0.01, interval_s)
+        self._max_rows = max(1, max_rows)
+        self._dirty: Dict[str, BatchTask] = {}
+        self._wake = asyncio.Event()
+        self._closed = False
+        self._runner: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.rows_written = 0
+
+    def start(self) -> None:
+        self._runner = asyncio.create_task(self._run())
+
+    def mark(self, task: BatchTask) -> None:
+        self._dirty[task.id] = task
+        if len(self._dirty) >= self._max_rows:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self._interval_s)
+            self._wake.clear()
+            await self._flush()
+            if self._closed and not self._dirty:
+                return
+
+    async def _flush(self) -> None:
+        if not self._dirty:
+            return
+        tasks, self._dirty = list(self._dirty.values()), {}
+        rows = [(t.status.value, t.result, t.error, t.latency_ms, t.provider, t.id) for t in tasks]
+        try:
+            await asyncio.to_thread(self._save, rows)
+        except HANDLED_EXCEPTIONS:
+            # Keep them for the next flush; newer results for the same task win.
+            for task in tasks:
+                self._dirty.setdefault(task.id, task)
+            return
+        self.flushes += 1
+        self.rows_written += len(rows)
+
+    async def close(self) -> None:
+        """Flush everything still pending and stop."""
+        self._closed = True
+        self._wake.set()
+        if self._runner is not None:
+            await self._runner
+
+
 class BatchProcessorExecMixin:
     """Mixin methods extracted from BatchProcessor."""
 
-    def _execute_task(self, task: BatchTask) -> BatchTask:
-        """Execute a single task."""
-        if task.id in self._cancelled:
-            task.status = BatchStatus.CANCELLED
-            return task
-
-        provider = task.provider or self.default_provider or "claude"
-        ask_cmd = self._get_ask_command(provider)
+    async def _execute_task_async(self, task: BatchTask, provider: str) -> BatchTask:
+        """Run one task: the provider's ask command with the message on stdin."""
+        task.provider = provider
+        task.status = BatchStatus.RUNNING
         start_time = time.time()
+        process = None
 
         try:
-            cmd = f"{ask_cmd} <<'EOF'\n{task.message}\nEOF"
-            result = subprocess.run(
-                ["bash", "-c", cmd],
-                capture_output=True,
-                text=True,
+            process = await asyncio.create_subprocess_exec(
+                *self._task_argv(provider),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(f"{task.message}\n".encode("utf-8")),
                 timeout=self.timeout_s,
             )
 
-            task.latency_ms = (time.time() - start_time) * 1000
-            task.provider = provider
-
-            if result.returncode == 0:
+            if process.returncode == 0:
                 task.status = BatchStatus.COMPLETED
-                task.result = result.stdout
+                task.result = stdout.decode("utf-8", errors="replace")
+                task.error = None
             else:
                 task.status = BatchStatus.FAILED
-                task.error = result.stderr or f"Exit code: {result.returncode}"
+                task.error = stderr.decode("utf-8", errors="replace") or f"Exit code: {process.returncode}"
 
-        except subprocess.TimeoutExpired:
-            task.latency_ms = (time.time() - start_time) * 1000
+        except asyncio.TimeoutError:
             task.status = BatchStatus.FAILED
             task.error = "Timeout"
         except HANDLED_EXCEPTIONS as e:
-            task.latency_ms = (time.time() - start_time) * 1000
             task.status = BatchStatus.FAILED
             task.error = str(e)
+        finally:
+            if process is not None and process.returncode is None:
+                with contextlib.suppress(ProcessLookupError):
+                    process.kill()
+                await process.wait()
+            task.latency_ms = (time.time() - start_time) * 1000
 
         return task
 
-    def execute_batch(
+    async def execute_batch_async(
         self,
         job: BatchJob,
         on_progress: Optional[Callable[[BatchJob, BatchTask], None]] = None,
     ) -> BatchJob:
         """
-        Execute a batch job.
+        Execute a batch job on the running event loop.
+
+        Only pending tasks run, so calling this again on a job that was
+        interrupted (see ``resume_batch``) picks up where it stopped.
+        Results are saved in batches; after a crash, tasks finished within
+        the last ``flush_interval_s`` run again.
 
         Args:
             job: The batch job to execute
@@ -75,54 +136,99 @@ class BatchProcessorExecMixin:
             Updated BatchJob
         """
         job.status = BatchStatus.RUNNING
-        self._save_job(job)  # Save running status
-
-        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
-            # Submit all tasks
-            future_to_task = {
-                executor.submit(self._execute_task, task): task
-                for task in job.tasks
-            }
-
-            # Collect results
-            for future in as_completed(future_to_task):
-                task = future_to_task[future]
+        job.completed_at = None
+        self._running.add(job.id)
+        self._save_job_status(job)
+
+        overall = asyncio.Semaphore(max(1, self.max_concurrent))
+        per_provider = {
+            name: asyncio.Semaphore(limit) for name, limit in self.provider_limits.items() if limit > 0
+        }
+        writer = _TaskRowWriter(self._save_task_updates, self.flush_interval_s, self.flush_rows)
+        writer.start()
+
+        async def run(task: BatchTask) -> None:
+            provider = task.provider or job.default_provider or self.default_provider or "claude"
+            # Wait on the provider cap first so a throttled provider never
+            # holds global slots that other providers could use.
+            async with per_provider.get(provider) or contextlib.nullcontext():
+                async with overall:
+                    if job.id in self._cancelled or task.id in self._cancelled:
+                        task.status = BatchStatus.CANCELLED
+                        writer.mark(task)
+                        return
+                    await self._execute_task_async(task, provider)
+            writer.mark(task)
+            if on_progress:
                 try:
-                    completed_task = future.result()
-                    # Update task in job
-                    for i, t in enumerate(job.tasks):
-                        if t.id == completed_task.id:
-                            job.tasks[i] = completed_task
-                            break
-
-                    # Save progress to database
-                    self._save_job(job)
-
-                    if on_progress:
-                        on_progress(job, completed_task)
-
-                except HANDLED_EXCEPTIONS as e:
-                    task.status = BatchStatus.FAILED
-                    task.error = str(e)
-
-                # Check for cancellation
-                if job.id in self._cancelled:
-                    for f in future_to_task:
-                        f.cancel()
-                    job.status = BatchStatus.CANCELLED
-                    break
+                    on_progress(job, task)
+                except HANDLED_EXCEPTIONS:
+                    pass
 
-        job.completed_at = time.time()
+        try:
+            await asyncio.gather(*(run(task) for task in job.tasks if task.status in _RUNNABLE))
+        finally:
+            await writer.close()
+            self._running.discard(job.id)
 
-        if job.status != BatchStatus.CANCELLED:
-            if job.failed_count == len(job.tasks):
-                job.status = BatchStatus.FAILED
-            else:
-                job.status = BatchStatus.COMPLETED
+        job.completed_at = time.time()
+        if job.id in self._cancelled:
+            job.status = BatchStatus.CANCELLED
+        elif job.failed_count == len(job.tasks):
+            job.status = BatchStatus.FAILED
+        else:
+            job.status = BatchStatus.COMPLETED
 
-        self._save_job(job)  # Save final status
+        self._save_job_status(job)  # Save final status
         return job
 
+    def execute_batch(
+        self,
+        job: BatchJob,
+        on_progress: Optional[Callable[[BatchJob, BatchTask], None]] = None,
+    ) -> BatchJob:
+        """
+        Execute a batch job, blocking until it finishes.
+
+        Must not be called from a running event loop; use
+        ``execute_batch_async`` there.
+
+        Args:
+            job: The batch job to execute
+            on_progress: Optional callback called after each task completes
+
+        Returns:
+            Updated BatchJob
+        """
+        return asyncio.run(self.execute_batch_async(job, on_progress))
+
+    def find_interrupted_jobs(self) -> List[str]:
+        """IDs of jobs saved as running that no executor in this process owns."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("""
+                SELECT id FROM batch_jobs WHERE status = ? ORDER BY created_at
+            """, (BatchStatus.RUNNING.value,))
+            return [row[0] for row in cursor.fetchall() if row[0] not in self._running]
+
+    def resume_batch(
+        self,
+        job_id: str,
+        on_progress: Optional[Callable[[BatchJob, BatchTask], None]] = None,
+    ) -> Optional[BatchJob]:
+        """
+        Run the unfinished tasks of an interrupted job.
+
+        Returns:
+            Updated BatchJob, or None if the job is unknown or already running
+        """
+        if job_id in self._running:
+            return None
+        job = self.get_job(job_id)
+        if job is None:
+            return None
+        self._cancelled.discard(job_id)
+        return self.execute_batch(job, on_progress)
+
     def get_job(self, job_id: str) -> Optional[BatchJob]:
         """Get a batch job by ID."""
         # Check memory cache first
@@ -138,32 +244,7 @@ class BatchProcessorExecMixin:
             row = cursor.fetchone()
 
             if row:
-                # Load tasks
-                task_cursor = conn.execute("""
-                    SELECT * FROM batch_tasks WHERE job_id = ?
-                """, (job_id,))
-
-                tasks = []
-                for task_row in task_cursor.fetchall():
-                    task = BatchTask(
-                        id=task_row["id"],
-                        message=task_row["message"],
-                        provider=task_row["provider"],
-                        status=BatchStatus(task_row["status"]),
-                        result=task_row["result"],
-                        error=task_row["error"],
-                        latency_ms=task_row["latency_ms"] or 0.0,
-                    )
-                    tasks.append(task)
-
-                job = BatchJob(
-                    id=job_id,
-                    tasks=tasks,
-                    created_at=row["created_at"],
-                    completed_at=row["completed_at"],
-                    status=BatchStatus(row["status"]),
-                    default_provider=row["default_provider"],
-                )
+                job = self._job_from_row(conn, row)
                 self._jobs[job_id] = job
                 return job
 
@@ -193,7 +274,13 @@ class BatchProcessorExecMixin:
                     task.status = BatchStatus.CANCELLED
                     self._cancelled.add(task.id)
             job.status = BatchStatus.CANCELLED
-            self._save_job(job)  # Persist cancellation
+            # Persist cancellation without rewriting finished task rows
+            with sqlite3.connect(self.db_path) as conn:
+                self._write_job_row(conn, job)
+                conn.execute("""
+                    UPDATE batch_tasks SET status = ? WHERE job_id = ? AND status = ?
+                """, (BatchStatus.CANCELLED.value, job_id, BatchStatus.PENDING.value))
+                conn.commit()
             return True
         return False
 
@@ -25,7 +25,14 @@ from .paths import (
     default_performance_db_path,
     project_root,
 )
-from .tokens import estimate_input_output_tokens, estimate_tokens
+from .tokens import (
+    clear_token_cache,
+    estimate_input_output_tokens,
+    estimate_segments_tokens,
+    estimate_tokens,
+    set_tokenizer,
+    token_cache_stats,
+)
 
 __all__ = [
     "AuthError",
@@ -50,4 +57,8 @@ __all__ = [
     "default_performance_db_path",
     "estimate_input_output_tokens",
     "estimate_tokens",
+    "estimate_segments_tokens",
+    "set_tokenizer",
+    "token_cache_stats",
+    "clear_token_cache",
 ]
@@ -1,20 +1,143 @@
-"""Token estimation helpers."""
+"""Token estimation helpers.
+
+``estimate_tokens`` uses a language-aware heuristic (CJK characters at
+~1.5 per token, everything else at ~4 per token) unless an exact tokenizer
+is configured, either with ``set_tokenizer`` or via ``CCB_TOKENIZER``:
+
+- ``tiktoken:<encoding>`` (e.g. ``tiktoken:o200k_base``; the encoding file
+  must already be in tiktoken's cache or it is downloaded on first use)
+- ``tokenizers:<path/to/tokenizer.json>`` (Hugging Face ``tokenizers``)
+
+Counts for long non-ASCII texts and for exact tokenizers are memoized by
+content hash, so repeated prompt segments (system context, injected
+memories) are only counted once.
+"""
 
 from __future__ import annotations
 
+import os
 import re
-from typing import Dict
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from .logging import get_logger
+
+logger = get_logger("common.tokens")
+
+_CJK_RANGES = "\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af"
+_CJK_PATTERN = re.compile(f"[{_CJK_RANGES}]")
+_NON_CJK_RUNS = re.compile(f"[^{_CJK_RANGES}]+")
+
+# Below this length counting is cheaper than hashing for a cache lookup.
+MEMO_MIN_CHARS = 256
+MEMO_MAX_ENTRIES = 4096
+
+TokenCounter = Callable[[str], int]
+
+_lock = threading.Lock()
+_memo: "OrderedDict[Tuple[str, int, int], int]" = OrderedDict()
+_memo_stats = {"hits": 0, "misses": 0}
+_tokenizer: Optional[Tuple[str, TokenCounter]] = None
+_tokenizer_loaded = False
+
+
+def count_cjk(text: str) -> int:
+    """Number of CJK characters in ``text`` without building a per-character list."""
+    if text.isascii():
+        return 0
+    # Deleting the non-CJK runs leaves exactly the CJK characters.
+    return len(_NON_CJK_RUNS.sub("", text))
+
+
+def _heuristic_tokens(text: str) -> int:
+    cjk_count = count_cjk(text)
+    return int(cjk_count / 1.5 + (len(text) - cjk_count) / 4)
+
+
+def _load_tokenizer(spec: str) -> Optional[Tuple[str, TokenCounter]]:
+    kind, _, arg = spec.partition(":")
+    kind = kind.strip().lower()
+    arg = arg.strip()
+    if kind in ("", "heuristic", "none"):
+        return None
+    try:
+        if kind == "tiktoken":
+            import tiktoken
 
-_CJK_PATTERN = re.compile(r"[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af]")
+            encoding = tiktoken.get_encoding(arg or "o200k_base")
+            return f"tiktoken:{encoding.name}", lambda text: len(encoding.encode(text, disallowed_special=()))
+        if kind == "tokenizers":
+            from tokenizers import Tokenizer
+
+            tokenizer = Tokenizer.from_file(arg)
+            return f"tokenizers:{arg}", lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids)
+    except Exception as exc:  # optional dependency / missing local files
+        logger.warning("Tokenizer %r unavailable, using heuristic estimates: %s", spec, exc)
+        return None
+    logger.warning("Unknown tokenizer spec %r, using heuristic estimates", spec)
+    return None
+
+
+def _active_tokenizer() -> Optional[Tuple[str, TokenCounter]]:
+    global _tokenizer, _tokenizer_loaded
+    if not _tokenizer_loaded:
+        with _lock:
+            if not _tokenizer_loaded:
+                _tokenizer = _load_tokenizer(os.environ.get("CCB_TOKENIZER", ""))
+                _tokenizer_loaded = True
+    return _tokenizer
+
+
+def set_tokenizer(counter: Optional[TokenCounter], name: str = "custom") -> None:
+    """Use ``counter`` (text -> token count) for all estimates; None restores the heuristic."""
+    global _tokenizer, _tokenizer_loaded
+    with _lock:
+        _tokenizer = (name, counter) if counter is not None else None
+        _tokenizer_loaded = True
+        _memo.clear()
+
+
+def tokenizer_name() -> str:
+    active = _active_tokenizer()
+    return active[0] if active else "heuristic"
 
 
 def estimate_tokens(text: str) -> int:
     """Estimate token count using a lightweight language-aware heuristic."""
     if not text:
         return 0
-    cjk_count = len(_CJK_PATTERN.findall(text))
-    ascii_count = len(text) - cjk_count
-    return int(cjk_count / 1.5 + ascii_count / 4)
+    active = _active_tokenizer()
+    if active is None and (len(text) < MEMO_MIN_CHARS or text.isascii()):
+        return _heuristic_tokens(text)
+
+    name = active[0] if active else "heuristic"
+    key = (name, len(text), hash(text))
+    with _lock:
+        cached = _memo.get(key)
+        if cached is not None:
+            _memo.move_to_end(key)
+            _memo_stats["hits"] += 1
+            return cached
+        _memo_stats["misses"] += 1
+
+    count = _heuristic_tokens(text)
+    if active is not None:
+        try:
+            count = int(active[1](text))
+        except Exception as exc:  # a broken tokenizer must not fail the request
+            logger.debug("Tokenizer %s failed, using heuristic: %s", name, exc)
+
+    with _lock:
+        _memo[key] = count
+        if len(_memo) > MEMO_MAX_ENTRIES:
+            _memo.popitem(last=False)
+    return count
+
+
+def estimate_segments_tokens(segments: Iterable[str]) -> int:
+    """Token count of a prompt assembled from segments, each memoized on its own."""
+    return sum(estimate_tokens(segment) for segment in segments if segment)
 
 
 def estimate_input_output_tokens(input_text: str, output_text: str) -> Dict[str, int]:
@@ -26,3 +149,19 @@ def estimate_input_output_tokens(input_text: str, output_text: str) -> Dict[str,
         "output_tokens": output_tokens,
         "total_tokens": input_tokens + output_tokens,
     }
+
+
+def token_cache_stats() -> Dict[str, object]:
+    with _lock:
+        return {
+            "tokenizer": _tokenizer[0] if _tokenizer else "heuristic",
+            "entries": len(_memo),
+            "hits": _memo_stats["hits"],
+            "misses": _memo_stats["misses"],
+        }
+
+
+def clear_token_cache() -> None:
+    with _lock:
+        _memo.clear()
+        _memo_stats["hits"] = _memo_stats["misses"] = 0
@@ -90,7 +90,10 @@ def create_app(
         version="2.1.0",
     )
 
-    ws_manager = WebSocketManager()
+    ws_manager = WebSocketManager(
+        max_queue=config.ws_queue_size,
+        slow_consumer_policy=config.ws_slow_consumer_policy,
+    )
     start_time = time.time()
 
     app.state.config = config
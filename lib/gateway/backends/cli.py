@@ -9,7 +9,7 @@ import asyncio
 import os
 import shutil
 import time
-from typing import Optional, List
+from typing import AsyncGenerator, Callable, List, Optional
 
 from lib.common.auth import (
     open_auth_terminal as _open_auth_terminal,
@@ -17,7 +17,13 @@ from lib.common.auth import (
 )
 from lib.common.errors import BackendError
 from lib.common.logging import get_logger
-from .extractors.cli_output import clean_cli_output, extract_thinking, process_cli_output
+from .extractors.cli_output import (
+    CLIEvent,
+    CLIOutputParser,
+    clean_cli_output,
+    extract_thinking,
+    process_cli_output,
+)
 from .executors.cli_process import (
     execute_with_pty as _execute_with_pty_runner,
     execute_with_streaming as _execute_with_streaming_runner,
@@ -27,9 +33,21 @@ from .base_backend import BaseBackend, BackendResult
 from ..models import GatewayRequest
 from ..gateway_config import ProviderConfig
 from ..stream_output import StreamOutput, get_stream_manager
+from ..streaming import StreamChunk
 
 logger = get_logger("gateway.backends.cli")
 
+_STREAM_EVENT_TYPES = {
+    "text": "text_delta",
+    "thinking": "thinking_delta",
+    "tool_call": "tool_call",
+    "usage": "usage",
+}
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "0").lower() in ("1", "true", "yes")
+
 
 class CLIBackend(BaseBackend):
     """
@@ -123,6 +141,24 @@ class CLIBackend(BaseBackend):
         cwd = os.path.expanduser(os.path.expandvars(self.config.cli_cwd))
         return cwd or None
 
+    def _cli_env(self) -> dict:
+        """Environment for non-interactive execution."""
+        env = os.environ.copy()
+        env["TERM"] = "dumb"
+        env["NO_COLOR"] = "1"
+        env["CI"] = "1"  # Many CLIs detect CI mode and disable interactivity
+        return env
+
+    def _make_parser(
+        self, on_event: Optional[Callable[[CLIEvent], None]] = None
+    ) -> Optional[CLIOutputParser]:
+        """Incremental stdout parser for this provider, or None to parse after exit."""
+        return CLIOutputParser(self.config.name, on_event=on_event)
+
+    @staticmethod
+    def _record_event(stream: StreamOutput, event: CLIEvent) -> None:
+        stream.event(_STREAM_EVENT_TYPES.get(event.kind, event.kind), event.text, **(event.data or {}))
+
     async def execute(self, request: GatewayRequest) -> BackendResult:
         """Execute request via CLI subprocess with streaming output."""
         start_time = time.time()
@@ -152,11 +188,7 @@ class CLIBackend(BaseBackend):
             logger.debug("Provider=%s full command=%s", self.config.name, cmd)
             stream.status(f"Executing: {' '.join(cmd[:2])}...")
 
-            # Set up environment for non-interactive execution
-            env = os.environ.copy()
-            env["TERM"] = "dumb"
-            env["NO_COLOR"] = "1"
-            env["CI"] = "1"  # Many CLIs detect CI mode and disable interactivity
+            env = self._cli_env()
             cwd = self._resolve_cwd()
             if cwd and not os.path.isdir(cwd):
                 stream.status(f"Configured cwd not found: {cwd}, using default")
@@ -165,11 +197,11 @@ class CLIBackend(BaseBackend):
             # Try PTY mode first for CLIs that need terminal (like Gemini)
             # This allows us to capture auth URLs that are only shown in TTY mode
             # Enable by default for Gemini since it requires TTY
-            use_pty = os.environ.get("CCB_CLI_USE_PTY", "0").lower() in ("1", "true", "yes")
+            use_pty = _env_flag("CCB_CLI_USE_PTY")
 
             # For Gemini with -p flag, use regular subprocess (no TTY needed)
             # WezTerm mode is only for interactive Gemini sessions
-            use_wezterm_for_gemini = os.environ.get("CCB_GEMINI_USE_WEZTERM", "0").lower() in ("1", "true", "yes")
+            use_wezterm_for_gemini = _env_flag("CCB_GEMINI_USE_WEZTERM")
 
             if self.config.name == "gemini" and use_wezterm_for_gemini:
                 debug = os.environ.get("CCB_DEBUG", "0").lower() in ("1", "true", "yes")
@@ -214,12 +246,18 @@ class CLIBackend(BaseBackend):
 
             # Fallback to regular subprocess with streaming
             stream.status("Starting subprocess...")
-            result = await self._execute_with_streaming(cmd, env, request.timeout_s or self.config.timeout_s, stream, cwd)
+            parser = self._make_parser(lambda event: self._record_event(stream, event))
+            result = await self._execute_with_streaming(
+                cmd, env, request.timeout_s or self.config.timeout_s, stream, cwd,
+                on_stdout=parser.feed if parser is not None else None,
+            )
 
             if result is not None:
                 stdout, stderr, returncode = result
                 latency_ms = (time.time() - start_time) * 1000
-                backend_result = self._process_output(stdout, stderr, returncode, latency_ms, request.message)
+                backend_result = self._process_output(
+                    stdout, stderr, returncode, latency_ms, request.message, parser=parser
+                )
 
                 if backend_result.success:
                     if backend_result.thinking:
@@ -296,11 +334,148 @@ class CLIBackend(BaseBackend):
                 latency_ms=(time.time() - start_time) * 1000,
             )
 
+    def _streams_natively(self) -> bool:
+        """Whether ``execute_stream`` can parse stdout while the process runs."""
+        if type(self).execute is not CLIBackend.execute:
+            return False
+        if _env_flag("CCB_CLI_USE_PTY"):
+            return False
+        return not (self.config.name == "gemini" and _env_flag("CCB_GEMINI_USE_WEZTERM"))
+
+    def _event_chunk(self, request: GatewayRequest, event: CLIEvent, index: int) -> StreamChunk:
+        if event.kind == "text":
+            return StreamChunk(request_id=request.id, content=event.text, chunk_index=index, provider=self.config.name)
+        return StreamChunk(
+            request_id=request.id,
+            content="",
+            chunk_index=index,
+            provider=self.config.name,
+            metadata={"event": event.kind, "text": event.text, "data": event.data},
+        )
+
+    def _final_chunk(self, request: GatewayRequest, result: BackendResult, content: str, index: int) -> StreamChunk:
+        if result.success:
+            metadata = {"thinking": result.thinking} if result.thinking else None
+        else:
+            content, metadata = "", {"error": result.error or "Unknown error"}
+        return StreamChunk(
+            request_id=request.id,
+            content=content,
+            chunk_index=index,
+            is_final=True,
+            tokens_used=result.tokens_used,
+            provider=self.config.name,
+            metadata=metadata,
+        )
+
+    async def execute_stream(self, request: GatewayRequest) -> AsyncGenerator[StreamChunk, None]:
+        """
+        Execute request and yield response text while the CLI is still running.
+
+        Text deltas come from the incremental output parser; thinking,
+        tool-call and usage events travel as content-less chunks with the
+        event in ``metadata``.  The final chunk carries the remainder of the
+        parsed response, token usage and any error; when the streamed text is
+        not a prefix of the parsed response, it carries ``replace: True`` and
+        the full ``response`` in ``metadata`` instead.  Paths that can only
+        parse after exit (PTY, WezTerm, overridden ``execute``) yield a single
+        final chunk.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        parser = self._make_parser(queue.put_nowait) if self._streams_natively() else None
+        if parser is None:
+            result = await self.execute(request)
+            yield self._final_chunk(request, result, result.response or "", 0)
+            return
+
+        start_time = time.time()
+        stream = get_stream_manager().create_stream(request.id, self.config.name)
+        stream.status(f"Starting {self.config.name} CLI execution (streaming)")
+        index = 0
+        streamed: List[str] = []
+        task: Optional[asyncio.Task] = None
+
+        def drained():
+            while not queue.empty():
+                yield queue.get_nowait()
+
+        try:
+            if self.config.name == "gemini":
+                await self._ensure_gemini_token()
+            cmd = self._build_command(request.message)
+            cwd = self._resolve_cwd()
+            if cwd and not os.path.isdir(cwd):
+                stream.status(f"Configured cwd not found: {cwd}, using default")
+                cwd = None
+            task = asyncio.create_task(self._execute_with_streaming(
+                cmd, self._cli_env(), request.timeout_s or self.config.timeout_s, stream, cwd,
+                on_stdout=parser.feed,
+            ))
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    break
+                for event in (getter.result(), *drained()):
+                    self._record_event(stream, event)
+                    if event.kind == "text":
+                        streamed.append(event.text)
+                    yield self._event_chunk(request, event, index)
+                    index += 1
+
+            outcome = task.result()
+            latency_ms = (time.time() - start_time) * 1000
+            if outcome is None:
+                backend_result = BackendResult.fail("Streaming execution failed", latency_ms=latency_ms)
+            else:
+                stdout, stderr, returncode = outcome
+                backend_result = self._process_output(
+                    stdout, stderr, returncode, latency_ms, request.message, parser=parser
+                )
+            # finish() may flush a last partial line.
+            for event in drained():
+                self._record_event(stream, event)
+                if event.kind == "text":
+                    streamed.append(event.text)
+                yield self._event_chunk(request, event, index)
+                index += 1
+
+            response = backend_result.response or ""
+            sent = "".join(streamed)
+            if backend_result.success:
+                if backend_result.thinking:
+                    stream.thinking(backend_result.thinking)
+                stream.complete(response=backend_result.response)
+            else:
+                stream.complete(error=backend_result.error)
+            if response.startswith(sent):
+                yield self._final_chunk(request, backend_result, response[len(sent):], index)
+            else:
+                # Live text (e.g. banner lines before JSON events) is not a
+                # prefix of the authoritative response: replace it.
+                final = self._final_chunk(request, backend_result, "", index)
+                if backend_result.success:
+                    final.metadata = {**(final.metadata or {}), "replace": True, "response": response}
+                yield final
+
+        except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError) as exc:
+            logger.exception("Unexpected CLI stream error for %s", self.config.name)
+            error_msg = str(BackendError(f"Unexpected backend error: {exc}"))
+            stream.error(error_msg)
+            stream.complete(error=error_msg)
+            yield self._final_chunk(request, BackendResult.fail(error_msg), "", index)
+        finally:
+            if task is not None and not task.done():
+                # Consumer went away mid-stream; cancelling kills the process.
+                task.cancel()
+
     async def _execute_with_streaming(
-        self, cmd: List[str], env: dict, timeout: float, stream: StreamOutput, cwd: Optional[str]
+        self, cmd: List[str], env: dict, timeout: float, stream: StreamOutput, cwd: Optional[str],
+        on_stdout: Optional[Callable[[str], object]] = None,
     ) -> Optional[tuple]:
         """Execute command with real-time streaming output."""
-        return await _execute_with_streaming_runner(cmd, env, timeout, stream, cwd, logger)
+        return await _execute_with_streaming_runner(cmd, env, timeout, stream, cwd, logger, on_stdout=on_stdout)
 
     async def _execute_with_wezterm(
         self, cmd: List[str], timeout: float, cwd: Optional[str]
@@ -316,7 +491,7 @@ class CLIBackend(BaseBackend):
 
     def _process_output(
         self, stdout: str, stderr: str, returncode: int, latency_ms: float,
-        input_text: str = ""
+        input_text: str = "", parser: Optional[CLIOutputParser] = None,
     ) -> BackendResult:
         """Process CLI output and convert to BackendResult."""
         return process_cli_output(
@@ -326,6 +501,7 @@ class CLIBackend(BaseBackend):
             latency_ms=latency_ms,
             input_text=input_text,
             provider_name=self.config.name,
+            parser=parser,
         )
 
     def _extract_thinking(self, text: str) -> tuple:
@@ -0,0 +1,378 @@
+"""
+Warm worker pools for interactive CLI providers.
+
+Each provider gets a pool of long-lived CLI processes that already paid
+their cold start (runtime boot, auth check, banner).  A request checks a
+worker out, talks to it over stdin/stdout and checks it back in; up to
+``max_size`` requests run concurrently instead of queueing behind one
+process.
+
+Workers are recycled after ``max_requests`` requests, when their RSS grows
+more than ``max_rss_growth_mb`` past the first checkin, or when a request
+leaves them in an unknown state (timeout, error).  A maintenance task
+reaps dead idle workers, retires idle ones above ``min_size`` and keeps the
+pool topped up to ``min_size``.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+from lib.common.logging import get_logger
+
+from ..gateway_config import CLIPoolConfig
+
+logger = get_logger("gateway.backends.cli_pool")
+
+
+def read_rss_kb(pid: int) -> Optional[int]:
+    """Resident set size of ``pid`` in KiB, or None when it cannot be read."""
+    try:
+        with open(f"/proc/{pid}/status", "rb") as handle:
+            for line in handle:
+                if line.startswith(b"VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        return psutil.Process(pid).memory_info().rss // 1024
+    except (psutil.Error, OSError):
+        return None
+
+
+class CLIWorker:
+    """One warm CLI process and its usage counters."""
+
+    def __init__(self, process: asyncio.subprocess.Process, worker_id: int):
+        self.process = process
+        self.id = worker_id
+        self.requests = 0
+        self.spawned_at = time.monotonic()
+        self.last_used = self.spawned_at
+        self.baseline_rss_kb: Optional[int] = None
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def alive(self) -> bool:
+        if self.process.returncode is not None:
+            return False
+        stdout = self.process.stdout
+        return stdout is None or not stdout.at_eof()
+
+    async def write(self, text: str) -> None:
+        self.process.stdin.write(text.encode("utf-8"))
+        await self.process.stdin.drain()
+
+    async def readline(self, timeout: float) -> bytes:
+        return await asyncio.wait_for(self.process.stdout.readline(), timeout=timeout)
+
+    async def terminate(self) -> None:
+        if self.process.returncode is not None:
+            return
+        try:
+            self.process.terminate()
+            await asyncio.wait_for(self.process.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+        except ProcessLookupError:
+            pass
+
+
+class CLIWorkerPool:
+    """Checkout/checkin pool of warm CLI workers for one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        command: List[str],
+        config: Optional[CLIPoolConfig] = None,
+        *,
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[str] = None,
+        is_prompt: Optional[Callable[[str], bool]] = None,
+    ):
+        self.name = name
+        self.command = list(command)
+        self.config = config or CLIPoolConfig()
+        self.env = env
+        self.cwd = cwd
+        self.is_prompt = is_prompt or (lambda line: line.endswith("> "))
+        self._idle: Deque[CLIWorker] = deque()
+        self._workers: Set[CLIWorker] = set()
+        self._spawning = 0
+        self._next_id = 0
+        self._cond: Optional[asyncio.Condition] = None
+        self._maintainer: Optional[asyncio.Task] = None
+        # Top-ups and wake-ups started without awaiting; held so they are not garbage collected
+        self._background: Set[asyncio.Task] = set()
+        self._closed = False
+        # Counters
+        self.spawned = 0
+        self.spawn_failures = 0
+        self.spawn_time_s = 0.0
+        self.checkouts = 0
+        self.cold_checkouts = 0
+        self.waits = 0
+        self.wait_time_s = 0.0
+        self.retired: Counter = Counter()
+
+    @property
+    def size(self) -> int:
+        return len(self._workers)
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def start(self) -> int:
+        """Pre-spawn ``min_size`` workers and start maintenance; returns workers spawned."""
+        before = self.spawned
+        await self._top_up()
+        if self._maintainer is None and self.config.health_check_interval_s > 0:
+            self._maintainer = asyncio.create_task(self._maintain_loop())
+        return self.spawned - before
+
+    async def _spawn(self) -> CLIWorker:
+        started = time.monotonic()
+        process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            # Nobody drains stderr for a long-lived worker; a full pipe would stall it.
+            stderr=asyncio.subprocess.DEVNULL,
+            env=self.env,
+            cwd=self.cwd,
+        )
+        self._next_id += 1
+        worker = CLIWorker(process, self._next_id)
+        if self.config.wait_for_prompt:
+            try:
+                await self._await_prompt(worker, self.config.spawn_timeout_s)
+            except BaseException:
+                # Also on cancellation (callers wrap execute in wait_for):
+                # never leave a half-started process behind.
+                await asyncio.shield(worker.terminate())
+                raise
+        self.spawned += 1
+        self.spawn_time_s += time.monotonic() - started
+        return worker
+
+    async def _await_prompt(self, worker: CLIWorker, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            line = await worker.readline(max(0.0, deadline - time.monotonic()))
+            if not line:
+                raise ValueError(f"{self.name} CLI exited before its first prompt")
+            if self.is_prompt(line.decode("utf-8", errors="replace").rstrip("\r\n")):
+                return
+
+    async def _spawn_registered(self, idle: bool = False) -> Optional[CLIWorker]:
+        """Spawn a worker counted in ``_spawning`` and register it, busy unless ``idle``."""
+        worker: Optional[CLIWorker] = None
+        try:
+            worker = await self._spawn()
+        except (asyncio.TimeoutError, OSError, ValueError):
+            self.spawn_failures += 1
+            logger.warning("Failed to spawn %s CLI worker", self.name, exc_info=True)
+        finally:
+            # No await here: a cancelled spawn must still release its slot.
+            self._spawning -= 1
+            if worker is not None:
+                self._workers.add(worker)
+                if idle:
+                    self._idle.append(worker)
+            self._in_background(self._notify())
+        return worker
+
+    async def _notify(self) -> None:
+        cond = self._condition()
+        async with cond:
+            cond.notify()
+
+    async def checkout(self, timeout: Optional[float] = None) -> CLIWorker:
+        """
+        Take an idle worker, spawning one if the pool is below ``max_size``.
+
+        Waits for a checkin otherwise; raises ``asyncio.TimeoutError`` after
+        ``timeout`` seconds and ``RuntimeError`` if the pool is closed or the
+        new worker fails to start.
+        """
+        cond = self._condition()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited_from: Optional[float] = None
+        async with cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError(f"{self.name} CLI pool is closed")
+                while self._idle:
+                    # LIFO keeps the most recently used workers hot.
+                    worker = self._idle.pop()
+                    if worker.alive:
+                        self._record_checkout(waited_from, cold=False)
+                        return worker
+                    self._discard(worker, "exited")
+                if len(self._workers) + self._spawning < max(1, self.config.max_size):
+                    self._spawning += 1
+                    break
+                if waited_from is None:
+                    waited_from = time.monotonic()
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError()
+                await asyncio.wait_for(cond.wait(), timeout=remaining)
+        worker = await self._spawn_registered()
+        if worker is None:
+            raise RuntimeError(f"Failed to start a {self.name} CLI worker")
+        self._record_checkout(waited_from, cold=True)
+        return worker
+
+    def _record_checkout(self, waited_from: Optional[float], cold: bool) -> None:
+        self.checkouts += 1
+        if cold:
+            self.cold_checkouts += 1
+        if waited_from is not None:
+            self.waits += 1
+            self.wait_time_s += time.monotonic() - waited_from
+
+    async def checkin(self, worker: CLIWorker, reusable: bool = True) -> None:
+        """Return a worker; recycles it if it is spent, bloated or in an unknown state."""
+        worker.requests += 1
+        worker.last_used = time.monotonic()
+        reason = self._recycle_reason(worker) if reusable else "unusable"
+        cond = self._condition()
+        async with cond:
+            if reason is None and not self._closed:
+                self._idle.append(worker)
+            else:
+                self._discard(worker, reason or "closed")
+            cond.notify()
+        if reason is not None:
+            await worker.terminate()
+            if not self._closed:
+                self._in_background(self._top_up())
+
+    def _in_background(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("%s CLI pool background task failed", self.name, exc_info=task.exception())
+
+    def _recycle_reason(self, worker: CLIWorker) -> Optional[str]:
+        if not worker.alive:
+            return "exited"
+        if self.config.max_requests and worker.requests >= self.config.max_requests:
+            return "max_requests"
+        rss = read_rss_kb(worker.pid)
+        if rss is not None:
+            if worker.baseline_rss_kb is None:
+                worker.baseline_rss_kb = rss
+            elif self.config.max_rss_growth_mb and rss - worker.baseline_rss_kb > self.config.max_rss_growth_mb * 1024:
+                return "rss_growth"
+        return None
+
+    def _discard(self, worker: CLIWorker, reason: str) -> None:
+        """Forget ``worker``; caller holds the condition lock."""
+        if worker in self._workers:
+            self._workers.discard(worker)
+            self.retired[reason] += 1
+            logger.debug("Retired %s CLI worker %s (%s)", self.name, worker.id, reason)
+
+    async def _top_up(self) -> None:
+        cond = self._condition()
+        async with cond:
+            missing = self.config.min_size - len(self._workers) - self._spawning
+            if self._closed or missing <= 0:
+                return
+            self._spawning += missing
+        await asyncio.gather(*(self._spawn_registered(idle=True) for _ in range(missing)))
+
+    async def health_check(self) -> Dict[str, int]:
+        """Reap dead idle workers, retire stale ones above ``min_size`` and top up."""
+        cond = self._condition()
+        now = time.monotonic()
+        doomed: List[CLIWorker] = []
+        async with cond:
+            keep: Deque[CLIWorker] = deque()
+            # Oldest idle workers first, so the hottest ones survive.
+            for worker in self._idle:
+                reason = self._recycle_reason(worker)
+                if (
+                    reason is None
+                    and self.config.idle_timeout_s
+                    and now - worker.last_used > self.config.idle_timeout_s
+                    and len(self._workers) > self.config.min_size
+                ):
+                    reason = "idle"
+                if reason:
+                    self._discard(worker, reason)
+                    doomed.append(worker)
+                else:
+                    keep.append(worker)
+            self._idle = keep
+        for worker in doomed:
+            await worker.terminate()
+        before = self.spawned
+        await self._top_up()
+        return {"retired": len(doomed), "spawned": self.spawned - before}
+
+    async def _maintain_loop(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self.config.health_check_interval_s)
+            try:
+                await self.health_check()
+            except (RuntimeError, OSError, ValueError):
+                logger.warning("%s CLI pool health check failed", self.name, exc_info=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._workers),
+            "idle": len(self._idle),
+            "busy": len(self._workers) - len(self._idle),
+            "spawning": self._spawning,
+            "spawned": self.spawned,
+            "spawn_failures": self.spawn_failures,
+            "avg_spawn_ms": round(self.spawn_time_s / self.spawned * 1000, 2) if self.spawned else 0.0,
+            "checkouts": self.checkouts,
+            "warm_ratio": round(1 - self.cold_checkouts / self.checkouts, 3) if self.checkouts else 0.0,
+            "waits": self.waits,
+            "avg_wait_ms": round(self.wait_time_s / self.waits * 1000, 2) if self.waits else 0.0,
+            "retired": dict(self.retired),
+            "config": {
+                "min_size": self.config.min_size,
+                "max_size": self.config.max_size,
+                "max_requests": self.config.max_requests,
+                "max_rss_growth_mb": self.config.max_rss_growth_mb,
+            },
+        }
+
+    async def close(self) -> None:
+        """Stop maintenance and terminate every worker."""
+        self._closed = True
+        if self._maintainer is not None:
+            self._maintainer.cancel()
+            self._maintainer = None
+        # Let in-flight top-ups register their workers so they are terminated below.
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        cond = self._condition()
+        async with cond:
+            workers = list(self._workers)
+            self._workers.clear()
+            self._idle.clear()
+            cond.notify_all()
+        await asyncio.gather(*(worker.terminate() for worker in workers), return_exceptions=True)
@@ -2,6 +2,7 @@
 
 from .cli_process import execute_with_pty, execute_with_streaming, execute_with_wezterm
 from .http_request import (
+    anthropic_message_content,
     execute_anthropic_request,
     execute_gemini_request,
     execute_openai_compatible_request,
@@ -12,6 +13,7 @@ __all__ = [
     "execute_with_streaming",
     "execute_with_wezterm",
     "execute_with_pty",
+    "anthropic_message_content",
     "execute_anthropic_request",
     "execute_gemini_request",
     "execute_openai_compatible_request",
@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import codecs
 import os
 import re
 import subprocess
 import time
 import uuid
 from logging import Logger
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from ...stream_output import StreamOutput
 
@@ -21,8 +22,15 @@ async def execute_with_streaming(
     stream: StreamOutput,
     cwd: Optional[str],
     logger: Logger,
+    on_stdout: Optional[Callable[[str], object]] = None,
 ) -> Optional[tuple]:
-    """Execute command with real-time streaming output."""
+    """
+    Execute command with real-time streaming output.
+
+    ``on_stdout`` receives each decoded stdout chunk as it arrives (used to
+    feed an incremental output parser).
+    """
+    process = None
     try:
         process = await asyncio.create_subprocess_exec(
             *cmd,
@@ -40,6 +48,8 @@ async def execute_with_streaming(
 
         async def read_stream(stream_reader, parts, stream_type):
             nonlocal chunk_buffer
+            # Incremental decoding keeps multi-byte characters split across reads intact.
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
             while True:
                 try:
                     remaining = deadline - time.time()
@@ -51,8 +61,12 @@ async def execute_with_streaming(
                     )
                     if not chunk:
                         break
-                    decoded = chunk.decode("utf-8", errors="replace")
+                    decoded = decoder.decode(chunk)
+                    if not decoded:
+                        continue
                     parts.append(decoded)
+                    if on_stdout is not None and stream_type == "stdout":
+                        on_stdout(decoded)
 
                     # Stream output chunks (dedupe rapid small chunks)
                     chunk_buffer += decoded
@@ -62,6 +76,11 @@ async def execute_with_streaming(
 
                 except asyncio.TimeoutError:
                     continue
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                parts.append(tail)
+                if on_stdout is not None and stream_type == "stdout":
+                    on_stdout(tail)
 
         # Read both streams concurrently
         await asyncio.gather(
@@ -82,6 +101,10 @@ async def execute_with_streaming(
 
         return "".join(stdout_parts), "".join(stderr_parts), process.returncode or 0
 
+    except asyncio.CancelledError:
+        if process is not None and process.returncode is None:
+            process.kill()
+        raise
     except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError) as exc:
         logger.exception("Streaming execution error")
         stream.error(f"Streaming execution error: {exc}")
@@ -2,13 +2,52 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from ..base_backend import BackendResult
 from ...models import GatewayRequest
 
 
 ExtractFn = Callable[[str, Dict[str, Any]], Tuple[str, Optional[int]]]
+ExtractUsageFn = Callable[[str, Dict[str, Any]], Dict[str, int]]
+
+
+def anthropic_message_content(request: GatewayRequest) -> Union[str, List[Dict[str, Any]]]:
+    """
+    User message content for the Messages API.
+
+    When the prompt layout stage left ``_prompt_segments`` in the request
+    metadata (and the message was not rewritten since), each segment becomes
+    a text block and segments marked ``cache`` get an ephemeral
+    ``cache_control`` breakpoint, so the stable prefix is served from
+    Anthropic's prompt cache.
+    """
+    segments = (request.metadata or {}).get("_prompt_segments")
+    if not segments or not any(segment.get("cache") for segment in segments):
+        return request.message
+    if "".join(segment.get("text", "") for segment in segments) != request.message:
+        return request.message
+    blocks: List[Dict[str, Any]] = []
+    for segment in segments:
+        if not segment.get("text"):
+            continue
+        block: Dict[str, Any] = {"type": "text", "text": segment["text"]}
+        if segment.get("cache"):
+            block["cache_control"] = {"type": "ephemeral"}
+        blocks.append(block)
+    return blocks
+
+
+def _usage_metadata(api_kind: str, data: Dict[str, Any], extract_usage: Optional[ExtractUsageFn]) -> Dict[str, Any]:
+    """``usage`` plus top-level input/output token counts for cost tracking."""
+    usage = extract_usage(api_kind, data) if extract_usage else {}
+    if not usage:
+        return {}
+    return {
+        "usage": usage,
+        "input_tokens": usage.get("input_tokens", 0),
+        "output_tokens": usage.get("output_tokens", 0),
+    }
 
 
 async def execute_anthropic_request(
@@ -20,6 +59,7 @@ async def execute_anthropic_request(
     model: str,
     max_tokens: int,
     extract_response_and_tokens: ExtractFn,
+    extract_usage: Optional[ExtractUsageFn] = None,
 ) -> BackendResult:
     """Execute request using Anthropic API format."""
     url = f"{api_base_url}/messages"
@@ -33,7 +73,7 @@ async def execute_anthropic_request(
     payload = {
         "model": model,
         "max_tokens": max_tokens,
-        "messages": [{"role": "user", "content": request.message}],
+        "messages": [{"role": "user", "content": anthropic_message_content(request)}],
     }
 
     async with session.post(url, json=payload, headers=headers) as resp:
@@ -47,7 +87,11 @@ async def execute_anthropic_request(
         return BackendResult.ok(
             response=response_text,
             tokens_used=tokens_used,
-            metadata={"model": data.get("model"), "stop_reason": data.get("stop_reason")},
+            metadata={
+                "model": data.get("model"),
+                "stop_reason": data.get("stop_reason"),
+                **_usage_metadata("anthropic", data, extract_usage),
+            },
         )
 
 
@@ -60,6 +104,7 @@ async def execute_gemini_request(
     model: str,
     max_tokens: int,
     extract_response_and_tokens: ExtractFn,
+    extract_usage: Optional[ExtractUsageFn] = None,
 ) -> BackendResult:
     """Execute request using Google Gemini API format."""
     base_url = api_base_url.rstrip("/")
@@ -91,6 +136,7 @@ async def execute_gemini_request(
             metadata={
                 "model": model,
                 "finish_reason": candidates[0].get("finishReason") if candidates else None,
+                **_usage_metadata("gemini", data, extract_usage),
             },
         )
 
@@ -104,6 +150,7 @@ async def execute_openai_compatible_request(
     model: str,
     max_tokens: int,
     extract_response_and_tokens: ExtractFn,
+    extract_usage: Optional[ExtractUsageFn] = None,
 ) -> BackendResult:
     """Execute request using OpenAI-compatible API format."""
     url = f"{api_base_url}/chat/completions"
@@ -134,5 +181,6 @@ async def execute_openai_compatible_request(
             metadata={
                 "model": data.get("model"),
                 "finish_reason": choices[0].get("finish_reason") if choices else None,
+                **_usage_metadata("openai", data, extract_usage),
             },
         )
@@ -8,6 +8,7 @@ from typing import AsyncGenerator
 
 from ...models import GatewayRequest
 from ...streaming import StreamChunk
+from .http_request import anthropic_message_content
 
 
 async def stream_anthropic_response(
@@ -35,12 +36,13 @@ async def stream_anthropic_response(
     payload = {
         "model": model,
         "max_tokens": max_tokens,
-        "messages": [{"role": "user", "content": request.message}],
+        "messages": [{"role": "user", "content": anthropic_message_content(request)}],
         "stream": True,
     }
 
     chunk_index = 0
     total_tokens = 0
+    usage_metadata = {}
 
     timeout = aiohttp.ClientTimeout(total=timeout_s)
 
@@ -85,6 +87,17 @@ async def stream_anthropic_response(
                                 )
                                 chunk_index += 1
 
+                    elif event_type == "message_start":
+                        # Prompt-side usage (including prompt cache reads) arrives up front.
+                        usage = data.get("message", {}).get("usage", {})
+                        cached = usage.get("cache_read_input_tokens", 0) or 0
+                        created = usage.get("cache_creation_input_tokens", 0) or 0
+                        usage_metadata = {"usage": {
+                            "input_tokens": (usage.get("input_tokens", 0) or 0) + cached + created,
+                            "cached_tokens": cached,
+                            "cache_creation_tokens": created,
+                        }}
+
                     elif event_type == "message_delta":
                         usage = data.get("usage", {})
                         total_tokens = usage.get("output_tokens", 0)
@@ -97,6 +110,7 @@ async def stream_anthropic_response(
                             is_final=True,
                             tokens_used=total_tokens,
                             provider=provider_name,
+                            metadata=usage_metadata or None,
                         )
                         return
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
-from .base import ContentExtractor
+from .base import ContentExtractor, usage_ints
 
 
 class AnthropicExtractor(ContentExtractor):
@@ -38,3 +38,15 @@ class AnthropicExtractor(ContentExtractor):
             return int(input_tokens) + int(output_tokens)
         except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError):
             return 0
+
+    def extract_usage(self, data: Dict[str, Any]) -> Dict[str, int]:
+        # ``input_tokens`` counts only the uncached tail of the prompt.
+        usage = usage_ints(data.get("usage"))
+        cached = usage.get("cache_read_input_tokens", 0)
+        created = usage.get("cache_creation_input_tokens", 0)
+        return {
+            "input_tokens": usage.get("input_tokens", 0) + cached + created,
+            "output_tokens": usage.get("output_tokens", 0),
+            "cached_tokens": cached,
+            "cache_creation_tokens": created,
+        }
@@ -6,6 +6,17 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
 
 
+def usage_ints(usage: Any) -> Dict[str, int]:
+    """Integer-valued fields of a provider ``usage`` object (others dropped)."""
+    if not isinstance(usage, dict):
+        return {}
+    return {
+        key: int(value)
+        for key, value in usage.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+
+
 class ContentExtractor(ABC):
     """Parse provider response payloads into normalized fields."""
 
@@ -16,3 +27,11 @@ class ContentExtractor(ABC):
     @abstractmethod
     def extract_tokens(self, data: Dict[str, Any]) -> Optional[int]:
         """Extract total token usage from provider payload if available."""
+
+    def extract_usage(self, data: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Extract normalized usage: ``input_tokens`` (whole prompt, cached part
+        included), ``output_tokens``, ``cached_tokens`` (prompt tokens read from
+        the provider's prompt cache) and ``cache_creation_tokens``.
+        """
+        return {}
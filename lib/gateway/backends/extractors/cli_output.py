@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from lib.common.auth import (
     extract_auth_url,
@@ -67,123 +68,382 @@ def extract_thinking(text: str) -> Tuple[str, Optional[str]]:
     return cleaned_text.strip(), thinking
 
 
-def clean_cli_output(output: str, provider_name: str) -> Tuple[str, Optional[str]]:
-    """Clean raw CLI output and optionally extract reasoning content."""
-    if provider_name == "qoder":
-        cleaned_lines = []
-        for line in output.strip().split("\n"):
-            if any(
-                skip in line.lower()
-                for skip in [
-                    "loading",
-                    "context engine",
-                    "analyzing",
-                    "mcp:",
-                    "job id:",
-                ]
-            ):
-                continue
-            cleaned_lines.append(line)
-        return "\n".join(cleaned_lines).strip(), None
-
-    lines = output.strip().split("\n")
-    text_parts = []
-    thinking_parts = []
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        try:
-            data = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-
-        if not isinstance(data, dict):
-            continue
-
-        if data.get("type") == "item.completed":
-            item = data.get("item", {})
-            if item.get("type") == "agent_message":
-                text_parts.append(item.get("text", ""))
-            elif item.get("type") == "thinking":
-                thinking_parts.append(item.get("text", ""))
+_QODER_SKIP = ("loading", "context engine", "analyzing", "mcp:", "job id:")
+
+_PLAIN_SKIP = (
+    "loading",
+    "initializing",
+    "connecting",
+    "thinking...",
+    "processing...",
+    "mcp:",
+    "--------",
+    "workdir:",
+    "model:",
+    "provider:",
+    "approval:",
+    "sandbox:",
+    "reasoning effort:",
+    "reasoning summaries:",
+    "session id:",
+    "tokens used",
+    "loaded cached credentials",
+    "hook registry initialized",
+    "credentials loaded",
+)
 
-        if data.get("type") == "thinking":
-            thinking_parts.append(data.get("text", ""))
+# (open, close) markers of inline reasoning, matched case-insensitively.
+_THINKING_TAGS = (
+    ("<thinking>", "</thinking>"),
+    ("<antthinking>", "</antthinking>"),
+    ("[thinking]", "[/thinking]"),
+)
 
-        if data.get("type") == "text":
-            part = data.get("part", {})
-            if part.get("type") == "text" and part.get("text"):
-                text_parts.append(part.get("text"))
-            elif part.get("type") == "thinking" and part.get("text"):
-                thinking_parts.append(part.get("text"))
-
-    if text_parts:
-        response = "\n".join(text_parts)
-        thinking = "\n\n---\n\n".join(thinking_parts) if thinking_parts else None
-        return response, thinking
-
-    json_objects = []
-    i = 0
-    while i < len(output):
-        if output[i] == "{":
-            brace_count = 0
-            start = i
-            for j in range(i, len(output)):
-                if output[j] == "{":
-                    brace_count += 1
-                elif output[j] == "}":
-                    brace_count -= 1
-                    if brace_count == 0:
-                        json_objects.append(output[start : j + 1])
-                        i = j
+_THINKING_ITEM_TYPES = ("thinking", "reasoning")
+
+# JSON event types emitted by Codex ``exec --json`` and OpenCode ``--format json``.
+_EVENT_TYPES = ("thinking", "text", "tool_use")
+_EVENT_TYPE_PREFIXES = ("item.", "turn.", "thread.", "step_")
+
+_PLAIN_SKIP_RE = re.compile("|".join(re.escape(skip) for skip in _PLAIN_SKIP), re.IGNORECASE)
+_TAG_OPEN_RE = re.compile("|".join(re.escape(tag[0]) for tag in _THINKING_TAGS), re.IGNORECASE)
+_TAG_BY_OPEN = {tag[0]: tag for tag in _THINKING_TAGS}
+
+
+@dataclass
+class CLIEvent:
+    """A typed event recognized in CLI output: text, thinking, tool_call or usage."""
+
+    kind: str
+    text: str = ""
+    data: Optional[Dict[str, Any]] = None
+
+
+def _normalize_usage(raw: Dict[str, Any]) -> Dict[str, int]:
+    """Map Codex ``usage`` / OpenCode ``tokens`` payloads to common keys."""
+    cache = raw.get("cache") if isinstance(raw.get("cache"), dict) else {}
+    usage = {
+        "input_tokens": raw.get("input_tokens", raw.get("input", 0)),
+        "output_tokens": raw.get("output_tokens", raw.get("output", 0)),
+        "cached_tokens": raw.get("cached_input_tokens", cache.get("read", 0)),
+        "reasoning_tokens": raw.get("reasoning_output_tokens", raw.get("reasoning", 0)),
+    }
+    return {key: int(value) for key, value in usage.items() if isinstance(value, (int, float))}
+
+
+def _is_cli_event(data: Any) -> bool:
+    """A CLI event or ``{"response": ...}`` document, as opposed to JSON in an answer."""
+    if not isinstance(data, dict):
+        return False
+    kind = data.get("type")
+    if isinstance(kind, str) and (kind in _EVENT_TYPES or kind.startswith(_EVENT_TYPE_PREFIXES)):
+        return True
+    return "response" in data
+
+
+class CLIOutputParser:
+    """
+    Push parser for CLI stdout.
+
+    ``feed`` takes chunks as the process writes them and returns the events
+    completed so far; ``finish`` flushes the tail and returns the same
+    ``(response, thinking)`` pair ``clean_cli_output`` produces.  Each line is
+    looked at once: JSON event lines (Codex ``exec --json``, OpenCode
+    ``--format json``) become text/thinking/tool_call/usage events,
+    multi-line JSON documents are buffered until their braces balance, other
+    JSON objects are part of the answer and stay plain text, and
+    plain text goes through the reasoning-tag, ``thinking:`` block and
+    banner filters incrementally.
+
+    Precedence matches the batch cleaner: JSON event text, then a JSON
+    ``response`` document (also when embedded in a text line), then filtered
+    plain text.  Plain-text deltas stop
+    once JSON events have been seen, so the streamed text is a live view and
+    the value from ``finish`` is authoritative.
+    """
+
+    def __init__(self, provider_name: str, on_event: Optional[Callable[[CLIEvent], None]] = None):
+        self.provider_name = provider_name
+        self.on_event = on_event
+        self.bytes_seen = 0
+        self.tool_calls: List[Dict[str, Any]] = []
+        self.usage: Dict[str, int] = {}
+        self._events: List[CLIEvent] = []
+        self._partial = ""
+        self._text_parts: List[str] = []
+        self._thinking_parts: List[str] = []
+        self._response: Optional[str] = None
+        self._json_seen = False
+        self._region: Optional[List[str]] = None
+        self._region_depth = 0
+        # Plain-text pipeline state
+        self._tag: Optional[Tuple[str, str]] = None
+        self._tag_open = ""
+        self._tag_buffer: List[str] = []
+        self._visible = ""
+        self._block: List[str] = []
+        self._plain_lines: List[str] = []
+        self._pending_blank: List[str] = []
+        self._streamed_text = False
+        self._finished: Optional[Tuple[str, Optional[str]]] = None
+
+    # -- public API -------------------------------------------------------
+
+    def feed(self, chunk: str) -> List[CLIEvent]:
+        """Consume a chunk of stdout; returns the events it completed."""
+        self._events = []
+        if not chunk:
+            return self._events
+        self.bytes_seen += len(chunk)
+        data = self._partial + chunk
+        lines = data.split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._line(line)
+        return self._events
+
+    def finish(self) -> Tuple[str, Optional[str]]:
+        """Flush buffered input and return ``(response, thinking)``."""
+        if self._finished is not None:
+            return self._finished
+        self._events = []
+        if self._partial:
+            self._line(self._partial, final=True)
+            self._partial = ""
+        if self._region is not None:
+            region, self._region = self._region, None
+            self._plain_text_lines(region)
+        if self._tag is not None:
+            # Unclosed reasoning tag: the batch regexes leave it as text.
+            pending = self._tag_open + "".join(self._tag_buffer)
+            self._tag = None
+            self._tag_buffer = []
+            self._visible_text(pending)
+        if self._visible:
+            visible, self._visible = self._visible, ""
+            self._block_line(visible)
+        self._close_block()
+
+        thinking = "\n\n---\n\n".join(self._thinking_parts) if self._thinking_parts else None
+        if self.provider_name == "qoder":
+            self._finished = ("\n".join(self._plain_lines).strip(), None)
+        elif self._text_parts:
+            self._finished = ("\n".join(self._text_parts), thinking)
+        elif self._response is not None:
+            self._finished = (self._response, None)
+        else:
+            self._finished = ("\n".join(self._plain_lines).strip(), thinking)
+        return self._finished
+
+    # -- dispatch ---------------------------------------------------------
+
+    def _emit(self, event: CLIEvent) -> None:
+        self._events.append(event)
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def _text(self, text: str) -> None:
+        prefix = "\n" if self._streamed_text else ""
+        self._streamed_text = True
+        self._emit(CLIEvent("text", prefix + text))
+
+    def _thinking(self, text: str) -> None:
+        self._thinking_parts.append(text)
+        self._emit(CLIEvent("thinking", text))
+
+    def _line(self, line: str, final: bool = False) -> None:
+        if self.provider_name == "qoder":
+            if not any(skip in line.lower() for skip in _QODER_SKIP):
+                self._keep_plain(line)
+            return
+
+        if self._region is not None:
+            self._region.append(line)
+            self._region_depth += line.count("{") - line.count("}")
+            if self._region_depth <= 0:
+                region, self._region = self._region, None
+                self._json_document(region)
+            return
+
+        stripped = line.strip()
+        if stripped.startswith("{"):
+            try:
+                data = json.loads(stripped)
+            except json.JSONDecodeError:
+                depth = stripped.count("{") - stripped.count("}")
+                if depth > 0 and not final:
+                    self._region = [line]
+                    self._region_depth = depth
+                    return
+            else:
+                if _is_cli_event(data):
+                    self._json_event(data)
+                    return
+        if self._response is None and "{" in line:
+            self._inline_response(line)
+        self._plain_text_lines([line])
+
+    def _inline_response(self, line: str) -> None:
+        """Pick up a ``{"response": ...}`` document embedded in a text line."""
+        start = line.find("{")
+        while start >= 0:
+            depth, end = 0, -1
+            for j in range(start, len(line)):
+                if line[j] == "{":
+                    depth += 1
+                elif line[j] == "}":
+                    depth -= 1
+                    if depth == 0:
+                        end = j
                         break
-        i += 1
-
-    for json_str in json_objects:
+            if end < 0:
+                start = line.find("{", start + 1)
+                continue
+            try:
+                data = json.loads(line[start:end + 1])
+            except (json.JSONDecodeError, ValueError):
+                data = None
+            if isinstance(data, dict) and "response" in data and "error" not in data:
+                self._response = data["response"]
+                return
+            start = line.find("{", end + 1)
+
+    def _json_document(self, lines: List[str]) -> None:
         try:
-            data = json.loads(json_str)
+            data = json.loads("\n".join(lines))
         except (json.JSONDecodeError, ValueError):
-            continue
-        if isinstance(data, dict) and "response" in data and "error" not in data:
-            return data["response"], None
-
-    cleaned_text, thinking = extract_thinking(output)
-
-    cleaned_lines = []
-    for line in cleaned_text.split("\n"):
-        if any(
-            skip in line.lower()
-            for skip in [
-                "loading",
-                "initializing",
-                "connecting",
-                "thinking...",
-                "processing...",
-                "mcp:",
-                "--------",
-                "workdir:",
-                "model:",
-                "provider:",
-                "approval:",
-                "sandbox:",
-                "reasoning effort:",
-                "reasoning summaries:",
-                "session id:",
-                "tokens used",
-                "loaded cached credentials",
-                "hook registry initialized",
-                "credentials loaded",
-            ]
-        ):
-            continue
+            data = None
+        if _is_cli_event(data):
+            self._json_event(data)
+        else:
+            self._plain_text_lines(lines)
+
+    def _json_event(self, data: Dict[str, Any]) -> None:
+        self._json_seen = True
+        kind = data.get("type")
+        if kind == "item.completed":
+            item = data.get("item") or {}
+            item_type = item.get("type")
+            if item_type == "agent_message":
+                self._text_parts.append(item.get("text", ""))
+                self._text(item.get("text", ""))
+            elif item_type in _THINKING_ITEM_TYPES:
+                self._thinking(item.get("text", ""))
+            elif item_type:
+                self._tool_call(item_type, item)
+        elif kind == "thinking":
+            self._thinking(data.get("text", ""))
+        elif kind == "text":
+            part = data.get("part") or {}
+            if part.get("type") == "text" and part.get("text"):
+                self._text_parts.append(part["text"])
+                self._text(part["text"])
+            elif part.get("type") == "thinking" and part.get("text"):
+                self._thinking(part["text"])
+        elif kind == "tool_use":
+            part = data.get("part") or {}
+            self._tool_call(part.get("tool") or "tool", part)
+        elif kind == "turn.completed" and isinstance(data.get("usage"), dict):
+            self._add_usage(data["usage"])
+        elif kind == "step_finish" and isinstance((data.get("part") or {}).get("tokens"), dict):
+            self._add_usage(data["part"]["tokens"])
+
+        if self._response is None and "response" in data and "error" not in data:
+            self._response = data["response"]
+            if not self._text_parts and isinstance(self._response, str):
+                self._text(self._response)
+
+    def _tool_call(self, name: str, payload: Dict[str, Any]) -> None:
+        call = {"name": name, "data": payload}
+        self.tool_calls.append(call)
+        self._emit(CLIEvent("tool_call", name, call))
+
+    def _add_usage(self, raw: Dict[str, Any]) -> None:
+        for key, value in _normalize_usage(raw).items():
+            self.usage[key] = self.usage.get(key, 0) + value
+        self._emit(CLIEvent("usage", data=dict(self.usage)))
+
+    # -- plain text pipeline ---------------------------------------------
+
+    def _plain_text_lines(self, lines: List[str]) -> None:
+        for line in lines:
+            self._plain_chars(line + "\n")
+
+    def _plain_chars(self, text: str) -> None:
+        """Strip inline reasoning tags, then hand complete lines on."""
+        visible: List[str] = []
+        lower = text.lower()
+        pos = 0
+        while pos < len(text):
+            if self._tag is None:
+                match = _TAG_OPEN_RE.search(text, pos)
+                if match is None:
+                    visible.append(text[pos:])
+                    break
+                visible.append(text[pos:match.start()])
+                self._tag = _TAG_BY_OPEN[match.group(0).lower()]
+                self._tag_open = match.group(0)
+                pos = match.end()
+            else:
+                idx = lower.find(self._tag[1], pos)
+                if idx < 0:
+                    self._tag_buffer.append(text[pos:])
+                    break
+                self._tag_buffer.append(text[pos:idx])
+                pos = idx + len(self._tag[1])
+                self._thinking("".join(self._tag_buffer))
+                self._tag = None
+                self._tag_buffer = []
+        if visible:
+            self._visible_text("".join(visible))
+
+    def _visible_text(self, text: str) -> None:
+        lines = (self._visible + text).split("\n")
+        self._visible = lines.pop()
+        for line in lines:
+            self._block_line(line)
+
+    def _block_line(self, line: str) -> None:
+        """``thinking:`` / ``reasoning:`` blocks run until the next unindented line."""
+        lower = line.lower().strip()
+        if lower.startswith("thinking:") or lower.startswith("reasoning:"):
+            self._block.append(line)
+            return
+        if self._block and (line.startswith("  ") or line.startswith("\t") or not line.strip()):
+            self._block.append(line)
+            return
+        self._close_block()
+        if _PLAIN_SKIP_RE.search(line):
+            return
         if line.startswith("OpenAI") or line.startswith("user"):
-            continue
-        cleaned_lines.append(line)
+            return
+        self._keep_plain(line)
+
+    def _close_block(self) -> None:
+        if self._block:
+            self._thinking("\n".join(self._block))
+            self._block = []
+
+    def _keep_plain(self, line: str) -> None:
+        # Blank lines are held until more text follows so the result stays stripped.
+        if not line.strip():
+            if self._plain_lines:
+                self._pending_blank.append(line)
+            return
+        if not self._plain_lines:
+            line = line.lstrip()
+        kept = self._pending_blank + [line]
+        self._pending_blank = []
+        self._plain_lines.extend(kept)
+        if not self._json_seen:
+            self._text("\n".join(kept))
+
 
-    return "\n".join(cleaned_lines).strip(), thinking
+def clean_cli_output(output: str, provider_name: str) -> Tuple[str, Optional[str]]:
+    """Clean raw CLI output and optionally extract reasoning content."""
+    parser = CLIOutputParser(provider_name)
+    parser.feed(output)
+    return parser.finish()
 
 
 def _snip(text: str, limit: int = 1200) -> str:
@@ -202,8 +462,14 @@ def process_cli_output(
     latency_ms: float,
     input_text: str,
     provider_name: str,
+    parser: Optional[CLIOutputParser] = None,
 ) -> BackendResult:
-    """Convert raw CLI process output into ``BackendResult``."""
+    """
+    Convert raw CLI process output into ``BackendResult``.
+
+    ``parser`` is a ``CLIOutputParser`` that already consumed ``stdout``
+    while the process ran; its result is used instead of parsing again.
+    """
     stdout = stdout.strip()
     stderr = stderr.strip()
 
@@ -241,25 +507,42 @@ def process_cli_output(
                 metadata={"auth_required": True, "auth_terminal_opened": True},
             )
 
-    response_text, thinking = clean_cli_output(stdout, provider_name=provider_name)
+    if parser is not None:
+        response_text, thinking = parser.finish()
+    else:
+        response_text, thinking = clean_cli_output(stdout, provider_name=provider_name)
     raw_output = stdout
 
     if response_text:
-        token_stats = estimate_input_output_tokens(input_text, response_text)
-        input_tokens = token_stats["input_tokens"]
-        output_tokens = token_stats["output_tokens"]
-        total_tokens = token_stats["total_tokens"]
+        usage = parser.usage if parser is not None else {}
+        if usage.get("input_tokens") or usage.get("output_tokens"):
+            input_tokens = usage.get("input_tokens", 0)
+            output_tokens = usage.get("output_tokens", 0)
+            total_tokens = input_tokens + output_tokens
+            estimated = False
+        else:
+            token_stats = estimate_input_output_tokens(input_text, response_text)
+            input_tokens = token_stats["input_tokens"]
+            output_tokens = token_stats["output_tokens"]
+            total_tokens = token_stats["total_tokens"]
+            estimated = True
+
+        metadata = {
+            "exit_code": returncode,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "tokens_estimated": estimated,
+        }
+        if usage.get("cached_tokens"):
+            metadata["cached_tokens"] = usage["cached_tokens"]
+        if parser is not None and parser.tool_calls:
+            metadata["tool_calls"] = len(parser.tool_calls)
 
         return BackendResult.ok(
             response=response_text,
             latency_ms=latency_ms,
             tokens_used=total_tokens,
-            metadata={
-                "exit_code": returncode,
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "tokens_estimated": True,
-            },
+            metadata=metadata,
             thinking=thinking,
             raw_output=raw_output,
         )
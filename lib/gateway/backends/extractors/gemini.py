@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
-from .base import ContentExtractor
+from .base import ContentExtractor, usage_ints
 
 
 class GeminiExtractor(ContentExtractor):
@@ -47,3 +47,12 @@ class GeminiExtractor(ContentExtractor):
             return int(total)
         except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError):
             return 0
+
+    def extract_usage(self, data: Dict[str, Any]) -> Dict[str, int]:
+        usage = usage_ints(data.get("usageMetadata"))
+        return {
+            "input_tokens": usage.get("promptTokenCount", 0),
+            "output_tokens": usage.get("candidatesTokenCount", 0),
+            "cached_tokens": usage.get("cachedContentTokenCount", 0),
+            "cache_creation_tokens": 0,
+        }
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
-from .base import ContentExtractor
+from .base import ContentExtractor, usage_ints
 
 
 class OpenAIExtractor(ContentExtractor):
@@ -49,3 +49,15 @@ class OpenAIExtractor(ContentExtractor):
             return int(total)
         except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError):
             return 0
+
+    def extract_usage(self, data: Dict[str, Any]) -> Dict[str, int]:
+        raw = data.get("usage")
+        usage = usage_ints(raw)
+        details = usage_ints(raw.get("prompt_tokens_details") if isinstance(raw, dict) else None)
+        return {
+            "input_tokens": usage.get("prompt_tokens", 0),
+            "output_tokens": usage.get("completion_tokens", 0),
+            # DeepSeek-style compatible APIs report prompt_cache_hit_tokens instead
+            "cached_tokens": details.get("cached_tokens", usage.get("prompt_cache_hit_tokens", 0)),
+            "cache_creation_tokens": 0,
+        }
@@ -26,7 +26,9 @@ from .executors.http_stream import (
     stream_openai_compatible_response,
 )
 from .extractors import AnthropicExtractor, GeminiExtractor, OpenAIExtractor
+from .http_client import HTTPClientManager
 from .http_profile import HTTPExecutionProfile, resolve_http_profile
+from .http_prompt_cache import PromptCacheStats
 
 
 logger = get_logger("gateway.backends.http_backend")
@@ -35,15 +37,17 @@ logger = get_logger("gateway.backends.http_backend")
 class HTTPBackend(BaseBackend):
     """HTTP API backend for providers with REST APIs."""
 
-    def __init__(self, config: ProviderConfig):
+    def __init__(self, config: ProviderConfig, client_manager: Optional[HTTPClientManager] = None):
         super().__init__(config)
         self._session = None
+        self._client_manager = client_manager
         self._api_key: Optional[str] = None
         self._extractors = {
             "anthropic": AnthropicExtractor(),
             "gemini": GeminiExtractor(),
             "openai": OpenAIExtractor(),
         }
+        self._prompt_cache = PromptCacheStats()
 
     def _get_api_key(self) -> Optional[str]:
         """Get API key from environment or direct value."""
@@ -60,8 +64,18 @@ class HTTPBackend(BaseBackend):
                 self._api_key = env_value
         return self._api_key
 
-    async def _get_session(self):
-        """Get or create aiohttp session."""
+    async def _get_session(self, base_url: Optional[str] = None):
+        """
+        Get an aiohttp session for ``base_url`` (defaults to the provider URL).
+
+        With a client manager the session comes from the shared per-origin
+        pool; otherwise the backend lazily creates its own.
+        """
+        if self._client_manager is not None:
+            return await self._client_manager.session_for(
+                base_url or self.config.api_base_url or "",
+                timeout_s=self.config.timeout_s,
+            )
         if self._session is None:
             try:
                 import aiohttp
@@ -92,6 +106,15 @@ class HTTPBackend(BaseBackend):
         tokens_used = extractor.extract_tokens(data)
         return response_text, tokens_used
 
+    def _extract_usage(self, api_kind: str, data: Dict[str, Any]) -> Dict[str, int]:
+        """Extract normalized usage (including prompt cache reads) using provider strategy."""
+        extractor = self._extractors.get(api_kind, self._extractors["openai"])
+        return extractor.extract_usage(data)
+
+    def get_prompt_cache_stats(self) -> Dict[str, Any]:
+        """Provider prompt cache read ratio and hit/miss latency for this backend."""
+        return self._prompt_cache.to_dict()
+
     def _resolve_profile(self, api_kind: str) -> HTTPExecutionProfile:
         """Resolve effective settings for the requested API kind."""
         return resolve_http_profile(self.config, api_kind)
@@ -129,6 +152,8 @@ class HTTPBackend(BaseBackend):
             api_kind = self._detect_api_kind()
             result = await self._execute_by_api_kind(api_kind, request, api_key)
             result.latency_ms = (time.time() - start_time) * 1000
+            if result.success and result.metadata:
+                self._prompt_cache.record(result.metadata.get("usage") or {}, result.latency_ms)
             return result
 
         except asyncio.TimeoutError:
@@ -150,7 +175,7 @@ class HTTPBackend(BaseBackend):
     ) -> BackendResult:
         """Execute request using Anthropic API format."""
         profile = self._resolve_profile("anthropic")
-        session = await self._get_session()
+        session = await self._get_session(profile.api_base_url)
         return await execute_anthropic_request(
             session=session,
             request=request,
@@ -159,6 +184,7 @@ class HTTPBackend(BaseBackend):
             model=profile.model,
             max_tokens=profile.max_tokens,
             extract_response_and_tokens=self._extract_response_and_tokens,
+            extract_usage=self._extract_usage,
         )
 
     async def _execute_gemini(
@@ -168,7 +194,7 @@ class HTTPBackend(BaseBackend):
     ) -> BackendResult:
         """Execute request using Google Gemini API format."""
         profile = self._resolve_profile("gemini")
-        session = await self._get_session()
+        session = await self._get_session(profile.api_base_url)
         return await execute_gemini_request(
             session=session,
             request=request,
@@ -177,6 +203,7 @@ class HTTPBackend(BaseBackend):
             model=profile.model,
             max_tokens=profile.max_tokens,
             extract_response_and_tokens=self._extract_response_and_tokens,
+            extract_usage=self._extract_usage,
         )
 
     async def _execute_openai_compatible(
@@ -186,7 +213,7 @@ class HTTPBackend(BaseBackend):
     ) -> BackendResult:
         """Execute request using OpenAI-compatible API format."""
         profile = self._resolve_profile("openai")
-        session = await self._get_session()
+        session = await self._get_session(profile.api_base_url)
         return await execute_openai_compatible_request(
             session=session,
             request=request,
@@ -195,6 +222,7 @@ class HTTPBackend(BaseBackend):
             model=profile.model,
             max_tokens=profile.max_tokens,
             extract_response_and_tokens=self._extract_response_and_tokens,
+            extract_usage=self._extract_usage,
         )
 
     async def health_check(self) -> bool:
@@ -221,7 +249,7 @@ class HTTPBackend(BaseBackend):
             return False
 
     async def shutdown(self) -> None:
-        """Close the HTTP session."""
+        """Close the backend's own HTTP session (shared pools are closed by their manager)."""
         if self._session:
             await self._session.close()
             self._session = None
@@ -300,8 +328,9 @@ class HTTPBackend(BaseBackend):
         api_key: str,
     ) -> AsyncGenerator[StreamChunk, None]:
         """Stream response from Anthropic API."""
+        start_time = time.time()
         profile = self._resolve_profile("anthropic")
-        session = await self._get_session()
+        session = await self._get_session(profile.api_base_url)
         async for chunk in stream_anthropic_response(
             session=session,
             request=request,
@@ -312,6 +341,8 @@ class HTTPBackend(BaseBackend):
             timeout_s=profile.timeout_s,
             provider_name=profile.provider_name,
         ):
+            if chunk.is_final and chunk.metadata and chunk.metadata.get("usage"):
+                self._prompt_cache.record(chunk.metadata["usage"], (time.time() - start_time) * 1000)
             yield chunk
 
     async def _stream_openai_compatible(
@@ -321,7 +352,7 @@ class HTTPBackend(BaseBackend):
     ) -> AsyncGenerator[StreamChunk, None]:
         """Stream response from OpenAI-compatible API."""
         profile = self._resolve_profile("openai")
-        session = await self._get_session()
+        session = await self._get_session(profile.api_base_url)
         async for chunk in stream_openai_compatible_response(
             session=session,
             request=request,
@@ -0,0 +1,286 @@
+"""
+Shared HTTP client pools for HTTP backends.
+
+One ``aiohttp.ClientSession`` (and connector) is kept per origin
+(``scheme://host:port``), so provider profiles that point at the same API
+share keep-alive connections instead of each opening their own.  Connector
+limits, keep-alive and DNS caching come from ``HTTPPoolConfig``.  Pool
+activity is observed through aiohttp trace hooks and reported by
+``get_stats``.
+
+aiohttp speaks HTTP/1.1 only; connection reuse is what this buys us.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+from lib.common.logging import get_logger
+
+from ..gateway_config import HTTPPoolConfig
+
+logger = get_logger("gateway.backends.http_client")
+
+# Window used for the new-connection rate.
+RATE_WINDOW_S = 60.0
+
+
+def origin_of(url: str) -> str:
+    """Normalize a URL to its ``scheme://host:port`` origin."""
+    parts = urlsplit(url or "")
+    scheme = (parts.scheme or "http").lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port or (443 if scheme == "https" else 80)
+    return f"{scheme}://{host}:{port}"
+
+
+class PoolStats:
+    """Counters for one origin pool, fed by aiohttp trace callbacks."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.connect_time_s = 0.0
+        self.waits = 0
+        self.wait_time_s = 0.0
+        self.max_wait_s = 0.0
+        self._new_conn_times: Deque[float] = deque()
+
+    def record_new_connection(self, connect_s: float) -> None:
+        now = time.monotonic()
+        self.new_connections += 1
+        self.connect_time_s += connect_s
+        self._new_conn_times.append(now)
+        self._trim(now)
+
+    def record_wait(self, wait_s: float) -> None:
+        self.waits += 1
+        self.wait_time_s += wait_s
+        self.max_wait_s = max(self.max_wait_s, wait_s)
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - RATE_WINDOW_S
+        while self._new_conn_times and self._new_conn_times[0] < cutoff:
+            self._new_conn_times.popleft()
+
+    def new_connections_per_min(self) -> float:
+        self._trim(time.monotonic())
+        return len(self._new_conn_times) * 60.0 / RATE_WINDOW_S
+
+    def to_dict(self) -> Dict[str, Any]:
+        acquired = self.new_connections + self.reused_connections
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": round(self.reused_connections / acquired, 3) if acquired else 0.0,
+            "new_connections_per_min": self.new_connections_per_min(),
+            "avg_connect_ms": round(self.connect_time_s / self.new_connections * 1000, 2)
+            if self.new_connections else 0.0,
+            "waits": self.waits,
+            "avg_wait_ms": round(self.wait_time_s / self.waits * 1000, 2) if self.waits else 0.0,
+            "max_wait_ms": round(self.max_wait_s * 1000, 2),
+        }
+
+
+def _make_trace_config(stats: PoolStats):
+    import aiohttp
+
+    async def on_request_start(_session, ctx, _params):
+        stats.requests += 1
+
+    async def on_queued_start(_session, ctx, _params):
+        ctx.queued_at = time.monotonic()
+
+    async def on_queued_end(_session, ctx, _params):
+        queued_at = getattr(ctx, "queued_at", None)
+        if queued_at is not None:
+            stats.record_wait(time.monotonic() - queued_at)
+
+    async def on_create_start(_session, ctx, _params):
+        ctx.connect_started = time.monotonic()
+
+    async def on_create_end(_session, ctx, _params):
+        started = getattr(ctx, "connect_started", None)
+        stats.record_new_connection(time.monotonic() - started if started else 0.0)
+
+    async def on_reuse(_session, ctx, _params):
+        stats.reused_connections += 1
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_request_start)
+    trace.on_connection_queued_start.append(on_queued_start)
+    trace.on_connection_queued_end.append(on_queued_end)
+    trace.on_connection_create_start.append(on_create_start)
+    trace.on_connection_create_end.append(on_create_end)
+    trace.on_connection_reuseconn.append(on_reuse)
+    return trace
+
+
+class PooledSession:
+    """
+    A backend's view of a shared session.
+
+    Applies the backend's own total timeout to calls that do not pass one,
+    since the underlying session is shared by providers with different
+    timeouts.
+    """
+
+    def __init__(self, session, timeout) -> None:
+        self._session = session
+        self._timeout = timeout
+
+    @property
+    def closed(self) -> bool:
+        return self._session.closed
+
+    def request(self, method: str, url: str, **kwargs):
+        kwargs.setdefault("timeout", self._timeout)
+        return self._session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+class HTTPClientManager:
+    """Gateway-wide registry of per-origin HTTP client pools."""
+
+    def __init__(self, config: Optional[HTTPPoolConfig] = None):
+        self.config = config or HTTPPoolConfig()
+        self._sessions: Dict[str, Any] = {}
+        self._stats: Dict[str, PoolStats] = {}
+        self._lock: Optional[asyncio.Lock] = None
+        self._host_limits = {origin_of(k): int(v) for k, v in self.config.host_limits.items()}
+
+    def _limit_for(self, origin: str) -> int:
+        return self._host_limits.get(origin, self.config.limit)
+
+    def _create_session(self, origin: str):
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("aiohttp is required for HTTP backend. Install with: pip install aiohttp")
+
+        stats = self._stats.setdefault(origin, PoolStats())
+        limit = self._limit_for(origin)
+        per_host = self.config.limit_per_host
+        if origin in self._host_limits or not per_host:
+            # An explicit origin override applies to the whole pool.
+            per_host = limit
+        connector = aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=min(limit, per_host),
+            keepalive_timeout=self.config.keepalive_timeout_s,
+            use_dns_cache=True,
+            ttl_dns_cache=self.config.dns_cache_ttl_s,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=None, connect=self.config.connect_timeout_s),
+            trace_configs=[_make_trace_config(stats)],
+        )
+
+    async def get_session(self, base_url: str):
+        """Return the shared session for ``base_url``'s origin, creating it on first use."""
+        origin = origin_of(base_url)
+        session = self._sessions.get(origin)
+        if session is not None and not session.closed:
+            return session
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            session = self._sessions.get(origin)
+            if session is None or session.closed:
+                session = self._create_session(origin)
+                self._sessions[origin] = session
+        return session
+
+    async def session_for(self, base_url: str, timeout_s: Optional[float] = None) -> PooledSession:
+        """Shared session for ``base_url`` with ``timeout_s`` as the default total timeout."""
+        import aiohttp
+
+        session = await self.get_session(base_url)
+        return PooledSession(session, aiohttp.ClientTimeout(total=timeout_s))
+
+    async def prewarm(self, base_urls: Iterable[str], connections: Optional[int] = None) -> Dict[str, int]:
+        """
+        Open keep-alive connections to each origin ahead of the first request.
+
+        Each connection is established with an ``OPTIONS /`` whose status is
+        ignored; only the socket matters (aiohttp does not pool sockets used
+        for HEAD).  Returns sockets opened per origin.
+        """
+        import aiohttp
+
+        count = connections if connections is not None else self.config.prewarm_connections
+        origins = {origin_of(url): url for url in base_urls if url}
+        opened: Dict[str, int] = {}
+        if count <= 0:
+            return opened
+
+        async def _touch(session, origin: str) -> bool:
+            scheme, rest = origin.split("://", 1)
+            try:
+                async with session.options(
+                    f"{scheme}://{rest}/",
+                    timeout=aiohttp.ClientTimeout(total=self.config.connect_timeout_s),
+                    allow_redirects=False,
+                ) as resp:
+                    await resp.read()
+                return True
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+                logger.debug("Pre-warm request to %s failed", origin, exc_info=True)
+                return False
+
+        for origin in origins:
+            session = await self.get_session(origin)
+            before = self._stats[origin].new_connections
+            await asyncio.gather(*(_touch(session, origin) for _ in range(count)))
+            opened[origin] = self._stats[origin].new_connections - before
+        logger.info("Pre-warmed HTTP pools: %s", opened)
+        return opened
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool occupancy and connection counters per origin."""
+        pools: Dict[str, Any] = {}
+        for origin, session in self._sessions.items():
+            connector = session.connector
+            entry = self._stats.get(origin, PoolStats()).to_dict()
+            # aiohttp exposes no public occupancy API; read its bookkeeping defensively.
+            acquired = getattr(connector, "_acquired", ()) if connector else ()
+            idle = getattr(connector, "_conns", {}) if connector else {}
+            entry.update({
+                "in_use": len(acquired),
+                "idle": sum(len(v) for v in idle.values()),
+                "limit": connector.limit if connector else 0,
+                "limit_per_host": connector.limit_per_host if connector else 0,
+                "closed": session.closed,
+            })
+            pools[origin] = entry
+        return {
+            "pools": pools,
+            "config": {
+                "limit": self.config.limit,
+                "limit_per_host": self.config.limit_per_host,
+                "keepalive_timeout_s": self.config.keepalive_timeout_s,
+                "dns_cache_ttl_s": self.config.dns_cache_ttl_s,
+            },
+        }
+
+    async def close(self) -> None:
+        """Close every pooled session."""
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            try:
+                await session.close()
+            except (RuntimeError, OSError):
+                logger.debug("Failed to close pooled HTTP session", exc_info=True)
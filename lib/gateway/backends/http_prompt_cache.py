@@ -0,0 +1,56 @@
+"""
+Provider-side prompt cache accounting for HTTP backends.
+
+Fed from the normalized ``usage`` the extractors return (see
+``ContentExtractor.extract_usage``).  Reports, per provider, the share of
+prompt tokens served from the provider's cache and the latency of requests
+that hit the cache vs those that did not.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping
+
+
+class PromptCacheStats:
+    """Prompt cache counters for one provider."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.cache_creation_tokens = 0
+        self.hit_requests = 0
+        self.hit_latency_ms = 0.0
+        self.miss_requests = 0
+        self.miss_latency_ms = 0.0
+
+    def record(self, usage: Mapping[str, int], latency_ms: float) -> None:
+        """Account one successful request; responses without usage are ignored."""
+        if not usage:
+            return
+        cached = int(usage.get("cached_tokens", 0) or 0)
+        self.requests += 1
+        self.prompt_tokens += int(usage.get("input_tokens", 0) or 0)
+        self.cached_tokens += cached
+        self.cache_creation_tokens += int(usage.get("cache_creation_tokens", 0) or 0)
+        if cached > 0:
+            self.hit_requests += 1
+            self.hit_latency_ms += latency_ms
+        else:
+            self.miss_requests += 1
+            self.miss_latency_ms += latency_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        avg_hit = self.hit_latency_ms / self.hit_requests if self.hit_requests else None
+        avg_miss = self.miss_latency_ms / self.miss_requests if self.miss_requests else None
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cache_creation_tokens": self.cache_creation_tokens,
+            "cache_read_ratio": self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+            "hit_requests": self.hit_requests,
+            "avg_latency_hit_ms": avg_hit,
+            "avg_latency_miss_ms": avg_miss,
+            "latency_saved_ms": avg_miss - avg_hit if avg_hit is not None and avg_miss is not None else None,
+        }
@@ -3,14 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+import os
 import time
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from lib.common.errors import BackendError
 from lib.common.logging import get_logger
 from .base_backend import BackendResult
 from .cli_backend import CLIBackend
-from ..gateway_config import ProviderConfig
+from .cli_pool import CLIWorker, CLIWorkerPool
+from ..gateway_config import CLIPoolConfig, ProviderConfig
 from ..models import GatewayRequest
 
 
@@ -22,92 +24,103 @@ class InteractiveCLIBackend(CLIBackend):
     Backend for interactive CLI tools that maintain a session.
 
     This is useful for tools like Codex that can maintain context
-    across multiple requests.
+    across multiple requests.  Requests are served by a pool of warm CLI
+    processes (see ``cli_pool``), so they run concurrently and skip the
+    CLI's cold start.
     """
 
-    def __init__(self, config: ProviderConfig):
+    def __init__(self, config: ProviderConfig, pool_config: Optional[CLIPoolConfig] = None):
         super().__init__(config)
-        self._process: Optional[asyncio.subprocess.Process] = None
-        self._lock = asyncio.Lock()
-
-    async def _ensure_process(self) -> asyncio.subprocess.Process:
-        """Ensure the interactive process is running."""
-        if self._process is None or self._process.returncode is not None:
-            cli = self._find_cli()
-            if not cli:
-                raise ValueError(f"CLI command not found: {self.config.cli_command}")
-
-            cmd = [cli]
-            if self.config.cli_args:
-                cmd.extend(self.config.cli_args)
-
-            self._process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                stdin=asyncio.subprocess.PIPE,
+        self.pool_config = (pool_config or CLIPoolConfig()).with_overrides(config.cli_pool)
+        self._pool: Optional[CLIWorkerPool] = None
+
+    def _interactive_command(self) -> List[str]:
+        cli = self._find_cli()
+        if not cli:
+            raise ValueError(f"CLI command not found: {self.config.cli_command}")
+        args = self.config.interactive_args
+        return [cli, *(self.config.cli_args if args is None else args)]
+
+    def _get_pool(self) -> CLIWorkerPool:
+        if self._pool is None:
+            cwd = self._resolve_cwd()
+            self._pool = CLIWorkerPool(
+                self.config.name,
+                self._interactive_command(),
+                self.pool_config,
+                cwd=cwd if cwd and os.path.isdir(cwd) else None,
+                is_prompt=self._is_response_complete,
             )
+        return self._pool
 
-        return self._process
+    async def start(self) -> int:
+        """Pre-spawn the warm workers; returns how many were started."""
+        try:
+            return await self._get_pool().start()
+        except ValueError:
+            logger.warning("Cannot pre-spawn %s workers: CLI not found", self.config.name)
+            return 0
 
     async def execute(self, request: GatewayRequest) -> BackendResult:
-        """Execute request via interactive CLI session."""
+        """Execute request on a warm interactive CLI worker."""
         start_time = time.time()
+        timeout = request.timeout_s or self.config.timeout_s
+
+        try:
+            pool = self._get_pool()
+            worker = await pool.checkout(timeout=timeout)
+        except asyncio.TimeoutError:
+            return BackendResult.fail(
+                f"No {self.config.name} CLI worker became available within {timeout}s",
+                latency_ms=(time.time() - start_time) * 1000,
+            )
+        except (RuntimeError, ValueError, OSError) as exc:
+            return BackendResult.fail(str(exc), latency_ms=(time.time() - start_time) * 1000)
 
-        async with self._lock:
-            try:
-                process = await self._ensure_process()
-
-                message = request.message + "\n"
-                process.stdin.write(message.encode("utf-8"))
-                await process.stdin.drain()
-
-                response_lines = []
-                timeout = request.timeout_s or self.config.timeout_s
-
-                try:
-                    while True:
-                        line = await asyncio.wait_for(
-                            process.stdout.readline(),
-                            timeout=timeout,
-                        )
-                        if not line:
-                            break
-
-                        decoded = line.decode("utf-8", errors="replace").rstrip()
-                        response_lines.append(decoded)
-
-                        if self._is_response_complete(decoded):
-                            break
-
-                except asyncio.TimeoutError:
-                    pass
-
-                latency_ms = (time.time() - start_time) * 1000
-                response_text = "\n".join(response_lines)
-
-                return BackendResult.ok(
-                    response=self._clean_output(response_text)[0],
-                    latency_ms=latency_ms,
-                )
-
-            except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError):
-                logger.exception("Interactive CLI execution error for %s", self.config.name)
-                return BackendResult.fail(
-                    str(BackendError(f"Unexpected interactive backend error: {self.config.name}")),
-                    latency_ms=(time.time() - start_time) * 1000,
-                )
+        complete = False
+        try:
+            response_lines, complete = await self._exchange(
+                worker, request.message, start_time + timeout
+            )
+            return BackendResult.ok(
+                response=self._clean_output("\n".join(response_lines))[0],
+                latency_ms=(time.time() - start_time) * 1000,
+            )
+        except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError):
+            logger.exception("Interactive CLI execution error for %s", self.config.name)
+            return BackendResult.fail(
+                str(BackendError(f"Unexpected interactive backend error: {self.config.name}")),
+                latency_ms=(time.time() - start_time) * 1000,
+            )
+        finally:
+            # A worker that did not reach its prompt may still be mid-reply.
+            await pool.checkin(worker, reusable=complete)
+
+    async def _exchange(self, worker: CLIWorker, message: str, deadline: float) -> Tuple[List[str], bool]:
+        """Send one message and read the reply up to the next prompt."""
+        await worker.write(message + "\n")
+        response_lines: List[str] = []
+        try:
+            while True:
+                line = await worker.readline(max(0.0, deadline - time.time()))
+                if not line:
+                    return response_lines, False
+                decoded = line.decode("utf-8", errors="replace").rstrip("\r\n")
+                if self._is_response_complete(decoded):
+                    return response_lines, True
+                response_lines.append(decoded.rstrip())
+        except asyncio.TimeoutError:
+            return response_lines, False
 
     def _is_response_complete(self, line: str) -> bool:
         """Check if the response is complete based on line content."""
         return line.endswith("> ") or line.endswith(">>> ")
 
+    def get_pool_stats(self) -> Dict[str, Any]:
+        return self._pool.get_stats() if self._pool else {"size": 0}
+
     async def shutdown(self) -> None:
-        """Terminate the interactive process."""
-        if self._process and self._process.returncode is None:
-            self._process.terminate()
-            try:
-                await asyncio.wait_for(self._process.wait(), timeout=5.0)
-            except asyncio.TimeoutError:
-                self._process.kill()
-            self._process = None
+        """Terminate the warm workers."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
@@ -46,6 +46,10 @@ class ObsidianBackend(CLIBackend):
 
     BLOCKED_COMMANDS = {"daily"}
 
+    def _make_parser(self, on_event=None):
+        # Obsidian prints plain command output; it is parsed once after exit.
+        return None
+
     def _build_command(self, message: str) -> List[str]:
         cli = self._find_cli()
         if not cli:
@@ -183,6 +187,7 @@ class ObsidianBackend(CLIBackend):
         returncode: int,
         latency_ms: float,
         input_text: str = "",
+        parser=None,
     ) -> BackendResult:
         stdout = (stdout or "").strip()
         stderr = (stderr or "").strip()
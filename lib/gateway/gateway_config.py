@@ -6,7 +6,7 @@ and environment variables.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 import os
@@ -63,6 +63,10 @@ class ProviderConfig:
     max_tokens: int = 4096
     # Streaming support
     supports_streaming: bool = False
+    # Warm interactive sessions (served by InteractiveCLIBackend's worker pool)
+    interactive: bool = False
+    interactive_args: Optional[List[str]] = None  # REPL-mode args; defaults to cli_args
+    cli_pool: Dict[str, Any] = field(default_factory=dict)  # Per-provider CLIPoolConfig overrides
 
 @dataclass
 class RetryConfig:
@@ -180,6 +184,37 @@ class MetricsConfig:
     endpoint: str = "/metrics"
     use_prometheus_client: bool = True  # Use prometheus_client if available
 
+@dataclass
+class HTTPPoolConfig:
+    """Configuration for the shared HTTP client pools used by HTTP backends."""
+    limit: int = 100  # Total connections per origin pool
+    limit_per_host: int = 20  # Connections per resolved host within a pool
+    keepalive_timeout_s: float = 60.0  # Idle keep-alive before a socket is closed
+    dns_cache_ttl_s: int = 300
+    connect_timeout_s: float = 10.0
+    prewarm: bool = True  # Open connections to enabled providers at startup
+    prewarm_connections: int = 2  # Sockets opened per origin when pre-warming
+    # Per-origin overrides, e.g. {"https://api.openai.com": 50}
+    host_limits: Dict[str, int] = field(default_factory=dict)
+
+@dataclass
+class CLIPoolConfig:
+    """Configuration for the warm worker pools of interactive CLI providers."""
+    min_size: int = 1  # Idle workers kept warm per provider
+    max_size: int = 4  # Concurrent workers per provider
+    max_requests: int = 100  # Recycle a worker after serving this many requests
+    max_rss_growth_mb: float = 512.0  # Recycle once RSS grows this far past its first checkin
+    idle_timeout_s: float = 600.0  # Retire idle workers above min_size after this long
+    health_check_interval_s: float = 30.0
+    spawn_timeout_s: float = 60.0  # Wait for a new worker's first prompt
+    wait_for_prompt: bool = True  # New workers print a prompt once ready
+    prespawn: bool = True  # Spawn min_size workers at gateway startup
+
+    def with_overrides(self, overrides: Optional[Dict[str, Any]]) -> "CLIPoolConfig":
+        """Copy with a provider's ``cli_pool`` overrides applied."""
+        known = {k: v for k, v in (overrides or {}).items() if hasattr(self, k)}
+        return replace(self, **known) if known else self
+
 @dataclass
 class GatewayConfig:
     """Gateway configuration."""
@@ -201,6 +236,8 @@ class GatewayConfig:
     # WebSocket settings
     ws_enabled: bool = True
     ws_heartbeat_s: float = 30.0
+    ws_queue_size: int = 256  # Per-client bounded send queue
+    ws_slow_consumer_policy: str = "drop_oldest"  # drop_oldest, disconnect
     # Logging
     log_level: str = "INFO"
     log_file: Optional[str] = None
@@ -212,6 +249,8 @@ class GatewayConfig:
     auth: AuthConfig = field(default_factory=AuthConfig)
     rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
     metrics: MetricsConfig = field(default_factory=MetricsConfig)
+    http_pool: HTTPPoolConfig = field(default_factory=HTTPPoolConfig)
+    cli_pool: CLIPoolConfig = field(default_factory=CLIPoolConfig)
     # Health check configuration
     health_check: Dict[str, Any] = field(default_factory=dict)
 
@@ -281,6 +320,8 @@ class GatewayConfig:
             ws = data.get("websocket", {})
             self.ws_enabled = ws.get("enabled", self.ws_enabled)
             self.ws_heartbeat_s = ws.get("heartbeat_s", self.ws_heartbeat_s)
+            self.ws_queue_size = ws.get("queue_size", self.ws_queue_size)
+            self.ws_slow_consumer_policy = ws.get("slow_consumer_policy", self.ws_slow_consumer_policy)
 
             # Logging
             logging = data.get("logging", {})
@@ -290,6 +331,18 @@ class GatewayConfig:
             # Health check configuration
             self.health_check = data.get("health_check", {})
 
+            # Shared HTTP client pools
+            http_pool = data.get("http_pool", {})
+            for key, value in http_pool.items():
+                if hasattr(self.http_pool, key):
+                    setattr(self.http_pool, key, value)
+
+            # Warm CLI worker pools
+            cli_pool = data.get("cli_pool", {})
+            for key, value in cli_pool.items():
+                if hasattr(self.cli_pool, key):
+                    setattr(self.cli_pool, key, value)
+
             # Providers
             for name, pconfig in data.get("providers", {}).items():
                 if name in REMOVED_PROVIDERS:
@@ -324,6 +377,9 @@ class GatewayConfig:
             terminal_pane_id=data.get("terminal_pane_id"),
             model=data.get("model"),
             max_tokens=data.get("max_tokens", 4096),
+            interactive=data.get("interactive", False),
+            interactive_args=data.get("interactive_args"),
+            cli_pool=data.get("cli_pool", {}),
         )
 
     def _load_from_env(self) -> None:
@@ -481,11 +537,15 @@ class GatewayConfig:
             "websocket": {
                 "enabled": self.ws_enabled,
                 "heartbeat_s": self.ws_heartbeat_s,
+                "queue_size": self.ws_queue_size,
+                "slow_consumer_policy": self.ws_slow_consumer_policy,
             },
             "logging": {
                 "level": self.log_level,
                 "file": self.log_file,
             },
+            "http_pool": asdict(self.http_pool),
+            "cli_pool": asdict(self.cli_pool),
             "providers": {
                 name: {
                     "backend_type": p.backend_type.value,
@@ -58,6 +58,7 @@ class GatewayMetrics:
 
     # Default latency buckets (in seconds)
     DEFAULT_LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0]
+    TTFT_BUCKETS = [0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 2.0, 5.0, 10.0, 30.0]
 
     def __init__(self, use_prometheus_client: bool = True):
         """
@@ -68,6 +69,9 @@ class GatewayMetrics:
         """
         self._use_native = use_prometheus_client and HAS_PROMETHEUS
         self._start_time = time.time()
+        # Per-provider TTFT kept in both modes so it can be reported as JSON.
+        self._ttft: Dict[str, HistogramData] = {}
+        self._ttft_max: Dict[str, float] = {}
 
         if self._use_native:
             self._init_prometheus_metrics()
@@ -96,6 +100,15 @@ class GatewayMetrics:
             registry=self._registry,
         )
 
+        # Time to first streamed token
+        self.time_to_first_token = Histogram(
+            "gateway_time_to_first_token_seconds",
+            "Time from request receipt to the first streamed chunk",
+            ["provider"],
+            buckets=self.TTFT_BUCKETS,
+            registry=self._registry,
+        )
+
         # Queue depth gauge
         self.queue_depth = Gauge(
             "gateway_queue_depth",
@@ -257,6 +270,53 @@ class GatewayMetrics:
                 )
             self._histograms["request_latency"][key].observe(latency_s)
 
+    def observe_ttft(self, provider: str, ttft_s: float) -> None:
+        """Record time to first token for a streamed response."""
+        if self._use_native:
+            self.time_to_first_token.labels(provider=provider).observe(ttft_s)
+        else:
+            key = (provider,)
+            if key not in self._histograms["time_to_first_token"]:
+                self._histograms["time_to_first_token"][key] = HistogramData.create(
+                    self.TTFT_BUCKETS
+                )
+            self._histograms["time_to_first_token"][key].observe(ttft_s)
+
+        histogram = self._ttft.get(provider)
+        if histogram is None:
+            histogram = self._ttft[provider] = HistogramData.create(self.TTFT_BUCKETS)
+        histogram.observe(ttft_s)
+        self._ttft_max[provider] = max(self._ttft_max.get(provider, 0.0), ttft_s)
+
+    def get_ttft_summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-provider TTFT statistics in milliseconds.
+
+        Percentiles are bucket upper bounds, so they over-estimate by at most
+        one bucket width.
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        for provider, histogram in self._ttft.items():
+            if not histogram.count:
+                continue
+            summary[provider] = {
+                "count": histogram.count,
+                "avg_ms": round(histogram.sum / histogram.count * 1000, 2),
+                "p50_ms": self._bucket_quantile_ms(histogram, 0.5, provider),
+                "p95_ms": self._bucket_quantile_ms(histogram, 0.95, provider),
+                "max_ms": round(self._ttft_max.get(provider, 0.0) * 1000, 2),
+            }
+        return summary
+
+    def _bucket_quantile_ms(self, histogram: HistogramData, q: float, provider: str) -> float:
+        target = q * histogram.count
+        for bucket in histogram.buckets:
+            if bucket.count >= target:
+                if bucket.le == float("inf"):
+                    break
+                return round(min(bucket.le, self._ttft_max.get(provider, bucket.le)) * 1000, 2)
+        return round(self._ttft_max.get(provider, 0.0) * 1000, 2)
+
     # ==================== Export Methods ====================
 
     def export(self) -> bytes:
@@ -330,6 +390,7 @@ class GatewayMetrics:
             "errors_total": ["provider", "error_type"],
             "queue_depth": ["provider"],
             "request_latency": ["provider"],
+            "time_to_first_token": ["provider"],
         }
 
         names = label_names.get(metric_name, [f"label{i}" for i in range(len(labels))])
@@ -350,6 +411,7 @@ class GatewayMetrics:
             return {
                 "uptime_s": time.time() - self._start_time,
                 "prometheus_client": True,
+                "ttft": self.get_ttft_summary(),
             }
         else:
             return {
@@ -357,6 +419,7 @@ class GatewayMetrics:
                 "prometheus_client": False,
                 "counters": {k: dict(v) for k, v in self._counters.items()},
                 "gauges": {k: dict(v) for k, v in self._gauges.items()},
+                "ttft": self.get_ttft_summary(),
             }
 
 
@@ -12,6 +12,7 @@ from lib.memory.memory_v2 import CCBLightMemory
 from lib.memory.registry import CCBRegistry
 from lib.skills.skills_discovery import SkillsDiscoveryService
 
+from .prompt_layout import SESSION, STABLE, VOLATILE, layout_prompt
 from .system_context import SystemContextBuilder
 
 try:
@@ -246,46 +247,46 @@ class MemoryMiddlewareCoreMixin:
 
         # 4. 注入上下文（包括系统上下文和相关记忆）
         try:
+            # (稳定性层级, 文本)：按从稳定到易变排列，共享前缀可命中 prompt cache
             context_parts = []
 
             # 4a. 注入预埋的系统上下文（Skills、MCP、Providers）
             if self.inject_system_context:
-                system_ctx = self.system_context.get_relevant_context(
+                assembled = self.system_context.build_relevant_context(
                     keywords,
                     provider or request.get("provider", "unknown")
                 )
-                if system_ctx:
-                    context_parts.append(system_ctx)
-                    logger.info(f"System context injected")
+                if assembled["context"]:
+                    context_parts.append((STABLE, assembled["stable_context"]))
+                    context_parts.append((SESSION, assembled["skills_context"]))
+                    request["_system_context_bytes"] = assembled["bytes"]
+                    request["_system_context_ms"] = round(assembled["assembly_ms"], 3)
+                    logger.info(
+                        f"System context injected ({assembled['bytes']} bytes, "
+                        f"{assembled['assembly_ms']:.2f}ms, cached={assembled['cached']})"
+                    )
 
             # 4b. 注入相关记忆
             if relevant_memories:
                 memory_ctx = self._format_memory_context(relevant_memories)
                 if memory_ctx:
-                    context_parts.append(memory_ctx)
+                    context_parts.append((VOLATILE, memory_ctx))
                     logger.info(f"{len(relevant_memories)} memories injected")
 
             # 🆕 4c. 注入技能推荐（如果找到）
             if skill_recommendations and skill_recommendations['found']:
                 skills_ctx = self._format_skills_context(skill_recommendations)
                 if skills_ctx:
-                    context_parts.append(skills_ctx)
+                    context_parts.append((SESSION, skills_ctx))
                     logger.info(f"Skills recommendations injected")
 
             # 合并上下文
-            if context_parts:
-                full_context = "\n\n".join(context_parts)
+            if any(text for _, text in context_parts):
+                layout = layout_prompt(context_parts, message)
 
                 # 增强原始消息
-                request["message"] = f"""# 系统上下文
-
-{full_context}
-
----
-
-# 用户请求
-{message}
-"""
+                request["message"] = layout.message
+                request["_prompt_segments"] = layout.segments
                 request["_memory_injected"] = True
                 request["_memory_count"] = len(relevant_memories)
                 request["_system_context_injected"] = self.inject_system_context
@@ -0,0 +1,89 @@
+"""
+Prompt Layout
+把注入的上下文按稳定性从高到低排列在用户请求之前，使不同请求共享尽可能长的
+相同前缀，从而命中服务端的 prompt cache（Anthropic 显式 cache_control 断点，
+OpenAI 兼容接口的自动前缀缓存）。
+
+同一层级内的内容合并为一个 segment；STABLE/SESSION 层级的末尾是缓存断点候选，
+前缀估算 token 数达到 ``min_cache_tokens`` 才标记（更短的前缀服务端不会缓存）。
+VOLATILE 层级从不标记：每个请求都不同，断点只会付写缓存的溢价而几乎读不到。
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from lib.common.tokens import estimate_tokens
+
+# 稳定性层级：数值越小越稳定，越靠前
+STABLE = 0      # Provider / MCP 信息：同一 provider 的所有请求相同
+SESSION = 1     # 相关 Skills、技能推荐：随任务关键词变化
+VOLATILE = 2    # 相关记忆：几乎每个请求都不同
+
+# Anthropic 每个请求最多 4 个 cache_control 断点
+MAX_CACHE_BREAKPOINTS = 4
+# 可缓存前缀的最小长度（Anthropic Sonnet/Opus 为 1024 tokens）
+DEFAULT_MIN_CACHE_TOKENS = 1024
+
+CONTEXT_HEADER = "# 系统上下文\n\n"
+REQUEST_HEADER = "\n\n---\n\n# 用户请求\n"
+
+
+@dataclass
+class PromptLayout:
+    """布局结果：message 为完整 prompt，segments 按顺序拼接后等于 message"""
+
+    message: str
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def breakpoints(self) -> int:
+        return sum(1 for segment in self.segments if segment.get("cache"))
+
+
+def layout_prompt(
+    sections: List[Tuple[int, str]],
+    user_message: str,
+    min_cache_tokens: int = DEFAULT_MIN_CACHE_TOKENS,
+) -> PromptLayout:
+    """
+    按稳定性排列上下文并生成带缓存断点的 segments
+
+    Args:
+        sections: [(稳定性层级, 文本)]，同层级保持传入顺序；空文本忽略
+        user_message: 原始用户请求（始终在最后）
+        min_cache_tokens: 标记缓存断点所需的最小前缀 token 数
+    """
+    ordered = sorted(
+        ((tier, text) for tier, text in sections if text),
+        key=lambda item: item[0],
+    )
+    if not ordered:
+        return PromptLayout(message=user_message, segments=[{"text": user_message, "cache": False}])
+
+    # 合并同层级内容，层级之间用空行分隔（与原先 "\n\n".join 的格式一致）
+    tiers: List[Tuple[int, List[str]]] = []
+    for tier, text in ordered:
+        if not tiers or tiers[-1][0] != tier:
+            tiers.append((tier, []))
+        tiers[-1][1].append(text)
+
+    segments: List[Dict[str, Any]] = []
+    prefix_tokens = 0
+    breakpoints = 0
+    for i, (tier, texts) in enumerate(tiers):
+        text = "\n\n".join(texts)
+        if i == 0:
+            text = CONTEXT_HEADER + text
+        else:
+            text = "\n\n" + text
+        prefix_tokens += estimate_tokens(text)
+        cache = (
+            tier < VOLATILE
+            and prefix_tokens >= min_cache_tokens
+            and breakpoints < MAX_CACHE_BREAKPOINTS
+        )
+        breakpoints += cache
+        segments.append({"text": text, "cache": cache})
+
+    segments.append({"text": f"{REQUEST_HEADER}{user_message}\n", "cache": False})
+    return PromptLayout(message="".join(segment["text"] for segment in segments), segments=segments)
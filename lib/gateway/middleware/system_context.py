@@ -2,11 +2,17 @@
 System Context Builder
 预加载所有 Skills、MCP Servers、Providers 信息
 避免 Agent 在运行时反向查找
+
+相关上下文按 (provider, 关键词签名) 缓存，关键词 → skills 使用倒排索引，
+reload() 时全部失效。
 """
 
 import json
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import sys
 
 from lib.common.logging import get_logger
@@ -20,6 +26,11 @@ from lib.memory.registry import CCBRegistry
 
 logger = get_logger("gateway.middleware.system_context")
 
+# 相关上下文缓存条目上限（provider × 关键词签名）
+FRAGMENT_CACHE_SIZE = 512
+# 倒排索引中保留的关键词上限
+KEYWORD_INDEX_SIZE = 4096
+
 
 class SystemContextBuilder:
     """系统上下文构建器 - 预加载并格式化所有系统信息"""
@@ -29,6 +40,20 @@ class SystemContextBuilder:
         self.context_cache = None
         self.last_updated = None
 
+        self._lock = threading.Lock()
+        # (provider, 关键词签名) -> (上下文, 字节数, 稳定部分, 相关 Skills 部分)
+        self._fragments: "OrderedDict[Tuple[str, Tuple[str, ...]], Tuple[str, int, str, str]]" = OrderedDict()
+        # 关键词 -> [(skill 下标, 得分)]，首次出现时计算
+        self._keyword_index: Dict[str, List[Tuple[int, int]]] = {}
+        self._skill_texts: List[Tuple[str, str, Tuple[str, ...]]] = []
+        self._providers_by_name: Dict[str, Dict] = {}
+        self._assembly_stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "total_ms": 0.0,
+            "total_bytes": 0,
+        }
+
         # 启动时预加载
         self._preload()
 
@@ -72,6 +97,30 @@ class SystemContextBuilder:
                 "metadata": {}
             }
 
+        self._build_indexes()
+
+    def _build_indexes(self):
+        """重建倒排索引和片段缓存（预加载 / reload 后调用）"""
+        skills = self.context_cache.get("skills", [])
+        providers = self.context_cache.get("providers", [])
+        skill_texts = [
+            (
+                skill.get("name", "").lower(),
+                skill.get("description", "").lower(),
+                tuple(t.lower() for t in skill.get("triggers", [])),
+            )
+            for skill in skills
+        ]
+        providers_by_name: Dict[str, Dict] = {}
+        for p in providers:
+            providers_by_name.setdefault(p.get("name"), p)
+
+        with self._lock:
+            self._skill_texts = skill_texts
+            self._providers_by_name = providers_by_name
+            self._keyword_index = {}
+            self._fragments.clear()
+
     def get_full_context(self) -> str:
         """
         获取完整的系统上下文（Markdown 格式）
@@ -159,40 +208,90 @@ class SystemContextBuilder:
             keywords: 任务关键词
             provider: 当前使用的 provider
         """
-        if not self.context_cache:
-            return ""
+        return self.build_relevant_context(keywords, provider)["context"]
 
-        parts = []
+    def build_relevant_context(self, keywords: List[str], provider: str) -> Dict[str, Any]:
+        """
+        同 get_relevant_context，并返回本次组装的耗时和注入字节数
+
+        Returns:
+            {"context": str, "bytes": int, "assembly_ms": float, "cached": bool,
+             "stable_context": str, "skills_context": str}
+
+            stable_context 只含 Provider 和 MCP 信息（不随关键词变化），
+            skills_context 为相关 Skills，供前缀稳定的 prompt 布局使用。
+        """
+        started = time.perf_counter()
+        if not self.context_cache:
+            return {"context": "", "bytes": 0, "assembly_ms": 0.0, "cached": False,
+                    "stable_context": "", "skills_context": ""}
+
+        # 得分只与关键词多重集有关，与顺序无关
+        key = (provider, tuple(sorted(k.lower() for k in keywords or [])))
+        with self._lock:
+            entry = self._fragments.get(key)
+            if entry is not None:
+                self._fragments.move_to_end(key)
+        cached = entry is not None
+        if entry is None:
+            provider_part, skills_part, mcp_part = self._render_relevant_context(keywords, provider)
+            context = "\n".join(part for part in (provider_part, skills_part, mcp_part) if part)
+            stable = "\n".join(part for part in (provider_part, mcp_part) if part)
+            entry = (context, len(context.encode("utf-8")), stable, skills_part)
+            with self._lock:
+                self._fragments[key] = entry
+                if len(self._fragments) > FRAGMENT_CACHE_SIZE:
+                    self._fragments.popitem(last=False)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            stats = self._assembly_stats
+            stats["requests"] += 1
+            stats["cache_hits"] += int(cached)
+            stats["total_ms"] += elapsed_ms
+            stats["total_bytes"] += entry[1]
+        return {
+            "context": entry[0],
+            "bytes": entry[1],
+            "assembly_ms": elapsed_ms,
+            "cached": cached,
+            "stable_context": entry[2],
+            "skills_context": entry[3],
+        }
 
+    def _render_relevant_context(self, keywords: List[str], provider: str) -> Tuple[str, str, str]:
+        """渲染 (Provider, 相关 Skills, MCP) 三段，空段为空字符串"""
         # 1. 当前 Provider 信息
-        parts.append("## 🤖 Current Provider")
+        provider_lines = ["## 🤖 Current Provider"]
         provider_info = self._get_provider_info(provider)
         if provider_info:
-            parts.append(f"- **{provider}**: {provider_info.get('description', '')}")
+            provider_lines.append(f"- **{provider}**: {provider_info.get('description', '')}")
             models = provider_info.get("models", [])
             if models:
-                parts.append(f"- Available models: {', '.join(models[:5])}")
-        parts.append("")
+                provider_lines.append(f"- Available models: {', '.join(models[:5])}")
+        provider_lines.append("")
 
         # 2. 相关 Skills
+        skill_lines = []
         relevant_skills = self._find_relevant_skills(keywords)
         if relevant_skills:
-            parts.append("## 🛠️ Relevant Skills")
+            skill_lines.append("## 🛠️ Relevant Skills")
             for skill in relevant_skills[:5]:  # 最多 5 个
                 name = skill.get("name", "unknown")
                 description = skill.get("description", "")
-                parts.append(f"- **{name}**: {description}")
-            parts.append("")
+                skill_lines.append(f"- **{name}**: {description}")
+            skill_lines.append("")
 
         # 3. MCP Servers（如果有）
+        mcp_lines = []
         mcp_servers = self.context_cache.get("mcp_servers", [])
         if mcp_servers:
-            parts.append("## 🔌 MCP Tools Available")
+            mcp_lines.append("## 🔌 MCP Tools Available")
             for server in mcp_servers[:3]:  # 最多 3 个
-                parts.append(f"- {server.get('name', 'unknown')}: {len(server.get('tools', []))} tools")
-            parts.append("")
+                mcp_lines.append(f"- {server.get('name', 'unknown')}: {len(server.get('tools', []))} tools")
+            mcp_lines.append("")
 
-        return "\n".join(parts)
+        return "\n".join(provider_lines), "\n".join(skill_lines), "\n".join(mcp_lines)
 
     def _group_skills_by_category(self, skills: List[Dict]) -> Dict[str, List[Dict]]:
         """按类别分组 skills"""
@@ -227,44 +326,46 @@ class SystemContextBuilder:
 
     def _get_provider_info(self, provider_name: str) -> Optional[Dict]:
         """获取特定 provider 的信息"""
-        providers = self.context_cache.get("providers", [])
-        for p in providers:
-            if p.get("name") == provider_name:
-                return p
-        return None
+        return self._providers_by_name.get(provider_name)
+
+    def _keyword_postings(self, keyword: str) -> List[Tuple[int, int]]:
+        """倒排索引：关键词（小写）命中的 (skill 下标, 得分)"""
+        postings = self._keyword_index.get(keyword)
+        if postings is not None:
+            return postings
+
+        postings = []
+        for i, (name, description, triggers) in enumerate(self._skill_texts):
+            score = 0
+            if keyword in name:
+                score += 3
+            if keyword in description:
+                score += 2
+            if any(keyword in trigger for trigger in triggers):
+                score += 1
+            if score:
+                postings.append((i, score))
+
+        with self._lock:
+            if len(self._keyword_index) >= KEYWORD_INDEX_SIZE:
+                self._keyword_index.clear()
+            self._keyword_index[keyword] = postings
+        return postings
 
     def _find_relevant_skills(self, keywords: List[str]) -> List[Dict]:
-        """查找与关键词相关的 skills"""
+        """查找与关键词相关的 skills（按相关度排序）"""
         if not keywords:
             return []
 
         skills = self.context_cache.get("skills", [])
-        relevant = []
+        scores: Dict[int, int] = {}
+        for keyword in keywords:
+            for i, score in self._keyword_postings(keyword.lower()):
+                scores[i] = scores.get(i, 0) + score
 
-        for skill in skills:
-            name = skill.get("name", "").lower()
-            description = skill.get("description", "").lower()
-            triggers = [t.lower() for t in skill.get("triggers", [])]
-
-            # 计算相关度
-            score = 0
-            for keyword in keywords:
-                kw_lower = keyword.lower()
-                if kw_lower in name:
-                    score += 3
-                if kw_lower in description:
-                    score += 2
-                if any(kw_lower in trigger for trigger in triggers):
-                    score += 1
-
-            if score > 0:
-                skill["_relevance_score"] = score
-                relevant.append(skill)
-
-        # 按相关度排序
-        relevant.sort(key=lambda x: x.get("_relevance_score", 0), reverse=True)
-
-        return relevant
+        # 按相关度排序，同分保持原顺序
+        ranked = sorted(scores, key=lambda i: (-scores[i], i))
+        return [skills[i] for i in ranked]
 
     def reload(self):
         """重新加载系统信息"""
@@ -278,6 +379,17 @@ class SystemContextBuilder:
 
         return self.context_cache.get("metadata", {})
 
+    def get_assembly_stats(self) -> Dict[str, Any]:
+        """获取相关上下文组装统计（耗时、注入字节数、缓存命中）"""
+        with self._lock:
+            stats = dict(self._assembly_stats)
+            stats["cached_fragments"] = len(self._fragments)
+            stats["indexed_keywords"] = len(self._keyword_index)
+        requests = stats["requests"]
+        stats["avg_ms"] = stats["total_ms"] / requests if requests else 0.0
+        stats["avg_bytes"] = stats["total_bytes"] / requests if requests else 0.0
+        return stats
+
 
 # 测试代码
 if __name__ == "__main__":
@@ -60,7 +60,8 @@ class CacheStatsResponse(BaseModel):
 
 class BatchAskRequest(BaseModel):
     """Request body for batch ask operation."""
-    requests: List[AskRequest] = Field(..., min_length=1, max_length=50, description="List of requests to submit")
+    requests: List[AskRequest] = Field(..., min_length=1, max_length=10000, description="List of requests to submit")
+    dedupe: bool = Field(False, description="Collapse identical entries onto a single gateway request")
 
 class BatchCancelRequest(BaseModel):
     """Request body for batch cancel operation."""
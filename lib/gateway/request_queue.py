@@ -71,6 +71,7 @@ class RequestQueue:
 
         # Callbacks
         self._on_request_ready: Optional[Callable[[GatewayRequest], Awaitable[None]]] = None
+        self._notifier: Optional[Callable[[], None]] = None
 
         # Load pending requests from store
         self._load_pending()
@@ -101,7 +102,50 @@ class RequestQueue:
 
             # Add to in-memory queue
             heapq.heappush(self._queue, PrioritizedRequest(request))
-            return True
+
+        self._notify()
+        return True
+
+    def enqueue_many(self, requests: List[GatewayRequest]) -> List[bool]:
+        """
+        Add many requests with a single lock acquisition and DB transaction.
+
+        Requests beyond the remaining capacity are rejected, in order.
+
+        Args:
+            requests: Requests to enqueue
+
+        Returns:
+            One flag per input request: True if enqueued, False if queue was full
+        """
+        if not requests:
+            return []
+
+        with self._lock:
+            free = max(0, self.max_size - len(self._queue))
+            accepted = requests[:free]
+            if accepted:
+                self.store.create_requests_bulk(accepted)
+                items = [PrioritizedRequest(r) for r in accepted]
+                if len(items) > len(self._queue):
+                    # Cheaper to rebuild than to sift each item in.
+                    self._queue.extend(items)
+                    heapq.heapify(self._queue)
+                else:
+                    for item in items:
+                        heapq.heappush(self._queue, item)
+
+        if accepted:
+            self._notify()
+        return [True] * len(accepted) + [False] * (len(requests) - len(accepted))
+
+    def set_notifier(self, notifier: Optional[Callable[[], None]]) -> None:
+        """Register a callback invoked after new requests are enqueued."""
+        self._notifier = notifier
+
+    def _notify(self) -> None:
+        if self._notifier is not None:
+            self._notifier()
 
     def dequeue(self) -> Optional[GatewayRequest]:
         """
@@ -166,6 +210,23 @@ class RequestQueue:
 
         return result
 
+    def track_direct(self, request: GatewayRequest) -> None:
+        """
+        Persist and account for a request served outside the queue.
+
+        Used by the streaming fast path: the request is stored as PROCESSING
+        and counted against the concurrency limit until ``mark_completed``
+        (or a timeout) releases it, but it is never placed in the heap.
+        """
+        now = time.time()
+        request.status = RequestStatus.PROCESSING
+        request.updated_at = now
+        request.routed_at = now
+        request.started_at = now
+        self.store.create_request(request)
+        with self._processing_lock:
+            self._processing[request.id] = request
+
     def mark_processing(self, request_id: str) -> bool:
         """Mark a request as processing."""
         return self.store.update_request_status(request_id, RequestStatus.PROCESSING)
@@ -289,8 +350,10 @@ class AsyncRequestQueue:
         self._event = asyncio.Event()
         self._running = False
         self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._active_tasks: Dict[str, asyncio.Task] = {}
         self._tasks_lock = asyncio.Lock()
+        queue.set_notifier(self.notify)
 
     async def start(
         self,
@@ -298,6 +361,7 @@ class AsyncRequestQueue:
     ) -> None:
         """Start the async queue processor."""
         self._running = True
+        self._loop = asyncio.get_running_loop()
         self._task = asyncio.create_task(self._process_loop(handler))
 
     async def stop(self) -> None:
@@ -319,8 +383,19 @@ class AsyncRequestQueue:
                 pass
 
     def notify(self) -> None:
-        """Notify that new requests are available."""
-        self._event.set()
+        """Notify that new requests are available (safe from any thread)."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self._event.set()
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._event.set()
+        else:
+            loop.call_soon_threadsafe(self._event.set)
 
     async def _process_loop(
         self,
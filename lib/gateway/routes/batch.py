@@ -49,6 +49,104 @@ def parse_provider_spec(config: Any, spec: str) -> Tuple[List[str], bool]:
     return [spec], False
 
 
+def _dedupe_key(req: Any) -> Tuple[Any, ...]:
+    return (
+        req.message,
+        req.provider,
+        req.priority,
+        req.timeout_s,
+        req.aggregation_strategy,
+        req.agent,
+    )
+
+
+def plan_batch(
+    config: Any,
+    requests: List[Any],
+    router_func: Optional[Callable[[str], Any]] = None,
+    *,
+    dedupe: bool = False,
+) -> Tuple[List[Dict[str, Any]], Dict[int, int], List[Dict[str, Any]]]:
+    """
+    Validate and route a batch of ask requests without enqueueing them.
+
+    Routing decisions are computed once per distinct message.  With
+    ``dedupe`` enabled, identical entries are collapsed onto the first
+    occurrence instead of creating separate gateway requests.
+
+    Returns:
+        (plans, dedup_of, errors) where each plan holds ``index``,
+        ``provider_spec`` and a ready-to-enqueue ``request``, and
+        ``dedup_of`` maps duplicate indexes to the index they reuse.
+    """
+    plans: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    dedup_of: Dict[int, int] = {}
+    first_seen: Dict[Tuple[Any, ...], int] = {}
+    routed: Dict[str, str] = {}
+    parsed: Dict[str, Tuple[List[str], bool]] = {}
+
+    for i, req in enumerate(requests):
+        if dedupe:
+            key = _dedupe_key(req)
+            if key in first_seen:
+                dedup_of[i] = first_seen[key]
+                continue
+            first_seen[key] = i
+
+        try:
+            provider_spec = req.provider
+            if not provider_spec:
+                if req.message in routed:
+                    provider_spec = routed[req.message]
+                else:
+                    if router_func:
+                        provider_spec = router_func(req.message).provider
+                    else:
+                        provider_spec = config.default_provider
+                    routed[req.message] = provider_spec
+
+            if provider_spec not in parsed:
+                parsed[provider_spec] = parse_provider_spec(config, provider_spec)
+            providers, is_parallel = parsed[provider_spec]
+
+            if not providers:
+                errors.append({"index": i, "error": f"Unknown provider: {provider_spec}"})
+                continue
+
+            invalid_providers = [p for p in providers if p not in config.providers]
+            if invalid_providers:
+                errors.append({"index": i, "error": f"Unknown providers: {invalid_providers}"})
+                continue
+
+            gw_request = GatewayRequest.create(
+                provider=providers[0] if not is_parallel else provider_spec,
+                message=req.message,
+                priority=req.priority,
+                timeout_s=req.timeout_s,
+                metadata={
+                    "parallel": is_parallel,
+                    "providers": providers if is_parallel else None,
+                    "aggregation_strategy": req.aggregation_strategy,
+                    "agent": req.agent,
+                    "batch_index": i,
+                },
+            )
+            plans.append({"index": i, "provider_spec": provider_spec, "request": gw_request})
+
+        except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError) as exc:
+            errors.append({"index": i, "error": str(exc)})
+
+    # Duplicates of entries that failed validation fail the same way.
+    failed = {e["index"]: e["error"] for e in errors}
+    for i, first in list(dedup_of.items()):
+        if first in failed:
+            errors.append({"index": i, "error": failed[first]})
+            del dedup_of[i]
+
+    return plans, dedup_of, errors
+
+
 if HAS_FASTAPI:
     @router.post("/ask")
     async def batch_ask(
@@ -61,85 +159,50 @@ if HAS_FASTAPI:
         Submit multiple requests in a single API call.
 
         Returns request IDs for all submitted requests.
-        More efficient than multiple individual /api/ask calls.
+        The batch is validated and routed up front, then inserted with a
+        single queue lock and database transaction.
         """
         results: List[Dict[str, Any]] = []
         errors: List[Dict[str, Any]] = []
 
-        for i, req in enumerate(batch_request.requests):
-            try:
-                provider_spec = req.provider
-                if not provider_spec:
-                    if router_func:
-                        decision = router_func(req.message)
-                        provider_spec = decision.provider
-                    else:
-                        provider_spec = config.default_provider
+        # Phase 1: validate and route the whole batch before touching the queue.
+        plans, dedup_of, route_errors = plan_batch(
+            config,
+            batch_request.requests,
+            router_func,
+            dedupe=batch_request.dedupe,
+        )
+        errors.extend(route_errors)
+
+        # Phase 2: one lock, one transaction, one scheduler wake-up.
+        accepted = queue.enqueue_many([plan["request"] for plan in plans])
+
+        by_index: Dict[int, Dict[str, Any]] = {}
+        for plan, ok in zip(plans, accepted):
+            if ok:
+                by_index[plan["index"]] = {
+                    "index": plan["index"],
+                    "request_id": plan["request"].id,
+                    "provider": plan["provider_spec"],
+                    "status": "queued",
+                }
+            else:
+                errors.append({"index": plan["index"], "error": "Queue is full"})
 
-                providers, is_parallel = parse_provider_spec(config, provider_spec)
-
-                if not providers:
-                    errors.append(
-                        {
-                            "index": i,
-                            "error": f"Unknown provider: {provider_spec}",
-                        }
-                    )
-                    continue
-
-                invalid_providers = [p for p in providers if p not in config.providers]
-                if invalid_providers:
-                    errors.append(
-                        {
-                            "index": i,
-                            "error": f"Unknown providers: {invalid_providers}",
-                        }
-                    )
-                    continue
-
-                gw_request = GatewayRequest.create(
-                    provider=providers[0] if not is_parallel else provider_spec,
-                    message=req.message,
-                    priority=req.priority,
-                    timeout_s=req.timeout_s,
-                    metadata={
-                        "parallel": is_parallel,
-                        "providers": providers if is_parallel else None,
-                        "aggregation_strategy": req.aggregation_strategy,
-                        "agent": req.agent,
-                        "batch_index": i,
-                    },
-                )
+        for i, first in dedup_of.items():
+            if first in by_index:
+                by_index[i] = dict(by_index[first], index=i, deduplicated_from=first)
+            else:
+                errors.append({"index": i, "error": "Queue is full"})
 
-                if queue.enqueue(gw_request):
-                    results.append(
-                        {
-                            "index": i,
-                            "request_id": gw_request.id,
-                            "provider": provider_spec,
-                            "status": "queued",
-                        }
-                    )
-                else:
-                    errors.append(
-                        {
-                            "index": i,
-                            "error": "Queue is full",
-                        }
-                    )
-
-            except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError) as exc:
-                errors.append(
-                    {
-                        "index": i,
-                        "error": str(exc),
-                    }
-                )
+        results = [by_index[i] for i in sorted(by_index)]
+        errors.sort(key=lambda e: e["index"])
 
         return {
             "submitted": len(results),
             "failed": len(errors),
             "total": len(batch_request.requests),
+            "deduplicated": len(dedup_of),
             "results": results,
             "errors": errors,
         }
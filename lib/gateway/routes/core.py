@@ -345,9 +345,11 @@ if HAS_FASTAPI:
         available = list(config.providers.keys())
         reliability_scores = reliability_tracker.get_all_scores() if reliability_tracker else {}
 
+        all_metrics = store.get_all_provider_metrics(hours=hours, providers=available)
+
         scores: Dict[str, Any] = {}
         for provider in available:
-            metrics = store.get_provider_metrics(provider, hours=hours)
+            metrics = all_metrics[provider]
 
             perf = ProviderPerformance(
                 provider=provider,
@@ -68,8 +68,10 @@ if HAS_FASTAPI:
         total_requests = 0
         total_successes = 0
 
+        all_metrics = store.get_all_provider_metrics(hours=hours, providers=config.providers.keys())
+
         for provider_name in config.providers.keys():
-            metrics = store.get_provider_metrics(provider_name, hours=hours)
+            metrics = all_metrics[provider_name]
 
             requests = int(metrics.get("total_requests", 0) or 0)
             successful = int(
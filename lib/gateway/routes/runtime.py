@@ -66,6 +66,22 @@ def get_backends(request: Request):
     return getattr(request.app.state, "backends", {})
 
 
+def get_stream_request(request: Request):
+    return getattr(request.app.state, "stream_request", None)
+
+
+def get_supports_fast_stream(request: Request):
+    return getattr(request.app.state, "supports_fast_stream", None)
+
+
+def get_http_client(request: Request):
+    return getattr(request.app.state, "http_client", None)
+
+
+def get_metrics(request: Request):
+    return getattr(request.app.state, "metrics", None)
+
+
 def get_ws_manager(request: Request):
     return getattr(request.app.state, "ws_manager", None)
 
@@ -342,11 +358,16 @@ if HAS_FASTAPI:
         router_func=Depends(get_router_func),
         stream_manager=Depends(get_stream_manager),
         backends=Depends(get_backends),
+        stream_request=Depends(get_stream_request),
+        supports_fast_stream=Depends(get_supports_fast_stream),
     ):
         """
         Submit a request and stream the response via SSE.
 
-        Returns Server-Sent Events with chunks of the response.
+        Returns Server-Sent Events with chunks of the response.  Providers
+        with a native streaming backend skip the request queue: the request
+        is recorded and accounted for, but chunks are relayed as soon as the
+        backend produces them.
         """
         if not config.streaming.enabled:
             raise HTTPException(status_code=400, detail="Streaming is disabled")
@@ -370,11 +391,15 @@ if HAS_FASTAPI:
             message=request.message,
             priority=request.priority,
             timeout_s=request.timeout_s,
+            metadata={"agent": request.agent} if request.agent else None,
         )
 
         async def generate_stream():
             """Generate SSE stream."""
-            if stream_manager:
+            if stream_request and supports_fast_stream and supports_fast_stream(provider):
+                async for chunk in stream_request(gw_request):
+                    yield chunk
+            elif stream_manager:
                 backend = backends.get(provider) if backends else None
                 if backend:
                     async for chunk in stream_manager.stream_response(
@@ -400,6 +425,42 @@ if HAS_FASTAPI:
         )
 
 
+    @router.get("/api/ask/stream/stats")
+    async def ask_stream_stats(metrics=Depends(get_metrics)):
+        """Per-provider time-to-first-token statistics for streamed requests."""
+        return {"ttft": metrics.get_ttft_summary() if metrics else {}}
+
+
+    @router.get("/api/http/pools")
+    async def http_pool_stats(http_client=Depends(get_http_client)):
+        """Connection pool occupancy and reuse counters for HTTP providers."""
+        return http_client.get_stats() if http_client else {"pools": {}}
+
+
+    @router.get("/api/http/prompt-cache")
+    async def http_prompt_cache_stats(backends=Depends(get_backends)):
+        """Provider-side prompt cache read ratio and hit/miss latency for HTTP providers."""
+        return {
+            "providers": {
+                name: backend.get_prompt_cache_stats()
+                for name, backend in backends.items()
+                if hasattr(backend, "get_prompt_cache_stats")
+            }
+        }
+
+
+    @router.get("/api/cli/pools")
+    async def cli_pool_stats(backends=Depends(get_backends)):
+        """Warm worker pool occupancy and recycling counters for interactive CLI providers."""
+        return {
+            "pools": {
+                name: backend.get_pool_stats()
+                for name, backend in backends.items()
+                if hasattr(backend, "get_pool_stats")
+            }
+        }
+
+
     @router.get("/api/status", response_model=StatusResponse)
     async def get_status(
         config=Depends(get_config),
@@ -419,10 +480,12 @@ if HAS_FASTAPI:
 
         token_data = {provider_stats["provider"]: provider_stats for provider_stats in store.get_cost_by_provider(days=30)}
 
+        all_metrics = store.get_all_provider_metrics(hours=24, providers=config.providers.keys())
+
         providers = []
         for name, pconfig in config.providers.items():
             pstatus = store.get_provider_status(name)
-            metrics = store.get_provider_metrics(name, hours=24)
+            metrics = all_metrics[name]
             cost_info = token_data.get(name, {})
 
             providers.append(
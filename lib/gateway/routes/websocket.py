@@ -2,19 +2,21 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Set
+from typing import Any, Dict, Optional, Set
 
 try:
-    from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+    from fastapi import APIRouter, Depends, Request, WebSocket, WebSocketDisconnect
 
     HAS_FASTAPI = True
 except ImportError:  # pragma: no cover - optional FastAPI dependency
     HAS_FASTAPI = False
     APIRouter = Any  # type: ignore[assignment]
+    Request = Any  # type: ignore[assignment]
     WebSocket = Any  # type: ignore[assignment]
     WebSocketDisconnect = Exception  # type: ignore[assignment]
 
 from ..models import WebSocketEvent
+from ..ws_fanout import SEND_ERRORS, FanoutHub, SlowConsumerPolicy, TopicFilter
 
 if HAS_FASTAPI:
     router = APIRouter()
@@ -23,57 +25,101 @@ else:  # pragma: no cover - API unavailable without FastAPI
 
 
 class WebSocketManager:
-    """Manages WebSocket connections for real-time updates."""
-
-    def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
+    """
+    Manages WebSocket connections for real-time updates.
+
+    Delivery goes through a :class:`FanoutHub`: ``broadcast`` serializes the
+    event once and enqueues it on each subscriber's bounded queue, so request
+    completion never waits on a slow dashboard client.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 256,
+        slow_consumer_policy: str = SlowConsumerPolicy.DROP_OLDEST.value,
+    ):
+        try:
+            policy = SlowConsumerPolicy(slow_consumer_policy)
+        except ValueError:
+            policy = SlowConsumerPolicy.DROP_OLDEST
+        self.hub = FanoutHub(max_queue=max_queue, policy=policy)
         self._lock: asyncio.Lock | None = None
 
+    @property
+    def active_connections(self) -> Set[WebSocket]:
+        return set(self.hub.keys())
+
     def _get_lock(self) -> asyncio.Lock:
         if self._lock is None:
             self._lock = asyncio.Lock()
         return self._lock
 
     async def connect(self, websocket: WebSocket) -> None:
-        """Accept a new WebSocket connection."""
+        """Accept a new WebSocket connection and start its writer task."""
         await websocket.accept()
+
+        async def _on_close(channel) -> None:
+            # 1013 (try again later) tells a client dropped as a slow
+            # consumer to reconnect; otherwise the peer is usually gone.
+            try:
+                await websocket.close(code=1013 if channel.slow else 1000)
+            except SEND_ERRORS:
+                pass
+            await self.disconnect(websocket)
+
         async with self._get_lock():
-            self.active_connections.add(websocket)
+            self.hub.add(websocket, websocket.send_text, on_close=_on_close)
 
     async def disconnect(self, websocket: WebSocket) -> None:
         """Remove a WebSocket connection."""
         async with self._get_lock():
-            self.active_connections.discard(websocket)
+            self.hub.remove(websocket)
+
+    def subscribe(self, websocket: WebSocket, data: Dict[str, Any]) -> Optional[TopicFilter]:
+        """Replace a client's topic filter from a ``subscribe`` message."""
+        channel = self.hub.get(websocket)
+        if channel is None:
+            return None
+        channel.filter = TopicFilter.from_message(data)
+        return channel.filter
+
+    def unsubscribe(self, websocket: WebSocket) -> None:
+        """Reset a client to receive every event."""
+        channel = self.hub.get(websocket)
+        if channel is not None:
+            channel.filter = TopicFilter()
 
     async def broadcast(self, event: WebSocketEvent) -> None:
-        """Broadcast an event to all connected clients."""
-        if not self.active_connections:
+        """Broadcast an event to all subscribed clients without blocking."""
+        if not len(self.hub):
             return
-
-        message = event.to_dict()
-        async with self._get_lock():
-            dead_connections = set()
-            for connection in self.active_connections:
-                try:
-                    await connection.send_json(message)
-                except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError):
-                    dead_connections.add(connection)
-
-            self.active_connections -= dead_connections
+        self.hub.publish(event.to_dict())
 
     async def send_to(self, websocket: WebSocket, event: WebSocketEvent) -> None:
         """Send an event to a specific client."""
-        try:
-            await websocket.send_json(event.to_dict())
-        except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError):
-            await self.disconnect(websocket)
+        self.hub.send_to(websocket, event.to_dict())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Fan-out counters for monitoring."""
+        return self.hub.get_stats()
 
 
 def get_ws_manager(websocket: WebSocket):
     return getattr(websocket.app.state, "ws_manager", None)
 
 
+def get_ws_manager_http(request: Request):
+    return getattr(request.app.state, "ws_manager", None)
+
+
 if HAS_FASTAPI:
+    @router.get("/api/ws/stats")
+    async def websocket_stats(ws_manager=Depends(get_ws_manager_http)) -> Dict[str, Any]:
+        """Fan-out queue depth, drop and slow-consumer counters."""
+        if ws_manager is None:
+            return {"clients": 0}
+        return ws_manager.get_stats()
+
     @router.websocket("/api/ws")
     async def websocket_endpoint(
         websocket: WebSocket,
@@ -92,6 +138,12 @@ if HAS_FASTAPI:
         - request_fallback: Request switched to fallback provider
         - provider_status: Provider status changed
         - stream_chunk: Streaming response chunk
+
+        Client messages:
+        - {"type": "subscribe", "channels": [...], "providers": [...],
+           "request_ids": [...], "discussion_ids": [...]} narrows delivery
+        - {"type": "unsubscribe"} restores delivery of every event
+        - {"type": "ping"} replies with "pong"
         """
         if ws_manager is None:
             await websocket.close(code=1011)
@@ -103,12 +155,22 @@ if HAS_FASTAPI:
                 data = await websocket.receive_json()
 
                 if data.get("type") == "subscribe":
-                    channels = data.get("channels", [])
+                    topic_filter = ws_manager.subscribe(websocket, data) or TopicFilter()
                     await ws_manager.send_to(
                         websocket,
                         WebSocketEvent(
                             type="subscribed",
-                            data={"channels": channels},
+                            data=topic_filter.to_dict(),
+                        ),
+                    )
+
+                elif data.get("type") == "unsubscribe":
+                    ws_manager.unsubscribe(websocket)
+                    await ws_manager.send_to(
+                        websocket,
+                        WebSocketEvent(
+                            type="unsubscribed",
+                            data={},
                         ),
                     )
 
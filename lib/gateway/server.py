@@ -26,14 +26,20 @@ from .models import (
 from .state_store import StateStore
 from .request_queue import RequestQueue, AsyncRequestQueue
 from .gateway_config import GatewayConfig
-from .backends import BaseBackend, HTTPBackend, CLIBackend, ObsidianBackend
+from .backends import BaseBackend, HTTPBackend, CLIBackend, InteractiveCLIBackend, ObsidianBackend
 from .backends.base_backend import BackendResult
+from .backends.http_client import HTTPClientManager
 from .server_requests import (
     process_request as process_request_impl,
     _process_single_request as process_single_request_impl,
     _process_parallel_request as process_parallel_request_impl,
     _handle_success as handle_success_impl,
     _handle_failure as handle_failure_impl,
+    _apply_memory_pre_request as apply_memory_pre_request_impl,
+)
+from .server_streaming import (
+    stream_request as stream_request_impl,
+    supports_fast_stream as supports_fast_stream_impl,
 )
 from .server_runtime import (
     health_check_loop as health_check_loop_impl,
@@ -125,6 +131,7 @@ class GatewayServer:
 
         # Backend instances
         self.backends: Dict[str, BaseBackend] = {}
+        self.http_client = HTTPClientManager(self.config.http_pool)
         self._init_backends()
 
         # Advanced feature managers
@@ -178,10 +185,12 @@ class GatewayServer:
 
             try:
                 if pconfig.backend_type == BackendType.HTTP_API:
-                    self.backends[name] = HTTPBackend(pconfig)
+                    self.backends[name] = HTTPBackend(pconfig, client_manager=self.http_client)
                 elif pconfig.backend_type == BackendType.CLI_EXEC:
                     if name == "obsidian":
                         self.backends[name] = ObsidianBackend(pconfig)
+                    elif pconfig.interactive:
+                        self.backends[name] = InteractiveCLIBackend(pconfig, pool_config=self.config.cli_pool)
                     else:
                         self.backends[name] = CLIBackend(pconfig)
                 # FIFO and Terminal backends can be added later
@@ -440,6 +449,15 @@ class GatewayServer:
     ) -> None:
         return await handle_failure_impl(self, request, result, latency_ms, retry_info)
 
+    async def _apply_memory_pre_request(self, request: GatewayRequest) -> None:
+        return await apply_memory_pre_request_impl(self, request)
+
+    def supports_fast_stream(self, provider: str) -> bool:
+        return supports_fast_stream_impl(self, provider)
+
+    def stream_request(self, request: GatewayRequest):
+        return stream_request_impl(self, request)
+
     async def health_check_loop(self) -> None:
         return await health_check_loop_impl(self)
 
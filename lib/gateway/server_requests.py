@@ -33,11 +33,8 @@ async def process_request(self, request: GatewayRequest) -> None:
         await self._process_parallel_request(request)
     else:
         await self._process_single_request(request)
-async def _process_single_request(self, request: GatewayRequest) -> None:
-    """Process a single (non-parallel) request with retry and fallback."""
-    provider = request.provider
-    start_time = time.time()
-
+async def _apply_memory_pre_request(self, request: GatewayRequest) -> None:
+    """Run the memory middleware pre-request hook, updating ``request`` in place."""
     # === Memory Middleware: Pre-Request Hook ===
     if self.memory_middleware:
         try:
@@ -64,9 +61,17 @@ async def _process_single_request(self, request: GatewayRequest) -> None:
                 request.metadata["_memory_injected"] = True
                 request.metadata["_memory_count"] = enhanced_dict.get("_memory_count", 0)
                 request.metadata["_system_context_injected"] = enhanced_dict.get("_system_context_injected", False)
+                if enhanced_dict.get("_prompt_segments"):
+                    request.metadata["_prompt_segments"] = enhanced_dict["_prompt_segments"]
 
         except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError):
             logger.exception("Memory pre-request hook error")
+async def _process_single_request(self, request: GatewayRequest) -> None:
+    """Process a single (non-parallel) request with retry and fallback."""
+    provider = request.provider
+    start_time = time.time()
+
+    await self._apply_memory_pre_request(request)
 
     # Broadcast processing started event (wrapped in try-except)
     try:
@@ -9,7 +9,8 @@ from typing import Optional
 from lib.common.logging import get_logger
 
 from .app import create_app as build_app
-from .models import ProviderInfo
+from .backends.interactive_cli_backend import InteractiveCLIBackend
+from .models import BackendType, ProviderInfo
 from .request_queue import AsyncRequestQueue
 
 logger = get_logger("gateway.server")
@@ -44,7 +45,7 @@ async def cleanup_loop(self) -> None:
     while self._running:
         try:
             self.store.cleanup_old_requests(self.config.request_ttl_hours)
-            self.store.cleanup_old_metrics(168)
+            self.store.compact_metrics()
             if self.cache_manager:
                 self.cache_manager.cleanup_expired()
         except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError):
@@ -78,6 +79,9 @@ def create_app(self):
     )
 
     self._app.state.backends = self.backends
+    self._app.state.http_client = self.http_client
+    self._app.state.stream_request = self.stream_request
+    self._app.state.supports_fast_stream = self.supports_fast_stream
 
     if self.discussion_executor and hasattr(self._app.state, "ws_manager"):
         self.discussion_executor.ws_broadcast = self._app.state.ws_manager.broadcast
@@ -96,6 +100,17 @@ async def start(self) -> None:
     asyncio.create_task(self.health_check_loop())
     asyncio.create_task(self.cleanup_loop())
 
+    if self.config.http_pool.prewarm:
+        asyncio.create_task(self.http_client.prewarm(
+            p.api_base_url
+            for name, p in self.config.providers.items()
+            if name in self.backends and p.backend_type == BackendType.HTTP_API and p.api_base_url
+        ))
+
+    for backend in self.backends.values():
+        if isinstance(backend, InteractiveCLIBackend) and backend.pool_config.prespawn:
+            asyncio.create_task(backend.start())
+
     if self.health_checker:
         await self.health_checker.start()
 
@@ -136,6 +151,8 @@ async def stop(self) -> None:
         except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError):
             logger.debug("Backend shutdown failed", exc_info=True)
 
+    await self.http_client.close()
+
     logger.info("Gateway server stopped")
 
 
@@ -0,0 +1,147 @@
+"""
+Streaming fast path for ``GatewayServer``.
+
+Requests for providers whose backend implements ``execute_stream`` are served
+directly from the SSE handler instead of being enqueued and picked up by the
+scheduler.  The request is still persisted and counted in the queue's
+processing set, and the usual success/failure bookkeeping (response row,
+memory post-hook, cache, metrics, WebSocket events) runs in a background task
+once the last chunk has been sent, so none of it delays the first token.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from lib.common.logging import get_logger
+
+from .backends.base_backend import BackendResult
+from .models import GatewayRequest, WebSocketEvent
+from .streaming import StreamError
+
+logger = get_logger("gateway.server")
+
+# Keeps finalization tasks referenced until they finish.
+_pending_finalizers: Set[asyncio.Task] = set()
+
+
+def supports_fast_stream(self, provider: str) -> bool:
+    """Whether ``provider`` can be streamed without going through the queue."""
+    backend = self.backends.get(provider)
+    return backend is not None and callable(getattr(backend, "execute_stream", None))
+
+
+def _schedule(coro) -> None:
+    try:
+        task = asyncio.get_running_loop().create_task(coro)
+    except RuntimeError:
+        # Generator finalized outside the loop; nothing left to run it on.
+        coro.close()
+        return
+    _pending_finalizers.add(task)
+    task.add_done_callback(_pending_finalizers.discard)
+
+
+async def _finalize_stream(
+    self,
+    request: GatewayRequest,
+    result: BackendResult,
+    latency_ms: float,
+) -> None:
+    try:
+        if result.success:
+            await self._handle_success(request, result, latency_ms)
+        else:
+            await self._handle_failure(request, result, latency_ms)
+    except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError):
+        logger.exception("Failed to finalize streamed request %s", request.id)
+        self.queue.mark_completed(request.id, error="finalization failed")
+
+
+async def stream_request(self, request: GatewayRequest) -> AsyncIterator[str]:
+    """
+    Stream ``request`` straight from its backend as SSE strings.
+
+    Time to first token is measured from entry (so it includes the memory
+    pre-request hook) to the first chunk handed to the client.
+    """
+    start_time = time.time()
+    provider = request.provider
+    backend = self.backends.get(provider)
+    if request.metadata is None:
+        request.metadata = {}
+    request.metadata.setdefault("original_message", request.message)
+    request.metadata["streamed"] = True
+
+    self.queue.track_direct(request)
+
+    if backend is None:
+        error = f"Backend not available: {provider}"
+        yield StreamError(request_id=request.id, error=error).to_sse()
+        _schedule(_finalize_stream(
+            self, request, BackendResult.fail(error), (time.time() - start_time) * 1000,
+        ))
+        return
+
+    await self._apply_memory_pre_request(request)
+
+    try:
+        if self._app and hasattr(self._app.state, "ws_manager"):
+            await self._app.state.ws_manager.broadcast(WebSocketEvent(
+                type="request_processing",
+                data={"request_id": request.id, "provider": provider, "streamed": True},
+            ))
+    except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError):
+        logger.debug("Failed to broadcast request_processing event", exc_info=True)
+
+    parts: List[str] = []
+    ttft_s: Optional[float] = None
+    tokens_used: Optional[int] = None
+    error: Optional[str] = None
+    finished = False
+
+    try:
+        async for chunk in backend.execute_stream(request):
+            if ttft_s is None and (chunk.content or chunk.is_final):
+                ttft_s = time.time() - start_time
+                if self.metrics:
+                    self.metrics.observe_ttft(provider, ttft_s)
+            if chunk.content:
+                parts.append(chunk.content)
+            if chunk.is_final:
+                tokens_used = chunk.tokens_used
+                if chunk.metadata and chunk.metadata.get("error"):
+                    error = str(chunk.metadata["error"])
+                elif chunk.metadata and chunk.metadata.get("replace"):
+                    parts = [str(chunk.metadata.get("response") or "")]
+            yield chunk.to_sse()
+            if chunk.is_final:
+                break
+        finished = True
+    except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError) as exc:
+        logger.exception("Streaming backend error for %s", provider)
+        error = str(exc)
+        finished = True
+        yield StreamError(request_id=request.id, error=error, error_type="exception").to_sse()
+    finally:
+        latency_ms = (time.time() - start_time) * 1000
+        metadata: Dict[str, Any] = {"streamed": True}
+        if ttft_s is not None:
+            metadata["ttft_ms"] = round(ttft_s * 1000, 2)
+        if not finished:
+            # Client went away (generator closed or cancelled mid-stream).
+            error = error or "Client disconnected during stream"
+            metadata["client_disconnected"] = True
+
+        if error:
+            result = BackendResult.fail(error, latency_ms=latency_ms, metadata=metadata)
+        else:
+            result = BackendResult.ok(
+                "".join(parts),
+                latency_ms=latency_ms,
+                tokens_used=tokens_used,
+                metadata=metadata,
+            )
+        _schedule(_finalize_stream(self, request, result, latency_ms))
@@ -30,6 +30,7 @@ from .models import (
 
 from .state_store_requests import (
     create_request_impl,
+    create_requests_bulk_impl,
     get_request_impl,
     update_request_status_impl,
     list_requests_impl,
@@ -46,7 +47,6 @@ from .state_store_providers import (
     list_provider_status_impl,
     _row_to_provider_info_impl,
     record_metric_impl,
-    get_provider_metrics_impl,
     cleanup_old_metrics_impl,
     get_stats_impl,
 )
@@ -73,13 +73,19 @@ from .state_store_discussions import (
 )
 from .state_store_costs import (
     record_token_cost_impl,
-    get_cost_summary_impl,
-    get_cost_by_provider_impl,
-    get_cost_by_day_impl,
     cleanup_old_costs_impl,
     get_latest_results_impl,
     get_result_by_id_impl,
 )
+from .state_store_rollups import (
+    init_rollup_tables_impl,
+    get_provider_metrics_impl,
+    get_all_provider_metrics_impl,
+    get_cost_summary_impl,
+    get_cost_by_provider_impl,
+    get_cost_by_day_impl,
+    compact_metrics_impl,
+)
 
 
 class StateStore:
@@ -90,9 +96,13 @@ class StateStore:
     - Requests and their status
     - Responses from providers
     - Provider health/status information
-    - Request metrics for analytics
+    - Request metrics for analytics, with per-minute/per-hour rollups
     """
 
+    # USD per million tokens, keyed by provider name.  Providers without an
+    # entry are tracked for token counts only.
+    PROVIDER_PRICING: Dict[str, Dict[str, float]] = {}
+
     def __init__(self, db_path: Optional[str] = None):
         """
         Initialize the state store.
@@ -219,6 +229,9 @@ class StateStore:
             # Initialize cost tracking table
             self._init_cost_tracking_table(conn)
 
+            # Pre-aggregated metric/cost buckets (backfilled on first run)
+            init_rollup_tables_impl(self, conn)
+
     def _init_cost_tracking_table(self, conn: sqlite3.Connection) -> None:
         """Initialize token cost tracking table."""
         conn.execute("""
@@ -384,6 +397,8 @@ class StateStore:
 
     def create_request(self, *args, **kwargs):
         return create_request_impl(self, *args, **kwargs)
+    def create_requests_bulk(self, *args, **kwargs):
+        return create_requests_bulk_impl(self, *args, **kwargs)
     def get_request(self, *args, **kwargs):
         return get_request_impl(self, *args, **kwargs)
     def update_request_status(self, *args, **kwargs):
@@ -414,6 +429,10 @@ class StateStore:
         return record_metric_impl(self, *args, **kwargs)
     def get_provider_metrics(self, *args, **kwargs):
         return get_provider_metrics_impl(self, *args, **kwargs)
+    def get_all_provider_metrics(self, *args, **kwargs):
+        return get_all_provider_metrics_impl(self, *args, **kwargs)
+    def compact_metrics(self, *args, **kwargs):
+        return compact_metrics_impl(self, *args, **kwargs)
     def cleanup_old_metrics(self, *args, **kwargs):
         return cleanup_old_metrics_impl(self, *args, **kwargs)
     def get_stats(self, *args, **kwargs):
@@ -20,6 +20,7 @@ from .models import (
     DiscussionConfig,
     MessageType,
 )
+from .state_store_rollups import rollup_cost
 
 
 def record_token_cost_impl(
@@ -38,6 +39,7 @@ def record_token_cost_impl(
         (output_tokens * pricing["output"] / 1_000_000)
     )
 
+    now = time.time()
     with self._get_connection() as conn:
         conn.execute("""
             INSERT INTO token_costs (
@@ -51,111 +53,9 @@ def record_token_cost_impl(
             output_tokens,
             cost_usd,
             model,
-            time.time(),
+            now,
         ))
-
-def get_cost_summary_impl(self, days: int = 30) -> Dict[str, Any]:
-    """Get cost summary for the specified period."""
-    cutoff = time.time() - (days * 86400)
-
-    with self._get_connection() as conn:
-        # Total costs
-        cursor = conn.execute("""
-            SELECT
-                SUM(input_tokens) as total_input,
-                SUM(output_tokens) as total_output,
-                SUM(cost_usd) as total_cost,
-                COUNT(*) as total_requests
-            FROM token_costs
-            WHERE timestamp > ?
-        """, (cutoff,))
-        row = cursor.fetchone()
-
-        # Today's costs
-        today_start = time.time() - (time.time() % 86400)
-        cursor = conn.execute("""
-            SELECT SUM(cost_usd) as today_cost
-            FROM token_costs
-            WHERE timestamp > ?
-        """, (today_start,))
-        today_row = cursor.fetchone()
-
-        # This week's costs
-        week_start = time.time() - (7 * 86400)
-        cursor = conn.execute("""
-            SELECT SUM(cost_usd) as week_cost
-            FROM token_costs
-            WHERE timestamp > ?
-        """, (week_start,))
-        week_row = cursor.fetchone()
-
-        return {
-            "period_days": days,
-            "total_input_tokens": row["total_input"] or 0,
-            "total_output_tokens": row["total_output"] or 0,
-            "total_cost_usd": row["total_cost"] or 0.0,
-            "total_requests": row["total_requests"] or 0,
-            "today_cost_usd": today_row["today_cost"] or 0.0,
-            "week_cost_usd": week_row["week_cost"] or 0.0,
-        }
-
-def get_cost_by_provider_impl(self, days: int = 30) -> List[Dict[str, Any]]:
-    """Get cost breakdown by provider."""
-    cutoff = time.time() - (days * 86400)
-
-    with self._get_connection() as conn:
-        cursor = conn.execute("""
-            SELECT
-                provider,
-                SUM(input_tokens) as total_input,
-                SUM(output_tokens) as total_output,
-                SUM(cost_usd) as total_cost,
-                COUNT(*) as request_count
-            FROM token_costs
-            WHERE timestamp > ?
-            GROUP BY provider
-            ORDER BY total_cost DESC
-        """, (cutoff,))
-
-        return [
-            {
-                "provider": row["provider"],
-                "total_input_tokens": row["total_input"] or 0,
-                "total_output_tokens": row["total_output"] or 0,
-                "total_cost_usd": row["total_cost"] or 0.0,
-                "request_count": row["request_count"] or 0,
-            }
-            for row in cursor.fetchall()
-        ]
-
-def get_cost_by_day_impl(self, days: int = 7) -> List[Dict[str, Any]]:
-    """Get daily cost breakdown."""
-    cutoff = time.time() - (days * 86400)
-
-    with self._get_connection() as conn:
-        cursor = conn.execute("""
-            SELECT
-                DATE(timestamp, 'unixepoch', 'localtime') as date,
-                SUM(input_tokens) as total_input,
-                SUM(output_tokens) as total_output,
-                SUM(cost_usd) as total_cost,
-                COUNT(*) as request_count
-            FROM token_costs
-            WHERE timestamp > ?
-            GROUP BY DATE(timestamp, 'unixepoch', 'localtime')
-            ORDER BY date DESC
-        """, (cutoff,))
-
-        return [
-            {
-                "date": row["date"],
-                "total_input_tokens": row["total_input"] or 0,
-                "total_output_tokens": row["total_output"] or 0,
-                "total_cost_usd": row["total_cost"] or 0.0,
-                "request_count": row["request_count"] or 0,
-            }
-            for row in cursor.fetchall()
-        ]
+        rollup_cost(conn, provider, now, input_tokens, output_tokens, cost_usd)
 
 def cleanup_old_costs_impl(self, max_age_days: int = 90) -> int:
     """Remove cost records older than specified age."""
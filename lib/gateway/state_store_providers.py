@@ -20,6 +20,7 @@ from .models import (
     DiscussionConfig,
     MessageType,
 )
+from .state_store_rollups import rollup_metric
 
 
 def update_provider_status_impl(self, info: ProviderInfo) -> None:
@@ -93,7 +94,8 @@ def record_metric_impl(
     success: bool = True,
     error: Optional[str] = None,
 ) -> None:
-    """Record a metric event."""
+    """Record a metric event and fold it into the rollup buckets."""
+    now = time.time()
     with self._get_connection() as conn:
         conn.execute("""
             INSERT INTO metrics (
@@ -107,49 +109,9 @@ def record_metric_impl(
             latency_ms,
             1 if success else 0,
             error,
-            time.time(),
+            now,
         ))
-
-def get_provider_metrics_impl(
-    self,
-    provider: str,
-    hours: int = 24,
-) -> Dict[str, Any]:
-    """Get aggregated metrics for a provider."""
-    cutoff = time.time() - (hours * 3600)
-    with self._get_connection() as conn:
-        cursor = conn.execute("""
-            SELECT
-                COUNT(*) as total,
-                SUM(success) as successes,
-                AVG(latency_ms) as avg_latency,
-                MAX(latency_ms) as max_latency,
-                MIN(latency_ms) as min_latency
-            FROM metrics
-            WHERE provider = ? AND timestamp > ?
-        """, (provider, cutoff))
-        row = cursor.fetchone()
-        if row:
-            total = row["total"] or 0
-            successes = row["successes"] or 0
-            return {
-                "provider": provider,
-                "total_requests": total,
-                "successful_requests": successes,
-                "success_rate": successes / total if total > 0 else 1.0,
-                "avg_latency_ms": row["avg_latency"] or 0.0,
-                "max_latency_ms": row["max_latency"] or 0.0,
-                "min_latency_ms": row["min_latency"] or 0.0,
-            }
-    return {
-        "provider": provider,
-        "total_requests": 0,
-        "successful_requests": 0,
-        "success_rate": 1.0,
-        "avg_latency_ms": 0.0,
-        "max_latency_ms": 0.0,
-        "min_latency_ms": 0.0,
-    }
+        rollup_metric(conn, provider, now, latency_ms, success)
 
 def cleanup_old_metrics_impl(self, max_age_hours: int = 168) -> int:
     """Remove metrics older than specified age (default 7 days)."""
@@ -22,32 +22,51 @@ from .models import (
 )
 
 
+_INSERT_REQUEST_SQL = """
+    INSERT INTO requests (
+        id, provider, message, status, priority, timeout_s,
+        created_at, updated_at, backend_type, routed_at,
+        started_at, completed_at, metadata
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _request_row(request: GatewayRequest) -> tuple:
+    return (
+        request.id,
+        request.provider,
+        request.message,
+        request.status.value,
+        request.priority,
+        request.timeout_s,
+        request.created_at,
+        request.updated_at,
+        request.backend_type.value if request.backend_type else None,
+        request.routed_at,
+        request.started_at,
+        request.completed_at,
+        json.dumps(request.metadata) if request.metadata else None,
+    )
+
+
 def create_request_impl(self, request: GatewayRequest) -> GatewayRequest:
     """Create a new request in the store."""
     with self._get_connection() as conn:
-        conn.execute("""
-            INSERT INTO requests (
-                id, provider, message, status, priority, timeout_s,
-                created_at, updated_at, backend_type, routed_at,
-                started_at, completed_at, metadata
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            request.id,
-            request.provider,
-            request.message,
-            request.status.value,
-            request.priority,
-            request.timeout_s,
-            request.created_at,
-            request.updated_at,
-            request.backend_type.value if request.backend_type else None,
-            request.routed_at,
-            request.started_at,
-            request.completed_at,
-            json.dumps(request.metadata) if request.metadata else None,
-        ))
+        conn.execute(_INSERT_REQUEST_SQL, _request_row(request))
     return request
 
+def create_requests_bulk_impl(self, requests: List[GatewayRequest]) -> int:
+    """Insert many requests in a single transaction.
+
+    Returns:
+        Number of rows inserted
+    """
+    if not requests:
+        return 0
+    with self._get_connection() as conn:
+        conn.executemany(_INSERT_REQUEST_SQL, [_request_row(r) for r in requests])
+    return len(requests)
+
 def get_request_impl(self, request_id: str) -> Optional[GatewayRequest]:
     """Get a request by ID."""
     with self._get_connection() as conn:
@@ -0,0 +1,412 @@
+"""Pre-aggregated metric rollups for ``StateStore``.
+
+Every ``record_metric`` / ``record_token_cost`` call also upserts into
+per-minute and per-hour buckets in ``metrics_rollup``.  Read paths (monitor,
+cost and stats endpoints) aggregate a few hundred bucket rows instead of
+scanning the raw ``metrics`` / ``token_costs`` tables.
+
+A window ``[cutoff, now]`` is answered from hour buckets that start at or
+after the first full hour, plus minute buckets for the leading partial hour
+while those are still retained.  Once minute buckets have been compacted the
+leading edge is rounded down to the whole hour.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+GRANULARITY_MINUTE = "m"
+GRANULARITY_HOUR = "h"
+_BUCKET_SECONDS = {GRANULARITY_MINUTE: 60, GRANULARITY_HOUR: 3600}
+
+# Upper bounds (ms) for latency histogram buckets; the last bucket is open.
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000, 300000,
+)
+_HIST_COLUMNS = [f"lat_b{i}" for i in range(len(LATENCY_BUCKETS_MS) + 1)]
+
+# Retention defaults used by ``compact_metrics_impl``.
+RAW_METRICS_RETENTION_HOURS = 48
+MINUTE_ROLLUP_RETENTION_HOURS = 26
+HOUR_ROLLUP_RETENTION_DAYS = 400
+
+
+def init_rollup_tables_impl(self, conn: sqlite3.Connection) -> None:
+    """Create the rollup table and backfill it from raw rows if empty."""
+    hist_defs = ",\n".join(f"            {col} INTEGER NOT NULL DEFAULT 0" for col in _HIST_COLUMNS)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS metrics_rollup (
+            granularity TEXT NOT NULL,
+            bucket_start INTEGER NOT NULL,
+            provider TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            successes INTEGER NOT NULL DEFAULT 0,
+            latency_sum REAL NOT NULL DEFAULT 0,
+            latency_count INTEGER NOT NULL DEFAULT 0,
+            latency_min REAL,
+            latency_max REAL,
+{hist_defs},
+            cost_count INTEGER NOT NULL DEFAULT 0,
+            input_tokens INTEGER NOT NULL DEFAULT 0,
+            output_tokens INTEGER NOT NULL DEFAULT 0,
+            cost_usd REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (granularity, bucket_start, provider)
+        ) WITHOUT ROWID
+    """)
+
+    has_rollups = conn.execute("SELECT 1 FROM metrics_rollup LIMIT 1").fetchone()
+    if not has_rollups:
+        _backfill(conn)
+
+
+def _bucket(ts: float, granularity: str) -> int:
+    size = _BUCKET_SECONDS[granularity]
+    return int(ts // size) * size
+
+
+def _hist_index(latency_ms: Optional[float]) -> Optional[int]:
+    if latency_ms is None:
+        return None
+    for i, bound in enumerate(LATENCY_BUCKETS_MS):
+        if latency_ms <= bound:
+            return i
+    return len(LATENCY_BUCKETS_MS)
+
+
+def _hist_case_sql(column: str = "latency_ms") -> List[str]:
+    """SQL expressions assigning a raw latency to each histogram column."""
+    exprs = []
+    lower = None
+    for bound in LATENCY_BUCKETS_MS:
+        cond = f"{column} <= {bound}" if lower is None else f"{column} > {lower} AND {column} <= {bound}"
+        exprs.append(f"SUM(CASE WHEN {cond} THEN 1 ELSE 0 END)")
+        lower = bound
+    exprs.append(f"SUM(CASE WHEN {column} > {lower} THEN 1 ELSE 0 END)")
+    return exprs
+
+
+def _backfill(conn: sqlite3.Connection) -> None:
+    """Build rollups from whatever raw rows already exist."""
+    hist_cols = ", ".join(_HIST_COLUMNS)
+    hist_exprs = ", ".join(_hist_case_sql())
+    for granularity, size in _BUCKET_SECONDS.items():
+        conn.execute(f"""
+            INSERT INTO metrics_rollup (
+                granularity, bucket_start, provider, count, successes,
+                latency_sum, latency_count, latency_min, latency_max, {hist_cols}
+            )
+            SELECT ?, CAST(timestamp / {size} AS INTEGER) * {size}, provider,
+                   COUNT(*), COALESCE(SUM(success), 0),
+                   COALESCE(SUM(latency_ms), 0), COUNT(latency_ms),
+                   MIN(latency_ms), MAX(latency_ms), {hist_exprs}
+            FROM metrics
+            GROUP BY 2, provider
+        """, (granularity,))
+        conn.execute(f"""
+            INSERT INTO metrics_rollup (
+                granularity, bucket_start, provider,
+                cost_count, input_tokens, output_tokens, cost_usd
+            )
+            SELECT ?, CAST(timestamp / {size} AS INTEGER) * {size}, provider,
+                   COUNT(*), COALESCE(SUM(input_tokens), 0),
+                   COALESCE(SUM(output_tokens), 0), COALESCE(SUM(cost_usd), 0)
+            FROM token_costs
+            WHERE 1
+            GROUP BY 2, provider
+            ON CONFLICT (granularity, bucket_start, provider) DO UPDATE SET
+                cost_count = cost_count + excluded.cost_count,
+                input_tokens = input_tokens + excluded.input_tokens,
+                output_tokens = output_tokens + excluded.output_tokens,
+                cost_usd = cost_usd + excluded.cost_usd
+        """, (granularity,))
+
+
+def rollup_metric(
+    conn: sqlite3.Connection,
+    provider: str,
+    timestamp: float,
+    latency_ms: Optional[float],
+    success: bool,
+) -> None:
+    """Fold one metric event into its minute and hour buckets."""
+    hist = _hist_index(latency_ms)
+    hist_col = _HIST_COLUMNS[hist] if hist is not None else None
+    has_latency = latency_ms is not None
+    rows = [
+        (
+            granularity,
+            _bucket(timestamp, granularity),
+            provider,
+            1 if success else 0,
+            latency_ms if has_latency else 0.0,
+            1 if has_latency else 0,
+            latency_ms,
+            latency_ms,
+        )
+        for granularity in _BUCKET_SECONDS
+    ]
+    hist_insert = f", {hist_col}" if hist_col else ""
+    hist_value = ", 1" if hist_col else ""
+    hist_update = f", {hist_col} = {hist_col} + 1" if hist_col else ""
+    conn.executemany(f"""
+        INSERT INTO metrics_rollup (
+            granularity, bucket_start, provider, count, successes,
+            latency_sum, latency_count, latency_min, latency_max{hist_insert}
+        ) VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?{hist_value})
+        ON CONFLICT (granularity, bucket_start, provider) DO UPDATE SET
+            count = count + 1,
+            successes = successes + excluded.successes,
+            latency_sum = latency_sum + excluded.latency_sum,
+            latency_count = latency_count + excluded.latency_count,
+            latency_min = MIN(COALESCE(latency_min, excluded.latency_min), COALESCE(excluded.latency_min, latency_min)),
+            latency_max = MAX(COALESCE(latency_max, excluded.latency_max), COALESCE(excluded.latency_max, latency_max))
+            {hist_update}
+    """, rows)
+
+
+def rollup_cost(
+    conn: sqlite3.Connection,
+    provider: str,
+    timestamp: float,
+    input_tokens: int,
+    output_tokens: int,
+    cost_usd: float,
+) -> None:
+    """Fold one token-cost record into its minute and hour buckets."""
+    rows = [
+        (granularity, _bucket(timestamp, granularity), provider,
+         input_tokens or 0, output_tokens or 0, cost_usd or 0.0)
+        for granularity in _BUCKET_SECONDS
+    ]
+    conn.executemany("""
+        INSERT INTO metrics_rollup (
+            granularity, bucket_start, provider,
+            cost_count, input_tokens, output_tokens, cost_usd
+        ) VALUES (?, ?, ?, 1, ?, ?, ?)
+        ON CONFLICT (granularity, bucket_start, provider) DO UPDATE SET
+            cost_count = cost_count + 1,
+            input_tokens = input_tokens + excluded.input_tokens,
+            output_tokens = output_tokens + excluded.output_tokens,
+            cost_usd = cost_usd + excluded.cost_usd
+    """, rows)
+
+
+def _window_clause(cutoff: float, now: Optional[float] = None) -> Tuple[str, List[Any]]:
+    """WHERE clause selecting buckets that cover ``[cutoff, now]``."""
+    now = time.time() if now is None else now
+    first_full_hour = -(-int(cutoff) // 3600) * 3600
+    minute_floor = now - MINUTE_ROLLUP_RETENTION_HOURS * 3600
+    if cutoff >= minute_floor:
+        first_minute = -(-int(cutoff) // 60) * 60
+        return (
+            "((granularity = 'h' AND bucket_start >= ?) OR "
+            "(granularity = 'm' AND bucket_start >= ? AND bucket_start < ?))",
+            [first_full_hour, first_minute, first_full_hour],
+        )
+    return "(granularity = 'h' AND bucket_start >= ?)", [_bucket(cutoff, GRANULARITY_HOUR)]
+
+
+def _percentile(hist: Sequence[int], q: float) -> float:
+    total = sum(hist)
+    if total <= 0:
+        return 0.0
+    target = q * total
+    running = 0
+    for i, n in enumerate(hist):
+        running += n
+        if running >= target:
+            if i < len(LATENCY_BUCKETS_MS):
+                return float(LATENCY_BUCKETS_MS[i])
+            return float(LATENCY_BUCKETS_MS[-1])
+    return float(LATENCY_BUCKETS_MS[-1])
+
+
+def _metrics_from_row(provider: str, row: Optional[sqlite3.Row]) -> Dict[str, Any]:
+    total = (row["total"] if row else 0) or 0
+    successes = (row["successes"] if row else 0) or 0
+    latency_count = (row["latency_count"] if row else 0) or 0
+    hist = [(row[col] if row else 0) or 0 for col in _HIST_COLUMNS]
+    return {
+        "provider": provider,
+        "total_requests": total,
+        "successful_requests": successes,
+        "success_rate": successes / total if total > 0 else 1.0,
+        "avg_latency_ms": (row["latency_sum"] / latency_count) if latency_count else 0.0,
+        "max_latency_ms": (row["max_latency"] if row else None) or 0.0,
+        "min_latency_ms": (row["min_latency"] if row else None) or 0.0,
+        "p50_latency_ms": _percentile(hist, 0.50),
+        "p95_latency_ms": _percentile(hist, 0.95),
+        "latency_histogram": dict(zip([*map(str, LATENCY_BUCKETS_MS), "inf"], hist)),
+    }
+
+
+_METRICS_SELECT = (
+    "SUM(count) AS total, SUM(successes) AS successes, "
+    "SUM(latency_sum) AS latency_sum, SUM(latency_count) AS latency_count, "
+    "MIN(latency_min) AS min_latency, MAX(latency_max) AS max_latency, "
+    + ", ".join(f"SUM({col}) AS {col}" for col in _HIST_COLUMNS)
+)
+
+
+def get_provider_metrics_impl(
+    self,
+    provider: str,
+    hours: int = 24,
+) -> Dict[str, Any]:
+    """Get aggregated metrics for a provider from the rollup buckets."""
+    clause, params = _window_clause(time.time() - hours * 3600)
+    with self._get_connection() as conn:
+        row = conn.execute(
+            f"SELECT {_METRICS_SELECT} FROM metrics_rollup WHERE {clause} AND provider = ?",
+            (*params, provider),
+        ).fetchone()
+    return _metrics_from_row(provider, row if row and row["total"] else None)
+
+
+def get_all_provider_metrics_impl(
+    self,
+    hours: int = 24,
+    providers: Optional[Iterable[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get aggregated metrics for every provider with a single grouped query.
+
+    Providers listed in ``providers`` are always present in the result, with
+    empty metrics if they have no data in the window.
+    """
+    clause, params = _window_clause(time.time() - hours * 3600)
+    with self._get_connection() as conn:
+        rows = conn.execute(
+            f"SELECT provider, {_METRICS_SELECT} FROM metrics_rollup "
+            f"WHERE {clause} GROUP BY provider",
+            params,
+        ).fetchall()
+    result = {
+        row["provider"]: _metrics_from_row(row["provider"], row)
+        for row in rows
+        if row["total"]
+    }
+    for provider in providers or ():
+        if provider not in result:
+            result[provider] = _metrics_from_row(provider, None)
+    return result
+
+
+def get_cost_summary_impl(self, days: int = 30) -> Dict[str, Any]:
+    """Get cost summary for the specified period."""
+    now = time.time()
+    today_start = now - (now % 86400)
+    week_start = now - (7 * 86400)
+    windows = {
+        "total": _window_clause(now - days * 86400, now),
+        "today": _window_clause(today_start, now),
+        "week": _window_clause(week_start, now),
+    }
+
+    with self._get_connection() as conn:
+        clause, params = windows["total"]
+        row = conn.execute(f"""
+            SELECT SUM(input_tokens) AS total_input, SUM(output_tokens) AS total_output,
+                   SUM(cost_usd) AS total_cost, SUM(cost_count) AS total_requests
+            FROM metrics_rollup WHERE {clause}
+        """, params).fetchone()
+        clause, params = windows["today"]
+        today_row = conn.execute(
+            f"SELECT SUM(cost_usd) AS today_cost FROM metrics_rollup WHERE {clause}", params
+        ).fetchone()
+        clause, params = windows["week"]
+        week_row = conn.execute(
+            f"SELECT SUM(cost_usd) AS week_cost FROM metrics_rollup WHERE {clause}", params
+        ).fetchone()
+
+    return {
+        "period_days": days,
+        "total_input_tokens": row["total_input"] or 0,
+        "total_output_tokens": row["total_output"] or 0,
+        "total_cost_usd": row["total_cost"] or 0.0,
+        "total_requests": row["total_requests"] or 0,
+        "today_cost_usd": today_row["today_cost"] or 0.0,
+        "week_cost_usd": week_row["week_cost"] or 0.0,
+    }
+
+
+def get_cost_by_provider_impl(self, days: int = 30) -> List[Dict[str, Any]]:
+    """Get cost breakdown by provider."""
+    clause, params = _window_clause(time.time() - days * 86400)
+    with self._get_connection() as conn:
+        cursor = conn.execute(f"""
+            SELECT provider, SUM(input_tokens) AS total_input, SUM(output_tokens) AS total_output,
+                   SUM(cost_usd) AS total_cost, SUM(cost_count) AS request_count
+            FROM metrics_rollup
+            WHERE {clause}
+            GROUP BY provider
+            HAVING SUM(cost_count) > 0
+            ORDER BY total_cost DESC
+        """, params)
+        return [
+            {
+                "provider": row["provider"],
+                "total_input_tokens": row["total_input"] or 0,
+                "total_output_tokens": row["total_output"] or 0,
+                "total_cost_usd": row["total_cost"] or 0.0,
+                "request_count": row["request_count"] or 0,
+            }
+            for row in cursor.fetchall()
+        ]
+
+
+def get_cost_by_day_impl(self, days: int = 7) -> List[Dict[str, Any]]:
+    """Get daily cost breakdown from hourly buckets."""
+    cutoff = time.time() - (days * 86400)
+    with self._get_connection() as conn:
+        cursor = conn.execute("""
+            SELECT DATE(bucket_start, 'unixepoch', 'localtime') AS date,
+                   SUM(input_tokens) AS total_input, SUM(output_tokens) AS total_output,
+                   SUM(cost_usd) AS total_cost, SUM(cost_count) AS request_count
+            FROM metrics_rollup
+            WHERE granularity = 'h' AND bucket_start >= ?
+            GROUP BY date
+            HAVING SUM(cost_count) > 0
+            ORDER BY date DESC
+        """, (_bucket(cutoff, GRANULARITY_HOUR),))
+        return [
+            {
+                "date": row["date"],
+                "total_input_tokens": row["total_input"] or 0,
+                "total_output_tokens": row["total_output"] or 0,
+                "total_cost_usd": row["total_cost"] or 0.0,
+                "request_count": row["request_count"] or 0,
+            }
+            for row in cursor.fetchall()
+        ]
+
+
+def compact_metrics_impl(
+    self,
+    raw_max_age_hours: int = RAW_METRICS_RETENTION_HOURS,
+    minute_max_age_hours: int = MINUTE_ROLLUP_RETENTION_HOURS,
+    hour_max_age_days: int = HOUR_ROLLUP_RETENTION_DAYS,
+) -> Dict[str, int]:
+    """
+    Age out raw metric rows and old rollup buckets.
+
+    Raw rows are only needed for per-request drill-down once their buckets
+    exist, so they can be dropped much sooner than the aggregates.
+    """
+    now = time.time()
+    with self._get_connection() as conn:
+        raw = conn.execute(
+            "DELETE FROM metrics WHERE timestamp < ?",
+            (now - raw_max_age_hours * 3600,),
+        ).rowcount
+        minutes = conn.execute(
+            "DELETE FROM metrics_rollup WHERE granularity = 'm' AND bucket_start < ?",
+            (now - minute_max_age_hours * 3600,),
+        ).rowcount
+        hours = conn.execute(
+            "DELETE FROM metrics_rollup WHERE granularity = 'h' AND bucket_start < ?",
+            (now - hour_max_age_days * 86400,),
+        ).rowcount
+    return {"raw_metrics": raw, "minute_buckets": minutes, "hour_buckets": hours}
@@ -33,7 +33,7 @@ logger = get_logger("gateway.stream_output")
 class StreamEntry:
     """A single entry in the stream log."""
     timestamp: float
-    type: str  # 'status', 'thinking', 'output', 'chunk', 'error', 'complete'
+    type: str  # 'status', 'thinking', 'output', 'chunk', 'error', 'complete', or a parsed event type
     content: str
     metadata: Dict[str, Any] = field(default_factory=dict)
 
@@ -66,6 +66,7 @@ class StreamOutput:
         self.log_path = self.stream_dir / f"{request_id}.jsonl"
         self.started_at = time.time()
         self._closed = False
+        self._last_ts = 0.0
 
         # Database sync configuration
         self._db_path = db_path or DB_PATH
@@ -85,6 +86,12 @@ class StreamOutput:
         """Write an entry to the log file and buffer for DB sync."""
         if self._closed:
             return
+        # (request_id, timestamp, entry_type) identifies a row in stream_entries,
+        # shared with the stream-file sync; keep timestamps strictly increasing
+        # even on coarse clocks.
+        if entry.timestamp <= self._last_ts:
+            entry.timestamp = self._last_ts + 1e-6
+        self._last_ts = entry.timestamp
         try:
             # 1. Write to JSONL file (original behavior)
             with open(self.log_path, "a", encoding="utf-8") as f:
@@ -107,7 +114,7 @@ class StreamOutput:
             conn = sqlite3.connect(str(self._db_path), timeout=5.0)
             cursor = conn.cursor()
             cursor.executemany(
-                """INSERT INTO stream_entries
+                """INSERT OR IGNORE INTO stream_entries
                    (request_id, entry_type, timestamp, content, metadata)
                    VALUES (?, ?, ?, ?, ?)""",
                 [(self.request_id, e.type, e.timestamp, e.content,
@@ -153,6 +160,15 @@ class StreamOutput:
             metadata=meta
         ))
 
+    def event(self, event_type: str, content: str = "", **meta) -> None:
+        """Write a parsed CLI event ('text_delta', 'thinking_delta', 'tool_call', 'usage')."""
+        self._write_entry(StreamEntry(
+            timestamp=time.time(),
+            type=event_type,
+            content=content,
+            metadata=meta
+        ))
+
     def output(self, content: str, **meta) -> None:
         """Write output content."""
         self._write_entry(StreamEntry(
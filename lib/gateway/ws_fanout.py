@@ -0,0 +1,332 @@
+"""
+Pub/sub fan-out for WebSocket clients.
+
+Each connected client owns a bounded send queue drained by its own writer
+task, so ``broadcast`` never awaits a socket write.  Events are serialized
+once per broadcast and the same JSON text is handed to every subscriber.
+Slow consumers either lose their oldest queued events or get disconnected,
+depending on the configured policy.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from lib.common.logging import get_logger
+
+logger = get_logger("gateway.ws_fanout")
+
+# Errors raised by Starlette/websockets when the peer is gone.
+SEND_ERRORS = (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError)
+
+
+class SlowConsumerPolicy(Enum):
+    """What to do when a client's send queue is full."""
+    DROP_OLDEST = "drop_oldest"
+    DISCONNECT = "disconnect"
+
+
+def _as_set(values: Optional[Iterable[Any]]) -> Set[str]:
+    if not values:
+        return set()
+    if isinstance(values, str):
+        return {values}
+    return {str(v) for v in values if v is not None and str(v)}
+
+
+@dataclass
+class TopicFilter:
+    """
+    Subscription filter for a single client.
+
+    Empty sets mean "no restriction" on that dimension; a non-empty set drops
+    events that do not carry a matching value.  A client that never
+    subscribes receives every event, matching the previous behaviour.
+    """
+    channels: Set[str] = field(default_factory=set)
+    providers: Set[str] = field(default_factory=set)
+    request_ids: Set[str] = field(default_factory=set)
+    discussion_ids: Set[str] = field(default_factory=set)
+
+    @classmethod
+    def from_message(cls, data: Dict[str, Any]) -> "TopicFilter":
+        """Build a filter from a client ``subscribe`` message."""
+        channels = _as_set(data.get("channels"))
+        # "*" / "all" keep the legacy catch-all meaning.
+        channels -= {"*", "all"}
+        return cls(
+            channels=channels,
+            providers=_as_set(data.get("providers")),
+            request_ids=_as_set(data.get("request_ids")),
+            discussion_ids=_as_set(data.get("discussion_ids")),
+        )
+
+    def is_empty(self) -> bool:
+        return not (self.channels or self.providers or self.request_ids or self.discussion_ids)
+
+    def matches(self, event_type: str, data: Dict[str, Any]) -> bool:
+        """Check whether an event passes this filter."""
+        if self.channels and not any(
+            event_type == ch or event_type.startswith(ch + "_") for ch in self.channels
+        ):
+            return False
+
+        if self.providers:
+            providers = _as_set(data.get("providers"))
+            for key in ("provider", "selected_provider"):
+                if data.get(key):
+                    providers.add(str(data[key]))
+            if not (providers & self.providers):
+                return False
+
+        if self.request_ids:
+            request_id = data.get("request_id")
+            if request_id is None or str(request_id) not in self.request_ids:
+                return False
+
+        if self.discussion_ids:
+            discussion_id = data.get("discussion_id") or data.get("session_id")
+            if discussion_id is None or str(discussion_id) not in self.discussion_ids:
+                return False
+
+        return True
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        return {
+            "channels": sorted(self.channels),
+            "providers": sorted(self.providers),
+            "request_ids": sorted(self.request_ids),
+            "discussion_ids": sorted(self.discussion_ids),
+        }
+
+
+class ClientChannel:
+    """A single subscriber: bounded queue plus a dedicated writer task."""
+
+    def __init__(
+        self,
+        send_text: Callable[[str], Awaitable[None]],
+        *,
+        max_queue: int = 256,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+        on_close: Optional[Callable[["ClientChannel"], Awaitable[None]]] = None,
+    ):
+        self._send_text = send_text
+        self._queue: asyncio.Queue[Optional[str]] = asyncio.Queue(maxsize=max(1, max_queue))
+        self._policy = policy
+        self._on_close = on_close
+        self._writer: Optional[asyncio.Task] = None
+        self.filter = TopicFilter()
+        self.closed = False
+        # Set when the DISCONNECT policy dropped this client.
+        self.slow = False
+        self._sending = False
+        self.connected_at = time.time()
+        self.sent = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def offer(self, payload: str) -> bool:
+        """
+        Enqueue a serialized event without blocking.
+
+        Returns False if the client was disconnected by the slow-consumer
+        policy and should be removed from the hub.
+        """
+        if self.closed:
+            return False
+        try:
+            self._queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        if self._policy is SlowConsumerPolicy.DISCONNECT:
+            self.dropped += self._queue.qsize() + 1
+            self.slow = True
+            self.close()
+            # A send stuck on a full socket buffer would otherwise keep the
+            # writer, and so the connection, alive.
+            if self._sending and self._writer is not None:
+                self._writer.cancel()
+            return False
+
+        try:
+            self._queue.get_nowait()
+            self.dropped += 1
+        except asyncio.QueueEmpty:
+            pass
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.dropped += 1
+        return True
+
+    def close(self) -> None:
+        """Stop the writer; queued events are discarded."""
+        if self.closed:
+            return
+        self.closed = True
+        while True:
+            try:
+                self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+        # Sentinel wakes the writer if it is parked on an empty queue.
+        self._queue.put_nowait(None)
+
+    async def _write_loop(self) -> None:
+        try:
+            while True:
+                payload = await self._queue.get()
+                if payload is None or self.closed:
+                    break
+                self._sending = True
+                try:
+                    await self._send_text(payload)
+                    self.sent += 1
+                except SEND_ERRORS:
+                    logger.debug("WebSocket send failed; dropping client", exc_info=True)
+                    break
+                finally:
+                    self._sending = False
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.closed = True
+            if self._on_close is not None:
+                try:
+                    await self._on_close(self)
+                except SEND_ERRORS:
+                    logger.debug("WebSocket close callback failed", exc_info=True)
+
+    async def aclose(self) -> None:
+        """Close and wait for the writer task to finish."""
+        self.close()
+        writer = self._writer
+        if writer is not None and writer is not asyncio.current_task():
+            try:
+                await asyncio.wait_for(writer, timeout=1.0)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                writer.cancel()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "connected_s": time.time() - self.connected_at,
+            "filter": self.filter.to_dict(),
+        }
+
+
+class FanoutHub:
+    """Registry of client channels with non-blocking publish."""
+
+    def __init__(
+        self,
+        *,
+        max_queue: int = 256,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+    ):
+        self.max_queue = max_queue
+        self.policy = policy
+        self._channels: Dict[Any, ClientChannel] = {}
+        self.published = 0
+        self.delivered = 0
+        self.disconnected_slow = 0
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def get(self, key: Any) -> Optional[ClientChannel]:
+        return self._channels.get(key)
+
+    def keys(self) -> List[Any]:
+        return list(self._channels)
+
+    def add(
+        self,
+        key: Any,
+        send_text: Callable[[str], Awaitable[None]],
+        on_close: Optional[Callable[[ClientChannel], Awaitable[None]]] = None,
+    ) -> ClientChannel:
+        channel = ClientChannel(
+            send_text,
+            max_queue=self.max_queue,
+            policy=self.policy,
+            on_close=on_close,
+        )
+        self._channels[key] = channel
+        channel.start()
+        return channel
+
+    def remove(self, key: Any) -> Optional[ClientChannel]:
+        channel = self._channels.pop(key, None)
+        if channel is not None:
+            channel.close()
+        return channel
+
+    def publish(self, message: Dict[str, Any]) -> int:
+        """
+        Serialize ``message`` once and enqueue it for every matching client.
+
+        Returns the number of clients the event was queued for.
+        """
+        if not self._channels:
+            return 0
+
+        payload = json.dumps(message, default=str)
+        event_type = str(message.get("type", ""))
+        data = message.get("data") or {}
+        if not isinstance(data, dict):
+            data = {}
+
+        self.published += 1
+        delivered = 0
+        # Snapshot: offer() may close channels, and callers may add clients.
+        for key, channel in list(self._channels.items()):
+            if not channel.filter.matches(event_type, data):
+                continue
+            if channel.offer(payload):
+                delivered += 1
+            else:
+                self._channels.pop(key, None)
+                self.disconnected_slow += 1
+        self.delivered += delivered
+        return delivered
+
+    def send_to(self, key: Any, message: Dict[str, Any]) -> bool:
+        """Queue a message for one client, bypassing its topic filter."""
+        channel = self._channels.get(key)
+        if channel is None:
+            return False
+        if channel.offer(json.dumps(message, default=str)):
+            return True
+        self._channels.pop(key, None)
+        self.disconnected_slow += 1
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        channels = list(self._channels.values())
+        return {
+            "clients": len(channels),
+            "max_queue": self.max_queue,
+            "policy": self.policy.value,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": sum(c.dropped for c in channels),
+            "disconnected_slow": self.disconnected_slow,
+            "max_queue_depth": max((c.queue_depth for c in channels), default=0),
+        }
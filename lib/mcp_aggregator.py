@@ -48,6 +48,11 @@ class MCPServerConfig:
     env: Dict[str, str] = field(default_factory=dict)
     enabled: bool = True
     timeout_s: float = 30.0
+    # Result caching is opt-in: only tools listed here ("*" for all) are cached,
+    # for cache_ttl_s[tool] (or cache_ttl_s["*"], else default_cache_ttl_s) seconds.
+    idempotent_tools: List[str] = field(default_factory=list)
+    cache_ttl_s: Dict[str, float] = field(default_factory=dict)
+    default_cache_ttl_s: float = 300.0
 
 
 @dataclass
@@ -69,6 +74,7 @@ class ServerHealth:
     last_check: float = 0.0
     error: Optional[str] = None
     tool_count: int = 0
+    cache: Dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass
@@ -80,6 +86,10 @@ class ToolCallResult:
     result: Any = None
     error: Optional[str] = None
     latency_ms: float = 0.0
+    # cached: no upstream call of its own (result cache or a shared in-flight call)
+    cached: bool = False
+    # coalesced: served from an identical call that was already in flight
+    coalesced: bool = False
 
 
 
@@ -0,0 +1,192 @@
+"""
+Result cache for idempotent MCP tool calls.
+
+Entries are keyed by (server, tool, canonical arguments JSON).  Lookups hit
+an in-memory LRU first and fall back to the ``mcp_tool_cache`` table, so
+results survive restarts and are shared by aggregators on the same
+database.  Only tools a server declares idempotent are cached, each with
+its own TTL (see ``MCPServerConfig.idempotent_tools`` / ``cache_ttl_s``).
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from .mcp_aggregator import HANDLED_EXCEPTIONS, MCPServerConfig
+except ImportError:  # pragma: no cover - script mode
+    from mcp_aggregator import HANDLED_EXCEPTIONS, MCPServerConfig
+
+
+CACHE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS mcp_tool_cache (
+        cache_key TEXT PRIMARY KEY,
+        server TEXT NOT NULL,
+        tool TEXT NOT NULL,
+        args TEXT NOT NULL,
+        result TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    )
+"""
+
+
+def canonical_args(args: Dict[str, Any]) -> str:
+    """Stable JSON for tool arguments: sorted keys, no whitespace."""
+    return json.dumps(args or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def cache_key(server: str, tool: str, args: Dict[str, Any]) -> str:
+    raw = "\0".join((server, tool, canonical_args(args)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def tool_cache_ttl(config: MCPServerConfig, tool: str) -> float:
+    """TTL in seconds for ``tool`` on this server; 0 means not cacheable."""
+    declared = config.idempotent_tools
+    if tool not in declared and "*" not in declared:
+        return 0.0
+    return max(0.0, float(config.cache_ttl_s.get(tool, config.cache_ttl_s.get("*", config.default_cache_ttl_s))))
+
+
+class ToolResultCache:
+    """In-memory LRU over a SQLite table of tool results."""
+
+    def __init__(self, db_path: str, max_entries: int = 1024):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self.coalesced: Counter = Counter()
+        self.stores: Counter = Counter()
+        self.evictions = 0
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(CACHE_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_mcp_tool_cache_expires ON mcp_tool_cache(expires_at)")
+            conn.commit()
+
+    async def get(self, server: str, key: str, now: Optional[float] = None) -> Tuple[bool, Any]:
+        """
+        Return ``(found, result)``; counts a hit or miss for ``server``.
+
+        Memory hits are answered inline; the SQLite lookup runs in a worker
+        thread so it never blocks the event loop shared by the MCP clients.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits[server] += 1
+                    # Callers may mutate results; the cached copy stays pristine.
+                    return True, copy.deepcopy(entry[1])
+                del self._entries[key]
+
+        row = await asyncio.to_thread(self._load, key, now)
+        if row is None:
+            with self._lock:
+                self.misses[server] += 1
+            return False, None
+        result = json.loads(row[0])
+        with self._lock:
+            self._remember(key, row[1], result)
+            self.hits[server] += 1
+        return True, copy.deepcopy(result)
+
+    def _load(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                return conn.execute(
+                    "SELECT result, expires_at FROM mcp_tool_cache WHERE cache_key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+        except HANDLED_EXCEPTIONS:
+            return None
+
+    async def put(self, server: str, tool: str, args: Dict[str, Any], key: str, result: Any, ttl_s: float) -> None:
+        """Store a result: in memory immediately, in SQLite from a worker thread."""
+        now = time.time()
+        expires_at = now + ttl_s
+        with self._lock:
+            self._remember(key, expires_at, copy.deepcopy(result))
+            self.stores[server] += 1
+        row = (key, server, tool, canonical_args(args), json.dumps(result, default=str), now, expires_at)
+        await asyncio.to_thread(self._store, row)
+
+    def _store(self, row: Tuple[Any, ...]) -> None:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO mcp_tool_cache "
+                    "(cache_key, server, tool, args, result, created_at, expires_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    row,
+                )
+                conn.commit()
+        except HANDLED_EXCEPTIONS:
+            pass  # the in-memory copy still serves this process
+
+    def _remember(self, key: str, expires_at: float, result: Any) -> None:
+        self._entries[key] = (expires_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def record_coalesced(self, server: str) -> None:
+        with self._lock:
+            self.coalesced[server] += 1
+
+    def invalidate(self, server: Optional[str] = None, tool: Optional[str] = None) -> int:
+        """Drop cached results for a server and/or tool (everything if neither)."""
+        clauses, params = [], []
+        if server is not None:
+            clauses.append("server = ?")
+            params.append(server)
+        if tool is not None:
+            clauses.append("tool = ?")
+            params.append(tool)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with sqlite3.connect(self.db_path) as conn:
+            removed = conn.execute(f"DELETE FROM mcp_tool_cache{where}", params).rowcount
+            conn.commit()
+        with self._lock:
+            # Keys are hashes, so the memory tier is cleared wholesale and refills from SQLite.
+            self._entries.clear()
+        return removed
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        with sqlite3.connect(self.db_path) as conn:
+            removed = conn.execute("DELETE FROM mcp_tool_cache WHERE expires_at <= ?", (now,)).rowcount
+            conn.commit()
+        return removed
+
+    def get_stats(self, server: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            if server is None:
+                hits, misses = sum(self.hits.values()), sum(self.misses.values())
+                coalesced, stores = sum(self.coalesced.values()), sum(self.stores.values())
+            else:
+                hits, misses = self.hits[server], self.misses[server]
+                coalesced, stores = self.coalesced[server], self.stores[server]
+            lookups = hits + misses
+            return {
+                "hits": hits,
+                "misses": misses,
+                "coalesced": coalesced,
+                "stores": stores,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._entries),
+                "evictions": self.evictions,
+            }
@@ -20,6 +20,8 @@ try:
         ToolCallResult,
         ToolCapability,
     )
+    from .mcp_aggregator_cache import ToolResultCache
+    from .mcp_aggregator_transport import MCPClientLoop, MCPStdioClient
 except ImportError:  # pragma: no cover - script mode
     from mcp_aggregator import (
         HANDLED_EXCEPTIONS,
@@ -30,6 +32,8 @@ except ImportError:  # pragma: no cover - script mode
         ToolCallResult,
         ToolCapability,
     )
+    from mcp_aggregator_cache import ToolResultCache
+    from mcp_aggregator_transport import MCPClientLoop, MCPStdioClient
 
 
 class MCPAggregatorCoreMixin:
@@ -54,11 +58,17 @@ class MCPAggregatorCoreMixin:
         self.servers: Dict[str, MCPServerConfig] = {}
         self._tools: Dict[str, ToolCapability] = {}
         self._server_health: Dict[str, ServerHealth] = {}
-        self._processes: Dict[str, subprocess.Popen] = {}
+        # Warm JSON-RPC clients, started lazily on first use and run on self._io
+        self._clients: Dict[str, MCPStdioClient] = {}
+        self._io = MCPClientLoop()
+        self._notification_handlers: List[Callable[[str, str, Dict[str, Any]], None]] = []
+        # In-flight cacheable calls by cache key, for single-flight coalescing (on self._io)
+        self._inflight_calls: Dict[str, asyncio.Future] = {}
         self._lock = threading.Lock()
 
         # Initialize database
         self._init_db()
+        self._result_cache = ToolResultCache(self.db_path)
 
         # Load servers from config
         if config:
@@ -80,9 +90,13 @@ class MCPAggregatorCoreMixin:
                     args TEXT,
                     env TEXT,
                     enabled INTEGER DEFAULT 1,
-                    timeout_s REAL DEFAULT 30.0
+                    timeout_s REAL DEFAULT 30.0,
+                    cache_config TEXT
                 )
             """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(mcp_servers)")}
+            if "cache_config" not in columns:
+                conn.execute("ALTER TABLE mcp_servers ADD COLUMN cache_config TEXT")
 
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS mcp_tools (
@@ -112,10 +126,11 @@ class MCPAggregatorCoreMixin:
         """Load server configurations from database."""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute(
-                "SELECT name, command, transport, args, env, enabled, timeout_s FROM mcp_servers"
+                "SELECT name, command, transport, args, env, enabled, timeout_s, cache_config FROM mcp_servers"
             )
             for row in cursor:
-                name, command, transport, args_json, env_json, enabled, timeout_s = row
+                name, command, transport, args_json, env_json, enabled, timeout_s, cache_json = row
+                cache_config = json.loads(cache_json) if cache_json else {}
                 self.servers[name] = MCPServerConfig(
                     name=name,
                     command=command,
@@ -124,6 +139,9 @@ class MCPAggregatorCoreMixin:
                     env=json.loads(env_json) if env_json else {},
                     enabled=bool(enabled),
                     timeout_s=timeout_s,
+                    idempotent_tools=cache_config.get("idempotent_tools", []),
+                    cache_ttl_s=cache_config.get("cache_ttl_s", {}),
+                    default_cache_ttl_s=cache_config.get("default_cache_ttl_s", 300.0),
                 )
 
     def register_server(self, config: MCPServerConfig) -> None:
@@ -140,8 +158,8 @@ class MCPAggregatorCoreMixin:
             with sqlite3.connect(self.db_path) as conn:
                 conn.execute("""
                     INSERT OR REPLACE INTO mcp_servers
-                    (name, command, transport, args, env, enabled, timeout_s)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    (name, command, transport, args, env, enabled, timeout_s, cache_config)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     config.name,
                     config.command,
@@ -150,6 +168,11 @@ class MCPAggregatorCoreMixin:
                     json.dumps(config.env),
                     int(config.enabled),
                     config.timeout_s,
+                    json.dumps({
+                        "idempotent_tools": config.idempotent_tools,
+                        "cache_ttl_s": config.cache_ttl_s,
+                        "default_cache_ttl_s": config.default_cache_ttl_s,
+                    }),
                 ))
                 conn.commit()
 
@@ -177,11 +200,51 @@ class MCPAggregatorCoreMixin:
                 conn.execute("DELETE FROM mcp_servers WHERE name = ?", (name,))
                 conn.execute("DELETE FROM mcp_tools WHERE server = ?", (name,))
                 conn.commit()
+            self._result_cache.invalidate(server=name)
 
             return True
 
+    def add_notification_handler(self, handler: Callable[[str, str, Dict[str, Any]], None]) -> None:
+        """Register ``handler(server, method, params)`` for server notifications."""
+        self._notification_handlers.append(handler)
+
+    def _dispatch_notification(self, server: str, method: str, params: Dict[str, Any]) -> None:
+        for handler in list(self._notification_handlers):
+            try:
+                handler(server, method, params)
+            except HANDLED_EXCEPTIONS:
+                pass
+
+    async def _ensure_client(self, name: str) -> MCPStdioClient:
+        """Return the warm client for ``name``, starting its server if needed (runs on self._io)."""
+        config = self.servers.get(name)
+        if config is None or not config.enabled:
+            raise RuntimeError(f"Server '{name}' not available")
+        client = self._clients.get(name)
+        if client is None or client.config is not config:
+            if client is not None:
+                await client.close()
+            client = MCPStdioClient(
+                config,
+                on_notification=lambda method, params: self._dispatch_notification(name, method, params),
+            )
+            self._clients[name] = client
+        if not client.alive:
+            await client.start()
+        return client
+
+    async def _server_request(
+        self,
+        name: str,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout_s: Optional[float] = None,
+    ) -> Any:
+        client = await self._ensure_client(name)
+        return await client.request(method, params, timeout=timeout_s or client.config.timeout_s)
+
     def _start_server(self, name: str) -> bool:
-        """Start an MCP server process."""
+        """Start an MCP server process (no-op when it is already warm)."""
         if name not in self.servers:
             return False
 
@@ -190,18 +253,7 @@ class MCPAggregatorCoreMixin:
             return False
 
         try:
-            cmd = [config.command] + config.args
-            env = {**dict(subprocess.os.environ), **config.env}
-
-            process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                env=env,
-            )
-
-            self._processes[name] = process
+            self._io.run(self._ensure_client(name))
             return True
 
         except HANDLED_EXCEPTIONS as e:
@@ -215,14 +267,12 @@ class MCPAggregatorCoreMixin:
 
     def _stop_server(self, name: str) -> None:
         """Stop an MCP server process."""
-        if name in self._processes:
+        client = self._clients.pop(name, None)
+        if client is not None:
             try:
-                self._processes[name].terminate()
-                self._processes[name].wait(timeout=5)
+                self._io.run(client.close(), timeout=10)
             except HANDLED_EXCEPTIONS:
-                self._processes[name].kill()
-            finally:
-                del self._processes[name]
+                pass
 
     def discover_tools(self, server: Optional[str] = None) -> List[ToolCapability]:
         """
@@ -270,46 +320,29 @@ class MCPAggregatorCoreMixin:
         tools = []
 
         try:
-            # Start server if not running
-            if server_name not in self._processes:
-                if not self._start_server(server_name):
-                    return []
-
-            process = self._processes.get(server_name)
-            if not process:
-                return []
-
-            # Send tools/list request (JSON-RPC)
-            request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/list",
-                "params": {},
-            }
-
-            process.stdin.write((json.dumps(request) + "\n").encode())
-            process.stdin.flush()
-
-            # Read response with timeout
-            import select
-            ready, _, _ = select.select([process.stdout], [], [], config.timeout_s)
-
-            if ready:
-                response_line = process.stdout.readline().decode()
-                response = json.loads(response_line)
-
-                if "result" in response and "tools" in response["result"]:
-                    for tool_data in response["result"]["tools"]:
-                        tool = ToolCapability(
-                            name=tool_data.get("name", ""),
-                            server=server_name,
-                            description=tool_data.get("description", ""),
-                            input_schema=tool_data.get("inputSchema", {}),
-                        )
-                        tools.append(tool)
-
-                        # Save to database
-                        self._save_tool(tool)
+            # Starts the server on first use; follows nextCursor pagination.
+            cursor: Optional[str] = None
+            while True:
+                params = {"cursor": cursor} if cursor else {}
+                result = self._io.run(self._server_request(server_name, "tools/list", params, config.timeout_s))
+                if not isinstance(result, dict):
+                    break
+
+                for tool_data in result.get("tools", []):
+                    tool = ToolCapability(
+                        name=tool_data.get("name", ""),
+                        server=server_name,
+                        description=tool_data.get("description", ""),
+                        input_schema=tool_data.get("inputSchema", {}),
+                    )
+                    tools.append(tool)
+
+                    # Save to database
+                    self._save_tool(tool)
+
+                cursor = result.get("nextCursor")
+                if not cursor:
+                    break
 
         except HANDLED_EXCEPTIONS as e:
             self._server_health[server_name] = ServerHealth(
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import json
 import sqlite3
 import subprocess
@@ -20,6 +21,8 @@ try:
         ToolCallResult,
         ToolCapability,
     )
+    from .mcp_aggregator_cache import cache_key, tool_cache_ttl
+    from .mcp_aggregator_transport import MCPRPCError
 except ImportError:  # pragma: no cover - script mode
     from mcp_aggregator import (
         HANDLED_EXCEPTIONS,
@@ -30,6 +33,8 @@ except ImportError:  # pragma: no cover - script mode
         ToolCallResult,
         ToolCapability,
     )
+    from mcp_aggregator_cache import cache_key, tool_cache_ttl
+    from mcp_aggregator_transport import MCPRPCError
 
 
 class MCPAggregatorRoutingMixin:
@@ -40,20 +45,49 @@ class MCPAggregatorRoutingMixin:
         tool_name: str,
         args: Dict[str, Any],
         timeout_s: Optional[float] = None,
+        use_cache: bool = True,
     ) -> ToolCallResult:
         """
         Route a tool call to the appropriate server.
 
+        Blocks the calling thread only; calls from other threads run
+        concurrently over the server's multiplexed connection.  Results of
+        tools the server declares idempotent are served from the result
+        cache, and identical concurrent calls share one upstream call.
+
         Args:
             tool_name: Name of the tool to call
             args: Arguments for the tool
             timeout_s: Optional timeout override
+            use_cache: Set False to bypass (and not refresh) the result cache
 
         Returns:
             ToolCallResult with the response
         """
         start_time = time.time()
+        target = self._resolve_tool_server(tool_name, start_time)
+        if isinstance(target, ToolCallResult):
+            return target
+        return self._io.run(self._cached_call_tool(target, tool_name, args, timeout_s, start_time, use_cache))
 
+    async def route_tool_call_async(
+        self,
+        tool_name: str,
+        args: Dict[str, Any],
+        timeout_s: Optional[float] = None,
+        use_cache: bool = True,
+    ) -> ToolCallResult:
+        """Async variant of ``route_tool_call``; usable from any event loop."""
+        start_time = time.time()
+        target = self._resolve_tool_server(tool_name, start_time)
+        if isinstance(target, ToolCallResult):
+            return target
+        return await self._io.call(
+            self._cached_call_tool(target, tool_name, args, timeout_s, start_time, use_cache)
+        )
+
+    def _resolve_tool_server(self, tool_name: str, start_time: float):
+        """Server name for ``tool_name``, or a failed ToolCallResult."""
         # Find the server for this tool
         tool = self._tools.get(tool_name)
         if not tool:
@@ -88,63 +122,118 @@ class MCPAggregatorRoutingMixin:
                 error=f"Server '{server_name}' not available",
                 latency_ms=(time.time() - start_time) * 1000,
             )
+        return server_name
+
+    async def _cached_call_tool(
+        self,
+        server_name: str,
+        tool_name: str,
+        args: Dict[str, Any],
+        timeout_s: Optional[float],
+        start_time: float,
+        use_cache: bool,
+    ) -> ToolCallResult:
+        """Serve cacheable calls from the result cache, coalescing identical misses (runs on self._io)."""
+        ttl_s = tool_cache_ttl(self.servers[server_name], tool_name) if use_cache else 0.0
+        if ttl_s <= 0:
+            return await self._call_tool(server_name, tool_name, args, timeout_s, start_time)
+
+        key = cache_key(server_name, tool_name, args)
+        found, cached = await self._result_cache.get(server_name, key)
+        if found:
+            return ToolCallResult(
+                success=True,
+                server=server_name,
+                tool=tool_name,
+                result=cached,
+                latency_ms=(time.time() - start_time) * 1000,
+                cached=True,
+            )
 
+        leader = self._inflight_calls.get(key)
+        if leader is not None:
+            self._result_cache.record_coalesced(server_name)
+            try:
+                shared = await asyncio.shield(leader)
+            except asyncio.CancelledError:
+                if not leader.cancelled():
+                    raise
+                # The leading caller went away before its call finished; make our own.
+                return await self._call_tool(server_name, tool_name, args, timeout_s, start_time)
+            return ToolCallResult(
+                success=shared.success,
+                server=server_name,
+                tool=tool_name,
+                result=copy.deepcopy(shared.result),
+                error=shared.error,
+                latency_ms=(time.time() - start_time) * 1000,
+                cached=True,
+                coalesced=True,
+            )
+
+        leader = asyncio.get_running_loop().create_future()
+        self._inflight_calls[key] = leader
+        try:
+            result = await self._call_tool(server_name, tool_name, args, timeout_s, start_time)
+            leader.set_result(result)
+            # MCP reports tool-level failures inside a successful response.
+            if result.success and not (isinstance(result.result, dict) and result.result.get("isError")):
+                await self._result_cache.put(server_name, tool_name, args, key, result.result, ttl_s)
+            return result
+        except BaseException:
+            leader.cancel()
+            raise
+        finally:
+            self._inflight_calls.pop(key, None)
+
+    def invalidate_tool_cache(self, server: Optional[str] = None, tool: Optional[str] = None) -> int:
+        """Drop cached tool results for a server and/or tool; returns rows removed."""
+        return self._result_cache.invalidate(server=server, tool=tool)
+
+    async def _call_tool(
+        self,
+        server_name: str,
+        tool_name: str,
+        args: Dict[str, Any],
+        timeout_s: Optional[float],
+        start_time: float,
+    ) -> ToolCallResult:
+        """Send tools/call over the server's warm connection (runs on self._io)."""
         try:
             # Ensure server is running
-            if server_name not in self._processes:
-                if not self._start_server(server_name):
-                    return ToolCallResult(
-                        success=False,
-                        server=server_name,
-                        tool=tool_name,
-                        error="Failed to start server",
-                        latency_ms=(time.time() - start_time) * 1000,
-                    )
+            try:
+                client = await self._ensure_client(server_name)
+            except HANDLED_EXCEPTIONS as e:
+                return ToolCallResult(
+                    success=False,
+                    server=server_name,
+                    tool=tool_name,
+                    error=f"Failed to start server: {e}",
+                    latency_ms=(time.time() - start_time) * 1000,
+                )
 
-            process = self._processes[server_name]
-
-            # Send tools/call request
-            request = {
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": args,
-                },
-            }
-
-            process.stdin.write((json.dumps(request) + "\n").encode())
-            process.stdin.flush()
-
-            # Read response
-            effective_timeout = timeout_s or config.timeout_s
-            import select
-            ready, _, _ = select.select([process.stdout], [], [], effective_timeout)
-
-            if ready:
-                response_line = process.stdout.readline().decode()
-                response = json.loads(response_line)
-
-                latency_ms = (time.time() - start_time) * 1000
-
-                if "result" in response:
-                    return ToolCallResult(
-                        success=True,
-                        server=server_name,
-                        tool=tool_name,
-                        result=response["result"],
-                        latency_ms=latency_ms,
-                    )
-                elif "error" in response:
-                    return ToolCallResult(
-                        success=False,
-                        server=server_name,
-                        tool=tool_name,
-                        error=response["error"].get("message", "Unknown error"),
-                        latency_ms=latency_ms,
-                    )
+            result = await client.request(
+                "tools/call",
+                {"name": tool_name, "arguments": args},
+                timeout=timeout_s or client.config.timeout_s,
+            )
+            return ToolCallResult(
+                success=True,
+                server=server_name,
+                tool=tool_name,
+                result=result,
+                latency_ms=(time.time() - start_time) * 1000,
+            )
 
+        except MCPRPCError as e:
+            return ToolCallResult(
+                success=False,
+                server=server_name,
+                tool=tool_name,
+                error=e.message or "Unknown error",
+                latency_ms=(time.time() - start_time) * 1000,
+            )
+        except asyncio.TimeoutError:
             return ToolCallResult(
                 success=False,
                 server=server_name,
@@ -152,7 +241,6 @@ class MCPAggregatorRoutingMixin:
                 error="Timeout waiting for response",
                 latency_ms=(time.time() - start_time) * 1000,
             )
-
         except HANDLED_EXCEPTIONS as e:
             return ToolCallResult(
                 success=False,
@@ -184,16 +272,24 @@ class MCPAggregatorRoutingMixin:
 
             try:
                 # Check if process is running
-                if server_name in self._processes:
-                    process = self._processes[server_name]
-                    if process.poll() is None:
+                client = self._clients.get(server_name)
+                if client is not None:
+                    if client.alive:
                         # Process is running, try a ping
+                        status, error = ServerStatus.HEALTHY, None
+                        try:
+                            self._io.run(client.request("ping", timeout=min(config.timeout_s, 5.0)))
+                        except MCPRPCError:
+                            pass  # answered, just without ping support
+                        except asyncio.TimeoutError:
+                            status, error = ServerStatus.DEGRADED, "Ping timed out"
                         latency_ms = (time.time() - start_time) * 1000
                         results[server_name] = ServerHealth(
                             server=server_name,
-                            status=ServerStatus.HEALTHY,
+                            status=status,
                             latency_ms=latency_ms,
                             last_check=time.time(),
+                            error=error,
                             tool_count=len([t for t in self._tools.values() if t.server == server_name]),
                         )
                     else:
@@ -203,7 +299,7 @@ class MCPAggregatorRoutingMixin:
                             error="Process terminated",
                             last_check=time.time(),
                         )
-                        del self._processes[server_name]
+                        self._stop_server(server_name)
                 else:
                     # Try to start server
                     if self._start_server(server_name):
@@ -230,6 +326,8 @@ class MCPAggregatorRoutingMixin:
                     last_check=time.time(),
                 )
 
+            results[server_name].cache = self._result_cache.get_stats(server_name)
+
             # Log health check
             self._log_health(results[server_name])
 
@@ -274,10 +372,15 @@ class MCPAggregatorRoutingMixin:
         """List all registered servers."""
         return list(self.servers.values())
 
+    def get_transport_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-server JSON-RPC connection counters."""
+        return {name: client.get_stats() for name, client in self._clients.items()}
+
     def shutdown(self) -> None:
         """Shutdown all MCP server processes."""
-        for server_name in list(self._processes.keys()):
+        for server_name in list(self._clients.keys()):
             self._stop_server(server_name)
+        self._io.stop()
 
 
 # Singleton instance
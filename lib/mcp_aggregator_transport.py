@@ -0,0 +1,332 @@
+"""
+Multiplexed asyncio JSON-RPC transport for stdio MCP servers.
+
+One ``MCPStdioClient`` per server owns the process, a reader task and a map
+of pending request futures keyed by a monotonically increasing id, so any
+number of calls can be in flight at once and responses may arrive in any
+order.  Notifications are dispatched to handlers; server-to-client requests
+are answered (``ping``) or rejected.  ``MCPClientLoop`` runs the clients on
+a background event loop so the synchronous aggregator API can share them.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Set
+
+try:
+    from .mcp_aggregator import HANDLED_EXCEPTIONS, MCPServerConfig
+except ImportError:  # pragma: no cover - script mode
+    from mcp_aggregator import HANDLED_EXCEPTIONS, MCPServerConfig
+
+
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "ccb-aggregator", "version": "1.0.0"}
+
+# MCP results (file contents, search hits) easily exceed asyncio's 64 KiB line limit.
+_READ_LIMIT = 16 * 1024 * 1024
+
+NotificationHandler = Callable[[str, Dict[str, Any]], Any]
+
+
+class MCPRPCError(Exception):
+    """A JSON-RPC error response from an MCP server."""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class MCPStdioClient:
+    """JSON-RPC client for one stdio MCP server with concurrent in-flight requests."""
+
+    def __init__(
+        self,
+        config: MCPServerConfig,
+        on_notification: Optional[NotificationHandler] = None,
+    ):
+        self.config = config
+        self.server_info: Dict[str, Any] = {}
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._handlers: List[NotificationHandler] = [on_notification] if on_notification else []
+        self._background: Set[asyncio.Task] = set()
+        self._start_lock: Optional[asyncio.Lock] = None
+        # Counters
+        self.starts = 0
+        self.requests = 0
+        self.notifications = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.late_responses = 0
+        self.max_in_flight = 0
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self._process is not None
+            and self._process.returncode is None
+            and self._reader is not None
+            and not self._reader.done()
+        )
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def add_notification_handler(self, handler: NotificationHandler) -> None:
+        self._handlers.append(handler)
+
+    async def start(self) -> None:
+        """Spawn the server and run the ``initialize`` handshake; no-op while alive."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.alive:
+                return
+            await self._stop_process()
+            self._ids = itertools.count(1)
+            self._process = await asyncio.create_subprocess_exec(
+                self.config.command,
+                *self.config.args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                # Nobody reads stderr of a long-lived server; a full pipe would stall it.
+                stderr=asyncio.subprocess.DEVNULL,
+                env={**os.environ, **self.config.env},
+                limit=_READ_LIMIT,
+            )
+            self._reader = asyncio.create_task(self._read_loop(self._process))
+            self.starts += 1
+            try:
+                result = await self.request(
+                    "initialize",
+                    {"protocolVersion": PROTOCOL_VERSION, "capabilities": {}, "clientInfo": CLIENT_INFO},
+                    timeout=self.config.timeout_s,
+                )
+            except MCPRPCError:
+                # Pre-handshake servers answer tools/* directly.
+                result = {}
+            except BaseException:
+                await self._stop_process()
+                raise
+            self.server_info = (result or {}).get("serverInfo", {}) if isinstance(result, dict) else {}
+            await self.notify("notifications/initialized")
+
+    async def request(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Send a request and wait for its response.
+
+        Raises ``MCPRPCError`` for error responses, ``asyncio.TimeoutError``
+        after ``timeout`` seconds and ``ConnectionError`` if the server goes
+        away.  Timed-out and cancelled requests are reported to the server
+        with ``notifications/cancelled``.
+        """
+        if not self.alive:
+            raise ConnectionError(f"MCP server '{self.config.name}' is not running")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self.requests += 1
+        self.max_in_flight = max(self.max_in_flight, len(self._pending))
+        try:
+            await self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}})
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._cancel_remote(request_id, "timeout")
+            raise
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            self._cancel_remote(request_id, "cancelled")
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        message: Dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._send(message)
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        process = self._process
+        if process is None or process.stdin is None:
+            raise ConnectionError(f"MCP server '{self.config.name}' is not running")
+        # One write() per message keeps concurrent senders from interleaving lines.
+        process.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+        await process.stdin.drain()
+
+    def _send_later(self, message: Dict[str, Any]) -> None:
+        if not self.alive:
+            return
+        task = asyncio.ensure_future(self._send(message))
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled():
+            task.exception()  # retrieved so a dead pipe is not logged as unhandled
+
+    def _cancel_remote(self, request_id: int, reason: str) -> None:
+        self._send_later({
+            "jsonrpc": "2.0",
+            "method": "notifications/cancelled",
+            "params": {"requestId": request_id, "reason": reason},
+        })
+
+    async def _read_loop(self, process: asyncio.subprocess.Process) -> None:
+        error: BaseException = ConnectionError(f"MCP server '{self.config.name}' closed its output")
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue  # banners and log lines on stdout
+                for item in message if isinstance(message, list) else [message]:
+                    if isinstance(item, dict):
+                        self._dispatch(item)
+        except (ValueError, OSError) as exc:
+            error = ConnectionError(f"MCP server '{self.config.name}' output unreadable: {exc}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        method = message.get("method")
+        message_id = message.get("id")
+        if method is None:
+            future = self._pending.get(message_id)
+            if future is None or future.done():
+                self.late_responses += 1
+                return
+            error = message.get("error")
+            if error is not None:
+                error = error if isinstance(error, dict) else {"message": str(error)}
+                future.set_exception(MCPRPCError(
+                    error.get("code", -32603), error.get("message", "Unknown error"), error.get("data"),
+                ))
+            else:
+                future.set_result(message.get("result"))
+        elif message_id is None:
+            self.notifications += 1
+            params = message.get("params") or {}
+            for handler in list(self._handlers):
+                try:
+                    handler(method, params)
+                except HANDLED_EXCEPTIONS:
+                    pass
+        elif method == "ping":
+            self._send_later({"jsonrpc": "2.0", "id": message_id, "result": {}})
+        else:
+            self._send_later({
+                "jsonrpc": "2.0",
+                "id": message_id,
+                "error": {"code": -32601, "message": f"Method not supported by client: {method}"},
+            })
+
+    async def _stop_process(self) -> None:
+        process, reader = self._process, self._reader
+        self._process = self._reader = None
+        if process is not None and process.returncode is None:
+            try:
+                process.terminate()
+                await asyncio.wait_for(process.wait(), timeout=5.0)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+            except ProcessLookupError:
+                pass
+        if reader is not None:
+            if not reader.done():
+                reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(f"MCP server '{self.config.name}' stopped"))
+
+    async def close(self) -> None:
+        """Terminate the server and fail any in-flight requests."""
+        await self._stop_process()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "alive": self.alive,
+            "pid": self._process.pid if self._process is not None else None,
+            "starts": self.starts,
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "late_responses": self.late_responses,
+            "notifications": self.notifications,
+        }
+
+
+class MCPClientLoop:
+    """Background event loop thread the MCP clients live on."""
+
+    def __init__(self, name: str = "mcp-aggregator-io"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+                self._loop = loop
+                self._thread.start()
+            return self._loop
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Run ``coro`` on the background loop and block for its result."""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("MCPClientLoop.run() called from its own event loop; await call() instead")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop()).result(timeout)
+
+    async def call(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Await ``coro`` on the background loop from any event loop."""
+        loop = self.loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+            loop.close()
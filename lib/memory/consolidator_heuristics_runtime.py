@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import asyncio
 import json
-import math
 import re
 import sqlite3
 import uuid
@@ -102,22 +101,27 @@ class ConsolidatorHeuristicsRuntimeMixin:
 
         return results
 
-    def apply_decay_to_all(self, batch_size: int = 1000) -> Dict[str, Any]:
+    def apply_decay_to_all(self, batch_size: Optional[int] = None, incremental: bool = True) -> Dict[str, Any]:
         """
         Apply Ebbinghaus decay to all tracked memories.
 
-        This updates importance scores based on time since last access.
+        Runs the vectorized DecayEngine, which stores decayed importance and
+        forgetting flags on memory_importance and, when incremental, only
+        revisits rows changed or newly past the threshold since its last run.
+
+        Args:
+            batch_size: Rows loaded per vectorized chunk (default: engine default)
+            incremental: Reuse the engine's last-run watermark when possible
 
         Returns:
             Dict with decay statistics
         """
+        from .decay_engine import CHUNK_ROWS, DecayEngine
+
         decay_config = self.config.get("decay", {})
         decay_lambda = decay_config.get("lambda", 0.1)
         min_score = decay_config.get("min_score", 0.01)
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         stats = {
             "processed": 0,
             "decayed": 0,
@@ -125,55 +129,12 @@ class ConsolidatorHeuristicsRuntimeMixin:
         }
 
         try:
-            # Get memories with access data
-            cursor.execute("""
-                SELECT memory_id, memory_type, importance_score, last_accessed_at, decay_rate
-                FROM memory_importance
-                WHERE last_accessed_at IS NOT NULL
-                LIMIT ?
-            """, (batch_size,))
-
-            rows = cursor.fetchall()
-            now = datetime.now()
-
-            for row in rows:
-                memory_id, memory_type, importance, last_accessed, decay_rate = row
-
-                if not last_accessed:
-                    continue
-
-                stats["processed"] += 1
-
-                # Calculate hours since access
-                try:
-                    if 'T' in last_accessed:
-                        dt = datetime.fromisoformat(last_accessed.replace('Z', '+00:00'))
-                    else:
-                        dt = datetime.strptime(last_accessed, "%Y-%m-%d %H:%M:%S")
-                    hours = (now - dt.replace(tzinfo=None)).total_seconds() / 3600
-                except (ValueError, TypeError):
-                    hours = 168
-
-                # Calculate decayed importance
-                decay_rate = decay_rate or decay_lambda
-                decay_factor = math.exp(-decay_rate * hours)
-                decayed_importance = importance * decay_factor
-
-                # Check if significantly decayed
-                if decayed_importance < importance * 0.9:
-                    stats["decayed"] += 1
-
-                # Flag for forgetting if below threshold
-                if decayed_importance < min_score:
-                    stats["flagged_for_forget"] += 1
-
-            return stats
-
+            stats.update(DecayEngine(self.db_path, chunk_rows=batch_size or CHUNK_ROWS).run(
+                default_rate=decay_lambda, min_score=min_score, incremental=incremental
+            ))
         except CONSOLIDATOR_ERRORS as e:
             logger.warning("apply_decay_to_all error: %s", e)
-            return stats
-        finally:
-            conn.close()
+        return stats
 
     async def merge_similar_memories(
         self,
@@ -182,7 +143,8 @@ class ConsolidatorHeuristicsRuntimeMixin:
         """
         Merge memories with very high similarity.
 
-        Uses simple text overlap for similarity (could be enhanced with embeddings).
+        Uses simple text overlap for similarity (could be enhanced with embeddings);
+        MinHash signatures are kept in ``memory_signatures`` between runs.
 
         Returns:
             Dict with merge statistics
@@ -207,8 +169,8 @@ class ConsolidatorHeuristicsRuntimeMixin:
 
             observations = cursor.fetchall()
 
-            # Simple similarity grouping (content-based)
-            groups = self._find_similar_groups(observations, threshold)
+            # Content-based grouping over LSH candidates
+            groups = self._find_similar_groups(observations, threshold, conn)
             stats["groups_found"] = len(groups)
 
             # Merge each group
@@ -230,11 +192,36 @@ class ConsolidatorHeuristicsRuntimeMixin:
     def _find_similar_groups(
         self,
         items: List[Tuple],
-        threshold: float
+        threshold: float,
+        conn: Optional[sqlite3.Connection] = None
     ) -> List[List[Tuple]]:
-        """Find groups of similar items based on text overlap."""
+        """
+        Find groups of similar items based on text overlap.
+
+        Greedy seeding is unchanged: each ungrouped item in order collects
+        every later ungrouped item whose ``SequenceMatcher`` ratio reaches
+        ``threshold``.  MinHash/LSH limits the comparisons to bucket
+        collisions; with ``conn`` the signatures are persisted per memory id.
+        """
         from difflib import SequenceMatcher
 
+        from .consolidator_minhash import LSHIndex, MinHasher, SignatureStore, choose_bands, jaccard_floor
+
+        if len(items) < 2:
+            return []
+
+        contents = [(item[1] if len(item) > 1 else "") or "" for item in items]
+        hasher = MinHasher()
+        if conn is not None:
+            keyed = [(str(item[0]), content) for item, content in zip(items, contents)]
+            signatures, recomputed = SignatureStore(conn, hasher).signatures_for(keyed)
+            logger.debug("similarity signatures: %d of %d recomputed", recomputed, len(items))
+        else:
+            signatures = hasher.signatures(contents)
+        floor = jaccard_floor(threshold)
+        index = LSHIndex(signatures, *choose_bands(floor, hasher.num_perm))
+        lengths = [len(content) for content in contents]
+
         groups = []
         used = set()
 
@@ -244,19 +231,28 @@ class ConsolidatorHeuristicsRuntimeMixin:
 
             group = [item1]
             used.add(i)
-
-            for j, item2 in enumerate(items):
-                if j in used or j == i:
+            candidates = [j for j in index.candidates(i) if j > i and j not in used]
+            if candidates:
+                # Signature agreement estimates Jaccard; half the floor leaves
+                # several standard deviations of margin for true matches.
+                agreement = (signatures[candidates] == signatures[i]).mean(axis=1)
+                candidates = [j for j, est in zip(candidates, agreement) if est >= floor / 2]
+            matcher = None
+
+            for j in candidates:
+                if j in used:
                     continue
 
-                # Calculate similarity
-                content1 = item1[1] if len(item1) > 1 else ""
-                content2 = item2[1] if len(item2) > 1 else ""
-
-                similarity = SequenceMatcher(None, content1, content2).ratio()
-
-                if similarity >= threshold:
-                    group.append(item2)
+                # Length-only bound on ratio (real_quick_ratio) before building the matcher.
+                total = lengths[i] + lengths[j]
+                if total and 2.0 * min(lengths[i], lengths[j]) / total < threshold:
+                    continue
+                if matcher is None:
+                    matcher = SequenceMatcher(None, contents[i], "")
+                matcher.set_seq2(contents[j])
+                # quick_ratio is a cheap upper bound of ratio.
+                if matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold:
+                    group.append(items[j])
                     used.add(j)
 
             if len(group) >= 2:
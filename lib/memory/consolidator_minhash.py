@@ -0,0 +1,203 @@
+"""
+MinHash/LSH near-duplicate candidates for memory consolidation.
+
+Texts are reduced to character shingles, summarised as MinHash signatures
+and bucketed by LSH bands.  Only items that share a bucket become candidate
+pairs, so grouping no longer compares every memory against every other one;
+the caller still verifies each candidate with its exact similarity measure.
+
+Signatures are persisted in ``memory_signatures`` keyed by memory id and
+content hash, so nightly runs only hash new or edited memories.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SHINGLE_SIZE = 4
+DEFAULT_NUM_PERM = 128
+DEFAULT_SEED = 1
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_WHITESPACE = re.compile(r"\s+")
+
+SIGNATURE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS memory_signatures (
+        memory_id TEXT PRIMARY KEY,
+        content_hash TEXT NOT NULL,
+        params TEXT NOT NULL,
+        signature BLOB NOT NULL,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lowercase and collapse whitespace so formatting noise does not split buckets."""
+    return _WHITESPACE.sub(" ", (text or "").lower()).strip()
+
+
+def shingle_hashes(text: Optional[str], size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Stable 32-bit hashes of the character shingles of ``text``."""
+    norm = normalize_text(text)
+    if not norm:
+        return np.empty(0, dtype=np.uint64)
+    if len(norm) <= size:
+        grams = {norm}
+    else:
+        grams = {norm[i:i + size] for i in range(len(norm) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def content_hash(text: Optional[str]) -> str:
+    return hashlib.blake2b((text or "").encode("utf-8"), digest_size=16).hexdigest()
+
+
+def jaccard_floor(ratio_threshold: float, shingle_size: int = SHINGLE_SIZE) -> float:
+    """
+    Shingle Jaccard expected for a pair right at ``ratio_threshold`` under
+    ``SequenceMatcher``, with some margin.  An edited fraction ``e`` of the
+    text breaks up to ``shingle_size * e`` of the shingles on each side, so
+    Jaccard is roughly ``(1 - k*e) / (1 + k*e)``.
+    """
+    broken = min(1.0, shingle_size * (1.0 - ratio_threshold))
+    return max(0.2, 0.85 * (1.0 - broken) / (1.0 + broken))
+
+
+def choose_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) whose LSH S-curve knee ``(1/b)**(1/r)`` sits at or
+    just below ``threshold``; erring low trades a few extra candidates for
+    recall.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if bands < 1:
+            break
+        if (1.0 / bands) ** (1.0 / rows) <= threshold:
+            best = (bands, rows)
+        else:
+            break
+    return best
+
+
+class MinHasher:
+    """MinHash signatures from universal hashing ``(a*x + b) mod p``."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = DEFAULT_SEED, shingle_size: int = SHINGLE_SIZE):
+        self.num_perm = num_perm
+        self.seed = seed
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # a, x < 2**32 keeps a*x inside uint64.
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    @property
+    def params(self) -> str:
+        """Identifies signatures produced by this configuration."""
+        return f"v1:{self.num_perm}:{self.seed}:{self.shingle_size}"
+
+    def signature(self, text: Optional[str]) -> np.ndarray:
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not hashes.size:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+    def signatures(self, texts: Iterable[Optional[str]]) -> np.ndarray:
+        rows = [self.signature(text) for text in texts]
+        if not rows:
+            return np.empty((0, self.num_perm), dtype=np.uint32)
+        return np.vstack(rows)
+
+
+class LSHIndex:
+    """Band the signature matrix and expose each row's bucket-mates."""
+
+    def __init__(self, signatures: np.ndarray, bands: int, rows: int):
+        self.size = signatures.shape[0]
+        # Per row: ids of the non-singleton buckets it belongs to.
+        self._row_buckets: List[List[int]] = [[] for _ in range(self.size)]
+        self._members: List[np.ndarray] = []
+        if self.size < 2:
+            return
+        mixer = np.random.RandomState(bands * 1000 + rows).randint(1, 1 << 62, size=rows, dtype=np.uint64)
+        for band in range(bands):
+            chunk = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+            # Wrapping multiply-add folds the band into one key; key collisions
+            # only add candidates, which the caller verifies anyway.
+            keys = (chunk * mixer).sum(axis=1)
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            ends = np.r_[starts[1:], self.size]
+            for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+                bucket_id = len(self._members)
+                members = order[start:end]
+                self._members.append(members)
+                for row in members.tolist():
+                    self._row_buckets[row].append(bucket_id)
+
+    def candidates(self, row: int) -> List[int]:
+        """Rows sharing at least one band bucket with ``row``, ascending."""
+        buckets = self._row_buckets[row]
+        if not buckets:
+            return []
+        if len(buckets) == 1:
+            found = self._members[buckets[0]]
+        else:
+            found = np.unique(np.concatenate([self._members[b] for b in buckets]))
+        return sorted(int(r) for r in found if r != row)
+
+
+class SignatureStore:
+    """Persisted MinHash signatures keyed by memory id and content hash."""
+
+    def __init__(self, conn: sqlite3.Connection, hasher: MinHasher):
+        self.conn = conn
+        self.hasher = hasher
+        conn.execute(SIGNATURE_SCHEMA)
+
+    def signatures_for(self, items: Sequence[Tuple[str, Optional[str]]]) -> Tuple[np.ndarray, int]:
+        """
+        Signature matrix for ``(memory_id, content)`` pairs.
+
+        Reuses stored rows whose content hash and params still match and
+        writes back the rest.  Returns the matrix and the number recomputed.
+        """
+        params = self.hasher.params
+        stored: Dict[str, Tuple[str, bytes]] = {}
+        ids = [item[0] for item in items]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT memory_id, content_hash, signature FROM memory_signatures "
+                f"WHERE params = ? AND memory_id IN ({','.join('?' * len(chunk))})",
+                [params, *chunk],
+            )
+            stored.update((row[0], (row[1], row[2])) for row in rows)
+
+        matrix = np.empty((len(items), self.hasher.num_perm), dtype=np.uint32)
+        updates = []
+        for i, (memory_id, text) in enumerate(items):
+            digest = content_hash(text)
+            cached = stored.get(memory_id)
+            if cached and cached[0] == digest:
+                matrix[i] = np.frombuffer(cached[1], dtype=np.uint32)
+                continue
+            matrix[i] = self.hasher.signature(text)
+            updates.append((memory_id, digest, params, matrix[i].tobytes()))
+        if updates:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO memory_signatures (memory_id, content_hash, params, signature, updated_at) "
+                "VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)",
+                updates,
+            )
+        return matrix, len(updates)
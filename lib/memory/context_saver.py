@@ -99,9 +99,36 @@ def main():
         action="store_true",
         help="Suppress output"
     )
+    parser.add_argument(
+        "--bulk",
+        type=Path,
+        nargs="?",
+        const=Path.home() / ".claude" / "projects",
+        help="Archive every session under a directory (default: ~/.claude/projects)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Parser processes for --bulk (default: CPU count)"
+    )
 
     args = parser.parse_args()
 
+    if args.bulk:
+        from .context_saver_bulk import BulkArchiver
+
+        def report(stats) -> None:
+            if not args.quiet:
+                data = stats.to_dict()
+                _emit(f"  {stats.processed}/{stats.discovered} files, "
+                      f"{data['files_per_s']} files/s, {data['mb_per_s']} MB/s", err=True)
+
+        saver = ContextSaver(archive_dir=args.output_dir)
+        stats = BulkArchiver(saver, workers=args.workers, force=args.force, progress=report).run([args.bulk])
+        if not args.quiet:
+            _emit(json.dumps(stats.to_dict(), ensure_ascii=False))
+        sys.exit(1 if stats.failed else 0)
+
     # Determine session path
     session_path = args.session
     if not session_path:
@@ -0,0 +1,271 @@
+"""
+Bulk, resumable session archiving for ContextSaver.
+
+Session files are parsed in a process pool (``SessionDigestSink`` keeps each
+result small enough to ship back cheaply) and written by a single SQLite
+writer in batched transactions.  Every processed file is recorded in
+``session_archive_ledger`` with its size, mtime and content hash:
+
+- same size and mtime as the ledger: skipped without reading the file
+- changed stat but same content hash: ledger refreshed, not re-archived
+- otherwise: parsed and archived (or marked trivial/failed)
+
+The ledger is committed with each batch, so an interrupted backfill resumes
+where it stopped.
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory.context_saver_core import ARCHIVE_INSERT_SQL
+from memory.jsonl_parser import ClaudeJsonlParser
+from memory.session_digest import SessionDigest, SessionDigestSink
+
+try:
+    from lib.common.logging import get_logger
+except ImportError:  # pragma: no cover - script mode
+    try:
+        from common.logging import get_logger  # type: ignore
+    except ImportError:  # pragma: no cover - fallback
+        import logging
+
+        def get_logger(name: str):
+            return logging.getLogger(name)
+
+
+logger = get_logger("memory.context_saver_bulk")
+
+HASH_CHUNK_SIZE = 1 << 20
+
+LEDGER_UPSERT_SQL = """
+    INSERT OR REPLACE INTO session_archive_ledger
+        (path, size, mtime, content_hash, status, archive_id, error, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+
+@dataclass
+class FileResult:
+    """Outcome of processing one session file in a worker."""
+    path: str
+    size: int
+    mtime: float
+    content_hash: str = ""
+    digest: Optional[SessionDigest] = None
+    unchanged: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkArchiveStats:
+    """Progress counters for a bulk run."""
+    discovered: int = 0
+    skipped_unchanged: int = 0
+    archived: int = 0
+    trivial: int = 0
+    failed: int = 0
+    bytes_parsed: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        return self.skipped_unchanged + self.archived + self.trivial + self.failed
+
+    def to_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        elapsed = self.elapsed_s or 1e-9
+        data["files_per_s"] = round(self.processed / elapsed, 1)
+        data["mb_per_s"] = round(self.bytes_parsed / 1024 / 1024 / elapsed, 1)
+        return data
+
+
+def hash_file(path: Path) -> str:
+    """BLAKE2b content hash of a file, read in chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        while True:
+            chunk = handle.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_worker_parser: Optional[ClaudeJsonlParser] = None
+
+
+def process_session_file(path: str, known_hash: Optional[str] = None) -> FileResult:
+    """Hash and digest one session file; runs in a pool worker."""
+    global _worker_parser
+    try:
+        st = os.stat(path)
+        result = FileResult(path=path, size=st.st_size, mtime=st.st_mtime)
+        result.content_hash = hash_file(Path(path))
+        if known_hash and result.content_hash == known_hash:
+            result.unchanged = True
+            return result
+        if _worker_parser is None:
+            _worker_parser = ClaudeJsonlParser()
+        sink = SessionDigestSink()
+        _worker_parser.stream(Path(path), sink)
+        result.digest = sink.digest
+        return result
+    except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError) as e:
+        return FileResult(path=path, size=0, mtime=0.0, error=f"{type(e).__name__}: {e}")
+
+
+class BulkArchiver:
+    """Archive many session files in parallel through one batched writer."""
+
+    def __init__(
+        self,
+        saver,
+        workers: Optional[int] = None,
+        batch_size: int = 200,
+        force: bool = False,
+        progress: Optional[Callable[[BulkArchiveStats], None]] = None,
+        progress_every: int = 500,
+    ):
+        self.saver = saver
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.batch_size = max(1, batch_size)
+        self.force = force
+        self.progress = progress
+        self.progress_every = max(1, progress_every)
+
+    def discover(self, root: Path) -> Iterator[Path]:
+        """All ``*.jsonl`` session files below ``root``."""
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for name in filenames:
+                if name.endswith(".jsonl") and not name.startswith("."):
+                    yield Path(dirpath) / name
+
+    def _load_ledger(self, conn: sqlite3.Connection) -> Dict[str, tuple]:
+        """path -> (size, mtime, content_hash, status, archive_id)"""
+        rows = conn.execute(
+            "SELECT path, size, mtime, content_hash, status, archive_id FROM session_archive_ledger"
+        )
+        return {row[0]: row[1:] for row in rows}
+
+    def run(self, sources: Iterable[Path]) -> BulkArchiveStats:
+        """
+        Archive session files from ``sources`` (directories are walked).
+
+        Returns the run's counters; the ledger makes repeated calls cheap.
+        """
+        stats = BulkArchiveStats()
+        started = time.perf_counter()
+        conn = sqlite3.connect(self.saver.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        ledger = self._load_ledger(conn)
+
+        archive_rows: List[tuple] = []
+        ledger_rows: List[tuple] = []
+
+        def flush() -> None:
+            if not archive_rows and not ledger_rows:
+                return
+            with conn:
+                if archive_rows:
+                    conn.executemany(ARCHIVE_INSERT_SQL, archive_rows)
+                conn.executemany(LEDGER_UPSERT_SQL, ledger_rows)
+            archive_rows.clear()
+            ledger_rows.clear()
+
+        def record(result: FileResult) -> None:
+            if result.error:
+                stats.failed += 1
+                ledger_rows.append((result.path, result.size, result.mtime, "", "failed", None, result.error))
+                logger.warning("Bulk archive failed for %s: %s", result.path, result.error)
+            elif result.unchanged:
+                stats.skipped_unchanged += 1
+                _, _, _, status, archive_id = ledger[result.path]
+                ledger_rows.append(
+                    (result.path, result.size, result.mtime, result.content_hash, status, archive_id, None)
+                )
+            else:
+                stats.bytes_parsed += result.size
+                digest = result.digest
+                if not self.force and digest.session.message_count < 2:
+                    stats.trivial += 1
+                    ledger_rows.append(
+                        (result.path, result.size, result.mtime, result.content_hash, "trivial", None, None)
+                    )
+                else:
+                    stats.archived += 1
+                    archive_id = str(uuid.uuid4())
+                    archive_rows.append(self.saver._archive_row(digest, archive_id))
+                    ledger_rows.append(
+                        (result.path, result.size, result.mtime, result.content_hash, "archived", archive_id, None)
+                    )
+            if len(ledger_rows) >= self.batch_size:
+                flush()
+            if self.progress and stats.processed % self.progress_every == 0:
+                stats.elapsed_s = time.perf_counter() - started
+                self.progress(stats)
+
+        def todo() -> Iterator[Tuple[str, Optional[str]]]:
+            seen: Set[str] = set()
+            for source in sources:
+                source = Path(source)
+                paths = self.discover(source) if source.is_dir() else [source]
+                for path in paths:
+                    key = str(path)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    stats.discovered += 1
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    known = ledger.get(key)
+                    if known and known[0] == st.st_size and known[1] == st.st_mtime:
+                        stats.skipped_unchanged += 1
+                        continue
+                    # Failed files are retried from scratch.
+                    yield key, known[2] if known and known[3] != "failed" else None
+
+        try:
+            if self.workers <= 1:
+                for path, known_hash in todo():
+                    record(process_session_file(path, known_hash))
+            else:
+                self._run_pool(todo(), record)
+        finally:
+            flush()
+            conn.close()
+            stats.elapsed_s = time.perf_counter() - started
+
+        logger.info("Bulk archive finished: %s", stats.to_dict())
+        return stats
+
+    def _run_pool(self, jobs: Iterator[Tuple[str, Optional[str]]], record: Callable[[FileResult], None]) -> None:
+        """Keep a bounded number of files in flight and hand results to ``record``."""
+        max_in_flight = self.workers * 4
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        in_flight: Set[Future] = set()
+        try:
+            for path, known_hash in jobs:
+                in_flight.add(executor.submit(process_session_file, path, known_hash))
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(future.result())
+            for future in wait(in_flight).done:
+                record(future.result())
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
@@ -13,6 +13,7 @@ from typing import Any, Dict, List, Optional
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from memory.jsonl_parser import ClaudeJsonlParser, Message, SessionData, ToolCall
+from memory.session_digest import SessionDigest, SessionDigestSink
 
 try:
     from lib.common.logging import get_logger
@@ -28,6 +29,14 @@ except ImportError:  # pragma: no cover - script mode
 
 logger = get_logger("memory.context_saver")
 
+ARCHIVE_INSERT_SQL = """
+    INSERT OR REPLACE INTO session_archives (
+        archive_id, session_id, user_id, project_path, git_branch, model,
+        start_time, end_time, duration_minutes, message_count, tool_call_count,
+        task_summary, key_messages, tool_usage, file_changes, learnings, metadata
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class ContextSaverCoreMixin:
     """Mixin methods extracted from ContextSaver."""
@@ -83,6 +92,20 @@ class ContextSaverCoreMixin:
             ON session_archives(project_path)
         """)
 
+        # Bulk archiving ledger: what was seen per file, so re-runs skip it
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS session_archive_ledger (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                content_hash TEXT NOT NULL,
+                status TEXT NOT NULL,  -- archived | trivial | failed
+                archive_id TEXT,
+                error TEXT,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
         conn.commit()
         conn.close()
 
@@ -102,89 +125,94 @@ class ContextSaverCoreMixin:
             return None
 
         try:
-            session = self.parser.parse(session_path)
+            digest = self._digest_session(session_path)
         except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError, json.JSONDecodeError) as e:
             logger.warning("Error parsing session: %s", e)
             return None
 
         # Skip trivial sessions (less than 2 meaningful messages)
-        if not force and len(session.messages) < 2:
+        if not force and digest.session.message_count < 2:
             return None
 
         # Save to database
-        archive_id = self._save_to_database(session)
+        archive_id = self._save_digest(digest)
         return archive_id
 
+    def _digest_session(self, session_path: Path) -> SessionDigest:
+        """Stream a session file into its archive digest without keeping every message."""
+        sink = SessionDigestSink()
+        self.parser.stream(session_path, sink)
+        return sink.digest
+
     def _save_to_database(self, session: SessionData) -> str:
         """Save session data to SQLite database."""
+        session.message_count = len(session.messages)
+        session.tool_call_count = len(session.tool_calls)
+        return self._save_digest(SessionDigestSink.from_session(session))
+
+    def _archive_row(self, digest: SessionDigest, archive_id: str) -> tuple:
+        """Build the session_archives row for a digest."""
+        session = digest.session
+        duration = self.parser.get_session_duration(session)
+
+        # Convert to JSON
+        key_messages_json = json.dumps([
+            {
+                'role': m.role,
+                'content': self._truncate_content(m.content, 1000),
+                'timestamp': m.timestamp
+            }
+            for m in digest.key_messages
+        ], ensure_ascii=False)
+
+        file_changes_json = json.dumps([
+            {'path': fc.file_path, 'action': fc.action}
+            for fc in session.file_changes[:50]
+        ], ensure_ascii=False)
+
+        # Calculate duration in minutes
+        duration_minutes = 0
+        if duration:
+            # Parse duration string like "45 分钟" or "1 小时 30 分钟"
+            hours_match = re.search(r'(\d+)\s*小时', duration)
+            mins_match = re.search(r'(\d+)\s*分', duration)
+            if hours_match:
+                duration_minutes += int(hours_match.group(1)) * 60
+            if mins_match:
+                duration_minutes += int(mins_match.group(1))
+
+        return (
+            archive_id,
+            session.session_id,
+            'default',
+            session.project_path,
+            session.git_branch,
+            session.model,
+            session.start_time,
+            session.end_time,
+            duration_minutes,
+            session.message_count,
+            session.tool_call_count,
+            digest.task_summary,
+            key_messages_json,
+            json.dumps(digest.tool_summary, ensure_ascii=False),
+            file_changes_json,
+            json.dumps(digest.learnings, ensure_ascii=False),
+            json.dumps({
+                'file_count': len(session.file_changes),
+                'source_file': str(session.session_id)
+            }, ensure_ascii=False)
+        )
+
+    def _save_digest(self, digest: SessionDigest) -> str:
+        """Write a session digest to the SQLite database."""
         archive_id = str(uuid.uuid4())
 
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
         try:
-            # Extract structured data
-            task_summary = self._extract_task_summary(session)
-            key_messages = self._extract_key_messages(session)
-            tool_summary = self.parser.get_tool_summary(session.tool_calls)
-            learnings = self._extract_learnings(session)
-            duration = self.parser.get_session_duration(session)
-
-            # Convert to JSON
-            key_messages_json = json.dumps([
-                {
-                    'role': m.role,
-                    'content': self._truncate_content(m.content, 1000),
-                    'timestamp': m.timestamp
-                }
-                for m in key_messages
-            ], ensure_ascii=False)
-
-            file_changes_json = json.dumps([
-                {'path': fc.file_path, 'action': fc.action}
-                for fc in session.file_changes[:50]
-            ], ensure_ascii=False)
-
-            # Calculate duration in minutes
-            duration_minutes = 0
-            if duration:
-                # Parse duration string like "45 分钟" or "1 小时 30 分钟"
-                import re
-                hours_match = re.search(r'(\d+)\s*小时', duration)
-                mins_match = re.search(r'(\d+)\s*分', duration)
-                if hours_match:
-                    duration_minutes += int(hours_match.group(1)) * 60
-                if mins_match:
-                    duration_minutes += int(mins_match.group(1))
-
-            cursor.execute("""
-                INSERT OR REPLACE INTO session_archives (
-                    archive_id, session_id, user_id, project_path, git_branch, model,
-                    start_time, end_time, duration_minutes, message_count, tool_call_count,
-                    task_summary, key_messages, tool_usage, file_changes, learnings, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                archive_id,
-                session.session_id,
-                'default',
-                session.project_path,
-                session.git_branch,
-                session.model,
-                session.start_time,
-                session.end_time,
-                duration_minutes,
-                len(session.messages),
-                len(session.tool_calls),
-                task_summary,
-                key_messages_json,
-                json.dumps(tool_summary, ensure_ascii=False),
-                file_changes_json,
-                json.dumps(learnings, ensure_ascii=False),
-                json.dumps({
-                    'file_count': len(session.file_changes),
-                    'source_file': str(session.session_id)
-                }, ensure_ascii=False)
-            ))
+            cursor.execute(ARCHIVE_INSERT_SQL, self._archive_row(digest, archive_id))
 
             conn.commit()
             logger.info("Session archived to database: %s", archive_id[:8])
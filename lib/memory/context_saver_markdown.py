@@ -13,6 +13,7 @@ from typing import Any, Dict, List, Optional
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from memory.jsonl_parser import ClaudeJsonlParser, Message, SessionData, ToolCall
+from memory.session_digest import SessionDigest, SessionDigestSink
 
 try:
     from lib.common.logging import get_logger
@@ -34,6 +35,15 @@ class ContextSaverMarkdownMixin:
 
     def _generate_markdown(self, session: SessionData) -> str:
         """Generate Markdown content from parsed session data."""
+        return self._render_markdown(SessionDigestSink.from_session(session))
+
+    def generate_markdown_for(self, session_path: Path) -> str:
+        """Stream a session file straight into its Markdown summary."""
+        return self._render_markdown(self._digest_session(session_path))
+
+    def _render_markdown(self, digest: SessionDigest) -> str:
+        """Render a session digest as Markdown."""
+        session = digest.session
         lines = []
 
         # Header
@@ -60,14 +70,14 @@ class ContextSaverMarkdownMixin:
         lines.append("")
 
         # Task Summary
-        task_summary = self._extract_task_summary(session)
+        task_summary = digest.task_summary
         if task_summary:
             lines.append("## 任务摘要")
             lines.append(task_summary)
             lines.append("")
 
         # Key Conversations
-        key_messages = self._extract_key_messages(session)
+        key_messages = digest.key_messages
         if key_messages:
             lines.append("## 关键对话")
             lines.append("")
@@ -87,7 +97,7 @@ class ContextSaverMarkdownMixin:
                 lines.append("")
 
         # Tool Usage Summary
-        tool_summary = self.parser.get_tool_summary(session.tool_calls)
+        tool_summary = digest.tool_summary
         if tool_summary:
             lines.append("## 工具调用")
             for tool, count in sorted(tool_summary.items(), key=lambda x: -x[1]):
@@ -105,7 +115,7 @@ class ContextSaverMarkdownMixin:
             lines.append("")
 
         # Learnings (extracted from thinking or conversation patterns)
-        learnings = self._extract_learnings(session)
+        learnings = digest.learnings
         if learnings:
             lines.append("## 学到的知识")
             for learning in learnings:
@@ -120,83 +130,19 @@ class ContextSaverMarkdownMixin:
 
     def _extract_task_summary(self, session: SessionData) -> str:
         """Extract a brief task summary from the first user message."""
-        for msg in session.messages:
-            if msg.role == "user" and len(msg.content) > 10:
-                # Take first sentence or first 200 chars
-                content = msg.content.strip()
-                first_sentence = re.split(r'[。.!?！？\n]', content)[0]
-                if len(first_sentence) > 200:
-                    first_sentence = first_sentence[:200] + "..."
-                return first_sentence
-
-        return ""
+        return SessionDigestSink.from_session(session).task_summary
 
     def _extract_key_messages(self, session: SessionData, max_messages: int = 8) -> List[Message]:
         """Select the most important messages from the session."""
-        key_messages = []
-
-        # Always include first user message
-        for msg in session.messages:
-            if msg.role == "user":
-                key_messages.append(msg)
-                break
-
-        # Include messages with substantial content
+        sink = SessionDigestSink(max_key_messages=max_messages)
         for msg in session.messages:
-            if msg in key_messages:
-                continue
-
-            # Skip very short messages
-            if len(msg.content) < 50:
-                continue
-
-            # Prioritize user messages
-            if msg.role == "user":
-                key_messages.append(msg)
-            # Include assistant messages with code blocks or structured content
-            elif msg.role == "assistant":
-                if '```' in msg.content or '##' in msg.content or len(msg.content) > 300:
-                    key_messages.append(msg)
-
-            if len(key_messages) >= max_messages:
-                break
-
-        # Sort by timestamp
-        key_messages.sort(key=lambda m: m.timestamp)
-
-        return key_messages
+            sink.on_message(session, msg)
+        sink.finish(session)
+        return sink.digest.key_messages
 
     def _extract_learnings(self, session: SessionData) -> List[str]:
         """Extract insights and learnings from the session."""
-        learnings = []
-
-        # Look for patterns in assistant messages
-        learning_patterns = [
-            r'(?:发现|原来|注意到)[：:]\s*(.+?)(?:\n|$)',
-            r'(?:这是因为|原因是)[：:]\s*(.+?)(?:\n|$)',
-            r'(?:学到|明白了)[：:]\s*(.+?)(?:\n|$)',
-            r'(?:关键点|要点)[：:]\s*(.+?)(?:\n|$)',
-        ]
-
-        for msg in session.messages:
-            if msg.role != "assistant":
-                continue
-
-            for pattern in learning_patterns:
-                matches = re.findall(pattern, msg.content, re.IGNORECASE)
-                for match in matches[:2]:  # Max 2 per pattern
-                    if len(match) > 20 and len(match) < 200:
-                        learnings.append(match.strip())
-
-        # Deduplicate
-        seen = set()
-        unique = []
-        for l in learnings:
-            if l not in seen:
-                seen.add(l)
-                unique.append(l)
-
-        return unique[:5]  # Max 5 learnings
+        return SessionDigestSink.from_session(session).learnings
 
     def _format_timestamp(self, ts: str) -> str:
         """Format ISO timestamp to readable format."""
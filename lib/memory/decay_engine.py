@@ -0,0 +1,271 @@
+"""
+Columnar Ebbinghaus decay for ``memory_importance``.
+
+The tracked memories are loaded in rowid chunks into NumPy columns and
+recency, decayed importance and the forgetting flag are computed in one
+vectorized pass per chunk, then written back with ``executemany``.
+
+Access times are kept as epoch seconds in ``last_accessed_ts`` next to the
+ISO ``last_accessed_at`` string; triggers keep the two in sync and clear
+``decay_ts`` whenever access time, importance or rate change.  Because
+decay is a closed-form function of time, each row also stores
+``forget_at_ts``, the moment its decayed importance crosses ``min_score``.
+An incremental run therefore only touches rows that changed since the last
+run plus rows whose crossing time has passed, instead of rescanning every
+tracked memory.
+
+Epoch seconds use the same naive local clock as the ISO strings written by
+``datetime.now().isoformat()``, so hour deltas match the old Python loop.
+"""
+from __future__ import annotations
+
+import math
+import sqlite3
+import time
+from datetime import datetime
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+DEFAULT_DECAY_RATE = 0.1
+DEFAULT_MIN_SCORE = 0.01
+# Hours assumed for timestamps SQLite cannot parse (matches the old loop).
+UNPARSEABLE_AGE_HOURS = 168.0
+# Decayed below this share of the stored importance counts as "decayed".
+DECAYED_RATIO = 0.9
+CHUNK_ROWS = 250_000
+
+_EPOCH_SQL = "(julianday({col}) - 2440587.5) * 86400.0"
+
+DECAY_COLUMNS = (
+    ("last_accessed_ts", "REAL"),
+    ("decayed_score", "REAL"),
+    ("decay_ts", "REAL"),
+    ("forget_at_ts", "REAL"),
+    ("forget_flag", "INTEGER DEFAULT 0"),
+)
+
+DECAY_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS memory_decay_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        last_run_ts REAL NOT NULL,
+        default_rate REAL NOT NULL,
+        min_score REAL NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_importance_decay_pending
+        ON memory_importance(decay_ts) WHERE decay_ts IS NULL;
+    CREATE INDEX IF NOT EXISTS idx_importance_forget_at
+        ON memory_importance(forget_at_ts) WHERE forget_flag = 0;
+    CREATE INDEX IF NOT EXISTS idx_importance_forget_flagged
+        ON memory_importance(forget_flag) WHERE forget_flag = 1;
+
+    CREATE TRIGGER IF NOT EXISTS memory_importance_decay_insert
+    AFTER INSERT ON memory_importance
+    BEGIN
+        UPDATE memory_importance
+        SET last_accessed_ts = {_EPOCH_SQL.format(col="NEW.last_accessed_at")}
+        WHERE rowid = NEW.rowid;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS memory_importance_decay_touch
+    AFTER UPDATE OF last_accessed_at, importance_score, decay_rate ON memory_importance
+    BEGIN
+        UPDATE memory_importance
+        SET last_accessed_ts = {_EPOCH_SQL.format(col="NEW.last_accessed_at")},
+            decay_ts = NULL
+        WHERE rowid = NEW.rowid;
+    END;
+"""
+
+_SELECT = """
+    SELECT rowid, IFNULL(last_accessed_ts, -1.0), IFNULL(decay_rate, 0.0),
+           IFNULL(importance_score, 0.5), IFNULL(forget_flag, 0)
+    FROM memory_importance
+"""
+
+_WRITE_BACK = """
+    UPDATE memory_importance
+    SET decayed_score = ?, decay_ts = ?, forget_at_ts = ?, forget_flag = ?
+    WHERE rowid = ?
+"""
+
+
+def naive_now_ts() -> float:
+    """Epoch seconds of local wall-clock time, comparable to ``last_accessed_ts``."""
+    return (datetime.now() - datetime(1970, 1, 1)).total_seconds()
+
+
+def ensure_decay_schema(conn: sqlite3.Connection) -> bool:
+    """
+    Add the decay columns, indexes and triggers to ``memory_importance``.
+
+    Backfills ``last_accessed_ts`` the first time the column appears.
+    Returns False when the table does not exist yet.
+    """
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(memory_importance)")}
+    if not existing:
+        return False
+    added = False
+    for name, decl in DECAY_COLUMNS:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE memory_importance ADD COLUMN {name} {decl}")
+            added = True
+    if added or "last_accessed_ts" not in existing:
+        conn.execute(
+            f"UPDATE memory_importance SET last_accessed_ts = {_EPOCH_SQL.format(col='last_accessed_at')} "
+            "WHERE last_accessed_at IS NOT NULL AND last_accessed_ts IS NULL"
+        )
+    conn.executescript(DECAY_SCHEMA)
+    return True
+
+
+class DecayEngine:
+    """Vectorized decay and forgetting pass over ``memory_importance``."""
+
+    def __init__(self, db_path: Union[str, Path], chunk_rows: int = CHUNK_ROWS):
+        self.db_path = str(db_path)
+        self.chunk_rows = max(1, int(chunk_rows))
+
+    def run(
+        self,
+        default_rate: float = DEFAULT_DECAY_RATE,
+        min_score: float = DEFAULT_MIN_SCORE,
+        incremental: bool = True,
+        now: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Recompute decay and persist forgetting flags.
+
+        Args:
+            default_rate: Per-hour λ for rows without their own ``decay_rate``
+            min_score: Decayed importance below this flags a memory for forgetting
+            incremental: Only revisit changed rows and rows whose crossing time
+                has passed since the last run; falls back to a full pass when
+                there is no watermark or the parameters changed
+            now: Epoch seconds on the naive local clock (default: now)
+
+        Returns:
+            Dict with processed, decayed and flagged_for_forget for the rows
+            revisited in this run, plus newly_flagged, total_flagged, mode and
+            elapsed_s
+        """
+        started = time.perf_counter()
+        now = naive_now_ts() if now is None else float(now)
+        stats: Dict[str, Any] = {
+            "processed": 0,
+            "decayed": 0,
+            "flagged_for_forget": 0,
+            "newly_flagged": 0,
+            "total_flagged": 0,
+            "mode": "full",
+        }
+        conn = sqlite3.connect(self.db_path)
+        try:
+            if not ensure_decay_schema(conn):
+                conn.commit()
+                return stats
+            state = conn.execute(
+                "SELECT last_run_ts, default_rate, min_score FROM memory_decay_state WHERE id = 1"
+            ).fetchone()
+            if incremental and state and state[1] == default_rate and state[2] == min_score and now >= state[0]:
+                stats["mode"] = "incremental"
+                # Rows edited since the watermark, then rows that crossed min_score.
+                self._pass(conn, stats, now, default_rate, min_score,
+                           "WHERE decay_ts IS NULL AND last_accessed_at IS NOT NULL", ())
+                self._pass(conn, stats, now, default_rate, min_score,
+                           "WHERE forget_flag = 0 AND forget_at_ts <= ?", (now,))
+            else:
+                self._full_pass(conn, stats, now, default_rate, min_score)
+            conn.execute(
+                "INSERT OR REPLACE INTO memory_decay_state (id, last_run_ts, default_rate, min_score) "
+                "VALUES (1, ?, ?, ?)",
+                (now, default_rate, min_score),
+            )
+            stats["total_flagged"] = conn.execute(
+                "SELECT COUNT(*) FROM memory_importance WHERE forget_flag = 1"
+            ).fetchone()[0]
+            conn.commit()
+        finally:
+            conn.close()
+        stats["elapsed_s"] = round(time.perf_counter() - started, 3)
+        return stats
+
+    def _full_pass(self, conn: sqlite3.Connection, stats: Dict[str, Any], now: float,
+                   default_rate: float, min_score: float) -> None:
+        last_rowid = 0
+        while True:
+            rows = conn.execute(
+                f"{_SELECT} WHERE rowid > ? AND last_accessed_at IS NOT NULL ORDER BY rowid LIMIT ?",
+                (last_rowid, self.chunk_rows),
+            ).fetchall()
+            if not rows:
+                return
+            last_rowid = rows[-1][0]
+            self._apply(conn, stats, rows, now, default_rate, min_score)
+            conn.commit()
+
+    def _pass(self, conn: sqlite3.Connection, stats: Dict[str, Any], now: float,
+              default_rate: float, min_score: float, where: str, params: tuple) -> None:
+        # Each chunk is written back before the next SELECT, so the rows it
+        # handled drop out of the filter and LIMIT alone pages through.
+        while True:
+            rows = conn.execute(f"{_SELECT} {where} LIMIT ?", (*params, self.chunk_rows)).fetchall()
+            if not rows:
+                return
+            self._apply(conn, stats, rows, now, default_rate, min_score)
+            conn.commit()
+            if len(rows) < self.chunk_rows:
+                return
+
+    @staticmethod
+    def compute(columns: np.ndarray, now: float, default_rate: float, min_score: float) -> Dict[str, np.ndarray]:
+        """
+        Decay for an ``(n, 5)`` array of rowid, access ts, rate, importance, flag.
+
+        ``access ts < 0`` marks an unparseable timestamp and ``rate <= 0`` the
+        default rate, mirroring the ``or`` fallbacks of the old loop.
+        """
+        accessed = columns[:, 1]
+        rate = np.where(columns[:, 2] > 0, columns[:, 2], default_rate)
+        importance = columns[:, 3]
+        anchor = np.where(accessed >= 0, accessed, now - UNPARSEABLE_AGE_HOURS * 3600.0)
+        hours = (now - anchor) / 3600.0
+        recency = np.exp(-rate * hours)
+        decayed = importance * recency
+        if min_score > 0:
+            with np.errstate(divide="ignore"):
+                headroom = np.log(np.maximum(importance, 0.0) / min_score)
+            forget_at = anchor + np.maximum(headroom, 0.0) * 3600.0 / rate
+        else:
+            forget_at = np.full(len(columns), math.inf)
+        forget = decayed < min_score
+        # Keep unflagged rows strictly in the future so rounding at the
+        # boundary cannot pull them back into the next incremental pass.
+        forget_at = np.where(forget, forget_at, np.maximum(forget_at, np.nextafter(now, math.inf)))
+        return {
+            "recency": recency,
+            "decayed": decayed,
+            "forget": forget,
+            "forget_at": forget_at,
+            "significant": decayed < importance * DECAYED_RATIO,
+        }
+
+    def _apply(self, conn: sqlite3.Connection, stats: Dict[str, Any], rows: list, now: float,
+               default_rate: float, min_score: float) -> None:
+        columns = np.array(rows, dtype=np.float64)
+        result = self.compute(columns, now, default_rate, min_score)
+        forget = result["forget"]
+        stats["processed"] += len(rows)
+        stats["decayed"] += int(result["significant"].sum())
+        stats["flagged_for_forget"] += int(forget.sum())
+        stats["newly_flagged"] += int((forget & (columns[:, 4] == 0)).sum())
+        conn.executemany(_WRITE_BACK, zip(
+            result["decayed"].tolist(),
+            repeat(now),
+            result["forget_at"].tolist(),
+            forget.astype(np.int64).tolist(),
+            columns[:, 0].astype(np.int64).tolist(),
+        ))
@@ -8,10 +8,23 @@ while filtering out noise (system reminders, protocol markers, signatures).
 
 import json
 import re
+import sys
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple, Union
+
+# Bytes read per chunk when streaming a session file.
+READ_CHUNK_SIZE = 1 << 20
+
+# Lines carrying one of these markers (and no message marker) are skipped
+# before json.loads; they make up most of a long session's bytes.
+SKIP_MARKERS = (b'"type":"progress"', b'"type":"file-history-snapshot"')
+MESSAGE_MARKERS = (b'"type":"user"', b'"type":"assistant"')
+
+# Message uuids remembered for de-duplication; repeats are near each other.
+DEDUP_WINDOW = 65536
 
 
 def _emit(message: str = "") -> None:
@@ -61,6 +74,63 @@ class SessionData:
     file_changes: List[FileChange] = field(default_factory=list)
     git_branch: str = ""
     version: str = ""
+    message_count: int = 0
+    tool_call_count: int = 0
+
+
+Record = Union[Message, ToolCall, FileChange]
+
+
+class BoundedSet:
+    """Set that forgets its oldest members beyond ``maxsize``."""
+
+    def __init__(self, maxsize: int = DEDUP_WINDOW):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Hashable, None]" = OrderedDict()
+
+    def add(self, item: Hashable) -> bool:
+        """Add ``item``; return False if it was already present."""
+        if item in self._items:
+            self._items.move_to_end(item)
+            return False
+        self._items[item] = None
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class SessionSink:
+    """Consumer of streamed session records; override what you need."""
+
+    def on_message(self, session: SessionData, message: Message) -> None:
+        pass
+
+    def on_tool_call(self, session: SessionData, tool_call: ToolCall) -> None:
+        pass
+
+    def finish(self, session: SessionData) -> None:
+        """Called once with final metadata and consolidated file changes."""
+
+
+class CollectingSink(SessionSink):
+    """Collects every record into the SessionData lists (``parse`` behaviour)."""
+
+    def __init__(self):
+        self.messages: List[Message] = []
+        self.tool_calls: List[ToolCall] = []
+
+    def on_message(self, session: SessionData, message: Message) -> None:
+        self.messages.append(message)
+
+    def on_tool_call(self, session: SessionData, tool_call: ToolCall) -> None:
+        self.tool_calls.append(tool_call)
+
+    def finish(self, session: SessionData) -> None:
+        session.messages = self.messages
+        session.tool_calls = self.tool_calls
 
 
 class ClaudeJsonlParser:
@@ -77,6 +147,17 @@ class ClaudeJsonlParser:
         r'<!-- SKILLS_MAINTENANCE_START -->.*?<!-- SKILLS_MAINTENANCE_END -->',  # Skills blocks
     ]
 
+    # Lower-case literal each NOISE_PATTERNS entry requires, in the same order
+    NOISE_HINTS = [
+        '<system-reminder>',
+        '<claude-mem-context>',
+        '"signature"',
+        'important:',
+        '<!-- ccb_config_start -->',
+        '<!-- task_workflow_start -->',
+        '<!-- skills_maintenance_start -->',
+    ]
+
     # Tool categories for summary
     TOOL_CATEGORIES = {
         'file_read': ['Read', 'Glob', 'Grep'],
@@ -94,12 +175,39 @@ class ClaudeJsonlParser:
 
     def parse(self, jsonl_path: Path) -> SessionData:
         """Parse a session.jsonl file and return structured data."""
+        return self.stream(jsonl_path, CollectingSink())
+
+    def stream(self, jsonl_path: Path, *sinks: SessionSink) -> SessionData:
+        """
+        Stream a session file through ``sinks`` in constant memory.
+
+        Returns the session metadata with counts; the message and tool call
+        lists stay empty unless a sink fills them.
+        """
         if not jsonl_path.exists():
             raise FileNotFoundError(f"Session file not found: {jsonl_path}")
 
-        lines = jsonl_path.read_text().splitlines()
-
-        session_data = SessionData(
+        session = self._new_session(jsonl_path)
+        path_actions: Dict[str, set] = {}
+        for record in self.iter_records(jsonl_path, session):
+            if isinstance(record, Message):
+                session.message_count += 1
+                for sink in sinks:
+                    sink.on_message(session, record)
+            elif isinstance(record, ToolCall):
+                session.tool_call_count += 1
+                for sink in sinks:
+                    sink.on_tool_call(session, record)
+            elif record.file_path:
+                path_actions.setdefault(record.file_path, set()).add(record.action)
+
+        session.file_changes = self._consolidate_file_changes(path_actions)
+        for sink in sinks:
+            sink.finish(session)
+        return session
+
+    def _new_session(self, jsonl_path: Path) -> SessionData:
+        return SessionData(
             session_id=jsonl_path.stem[:8],
             project_path="",
             model="",
@@ -107,69 +215,91 @@ class ClaudeJsonlParser:
             end_time="",
         )
 
-        messages = []
-        tool_calls = []
-        file_changes = []
-
-        for line in lines:
-            if not line.strip():
+    def iter_lines(self, jsonl_path: Path, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the raw lines of a file, reading it in fixed-size chunks."""
+        with jsonl_path.open("rb") as handle:
+            pending = b""
+            while True:
+                chunk = handle.read(chunk_size)
+                if not chunk:
+                    break
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                yield from lines
+            if pending:
+                yield pending
+
+    @staticmethod
+    def _is_noise_line(line: bytes) -> bool:
+        """Cheap pre-filter for progress/snapshot lines, checked before json.loads."""
+        progress, snapshot = SKIP_MARKERS
+        if progress not in line and snapshot not in line:
+            return False
+        # Nested messages (e.g. subagent progress) still go through the full check.
+        user, assistant = MESSAGE_MARKERS
+        return user not in line and assistant not in line
+
+    def iter_records(self, jsonl_path: Path, session: SessionData) -> Iterator[Record]:
+        """
+        Yield de-duplicated messages, tool calls and raw file changes.
+
+        ``session`` metadata (ids, cwd, model, start/end time) is filled in as
+        lines are read.
+        """
+        seen_uuids = BoundedSet()
+
+        for line in self.iter_lines(jsonl_path):
+            if not line.strip() or self._is_noise_line(line):
                 continue
 
             try:
                 obj = json.loads(line)
-            except json.JSONDecodeError:
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 continue
-
-            # Skip file history snapshots
-            if obj.get('type') == 'file-history-snapshot':
+            if not isinstance(obj, dict):
                 continue
 
-            # Skip progress updates
-            if obj.get('type') == 'progress':
+            # Skip file history snapshots and progress updates
+            if obj.get('type') in ('file-history-snapshot', 'progress'):
                 continue
 
             # Extract session metadata
-            if not session_data.session_id and obj.get('sessionId'):
-                session_data.session_id = obj['sessionId'][:8]
+            if not session.session_id and obj.get('sessionId'):
+                session.session_id = obj['sessionId'][:8]
 
-            if not session_data.project_path and obj.get('cwd'):
-                session_data.project_path = obj['cwd']
+            if not session.project_path and obj.get('cwd'):
+                session.project_path = obj['cwd']
 
-            if not session_data.version and obj.get('version'):
-                session_data.version = obj['version']
+            if not session.version and obj.get('version'):
+                session.version = obj['version']
 
-            if not session_data.git_branch and obj.get('gitBranch'):
-                session_data.git_branch = obj['gitBranch']
+            if not session.git_branch and obj.get('gitBranch'):
+                session.git_branch = obj['gitBranch']
 
             # Process user messages
             if obj.get('type') == 'user':
                 msg = self._extract_user_message(obj)
-                if msg:
-                    messages.append(msg)
-                    if not session_data.start_time:
-                        session_data.start_time = msg.timestamp
+                if msg and seen_uuids.add(msg.uuid):
+                    if not session.start_time:
+                        session.start_time = msg.timestamp
+                    yield msg
 
             # Process assistant messages
             elif obj.get('type') == 'assistant':
                 msg, tools = self._extract_assistant_message(obj)
                 if msg:
-                    messages.append(msg)
-                    session_data.end_time = msg.timestamp
-                    if not session_data.model and obj.get('message', {}).get('model'):
-                        session_data.model = obj['message']['model']
-                tool_calls.extend(tools)
+                    session.end_time = msg.timestamp
+                    if not session.model and obj.get('message', {}).get('model'):
+                        session.model = obj['message']['model']
+                    if seen_uuids.add(msg.uuid):
+                        yield msg
 
-                # Extract file changes from tool calls
                 for tool in tools:
+                    yield tool
+                    # Extract file changes from tool calls
                     fc = self._extract_file_change(tool)
                     if fc:
-                        file_changes.append(fc)
-
-        session_data.messages = self._deduplicate_messages(messages)
-        session_data.tool_calls = tool_calls
-        session_data.file_changes = self._deduplicate_file_changes(file_changes)
-
-        return session_data
+                        yield fc
 
     def _extract_user_message(self, obj: Dict) -> Optional[Message]:
         """Extract user message from a jsonl entry."""
@@ -282,41 +412,34 @@ class ClaudeJsonlParser:
         if not content:
             return ""
 
-        # Apply all noise filters
-        for pattern in self._compiled_patterns:
-            content = pattern.sub('', content)
+        # Apply all noise filters; a pattern only runs when its literal is present
+        lowered = content.lower()
+        for hint, pattern in zip(self.NOISE_HINTS, self._compiled_patterns):
+            if hint in lowered:
+                content = pattern.sub('', content)
+                lowered = content.lower()
 
         # Clean up excessive whitespace
-        content = re.sub(r'\n{3,}', '\n\n', content)
+        if '\n\n\n' in content:
+            content = re.sub(r'\n{3,}', '\n\n', content)
         content = content.strip()
 
         return content
 
     def _deduplicate_messages(self, messages: List[Message]) -> List[Message]:
-        """Remove duplicate messages (same uuid or very similar content)."""
-        seen_uuids = set()
-        result = []
-
-        for msg in messages:
-            if msg.uuid in seen_uuids:
-                continue
-            seen_uuids.add(msg.uuid)
-            result.append(msg)
-
-        return result
+        """Remove duplicate messages (same uuid)."""
+        seen_uuids = BoundedSet()
+        return [msg for msg in messages if seen_uuids.add(msg.uuid)]
 
     def _deduplicate_file_changes(self, changes: List[FileChange]) -> List[FileChange]:
         """Consolidate file changes to unique paths with action summary."""
-        path_to_actions = {}
-
+        path_to_actions: Dict[str, set] = {}
         for fc in changes:
-            if not fc.file_path:
-                continue
-
-            if fc.file_path not in path_to_actions:
-                path_to_actions[fc.file_path] = set()
-            path_to_actions[fc.file_path].add(fc.action)
+            if fc.file_path:
+                path_to_actions.setdefault(fc.file_path, set()).add(fc.action)
+        return self._consolidate_file_changes(path_to_actions)
 
+    def _consolidate_file_changes(self, path_to_actions: Dict[str, set]) -> List[FileChange]:
         result = []
         for path, actions in path_to_actions.items():
             # Prioritize write actions
@@ -360,8 +483,6 @@ class ClaudeJsonlParser:
 
 def main():
     """CLI for testing the parser."""
-    import sys
-
     if len(sys.argv) < 2:
         _emit("Usage: jsonl_parser.py <session.jsonl>")
         sys.exit(1)
@@ -2,22 +2,40 @@
 """
 CCB Memory Archive System
 自动归档旧数据，保持数据库轻量
+
+归档写入按月分文件的冷存储层（见 memory_archive_tier），可直接检索；
+旧版 ``archive_*.db.gz`` 文件仍可搜索，并可通过 ``migrate`` 转入新格式。
 """
 
 import sqlite3
 import json
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Optional
 import gzip
 import shutil
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory.memory_archive_tier import MonthlyArchiveTier
+
+
+def _emit(message: str = "") -> None:
+    sys.stdout.write(f"{message}\n")
+
 
 class CCBMemoryArchive:
     def __init__(self):
         self.ccb_dir = Path.home() / ".ccb"
         self.active_db = self.ccb_dir / "ccb_memory.db"
         self.archive_dir = self.ccb_dir / "archives"
-        self.archive_dir.mkdir(exist_ok=True)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.tier = MonthlyArchiveTier(self.archive_dir / "monthly")
+
+    def _legacy_archives(self) -> list:
+        """旧版整库归档文件（archive_*.db / archive_*.db.gz）"""
+        return sorted(self.archive_dir.glob("archive_*.db*"))
 
     def get_db_size(self) -> tuple:
         """获取数据库大小和记录数"""
@@ -35,13 +53,14 @@ class CCBMemoryArchive:
         conn.close()
         return count, size_mb
 
-    def archive_old_data(self, days_to_keep: int = 90, compress: bool = True):
+    def archive_old_data(self, days_to_keep: int = 90, compress: bool = True, vacuum: bool = False):
         """
-        归档旧数据到单独文件
+        归档旧数据到按月分文件的冷存储层
 
         Args:
             days_to_keep: 保留最近 N 天的数据
-            compress: 是否压缩归档文件
+            compress: 是否压缩归档数据块
+            vacuum: 归档后是否 VACUUM 主数据库（会重写整个文件，默认关闭）
         """
         cutoff_date = (datetime.now() - timedelta(days=days_to_keep)).isoformat()
 
@@ -50,7 +69,8 @@ class CCBMemoryArchive:
 
         # 查询需要归档的数据
         cursor.execute('''
-            SELECT * FROM conversations
+            SELECT id, timestamp, provider, question, answer, metadata, tokens
+            FROM conversations
             WHERE timestamp < ?
             ORDER BY timestamp
         ''', (cutoff_date,))
@@ -62,77 +82,67 @@ class CCBMemoryArchive:
             conn.close()
             return
 
-        # 创建归档文件
-        archive_name = f"archive_{datetime.now().strftime('%Y%m')}.db"
-        archive_path = self.archive_dir / archive_name
-
-        # 创建归档数据库
-        archive_conn = sqlite3.connect(archive_path)
-        archive_cursor = archive_conn.cursor()
-
-        # 创建表结构（复制）
-        archive_cursor.execute('''
-            CREATE TABLE IF NOT EXISTS conversations (
-                id INTEGER PRIMARY KEY,
-                timestamp TEXT NOT NULL,
-                provider TEXT NOT NULL,
-                question TEXT NOT NULL,
-                answer TEXT NOT NULL,
-                metadata TEXT,
-                tokens INTEGER DEFAULT 0
-            )
-        ''')
-
-        # 插入归档数据
-        archive_cursor.executemany('''
-            INSERT INTO conversations VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', old_records)
-
-        archive_conn.commit()
-        archive_conn.close()
-
-        # 从主数据库删除已归档数据
-        cursor.execute('DELETE FROM conversations WHERE timestamp < ?', (cutoff_date,))
-
-        # 重建 FTS 索引
-        cursor.execute("INSERT INTO conversations_fts(conversations_fts) VALUES('rebuild')")
-
-        # 优化数据库
-        cursor.execute('VACUUM')
-
+        # 先写入归档（按 id 去重，中断后可重跑），再从主库删除
+        self.tier.compress_level = 6 if compress else 0
+        written = self.tier.append(old_records)
+
+        # 增量删除 FTS 条目（external content 表需提供原值），无需整体 rebuild
+        has_fts = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'conversations_fts'"
+        ).fetchone()
+        if has_fts:
+            cursor.executemany('''
+                INSERT INTO conversations_fts(conversations_fts, rowid, question, answer, provider)
+                VALUES ('delete', ?, ?, ?, ?)
+            ''', [(r[0], r[3], r[4], r[2]) for r in old_records])
+
+        cursor.executemany('DELETE FROM conversations WHERE id = ?', [(r[0],) for r in old_records])
         conn.commit()
-        conn.close()
 
-        # 压缩归档文件（可选）
-        if compress:
-            with open(archive_path, 'rb') as f_in:
-                with gzip.open(f"{archive_path}.gz", 'wb') as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-            archive_path.unlink()  # 删除未压缩版本
-            archive_path = Path(f"{archive_path}.gz")
+        if vacuum:
+            cursor.execute('VACUUM')
 
-        archive_size = archive_path.stat().st_size / 1024 / 1024
+        conn.close()
 
         _emit(f"✅ 已归档 {len(old_records)} 条记录")
-        _emit(f"📁 归档文件: {archive_path.name} ({archive_size:.2f} MB)")
+        for month, count in written.items():
+            path = self.tier.archive_path(month)
+            _emit(f"📁 归档文件: {path.name} (+{count} 条, {path.stat().st_size / 1024 / 1024:.2f} MB)")
         _emit(f"🗑️  已从主数据库删除")
 
-    def search_archives(self, keyword: str, limit: int = 10):
-        """在归档文件中搜索"""
-        results = []
-
-        for archive_file in self.archive_dir.glob("archive_*.db*"):
-            # 如果是压缩文件，先解压
-            if archive_file.suffix == '.gz':
-                import tempfile
-                with gzip.open(archive_file, 'rb') as f_in:
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as f_out:
-                        shutil.copyfileobj(f_in, f_out)
-                        temp_db = f_out.name
-            else:
-                temp_db = archive_file
-
-            # 搜索归档数据库
+    def migrate_legacy_archives(self) -> int:
+        """将旧版整库归档转入按月冷存储层，返回迁移的记录数"""
+        migrated = 0
+        for archive_file in self._legacy_archives():
+            temp_db = self._open_legacy(archive_file)
+            try:
+                conn = sqlite3.connect(temp_db)
+                records = conn.execute('''
+                    SELECT id, timestamp, provider, question, answer, metadata, tokens
+                    FROM conversations
+                ''').fetchall()
+                conn.close()
+            finally:
+                if archive_file.suffix == '.gz':
+                    Path(temp_db).unlink()
+            self.tier.append(records)
+            migrated += len(records)
+            archive_file.unlink()
+        return migrated
+
+    def _open_legacy(self, archive_file: Path) -> str:
+        """旧版归档路径；压缩文件需先解压到临时文件"""
+        if archive_file.suffix != '.gz':
+            return str(archive_file)
+        import tempfile
+        with gzip.open(archive_file, 'rb') as f_in:
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as f_out:
+                shutil.copyfileobj(f_in, f_out)
+                return f_out.name
+
+    def _search_legacy(self, archive_file: Path, keyword: str, limit: int) -> list:
+        temp_db = self._open_legacy(archive_file)
+        try:
             conn = sqlite3.connect(temp_db)
             cursor = conn.cursor()
 
@@ -144,20 +154,42 @@ class CCBMemoryArchive:
                 LIMIT ?
             ''', (f'%{keyword}%', f'%{keyword}%', limit))
 
-            results.extend([{
+            results = [{
                 'timestamp': row[0],
                 'provider': row[1],
                 'question': row[2],
                 'answer': row[3],
                 'source': 'archive'
-            } for row in cursor.fetchall()])
+            } for row in cursor.fetchall()]
 
             conn.close()
-
-            # 清理临时文件
+            return results
+        finally:
             if archive_file.suffix == '.gz':
                 Path(temp_db).unlink()
 
+    def search_archives(
+        self,
+        keyword: str,
+        limit: int = 10,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ):
+        """
+        在归档中搜索（question/answer 子串匹配，最新优先）
+
+        冷存储层按 manifest 跳过时间范围或布隆过滤器不匹配的月份；
+        尚未迁移的旧版归档仍逐个解压扫描。
+        """
+        results = self.tier.search(keyword, limit=limit, since=since, until=until)
+
+        for archive_file in self._legacy_archives():
+            results.extend(
+                r for r in self._search_legacy(archive_file, keyword, limit)
+                if (not since or r['timestamp'] >= since) and (not until or r['timestamp'] <= until)
+            )
+
+        results.sort(key=lambda r: r['timestamp'], reverse=True)
         return results[:limit]
 
     def get_stats(self):
@@ -165,7 +197,7 @@ class CCBMemoryArchive:
         active_count, active_size = self.get_db_size()
 
         # 统计归档
-        archive_files = list(self.archive_dir.glob("archive_*"))
+        archive_files = self._legacy_archives() + self.tier.files()
         archive_count = len(archive_files)
         archive_size = sum(f.stat().st_size for f in archive_files) / 1024 / 1024
 
@@ -200,6 +232,7 @@ def main():
         _emit("  stats              - 查看存储统计")
         _emit("  archive [days]     - 归档 N 天前的数据（默认 90）")
         _emit("  search <keyword>   - 搜索归档数据")
+        _emit("  migrate            - 将旧版 .db.gz 归档转入按月冷存储")
         return
 
     command = sys.argv[1]
@@ -212,6 +245,11 @@ def main():
         archive.archive_old_data(days_to_keep=days)
         archive.get_stats()
 
+    elif command == "migrate":
+        migrated = archive.migrate_legacy_archives()
+        _emit(f"✅ 已迁移 {migrated} 条归档记录")
+        archive.get_stats()
+
     elif command == "search":
         if len(sys.argv) < 3:
             _emit("❌ 请提供搜索关键词")
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+CCB Memory Archive - monthly cold-storage tier
+
+归档按月份写入独立的 SQLite 文件，检索时无需整体解压：
+
+- 对话正文按 ``BLOCK_ROWS`` 条一组 zlib 压缩存入 ``blocks``，只解压命中的块
+- ``conversations_fts`` 为 contentless FTS5（trigram 分词，detail=none 只存行号），
+  命中后在解压的正文上确认子串，语义与原 LIKE 一致
+- ``manifest.db`` 记录每个归档的时间范围和 trigram 布隆过滤器，
+  检索时直接跳过时间不符或不可能包含关键词的归档
+"""
+
+import hashlib
+import json
+import math
+import sqlite3
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+BLOCK_ROWS = 64
+BLOOM_FP_RATE = 0.01
+
+ARCHIVE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS blocks (
+        block_id INTEGER PRIMARY KEY,
+        data BLOB NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS rows (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        provider TEXT NOT NULL,
+        block_id INTEGER NOT NULL,
+        slot INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_rows_timestamp ON rows(timestamp DESC)",
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+        question, answer,
+        content='',
+        tokenize='trigram',
+        detail='none',
+        columnsize=0
+    )
+    """,
+    "CREATE VIRTUAL TABLE IF NOT EXISTS conversations_vocab USING fts5vocab(conversations_fts, 'row')",
+)
+
+MANIFEST_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS archive_manifest (
+        month TEXT PRIMARY KEY,
+        file_name TEXT NOT NULL,
+        min_ts TEXT,
+        max_ts TEXT,
+        row_count INTEGER DEFAULT 0,
+        size_bytes INTEGER DEFAULT 0,
+        bloom BLOB,
+        bloom_hashes INTEGER DEFAULT 0,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+class BloomFilter:
+    """Fixed-size bloom filter with double hashing over BLAKE2b."""
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytes] = None):
+        self.num_bits = max(8, num_bits)
+        self.num_hashes = max(1, num_hashes)
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.num_bits = len(self.bits) * 8
+
+    @classmethod
+    def for_capacity(cls, capacity: int, fp_rate: float = BLOOM_FP_RATE) -> "BloomFilter":
+        capacity = max(1, capacity)
+        num_bits = int(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+def _caseless_safe(text: str) -> bool:
+    """True if Python lowercasing matches FTS5 case folding for every char."""
+    return all(ord(c) < 128 or c.lower() == c.upper() for c in text)
+
+
+def query_trigrams(keyword: str) -> Optional[Set[str]]:
+    """
+    Trigrams a match for ``keyword`` must contain, for bloom checks.
+
+    ``None`` means the keyword is too short for the trigram index.  Trigrams
+    whose case folding might differ from FTS5's are left out, which only
+    weakens the filter.
+    """
+    folded = keyword.lower()
+    if len(folded) < 3:
+        return None
+    return {folded[i:i + 3] for i in range(len(folded) - 2) if _caseless_safe(folded[i:i + 3])}
+
+
+@dataclass
+class ManifestEntry:
+    month: str
+    file_name: str
+    min_ts: str
+    max_ts: str
+    row_count: int
+    size_bytes: int
+    bloom: Optional[BloomFilter] = None
+
+
+class ArchiveManifest:
+    """Per-archive time ranges and bloom filters, cached until the file changes."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._cache: Optional[Tuple[float, List[ManifestEntry]]] = None
+        conn = sqlite3.connect(self.path)
+        conn.execute(MANIFEST_SCHEMA)
+        conn.commit()
+        conn.close()
+
+    def entries(self) -> List[ManifestEntry]:
+        """Archives ordered newest first."""
+        mtime = self.path.stat().st_mtime
+        if self._cache and self._cache[0] == mtime:
+            return self._cache[1]
+        conn = sqlite3.connect(self.path)
+        rows = conn.execute("""
+            SELECT month, file_name, min_ts, max_ts, row_count, size_bytes, bloom, bloom_hashes
+            FROM archive_manifest
+            ORDER BY max_ts DESC
+        """).fetchall()
+        conn.close()
+        entries = [
+            ManifestEntry(
+                month=row[0], file_name=row[1], min_ts=row[2] or "", max_ts=row[3] or "",
+                row_count=row[4], size_bytes=row[5],
+                bloom=BloomFilter(len(row[6]) * 8, row[7], row[6]) if row[6] else None,
+            )
+            for row in rows
+        ]
+        self._cache = (mtime, entries)
+        return entries
+
+    def upsert(self, entry: ManifestEntry) -> None:
+        bloom = entry.bloom
+        conn = sqlite3.connect(self.path)
+        conn.execute("""
+            INSERT OR REPLACE INTO archive_manifest
+            (month, file_name, min_ts, max_ts, row_count, size_bytes, bloom, bloom_hashes, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (
+            entry.month, entry.file_name, entry.min_ts, entry.max_ts, entry.row_count, entry.size_bytes,
+            bytes(bloom.bits) if bloom else None, bloom.num_hashes if bloom else 0,
+        ))
+        conn.commit()
+        conn.close()
+        self._cache = None
+
+
+class MonthlyArchiveTier:
+    """Queryable, block-compressed archives, one SQLite file per month."""
+
+    def __init__(self, root: Path, compress_level: int = 6):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.compress_level = compress_level
+        self.manifest = ArchiveManifest(self.root / "manifest.db")
+
+    @staticmethod
+    def month_of(timestamp: str) -> str:
+        """``YYYY-MM`` for ISO timestamps, ``unknown`` otherwise."""
+        month = (timestamp or "")[:7]
+        return month if len(month) == 7 and month[4] == "-" else "unknown"
+
+    def archive_path(self, month: str) -> Path:
+        return self.root / f"archive_{month}.db"
+
+    def files(self) -> List[Path]:
+        return sorted(self.root.glob("archive_*.db"))
+
+    def _connect(self, month: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.archive_path(month))
+        for statement in ARCHIVE_SCHEMA:
+            conn.execute(statement)
+        return conn
+
+    def append(self, records: Sequence[tuple]) -> Dict[str, int]:
+        """
+        Append ``conversations`` rows ``(id, timestamp, provider, question,
+        answer, metadata, tokens)`` to their monthly archives.
+
+        Rows already archived (same id) are skipped, so an interrupted
+        archive run can simply be repeated.  Returns rows written per month.
+        """
+        by_month: Dict[str, List[tuple]] = {}
+        for record in records:
+            by_month.setdefault(self.month_of(record[1]), []).append(record)
+        return {month: self._append_month(month, rows) for month, rows in sorted(by_month.items())}
+
+    def _append_month(self, month: str, records: List[tuple]) -> int:
+        conn = self._connect(month)
+        try:
+            existing: Set[int] = set()
+            ids = [record[0] for record in records]
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                existing.update(row[0] for row in conn.execute(
+                    f"SELECT id FROM rows WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                ))
+            fresh = sorted((r for r in records if r[0] not in existing), key=lambda r: (r[1], r[0]))
+
+            with conn:
+                for start in range(0, len(fresh), BLOCK_ROWS):
+                    block = fresh[start:start + BLOCK_ROWS]
+                    payload = json.dumps([[r[3], r[4], r[5], r[6]] for r in block], ensure_ascii=False)
+                    cursor = conn.execute(
+                        "INSERT INTO blocks (data) VALUES (?)",
+                        (zlib.compress(payload.encode("utf-8"), self.compress_level),),
+                    )
+                    block_id = cursor.lastrowid
+                    conn.executemany(
+                        "INSERT INTO rows (id, timestamp, provider, block_id, slot) VALUES (?, ?, ?, ?, ?)",
+                        [(r[0], r[1], r[2], block_id, slot) for slot, r in enumerate(block)],
+                    )
+                    conn.executemany(
+                        "INSERT INTO conversations_fts (rowid, question, answer) VALUES (?, ?, ?)",
+                        [(r[0], r[3], r[4]) for r in block],
+                    )
+            if fresh:
+                # Archives are cold: merge FTS segments and drop free pages once per append.
+                conn.execute("INSERT INTO conversations_fts(conversations_fts) VALUES('optimize')")
+                conn.commit()
+                conn.execute("VACUUM")
+            self._refresh_manifest(month, conn)
+            return len(fresh)
+        finally:
+            conn.close()
+
+    def _refresh_manifest(self, month: str, conn: sqlite3.Connection) -> None:
+        min_ts, max_ts, count = conn.execute("SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM rows").fetchone()
+        term_count = conn.execute("SELECT COUNT(*) FROM conversations_vocab").fetchone()[0]
+        bloom = BloomFilter.for_capacity(term_count)
+        for (term,) in conn.execute("SELECT term FROM conversations_vocab"):
+            bloom.add(term)
+        path = self.archive_path(month)
+        self.manifest.upsert(ManifestEntry(
+            month=month, file_name=path.name, min_ts=min_ts or "", max_ts=max_ts or "",
+            row_count=count, size_bytes=path.stat().st_size, bloom=bloom,
+        ))
+
+    def candidates(self, keyword: str, since: Optional[str] = None, until: Optional[str] = None) -> List[ManifestEntry]:
+        """Archives that may hold matches, newest first."""
+        trigrams = query_trigrams(keyword)
+        selected = []
+        for entry in self.manifest.entries():
+            if since and entry.max_ts and entry.max_ts < since:
+                continue
+            if until and entry.min_ts and entry.min_ts > until:
+                continue
+            if trigrams and entry.bloom and not all(t in entry.bloom for t in trigrams):
+                continue
+            selected.append(entry)
+        return selected
+
+    def search(
+        self,
+        keyword: str,
+        limit: int = 10,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Dict[str, str]]:
+        """Newest ``limit`` rows whose question or answer contains ``keyword``."""
+        results: List[Dict[str, str]] = []
+        for entry in self.candidates(keyword, since, until):
+            if len(results) >= limit and entry.max_ts < results[limit - 1]["timestamp"]:
+                break
+            results.extend(self.search_archive(entry, keyword, limit, since, until))
+            results.sort(key=lambda r: r["timestamp"], reverse=True)
+            del results[limit:]
+        return results
+
+    def search_archive(
+        self,
+        entry: ManifestEntry,
+        keyword: str,
+        limit: int,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Dict[str, str]]:
+        """Newest matches in a single archive; safe to call from worker threads."""
+        conn = sqlite3.connect(f"{(self.root / entry.file_name).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            clauses, params = [], []
+            if since:
+                clauses.append("r.timestamp >= ?")
+                params.append(since)
+            if until:
+                clauses.append("r.timestamp <= ?")
+                params.append(until)
+            if query_trigrams(keyword) is not None:
+                # detail=none has no positions: match rows holding every
+                # trigram and let the substring check below weed out the rest.
+                clauses.append("r.id IN (SELECT rowid FROM conversations_fts WHERE conversations_fts MATCH ?)")
+                grams = dict.fromkeys(keyword[i:i + 3] for i in range(len(keyword) - 2))
+                params.append(" AND ".join('"' + g.replace('"', '""') + '"' for g in grams))
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            rows = conn.execute(
+                f"SELECT r.timestamp, r.provider, r.block_id, r.slot FROM rows r {where} ORDER BY r.timestamp DESC",
+                params,
+            )
+
+            blocks: Dict[int, list] = {}
+            needle = keyword.lower()
+            results = []
+            for timestamp, provider, block_id, slot in rows:
+                if block_id not in blocks:
+                    data = conn.execute("SELECT data FROM blocks WHERE block_id = ?", (block_id,)).fetchone()[0]
+                    blocks[block_id] = json.loads(zlib.decompress(data))
+                question, answer = blocks[block_id][slot][:2]
+                if needle not in question.lower() and needle not in answer.lower():
+                    continue
+                results.append({
+                    'timestamp': timestamp,
+                    'provider': provider,
+                    'question': question,
+                    'answer': answer,
+                    'source': 'archive'
+                })
+                if len(results) >= limit:
+                    break
+            return results
+        finally:
+            conn.close()
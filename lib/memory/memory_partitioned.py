@@ -4,20 +4,44 @@ CCB Memory compatibility layer (single DB, month-aware views)
 
 历史上该模块按月拆分为多个 SQLite 文件。
 当前实现已统一到单库 `~/.ccb/ccb_memory.db`，通过 timestamp 做月维度统计/过滤。
+
+检索时把活跃库和 memory_archive 写出的按月归档（`~/.ccb/archives/monthly`）
+都视为分区：按时间范围/布隆过滤器挑出相关分区，线程池并发查询
+（每个分区一个只读连接），按 timestamp 归并，最新分区已凑满 limit 时提前结束。
 """
 
+import heapq
 import json
+import os
 import sqlite3
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory.memory_archive_tier import ManifestEntry, MonthlyArchiveTier
+
 
 def _emit(message: str = "") -> None:
     sys.stdout.write(f"{message}\n")
 
 
+@dataclass
+class Partition:
+    """一个可检索的分区：活跃库或某个月的归档。"""
+
+    name: str
+    path: Path
+    min_ts: str
+    max_ts: str
+    row_count: int
+    entry: Optional[ManifestEntry] = None  # 归档分区的 manifest 记录
+
+
 class CCBPartitionedMemory:
     """兼容旧接口的单库记忆系统。"""
 
@@ -27,6 +51,9 @@ class CCBPartitionedMemory:
         self.db_path = self.ccb_dir / "ccb_memory.db"
         self.current_month = datetime.now().strftime("%Y%m")
         self._init_db(self.db_path)
+        self.archive_tier = MonthlyArchiveTier(self.ccb_dir / "archives" / "monthly")
+        self.search_workers = min(8, (os.cpu_count() or 1) + 4)
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def _get_db_path(self, month: Optional[str] = None) -> Path:
         """兼容旧接口：始终返回统一数据库路径。"""
@@ -116,21 +143,52 @@ class CCBPartitionedMemory:
         conn.close()
         return rowid
 
-    def search_conversations(self, keyword: str, limit: int = 10, months: int = 3) -> List[Dict]:
+    def partitions(self, keyword: Optional[str] = None, since: Optional[str] = None) -> List[Partition]:
         """
-        搜索对话（最近 N 个月范围内）。
+        分区清单（最新优先）：活跃库 + 按月归档。
 
-        Args:
-            keyword: 搜索关键词
-            limit: 返回数量
-            months: 搜索最近 N 个月的数据
+        给出 keyword/since 时，跳过时间范围早于 since 或布隆过滤器
+        判定不含关键词的归档分区。
         """
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        min_ts, max_ts, count = conn.execute(
+            "SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM conversations"
+        ).fetchone()
+        conn.close()
+
+        found = []
+        if count and (not since or max_ts >= since):
+            found.append(Partition("live", self.db_path, min_ts, max_ts, count))
+
+        if keyword is None:
+            entries = [e for e in self.archive_tier.manifest.entries() if not since or e.max_ts >= since]
+        else:
+            entries = self.archive_tier.candidates(keyword, since=since)
+        found.extend(
+            Partition(e.month, self.archive_tier.root / e.file_name, e.min_ts, e.max_ts, e.row_count, e)
+            for e in entries
+        )
+        found.sort(key=lambda p: p.max_ts, reverse=True)
+        return found
+
+    def _search_partition(self, partition: Partition, keyword: str, limit: int, since: str) -> List[Dict]:
+        """在单个分区内检索，结果按 timestamp 降序；在线程池中执行。"""
+        if partition.entry is not None:
+            rows = self.archive_tier.search_archive(partition.entry, keyword, limit, since=since)
+            return [
+                {
+                    "timestamp": r["timestamp"],
+                    "provider": r["provider"],
+                    "question": r["question"],
+                    "answer": r["answer"],
+                    "partition": partition.name,
+                }
+                for r in rows
+            ]
 
+        conn = sqlite3.connect(f"{partition.path.resolve().as_uri()}?mode=ro", uri=True)
         try:
-            cutoff = self._cutoff_days(months)
-            cursor.execute(
+            cursor = conn.execute(
                 """
                 SELECT c.timestamp, c.provider, c.question, c.answer
                 FROM conversations c
@@ -139,15 +197,15 @@ class CCBPartitionedMemory:
                 ORDER BY c.timestamp DESC
                 LIMIT ?
             """,
-                (keyword, cutoff, limit),
+                (keyword, since, limit),
             )
-
             return [
                 {
                     "timestamp": row[0],
                     "provider": row[1],
                     "question": row[2],
                     "answer": row[3],
+                    "partition": partition.name,
                 }
                 for row in cursor.fetchall()
             ]
@@ -156,6 +214,58 @@ class CCBPartitionedMemory:
         finally:
             conn.close()
 
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.search_workers, thread_name_prefix="ccb-partition")
+        return self._executor
+
+    def close(self) -> None:
+        """关闭分区检索线程池（等待进行中的查询结束）；之后检索会按需重建。"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def search_conversations(
+        self,
+        keyword: str,
+        limit: int = 10,
+        months: int = 3,
+        workers: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        搜索对话（最近 N 个月范围内，跨活跃库与按月归档）。
+
+        相关分区按最新优先分批并发查询（批大小 1、2、4… 直到 workers），
+        每批结果与已有结果按 timestamp 归并；当已有 limit 条结果且下一个
+        分区的最新记录更早时停止。
+
+        Args:
+            keyword: 搜索关键词
+            limit: 返回数量
+            months: 搜索最近 N 个月的数据
+            workers: 并发查询的分区数（默认 search_workers；1 为串行）
+        """
+        since = self._cutoff_days(months)
+        pending = self.partitions(keyword, since=since)
+        max_batch = max(1, workers or self.search_workers)
+        batch_size = 1
+
+        results: List[Dict] = []
+        while pending:
+            if len(results) >= limit and pending[0].max_ts < results[limit - 1]["timestamp"]:
+                break
+            batch, pending = pending[:batch_size], pending[batch_size:]
+            # Widen 1, 2, 4, ...: shallow searches stop after the newest
+            # partitions, deep ones reach full concurrency quickly.
+            batch_size = min(batch_size * 2, max_batch)
+            if len(batch) == 1:
+                found = [self._search_partition(batch[0], keyword, limit, since)]
+            else:
+                found = list(self._pool().map(lambda p: self._search_partition(p, keyword, limit, since), batch))
+            results = list(heapq.merge(results, *found, key=lambda r: r["timestamp"], reverse=True))[:limit]
+
+        return results
+
     def get_recent_conversations(self, limit: int = 10) -> List[Dict]:
         """获取最近的对话。"""
         conn = sqlite3.connect(self.db_path)
@@ -217,6 +327,16 @@ class CCBPartitionedMemory:
             }
             for month, count in by_month
         ]
+        partitions.extend(
+            {
+                "month": entry.month.replace("-", ""),
+                "count": entry.row_count,
+                "size_mb": round(entry.size_bytes / 1024 / 1024, 2),
+                "path": str(self.archive_tier.root / entry.file_name),
+                "archived": True,
+            }
+            for entry in sorted(self.archive_tier.manifest.entries(), key=lambda e: e.month)
+        )
 
         return {
             "total_conversations": total_conversations,
@@ -289,7 +409,8 @@ def main():
         _emit(f"总大小:   {stats['total_size_mb']} MB")
         _emit("\n月度详情:")
         for p in stats["partitions"]:
-            _emit(f"  {p['month']}: {p['count']:>6} 条")
+            suffix = "（归档）" if p.get("archived") else ""
+            _emit(f"  {p['month']}: {p['count']:>6} 条{suffix}")
 
     elif command == "recent":
         limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10
@@ -306,7 +427,10 @@ def main():
             return
 
         keyword = sys.argv[2]
-        results = memory.search_conversations(keyword)
+        try:
+            results = memory.search_conversations(keyword)
+        finally:
+            memory.close()
 
         _emit(f"\n🔍 找到 {len(results)} 条结果:")
         for r in results:
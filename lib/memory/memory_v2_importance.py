@@ -209,76 +209,42 @@ class MemoryV2ImportanceMixin:
 
     def apply_decay(
         self,
-        batch_size: int = 1000,
-        min_importance: float = 0.01
+        batch_size: Optional[int] = None,
+        min_importance: float = 0.01,
+        incremental: bool = True
     ) -> Dict[str, int]:
         """Apply time decay to all tracked memories.
 
-        Note: This is primarily informational - recency is calculated
-        dynamically during retrieval. This method updates stored values
-        for reporting purposes.
+        Decayed importance and the forgetting flag are stored on
+        memory_importance by the vectorized DecayEngine; incremental runs
+        only revisit rows that changed or crossed the threshold since the
+        last pass.
 
         Args:
-            batch_size: Number of memories to process per batch
-            min_importance: Memories below this are flagged for forgetting
+            batch_size: Rows loaded per vectorized chunk
+            min_importance: Memories whose decayed importance falls below
+                this are flagged for forgetting
+            incremental: Reuse the last-run watermark when possible
 
         Returns:
-            Dict with counts: updated, flagged_for_forget
+            Dict with counts: updated, flagged_for_forget (plus the engine's
+            newly_flagged, total_flagged and mode)
         """
-        import math
-        from datetime import datetime
-
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        from .decay_engine import CHUNK_ROWS, DecayEngine
 
         stats = {'updated': 0, 'flagged_for_forget': 0}
-
         try:
-            # Get all memories with access data
-            cursor.execute("""
-                SELECT memory_id, memory_type, last_accessed_at, decay_rate, importance_score
-                FROM memory_importance
-                WHERE last_accessed_at IS NOT NULL
-                LIMIT ?
-            """, (batch_size,))
-
-            rows = cursor.fetchall()
-            now = datetime.now()
-
-            for row in rows:
-                memory_id, memory_type, last_accessed, decay_rate, importance = row
-
-                if not last_accessed:
-                    continue
-
-                # Calculate hours since access
-                try:
-                    if 'T' in last_accessed:
-                        dt = datetime.fromisoformat(last_accessed.replace('Z', '+00:00'))
-                    else:
-                        dt = datetime.strptime(last_accessed, "%Y-%m-%d %H:%M:%S")
-                    hours = (now - dt.replace(tzinfo=None)).total_seconds() / 3600
-                except (ValueError, TypeError):
-                    hours = 168  # Default 1 week
-
-                # Calculate decayed recency
-                decay_rate = decay_rate or 0.1
-                recency = math.exp(-decay_rate * hours)
-
-                # Check if should flag for forgetting
-                if recency < min_importance and importance < min_importance:
-                    stats['flagged_for_forget'] += 1
-
-                stats['updated'] += 1
-
-            conn.commit()
-            return stats
-
+            result = DecayEngine(self.db_path, chunk_rows=batch_size or CHUNK_ROWS).run(
+                min_score=min_importance, incremental=incremental
+            )
         except MEMORY_V2_ERRORS as e:
             logger.warning("apply_decay error: %s", e)
             return stats
-        finally:
-            conn.close()
+        stats['updated'] = result['processed']
+        stats['flagged_for_forget'] = result['flagged_for_forget']
+        for key in ('newly_flagged', 'total_flagged', 'mode'):
+            stats[key] = result[key]
+        return stats
 
     def search_with_scores(
         self,
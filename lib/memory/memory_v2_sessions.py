@@ -22,6 +22,7 @@ class MemoryV2SessionMixin:
         # Read and execute schema
         schema_file = Path(__file__).parent / "schema_v2.sql"
         if schema_file.exists():
+            self._dedupe_stream_entries(conn)
             with open(schema_file) as f:
                 conn.executescript(f.read())
         else:
@@ -30,6 +31,23 @@ class MemoryV2SessionMixin:
         conn.commit()
         conn.close()
 
+    @staticmethod
+    def _dedupe_stream_entries(conn: sqlite3.Connection) -> None:
+        """Drop exact duplicate stream rows left by older versions before the unique index is created."""
+        names = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE name IN ('stream_entries', 'idx_stream_entry_dedupe')"
+        )}
+        if names == {"stream_entries"}:
+            # Rows sharing a timestamp but not content are distinct entries and are kept.
+            conn.execute(
+                """DELETE FROM stream_entries WHERE id NOT IN (
+                       SELECT MIN(id) FROM stream_entries
+                       GROUP BY request_id, timestamp, entry_type, COALESCE(content, '')
+                   )"""
+            )
+            # Superseded key without content; it would reject those rows.
+            conn.execute("DROP INDEX IF EXISTS idx_stream_entry_unique")
+
     # ========================================================================
     # Session Management
     # ========================================================================
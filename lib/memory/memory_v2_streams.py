@@ -1,13 +1,15 @@
 """Auto-split mixins for Memory v2."""
 from __future__ import annotations
 
+import asyncio
 import gzip
 import json
 import sqlite3
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from .memory_v2_shared import MEMORY_V2_ERRORS, logger
 
@@ -285,8 +287,28 @@ class MemoryV2StreamMixin:
         finally:
             conn.close()
 
+    def _stream_dir(self) -> Path:
+        return Path.home() / ".ccb" / "streams"
+
+    @staticmethod
+    def _parse_stream_line(request_id: str, line: bytes) -> Optional[tuple]:
+        """Parse one JSONL stream line into a stream_entries row."""
+        try:
+            entry = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+        if not isinstance(entry, dict):
+            return None
+        return (
+            request_id,
+            entry.get("type", "unknown"),
+            entry.get("ts", 0),
+            entry.get("content", ""),
+            json.dumps(entry.get("meta", {}), ensure_ascii=False)
+        )
+
     def sync_stream_file(self, request_id: str) -> int:
-        """Sync a stream file to database
+        """Sync new lines of a stream file to database
 
         Args:
             request_id: Request ID to sync
@@ -294,97 +316,191 @@ class MemoryV2StreamMixin:
         Returns:
             Number of entries synced
         """
-        stream_file = Path.home() / ".ccb" / "streams" / f"{request_id}.jsonl"
+        stream_file = self._stream_dir() / f"{request_id}.jsonl"
         if not stream_file.exists():
             return 0
+        return self._sync_stream_files([stream_file])["total_entries"]
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        try:
-            # Check if already synced
-            cursor.execute(
-                "SELECT COUNT(*) FROM stream_entries WHERE request_id = ?",
-                (request_id,)
-            )
-            existing = cursor.fetchone()[0]
-            if existing > 0:
-                return 0  # Already synced
-
-            # Read and parse JSONL file
-            entries = []
-            with open(stream_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line.strip())
-                        entries.append((
-                            request_id,
-                            entry.get("type", "unknown"),
-                            entry.get("ts", 0),
-                            entry.get("content", ""),
-                            json.dumps(entry.get("meta", {}), ensure_ascii=False)
-                        ))
-                    except json.JSONDecodeError:
-                        continue
-
-            if not entries:
-                return 0
-
-            # Batch insert
-            cursor.executemany(
-                """INSERT INTO stream_entries
-                   (request_id, entry_type, timestamp, content, metadata)
-                   VALUES (?, ?, ?, ?, ?)""",
-                entries
-            )
-            conn.commit()
-            return len(entries)
-        except sqlite3.OperationalError as e:
-            logger.warning("sync_stream_file error: %s", e)
-            return 0
-        finally:
-            conn.close()
-
-    def sync_all_streams(self, force: bool = False) -> Dict[str, int]:
+    def sync_all_streams(self, force: bool = False) -> Dict[str, Any]:
         """Sync all stream files to database
 
+        Only bytes past each file's ledger offset are read, so streams that
+        grew after an earlier sync are completed and unchanged files cost a
+        stat.  Rows from all files go in batched transactions together with
+        their ledger updates.
+
         Args:
-            force: If True, re-sync even if already in database
+            force: If True, drop synced entries and ledger rows and re-read
+                every file from the start
 
         Returns:
-            Dict with sync statistics
+            Dict with sync statistics (files synced/skipped, entries, bytes,
+            throughput and lag between an entry's ``ts`` and its commit)
         """
-        stream_dir = Path.home() / ".ccb" / "streams"
+        stream_dir = self._stream_dir()
         if not stream_dir.exists():
             return {"synced": 0, "skipped": 0, "errors": 0}
 
-        stats = {"synced": 0, "skipped": 0, "errors": 0, "total_entries": 0}
-
-        for stream_file in stream_dir.glob("*.jsonl"):
-            request_id = stream_file.stem
+        files = sorted(stream_dir.glob("*.jsonl"))
+        if force:
+            conn = sqlite3.connect(self.db_path)
             try:
-                if force:
-                    # Delete existing entries for force sync
-                    conn = sqlite3.connect(self.db_path)
-                    conn.execute(
-                        "DELETE FROM stream_entries WHERE request_id = ?",
-                        (request_id,)
-                    )
-                    conn.commit()
-                    conn.close()
-
-                count = self.sync_stream_file(request_id)
-                if count > 0:
-                    stats["synced"] += 1
-                    stats["total_entries"] += count
-                else:
-                    stats["skipped"] += 1
-            except MEMORY_V2_ERRORS as e:
-                logger.warning("Error syncing %s: %s", request_id, e)
-                stats["errors"] += 1
+                with conn:
+                    for start in range(0, len(files), 500):
+                        ids = [(f.stem,) for f in files[start:start + 500]]
+                        conn.executemany("DELETE FROM stream_entries WHERE request_id = ?", ids)
+                        conn.executemany("DELETE FROM stream_sync_ledger WHERE request_id = ?", ids)
+            finally:
+                conn.close()
+        return self._sync_stream_files(files)
+
+    def _sync_stream_files(self, files: List[Path], batch_size: int = 5000) -> Dict[str, Any]:
+        """Append unsynced lines of ``files`` to stream_entries."""
+        started = time.perf_counter()
+        stats = {
+            "synced": 0, "skipped": 0, "errors": 0, "total_entries": 0, "bytes": 0,
+            "elapsed_s": 0.0, "entries_per_s": 0.0, "max_lag_s": 0.0, "avg_lag_s": 0.0,
+        }
+        lag_total = 0.0
+        lag_count = 0
+
+        conn = sqlite3.connect(self.db_path, timeout=10.0)
+        rows: List[tuple] = []
+        ledger_rows: List[tuple] = []
+
+        def flush() -> None:
+            nonlocal lag_total, lag_count
+            if not rows and not ledger_rows:
+                return
+            with conn:
+                before = conn.total_changes
+                # Rows the gateway already wrote itself (or an earlier pass
+                # synced) hit the unique index and are ignored.
+                conn.executemany(
+                    """INSERT OR IGNORE INTO stream_entries
+                       (request_id, entry_type, timestamp, content, metadata)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    rows
+                )
+                stats["total_entries"] -= len(rows) - (conn.total_changes - before)
+                conn.executemany(
+                    """INSERT INTO stream_sync_ledger
+                       (request_id, inode, byte_offset, synced_entries, updated_at)
+                       VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                       ON CONFLICT(request_id) DO UPDATE SET
+                           inode = excluded.inode,
+                           byte_offset = excluded.byte_offset,
+                           synced_entries = CASE WHEN stream_sync_ledger.inode = excluded.inode
+                               THEN stream_sync_ledger.synced_entries + excluded.synced_entries
+                               ELSE excluded.synced_entries END,
+                           updated_at = CURRENT_TIMESTAMP""",
+                    ledger_rows
+                )
+            committed = time.time()
+            for row in rows:
+                ts = row[2]
+                if isinstance(ts, (int, float)) and ts > 0:
+                    lag = max(0.0, committed - ts)
+                    lag_total += lag
+                    lag_count += 1
+                    stats["max_lag_s"] = max(stats["max_lag_s"], lag)
+            rows.clear()
+            ledger_rows.clear()
+
+        try:
+            ledger = {
+                row[0]: (row[1], row[2])
+                for row in conn.execute("SELECT request_id, inode, byte_offset FROM stream_sync_ledger")
+            }
+            for stream_file in files:
+                request_id = stream_file.stem
+                try:
+                    st = stream_file.stat()
+                    inode, offset = ledger.get(request_id, (None, 0))
+                    if inode != st.st_ino or st.st_size < offset:
+                        # New, replaced or truncated file: start over, but skip
+                        # entries already present (earlier syncs or the
+                        # gateway's own dual-write) by their timestamp.
+                        offset = 0
+                        high_water = conn.execute(
+                            "SELECT MAX(timestamp) FROM stream_entries WHERE request_id = ?",
+                            (request_id,)
+                        ).fetchone()[0]
+                    elif st.st_size == offset:
+                        stats["skipped"] += 1
+                        continue
+                    else:
+                        high_water = None
+
+                    with open(stream_file, "rb") as f:
+                        f.seek(offset)
+                        data = f.read(st.st_size - offset)
+                    # A trailing partial line is still being written; leave it
+                    # for the next pass.
+                    end = data.rfind(b"\n") + 1
+                    new_rows = []
+                    for line in data[:end].splitlines():
+                        row = self._parse_stream_line(request_id, line) if line.strip() else None
+                        if row is None:
+                            continue
+                        if high_water is not None and isinstance(row[2], (int, float)) and row[2] <= high_water:
+                            continue
+                        new_rows.append(row)
+
+                    stats["bytes"] += end
+                    if new_rows:
+                        stats["synced"] += 1
+                        stats["total_entries"] += len(new_rows)
+                        rows.extend(new_rows)
+                    else:
+                        stats["skipped"] += 1
+                    ledger_rows.append((request_id, st.st_ino, offset + end, len(new_rows)))
+                    if len(rows) >= batch_size:
+                        flush()
+                except (OSError, sqlite3.OperationalError) as e:
+                    logger.warning("Error syncing %s: %s", request_id, e)
+                    stats["errors"] += 1
+            flush()
+        except sqlite3.OperationalError as e:
+            logger.warning("sync_all_streams error: %s", e)
+            stats["errors"] += 1
+        finally:
+            conn.close()
 
+        stats["elapsed_s"] = round(time.perf_counter() - started, 4)
+        stats["entries_per_s"] = round(stats["total_entries"] / max(stats["elapsed_s"], 1e-9), 1)
+        stats["avg_lag_s"] = round(lag_total / lag_count, 4) if lag_count else 0.0
+        stats["max_lag_s"] = round(stats["max_lag_s"], 4)
         return stats
 
+    async def run_stream_sync(
+        self,
+        interval: float = 1.0,
+        stop_event: Optional[asyncio.Event] = None,
+        on_stats: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> None:
+        """Continuously sync stream files until ``stop_event`` is set
+
+        Each pass runs in a worker thread; idle passes only stat the files.
+
+        Args:
+            interval: Seconds between passes
+            stop_event: Event that ends the loop (runs until cancelled if None)
+            on_stats: Optional callback receiving each pass's statistics
+        """
+        stop_event = stop_event or asyncio.Event()
+        while not stop_event.is_set():
+            try:
+                stats = await asyncio.to_thread(self.sync_all_streams)
+                if on_stats and stats.get("total_entries"):
+                    on_stats(stats)
+            except MEMORY_V2_ERRORS as e:
+                logger.warning("Stream sync pass failed: %s", e)
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
 
     # ========================================================================
     # Heuristic Retrieval Support (v2.0)
@@ -294,6 +294,20 @@ CREATE TABLE IF NOT EXISTS stream_entries (
 CREATE INDEX IF NOT EXISTS idx_stream_request_id ON stream_entries(request_id);
 CREATE INDEX IF NOT EXISTS idx_stream_type ON stream_entries(entry_type);
 CREATE INDEX IF NOT EXISTS idx_stream_timestamp ON stream_entries(timestamp);
+CREATE INDEX IF NOT EXISTS idx_stream_request_ts ON stream_entries(request_id, timestamp);
+-- 同一条目只入库一次：网关双写与流文件同步可能写入同一行（StreamOutput 保证同一请求内 timestamp 递增）
+-- 键包含 content：旧版本可能在同一 timestamp 写入同类型的不同条目
+CREATE UNIQUE INDEX IF NOT EXISTS idx_stream_entry_dedupe
+    ON stream_entries(request_id, timestamp, entry_type, COALESCE(content, ''));
+
+-- 流文件同步账本：记录每个 ~/.ccb/streams/{request_id}.jsonl 已同步到的字节偏移
+CREATE TABLE IF NOT EXISTS stream_sync_ledger (
+    request_id TEXT PRIMARY KEY,
+    inode INTEGER NOT NULL,             -- 文件被替换（inode 变化）时从头同步
+    byte_offset INTEGER NOT NULL,       -- 已同步的完整行末尾
+    synced_entries INTEGER DEFAULT 0,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
 
 -- 思考链专用视图 (方便查询)
 CREATE VIEW IF NOT EXISTS thinking_chains AS
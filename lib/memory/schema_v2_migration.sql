@@ -75,7 +75,13 @@ CREATE TABLE IF NOT EXISTS memory_importance (
     access_count INTEGER DEFAULT 0,             -- Total access count
     decay_rate REAL DEFAULT 0.1,                -- Per-hour decay rate (λ)
     created_at TEXT,
-    updated_at TEXT
+    updated_at TEXT,
+    -- Decay engine columns (see decay_engine.py, which also adds them to older tables)
+    last_accessed_ts REAL,                      -- last_accessed_at as epoch seconds
+    decayed_score REAL,                         -- importance × recency at decay_ts
+    decay_ts REAL,                              -- Last decay pass; NULL = needs recompute
+    forget_at_ts REAL,                          -- When decayed importance crosses min_score
+    forget_flag INTEGER DEFAULT 0               -- 1 = flagged for forgetting
 );
 
 CREATE INDEX IF NOT EXISTS idx_importance_score ON memory_importance(importance_score DESC);
@@ -0,0 +1,133 @@
+"""
+Bounded-size digest of a streamed session.
+
+``SessionDigestSink`` plugs into ``ClaudeJsonlParser.stream`` and keeps only
+what the archive row and the markdown summary need (task summary, key
+messages, learnings, tool counts), so archiving a session does not hold its
+full message list in memory.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from memory.jsonl_parser import Message, SessionData, SessionSink, ToolCall
+
+# Patterns in assistant messages that usually introduce an insight.
+LEARNING_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r'(?:发现|原来|注意到)[：:]\s*(.+?)(?:\n|$)',
+        r'(?:这是因为|原因是)[：:]\s*(.+?)(?:\n|$)',
+        r'(?:学到|明白了)[：:]\s*(.+?)(?:\n|$)',
+        r'(?:关键点|要点)[：:]\s*(.+?)(?:\n|$)',
+    )
+]
+
+# Substring pre-check so most messages skip the regexes entirely.
+LEARNING_KEYWORDS = ("发现", "原来", "注意到", "这是因为", "原因是", "学到", "明白了", "关键点", "要点")
+
+MAX_KEY_MESSAGES = 8
+MAX_LEARNINGS = 5
+
+
+@dataclass
+class SessionDigest:
+    """What gets archived for a session."""
+    session: SessionData
+    task_summary: str = ""
+    key_messages: List[Message] = field(default_factory=list)
+    learnings: List[str] = field(default_factory=list)
+    tool_summary: Dict[str, int] = field(default_factory=dict)
+
+
+class SessionDigestSink(SessionSink):
+    """Builds a ``SessionDigest`` from streamed records in bounded memory."""
+
+    def __init__(self, max_key_messages: int = MAX_KEY_MESSAGES, max_learnings: int = MAX_LEARNINGS):
+        self.max_key_messages = max_key_messages
+        self.max_learnings = max_learnings
+        self.task_summary = ""
+        self.first_user: Optional[Message] = None
+        self.candidates: List[Message] = []
+        self.learnings: List[str] = []
+        self.tool_summary: Dict[str, int] = {}
+        self.digest: Optional[SessionDigest] = None
+
+    @classmethod
+    def from_session(cls, session: SessionData) -> SessionDigest:
+        """Digest an already parsed session."""
+        sink = cls()
+        for message in session.messages:
+            sink.on_message(session, message)
+        for tool_call in session.tool_calls:
+            sink.on_tool_call(session, tool_call)
+        sink.finish(session)
+        return sink.digest
+
+    def on_message(self, session: SessionData, message: Message) -> None:
+        if message.role == "user":
+            if self.first_user is None:
+                # Always keep the first user message
+                self.first_user = message
+                self._add_task_summary(message)
+                return
+            self._add_task_summary(message)
+
+        self._add_candidate(message)
+        if message.role == "assistant":
+            self._add_learnings(message)
+
+    def on_tool_call(self, session: SessionData, tool_call: ToolCall) -> None:
+        self.tool_summary[tool_call.tool_name] = self.tool_summary.get(tool_call.tool_name, 0) + 1
+
+    def finish(self, session: SessionData) -> None:
+        if self.first_user is not None:
+            key_messages = [self.first_user] + self.candidates[: self.max_key_messages - 1]
+        else:
+            key_messages = self.candidates[: self.max_key_messages]
+        # Sort by timestamp
+        key_messages.sort(key=lambda m: m.timestamp)
+        self.digest = SessionDigest(
+            session=session,
+            task_summary=self.task_summary,
+            key_messages=key_messages,
+            learnings=self.learnings,
+            tool_summary=self.tool_summary,
+        )
+
+    def _add_task_summary(self, message: Message) -> None:
+        """First sentence (max 200 chars) of the first substantial user message."""
+        if self.task_summary or len(message.content) <= 10:
+            return
+        first_sentence = re.split(r'[。.!?！？\n]', message.content.strip())[0]
+        if len(first_sentence) > 200:
+            first_sentence = first_sentence[:200] + "..."
+        self.task_summary = first_sentence
+
+    def _add_candidate(self, message: Message) -> None:
+        """Substantial user messages and structured assistant replies."""
+        if len(self.candidates) >= self.max_key_messages or len(message.content) < 50:
+            return
+        if message == self.first_user:
+            return
+        if message.role == "user":
+            self.candidates.append(message)
+        elif message.role == "assistant":
+            content = message.content
+            if '```' in content or '##' in content or len(content) > 300:
+                self.candidates.append(message)
+
+    def _add_learnings(self, message: Message) -> None:
+        if len(self.learnings) >= self.max_learnings:
+            return
+        if not any(keyword in message.content for keyword in LEARNING_KEYWORDS):
+            return
+        for pattern in LEARNING_PATTERNS:
+            for match in pattern.findall(message.content)[:2]:  # Max 2 per pattern
+                if 20 < len(match) < 200:
+                    learning = match.strip()
+                    if learning not in self.learnings:
+                        self.learnings.append(learning)
+                        if len(self.learnings) >= self.max_learnings:
+                            return
@@ -5,9 +5,10 @@ import os
 import sys
 import time
 from pathlib import Path
-from typing import Optional, Dict, Any, Iterable
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 
 from cli_output import atomic_write_text
+from pane_registry_index import RegistryIndex
 from project_id import compute_ccb_project_id
 from terminal import get_backend_for_session
 
@@ -37,6 +38,30 @@ def registry_path_for_session(session_id: str) -> Path:
     return _registry_dir() / f"{REGISTRY_PREFIX}{session_id}{REGISTRY_SUFFIX}"
 
 
+_INDEXES: Dict[Path, RegistryIndex] = {}
+
+
+def registry_index() -> Optional[RegistryIndex]:
+    """The (process-wide) index for the current registry dir, or None if the dir is missing."""
+    registry_dir = _registry_dir()
+    index = _INDEXES.get(registry_dir)
+    if index is None:
+        if not registry_dir.is_dir():
+            return None
+        index = RegistryIndex(registry_dir, prefix=REGISTRY_PREFIX, suffix=REGISTRY_SUFFIX, describe=_describe_record)
+        _INDEXES[registry_dir] = index
+    return index
+
+
+def rebuild_registry_index() -> int:
+    """Re-import every registry file into the index; returns the number of records."""
+    index = registry_index()
+    if index is None:
+        return 0
+    index.sync(force=True)
+    return int(index.get_stats()["records"])
+
+
 def _iter_registry_files() -> Iterable[Path]:
     registry_dir = _registry_dir()
     if not registry_dir.exists():
@@ -141,6 +166,65 @@ def _get_providers_map(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     return out
 
 
+def _effective_project_id(data: Dict[str, Any]) -> str:
+    existing = (data.get("ccb_project_id") or "").strip()
+    if existing:
+        return existing
+    # Back-compat: infer from work_dir (no side effects).
+    wd = (data.get("work_dir") or "").strip()
+    if wd:
+        try:
+            return compute_ccb_project_id(Path(wd))
+        except HANDLED_EXCEPTIONS:
+            return ""
+    return ""
+
+
+def _claude_pane_id(data: Dict[str, Any]) -> Optional[str]:
+    claude = _get_providers_map(data).get("claude")
+    claude_pane = claude.get("pane_id") if isinstance(claude, dict) else None
+    return claude_pane or data.get("claude_pane_id")
+
+
+def _describe_record(path: Path, data: Dict[str, Any]) -> Tuple[str, int, List[Tuple[str, str]]]:
+    """Index keys for a registry record: project id, updated_at and provider panes."""
+    panes = [
+        (provider, str(entry.get("pane_id") or "").strip())
+        for provider, entry in _get_providers_map(data).items()
+        if provider != "claude"
+    ]
+    claude_pane = _claude_pane_id(data)
+    if claude_pane:
+        panes.append(("claude", str(claude_pane)))
+    return _effective_project_id(data), _coerce_updated_at(data.get("updated_at"), path), panes
+
+
+def _scan_records() -> List[Tuple[Dict[str, Any], int]]:
+    """Every readable record with its updated_at (the pre-index path, kept as a fallback)."""
+    records = []
+    for path in _iter_registry_files():
+        data = _load_registry_file(path)
+        if data:
+            records.append((data, _coerce_updated_at(data.get("updated_at"), path)))
+    records.sort(key=lambda item: -item[1])  # stable: path order among equals
+    return records
+
+
+def _indexed(lookup: str, *args: str) -> Optional[List[Tuple[Dict[str, Any], int]]]:
+    """Run an index lookup; None means use the directory scan instead."""
+    index = registry_index()
+    if index is None:
+        return []
+    try:
+        found = getattr(index, lookup)(*args)
+    except HANDLED_EXCEPTIONS as exc:
+        _debug(f"Registry index unavailable ({exc}); scanning {_registry_dir()}")
+        return None
+    if lookup == "by_session":
+        return [found] if found else []
+    return found
+
+
 def _provider_pane_alive(record: Dict[str, Any], provider: str) -> bool:
     providers = _get_providers_map(record)
     entry = providers.get((provider or "").strip().lower())
@@ -179,15 +263,16 @@ def _provider_pane_alive(record: Dict[str, Any], provider: str) -> bool:
 def load_registry_by_session_id(session_id: str) -> Optional[Dict[str, Any]]:
     if not session_id:
         return None
-    path = registry_path_for_session(session_id)
-    if not path.exists():
+    found = _indexed("by_session", session_id)
+    if found is None:
+        path = registry_path_for_session(session_id)
+        data = _load_registry_file(path) if path.exists() else None
+        found = [(data, _coerce_updated_at(data.get("updated_at"), path))] if data else []
+    if not found:
         return None
-    data = _load_registry_file(path)
-    if not data:
-        return None
-    updated_at = _coerce_updated_at(data.get("updated_at"), path)
+    data, updated_at = found[0]
     if _is_stale(updated_at):
-        _debug(f"Registry stale for session {session_id}: {path}")
+        _debug(f"Registry stale for session {session_id}")
         return None
     return data
 
@@ -195,25 +280,15 @@ def load_registry_by_session_id(session_id: str) -> Optional[Dict[str, Any]]:
 def load_registry_by_claude_pane(pane_id: str) -> Optional[Dict[str, Any]]:
     if not pane_id:
         return None
-    best: Optional[Dict[str, Any]] = None
-    best_ts = -1
-    for path in _iter_registry_files():
-        data = _load_registry_file(path)
-        if not data:
-            continue
-        providers = _get_providers_map(data)
-        claude = providers.get("claude") if isinstance(providers, dict) else None
-        claude_pane = (claude or {}).get("pane_id") if isinstance(claude, dict) else None
-        if (claude_pane or data.get("claude_pane_id")) != pane_id:
-            continue
-        updated_at = _coerce_updated_at(data.get("updated_at"), path)
+    candidates = _indexed("by_pane", pane_id, "claude")
+    if candidates is None:
+        candidates = [(d, ts) for d, ts in _scan_records() if _claude_pane_id(d) == pane_id]
+    for data, updated_at in candidates:  # newest first
         if _is_stale(updated_at):
-            _debug(f"Registry stale for pane {pane_id}: {path}")
+            _debug(f"Registry stale for pane {pane_id}: session {data.get('ccb_session_id')}")
             continue
-        if updated_at > best_ts:
-            best = data
-            best_ts = updated_at
-    return best
+        return data
+    return None
 
 
 def load_registry_by_project_id(ccb_project_id: str, provider: str) -> Optional[Dict[str, Any]]:
@@ -227,50 +302,26 @@ def load_registry_by_project_id(ccb_project_id: str, provider: str) -> Optional[
     if not proj or not prov:
         return None
 
-    best: Optional[Dict[str, Any]] = None
-    best_ts = -1
-    best_needs_migration = False
+    candidates = _indexed("by_project", proj)
+    if candidates is None:
+        candidates = [(d, ts) for d, ts in _scan_records() if _effective_project_id(d) == proj]
 
-    for path in _iter_registry_files():
-        data = _load_registry_file(path)
-        if not data:
-            continue
-        updated_at = _coerce_updated_at(data.get("updated_at"), path)
+    best: Optional[Dict[str, Any]] = None
+    # Newest first, so only panes up to the first alive one are probed.
+    for data, updated_at in candidates:
         if _is_stale(updated_at):
             continue
-
-        existing = (data.get("ccb_project_id") or "").strip()
-        inferred = ""
-        if not existing:
-            # Back-compat: infer from work_dir (no side effects while scanning).
-            wd = (data.get("work_dir") or "").strip()
-            if wd:
-                try:
-                    inferred = compute_ccb_project_id(Path(wd))
-                except HANDLED_EXCEPTIONS:
-                    inferred = ""
-        effective = existing or inferred
-
-        if effective != proj:
-            continue
-
-        if not _provider_pane_alive(data, prov):
-            continue
-
-        # Prefer the newest record for this project+provider.
-        if updated_at > best_ts:
+        if _provider_pane_alive(data, prov):
             best = data
-            best_ts = updated_at
-            best_needs_migration = (not existing) and bool(inferred)
+            break
 
-    if best and best_needs_migration:
+    if best and not (best.get("ccb_project_id") or "").strip():
         # Best-effort persistence: update only the winning record to include ccb_project_id.
         try:
-            if not (best.get("ccb_project_id") or "").strip():
-                wd = (best.get("work_dir") or "").strip()
-                if wd:
-                    best["ccb_project_id"] = compute_ccb_project_id(Path(wd))
-                    upsert_registry(best)
+            wd = (best.get("work_dir") or "").strip()
+            if wd:
+                best["ccb_project_id"] = compute_ccb_project_id(Path(wd))
+                upsert_registry(best)
         except HANDLED_EXCEPTIONS:
             pass
 
@@ -349,9 +400,17 @@ def upsert_registry(record: Dict[str, Any]) -> bool:
 
     data["updated_at"] = int(time.time())
 
+    index = registry_index()
+    dir_mtime_before = index.dir_mtime_ns() if index is not None else None
     try:
         atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=2))
-        return True
     except HANDLED_EXCEPTIONS as exc:
         _debug(f"Failed to write registry {path}: {exc}")
         return False
+    if index is not None:
+        try:
+            index.record_written(path, data, dir_mtime_before)
+        except HANDLED_EXCEPTIONS as exc:
+            # The file is the source of truth; the next lookup rescans it.
+            _debug(f"Failed to index registry {path}: {exc}")
+    return True
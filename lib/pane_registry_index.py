@@ -0,0 +1,292 @@
+"""
+SQLite index over the per-session registry files in ``~/.ccb/run/``.
+
+Session records stay in ``ccb-session-<id>.json`` (scripts and older
+tools read and write those directly), but lookups no longer glob and
+parse the whole directory.  ``.index/registry.db`` maps session, project
+and pane ids to records and is refreshed only when the directory's mtime
+changes, re-reading just the files whose (mtime, size, inode) changed.
+The first refresh imports every existing record.
+
+Long-lived processes also keep lookup results in memory until the
+directory or the index file changes.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# In a subdirectory: SQLite's journal files must not touch the mtime of the
+# directory being watched.
+INDEX_PATH = Path(".index") / "registry.db"
+
+# Directory mtimes are only as fine as the filesystem clock tick; a stamp
+# taken this close to the last change may hide a later change in the same
+# tick, so such stamps are re-verified with a listing (like git's racy index).
+RACY_WINDOW_NS = 2_000_000_000
+
+# (project_id, updated_at, [(provider, pane_id), ...]) for a parsed record
+Describe = Callable[[Path, Dict[str, Any]], Tuple[str, int, List[Tuple[str, str]]]]
+Record = Tuple[Dict[str, Any], int]
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS registry_sessions (
+        file_name TEXT PRIMARY KEY,
+        session_id TEXT NOT NULL,
+        project_id TEXT,
+        updated_at INTEGER NOT NULL DEFAULT 0,
+        data TEXT,
+        file_mtime_ns INTEGER NOT NULL,
+        file_size INTEGER NOT NULL,
+        file_ino INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_registry_sessions_session ON registry_sessions(session_id)",
+    "CREATE INDEX IF NOT EXISTS idx_registry_sessions_project ON registry_sessions(project_id)",
+    """
+    CREATE TABLE IF NOT EXISTS registry_panes (
+        pane_id TEXT NOT NULL,
+        provider TEXT NOT NULL,
+        file_name TEXT NOT NULL,
+        PRIMARY KEY (pane_id, provider, file_name)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_registry_panes_file ON registry_panes(file_name)",
+    "CREATE TABLE IF NOT EXISTS registry_meta (key TEXT PRIMARY KEY, value INTEGER)",
+)
+
+_SELECT = "SELECT s.data, s.updated_at FROM registry_sessions s"
+_ORDER = "ORDER BY s.updated_at DESC, s.file_name"
+
+
+def _file_stamp(st: os.stat_result) -> Tuple[int, int, int]:
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class RegistryIndex:
+    """Index of one registry directory; thread-safe, one connection per instance."""
+
+    def __init__(self, run_dir: Path, *, prefix: str, suffix: str, describe: Describe):
+        self.run_dir = Path(run_dir)
+        self.prefix = prefix
+        self.suffix = suffix
+        self._describe = describe
+        self.db_path = self.run_dir / INDEX_PATH
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._token: Optional[Tuple] = None
+        self._racy = True
+        self._results: Dict[Tuple[str, str], List[Record]] = {}
+        self.rescans = 0
+        self.files_parsed = 0
+
+    # --- storage ----------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0, check_same_thread=False)
+            # Rollback journal (not WAL): every commit bumps the file's mtime,
+            # which is what other processes' memory caches key on.
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _file_name(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}{self.suffix}"
+
+    def _session_id(self, file_name: str) -> str:
+        return file_name[len(self.prefix):len(file_name) - len(self.suffix)]
+
+    def _is_record_file(self, name: str) -> bool:
+        return name.startswith(self.prefix) and name.endswith(self.suffix)
+
+    def _meta(self, conn: sqlite3.Connection, key: str) -> Optional[int]:
+        row = conn.execute("SELECT value FROM registry_meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else int(row[0])
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: int) -> None:
+        conn.execute("INSERT OR REPLACE INTO registry_meta (key, value) VALUES (?, ?)", (key, int(value)))
+
+    def _store(self, conn: sqlite3.Connection, file_name: str, stamp: Tuple[int, int, int],
+               data: Optional[Dict[str, Any]]) -> None:
+        conn.execute("DELETE FROM registry_panes WHERE file_name = ?", (file_name,))
+        project_id, updated_at, panes = ("", 0, [])
+        if data is not None:
+            project_id, updated_at, panes = self._describe(self.run_dir / file_name, data)
+        conn.execute(
+            "INSERT OR REPLACE INTO registry_sessions "
+            "(file_name, session_id, project_id, updated_at, data, file_mtime_ns, file_size, file_ino) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (file_name, self._session_id(file_name), project_id or None, int(updated_at),
+             None if data is None else json.dumps(data, ensure_ascii=False), *stamp),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO registry_panes (pane_id, provider, file_name) VALUES (?, ?, ?)",
+            [(pane_id, provider, file_name) for provider, pane_id in panes if pane_id],
+        )
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    # --- refresh ----------------------------------------------------------------------
+
+    def sync(self, *, force: bool = False) -> bool:
+        """
+        Bring the index up to date with the directory; True if it rescanned.
+
+        Skipped when the directory mtime matches the last scan (and that
+        scan was not racy).
+        """
+        with self._lock:
+            try:
+                dir_mtime = os.stat(self.run_dir).st_mtime_ns
+            except OSError:
+                return False
+            conn = self._connect()
+            synced_mtime = self._meta(conn, "dir_mtime_ns")
+            synced_at = self._meta(conn, "synced_at_ns") or 0
+            if not force and synced_mtime == dir_mtime and synced_at - dir_mtime > RACY_WINDOW_NS:
+                return False
+
+            scanned_at = time.time_ns()
+            current: Dict[str, Tuple[int, int, int]] = {}
+            with os.scandir(self.run_dir) as entries:
+                for entry in entries:
+                    if self._is_record_file(entry.name):
+                        try:
+                            current[entry.name] = _file_stamp(entry.stat())
+                        except OSError:
+                            continue
+            known = {
+                row[0]: (row[1], row[2], row[3])
+                for row in conn.execute(
+                    "SELECT file_name, file_mtime_ns, file_size, file_ino FROM registry_sessions"
+                )
+            }
+            with conn:
+                for name, stamp in current.items():
+                    if known.get(name) != stamp:
+                        self._store(conn, name, stamp, self._read(self.run_dir / name))
+                        self.files_parsed += 1
+                removed = [(name,) for name in known if name not in current]
+                conn.executemany("DELETE FROM registry_sessions WHERE file_name = ?", removed)
+                conn.executemany("DELETE FROM registry_panes WHERE file_name = ?", removed)
+                self._set_meta(conn, "dir_mtime_ns", dir_mtime)
+                self._set_meta(conn, "synced_at_ns", scanned_at)
+            self.rescans += 1
+            return True
+
+    def record_written(self, path: Path, data: Dict[str, Any], dir_mtime_before: Optional[int]) -> None:
+        """
+        Index a record this process just wrote (atomically) to ``path``.
+
+        If the index was current before the write, it is marked current
+        again, so the next lookup does not rescan for our own change.
+        """
+        with self._lock:
+            conn = self._connect()
+            stamp = _file_stamp(os.stat(path))
+            with conn:
+                self._store(conn, path.name, stamp, data)
+                if dir_mtime_before is not None and self._meta(conn, "dir_mtime_ns") == dir_mtime_before:
+                    self._set_meta(conn, "dir_mtime_ns", os.stat(self.run_dir).st_mtime_ns)
+                    self._set_meta(conn, "synced_at_ns", time.time_ns())
+            self._token = None
+
+    def dir_mtime_ns(self) -> Optional[int]:
+        try:
+            return os.stat(self.run_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def _fresh(self) -> sqlite3.Connection:
+        """Sync if needed and drop memoized results when anything changed."""
+        try:
+            dir_st = os.stat(self.run_dir)
+            db_st = os.stat(self.db_path)
+            token = (dir_st.st_mtime_ns, _file_stamp(db_st))
+        except OSError:
+            token = None
+        if token is not None and token == self._token and not self._racy:
+            return self._connect()
+        self.sync()
+        conn = self._connect()
+        synced_mtime = self._meta(conn, "dir_mtime_ns")
+        synced_at = self._meta(conn, "synced_at_ns") or 0
+        self._racy = synced_mtime is None or synced_at - synced_mtime <= RACY_WINDOW_NS
+        self._results.clear()
+        try:
+            self._token = (os.stat(self.run_dir).st_mtime_ns, _file_stamp(os.stat(self.db_path)))
+        except OSError:
+            self._token = None
+        return conn
+
+    # --- lookups (O(1) on the indexed columns) ------------------------------------------
+
+    def _lookup(self, kind: str, key: str, sql: str, params: Tuple) -> List[Record]:
+        with self._lock:
+            conn = self._fresh()
+            cached = self._results.get((kind, key))
+            if cached is None:
+                cached = [
+                    (json.loads(data), int(updated_at))
+                    for data, updated_at in conn.execute(sql, params)
+                    if data is not None
+                ]
+                self._results[(kind, key)] = cached
+        # Callers may edit and re-save what they get back.
+        return copy.deepcopy(cached)
+
+    def by_session(self, session_id: str) -> Optional[Record]:
+        rows = self._lookup(
+            "session", session_id,
+            f"{_SELECT} WHERE s.file_name = ?", (self._file_name(session_id),),
+        )
+        return rows[0] if rows else None
+
+    def by_project(self, project_id: str) -> List[Record]:
+        """Records for a project, newest first."""
+        return self._lookup("project", project_id, f"{_SELECT} WHERE s.project_id = ? {_ORDER}", (project_id,))
+
+    def by_pane(self, pane_id: str, provider: str) -> List[Record]:
+        """Records whose ``provider`` pane is ``pane_id``, newest first."""
+        return self._lookup(
+            "pane", f"{provider}\0{pane_id}",
+            f"{_SELECT} JOIN registry_panes p ON p.file_name = s.file_name "
+            f"WHERE p.pane_id = ? AND p.provider = ? {_ORDER}",
+            (pane_id, provider),
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._connect()
+            records = conn.execute("SELECT COUNT(*) FROM registry_sessions WHERE data IS NOT NULL").fetchone()[0]
+            return {
+                "records": records,
+                "rescans": self.rescans,
+                "files_parsed": self.files_parsed,
+                "memoized": len(self._results),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._token = None
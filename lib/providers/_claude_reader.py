@@ -7,12 +7,15 @@ import re
 from pathlib import Path
 from typing import Any, List, Optional
 
-from .base import BaseCommReader, CommMessage
+from .base import TAIL_LINES, BaseCommReader, CommMessage
 
 
 class ClaudeCommReader(BaseCommReader):
     """Reader for Claude CLI session logs."""
 
+    # Append-only JSONL: polls parse only newly written lines.
+    tail_mode = TAIL_LINES
+
     def __init__(self, home_dir: Optional[str] = None, work_dir: Optional[Path] = None):
         super().__init__("claude", home_dir=home_dir)
         self.work_dir = Path(work_dir).expanduser() if work_dir else Path.cwd()
@@ -80,34 +83,23 @@ class ClaudeCommReader(BaseCommReader):
 
         return None
 
+    def _index(self):
+        return self._session_index("*/*.jsonl")
+
     def _scan_latest_session(self) -> Optional[Path]:
         project_dir = self._project_dir()
         if not project_dir.exists():
             return None
 
-        try:
-            sessions = sorted(
-                (path for path in project_dir.glob("*.jsonl") if path.is_file() and not path.name.startswith(".")),
-                key=lambda path: path.stat().st_mtime,
-            )
-        except OSError:
-            return None
-
-        return sessions[-1] if sessions else None
+        entry = self._index().newest(under=project_dir)
+        return Path(entry.path) if entry is not None else None
 
     def _scan_latest_session_any_project(self) -> Optional[Path]:
         if not self.home_dir.exists():
             return None
 
-        try:
-            sessions = sorted(
-                (path for path in self.home_dir.glob("*/*.jsonl") if path.is_file() and not path.name.startswith(".")),
-                key=lambda path: path.stat().st_mtime,
-            )
-        except OSError:
-            return None
-
-        return sessions[-1] if sessions else None
+        entry = self._index().newest()
+        return Path(entry.path) if entry is not None else None
 
     def _find_session_file(self) -> Optional[Path]:
         preferred = self._resolve_preferred_session()
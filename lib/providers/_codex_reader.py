@@ -5,12 +5,15 @@ import json
 from pathlib import Path
 from typing import Any, List, Optional
 
-from .base import BaseCommReader, CommMessage
+from .base import TAIL_LINES, BaseCommReader, CommMessage
 
 
 class CodexCommReader(BaseCommReader):
     """Reader for Codex session logs."""
 
+    # Append-only JSONL: polls parse only newly written lines.
+    tail_mode = TAIL_LINES
+
     def __init__(self, home_dir: Optional[str] = None, work_dir: Optional[Path] = None):
         super().__init__("codex", home_dir=home_dir)
         self.work_dir = Path(work_dir).expanduser() if work_dir else Path.cwd()
@@ -64,16 +67,14 @@ class CodexCommReader(BaseCommReader):
         if not session_id:
             return None
 
-        try:
-            candidates = [path for path in self.home_dir.glob(f"**/*{session_id}*.jsonl") if path.is_file()]
-        except OSError:
-            return None
+        entry = self._index().find(session_id)
+        return Path(entry.path) if entry is not None else None
 
-        if not candidates:
-            return None
+    def _session_meta(self, log_path: Path) -> tuple:
+        return self._extract_cwd_from_log(log_path), None
 
-        candidates.sort(key=lambda path: path.stat().st_mtime)
-        return candidates[-1]
+    def _index(self):
+        return self._session_index("**/*.jsonl", self._session_meta)
 
     def _find_session_file(self) -> Optional[Path]:
         preferred = self._resolve_preferred_session()
@@ -83,36 +84,10 @@ class CodexCommReader(BaseCommReader):
         if not self.home_dir.exists():
             return None
 
+        index = self._index()
         expected_cwd = self._normalize_work_dir()
-        latest_match: Optional[Path] = None
-        latest_match_mtime = -1.0
-
-        latest_any: Optional[Path] = None
-        latest_any_mtime = -1.0
-
-        try:
-            for path in self.home_dir.glob("**/*.jsonl"):
-                if not path.is_file():
-                    continue
-
-                try:
-                    mtime = path.stat().st_mtime
-                except OSError:
-                    continue
-
-                if mtime >= latest_any_mtime:
-                    latest_any_mtime = mtime
-                    latest_any = path
-
-                if expected_cwd:
-                    cwd = self._extract_cwd_from_log(path)
-                    if cwd and cwd == expected_cwd and mtime >= latest_match_mtime:
-                        latest_match_mtime = mtime
-                        latest_match = path
-        except OSError:
-            return latest_any
-
-        return latest_match or latest_any
+        entry = (index.newest(cwd=expected_cwd) if expected_cwd else None) or index.newest()
+        return Path(entry.path) if entry is not None else None
 
     def _extract_assistant_message(self, entry: dict) -> Optional[str]:
         entry_type = entry.get("type")
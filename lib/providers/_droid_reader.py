@@ -6,12 +6,15 @@ import os
 from pathlib import Path
 from typing import Any, List, Optional
 
-from .base import BaseCommReader, CommMessage
+from .base import TAIL_LINES, BaseCommReader, CommMessage
 
 
 class DroidCommReader(BaseCommReader):
     """Reader for Droid CLI session logs."""
 
+    # Append-only JSONL: polls parse only newly written lines.
+    tail_mode = TAIL_LINES
+
     def __init__(self, home_dir: Optional[str] = None, work_dir: Optional[Path] = None):
         super().__init__("droid", home_dir=home_dir)
         self.work_dir = Path(work_dir).expanduser() if work_dir else Path.cwd()
@@ -79,17 +82,16 @@ class DroidCommReader(BaseCommReader):
         if not session_id:
             return None
 
-        try:
-            candidates = list(self.home_dir.glob(f"**/{session_id}.jsonl"))
-        except OSError:
+        entry = self._index().find(session_id)
+        if entry is None or Path(entry.path).stem != session_id:
             return None
+        return Path(entry.path)
 
-        candidates = [path for path in candidates if path.is_file()]
-        if not candidates:
-            return None
+    def _session_meta(self, session_file: Path) -> tuple:
+        return self._extract_session_cwd(session_file), None
 
-        candidates.sort(key=lambda path: path.stat().st_mtime)
-        return candidates[-1]
+    def _index(self):
+        return self._session_index("**/*.jsonl", self._session_meta)
 
     def _find_session_file(self) -> Optional[Path]:
         preferred = self._resolve_preferred_session()
@@ -100,38 +102,12 @@ class DroidCommReader(BaseCommReader):
             return None
 
         work_dir_str = str(self.work_dir)
-        best_match: Optional[Path] = None
-        best_match_mtime = -1.0
-
-        latest_any: Optional[Path] = None
-        latest_any_mtime = -1.0
-
-        try:
-            for path in self.home_dir.glob("**/*.jsonl"):
-                if not path.is_file() or path.name.startswith("."):
-                    continue
-
-                try:
-                    mtime = path.stat().st_mtime
-                except OSError:
-                    continue
-
-                if mtime >= latest_any_mtime:
-                    latest_any_mtime = mtime
-                    latest_any = path
-
-                cwd = self._extract_session_cwd(path)
-                if not cwd:
-                    continue
-
-                if self._path_is_same_or_parent(work_dir_str, cwd) or self._path_is_same_or_parent(cwd, work_dir_str):
-                    if mtime >= best_match_mtime:
-                        best_match_mtime = mtime
-                        best_match = path
-        except OSError:
-            return latest_any
-
-        return best_match or latest_any
+        index = self._index()
+        entry = index.newest(
+            cwd_match=lambda cwd: self._path_is_same_or_parent(work_dir_str, cwd)
+            or self._path_is_same_or_parent(cwd, work_dir_str)
+        ) or index.newest()
+        return Path(entry.path) if entry is not None else None
 
     def _extract_content_text(self, content: Any) -> str:
         if content is None:
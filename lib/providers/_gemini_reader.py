@@ -7,12 +7,15 @@ import os
 from pathlib import Path
 from typing import Any, List, Optional
 
-from .base import BaseCommReader, CommMessage
+from .base import TAIL_DOCUMENT, BaseCommReader, CommMessage
 
 
 class GeminiCommReader(BaseCommReader):
     """Reader for Gemini CLI session files."""
 
+    # Whole-file JSON rewritten on every turn: re-parse only when it changes.
+    tail_mode = TAIL_DOCUMENT
+
     def __init__(self, home_dir: Optional[str] = None, work_dir: Optional[Path] = None):
         super().__init__("gemini", home_dir=home_dir)
         self.work_dir = Path(work_dir).expanduser() if work_dir else Path.cwd()
@@ -35,16 +38,12 @@ class GeminiCommReader(BaseCommReader):
             return chats_dir
         return None
 
-    def _latest_session_in_chats(self, chats_dir: Path) -> Optional[Path]:
-        try:
-            sessions = sorted(
-                (path for path in chats_dir.glob("session-*.json") if path.is_file() and not path.name.startswith(".")),
-                key=lambda path: path.stat().st_mtime,
-            )
-        except OSError:
-            return None
+    def _index(self):
+        return self._session_index("*/chats/session-*.json")
 
-        return sessions[-1] if sessions else None
+    def _latest_session_in_chats(self, chats_dir: Path) -> Optional[Path]:
+        entry = self._index().newest(under=chats_dir)
+        return Path(entry.path) if entry is not None else None
 
     def _find_session_file(self) -> Optional[Path]:
         if self._preferred_session:
@@ -65,16 +64,9 @@ class GeminiCommReader(BaseCommReader):
                 return latest
 
         if os.environ.get("GEMINI_ALLOW_ANY_PROJECT_SCAN", "").lower() in {"1", "true", "yes"}:
-            try:
-                sessions = sorted(
-                    (path for path in self.home_dir.glob("*/chats/session-*.json") if path.is_file()),
-                    key=lambda path: path.stat().st_mtime,
-                )
-            except OSError:
-                sessions = []
-
-            if sessions:
-                return sessions[-1]
+            entry = self._index().newest()
+            if entry is not None:
+                return Path(entry.path)
 
         return None
 
@@ -5,12 +5,15 @@ import json
 from pathlib import Path
 from typing import Any, List, Optional
 
-from .base import BaseCommReader, CommMessage
+from .base import TAIL_LINES, BaseCommReader, CommMessage
 
 
 class IFlowCommReader(BaseCommReader):
     """Reader for iFlow CLI session logs."""
 
+    # Append-only JSONL: polls parse only newly written lines.
+    tail_mode = TAIL_LINES
+
     def __init__(self, home_dir: Optional[str] = None, work_dir: Optional[Path] = None):
         super().__init__("iflow", home_dir=home_dir)
         self.work_dir = Path(work_dir).expanduser() if work_dir else Path.cwd()
@@ -61,25 +64,12 @@ class IFlowCommReader(BaseCommReader):
 
         return None
 
-    def _latest_session_in_project(self, project_dir: Path) -> Optional[Path]:
-        latest_path: Optional[Path] = None
-        latest_mtime = -1.0
-
-        try:
-            for path in project_dir.glob("session-*.jsonl"):
-                if not path.is_file():
-                    continue
-                try:
-                    mtime = path.stat().st_mtime
-                except OSError:
-                    continue
-                if mtime >= latest_mtime:
-                    latest_mtime = mtime
-                    latest_path = path
-        except OSError:
-            return None
+    def _index(self):
+        return self._session_index("*/session-*.jsonl", root=self.projects_root)
 
-        return latest_path
+    def _latest_session_in_project(self, project_dir: Path) -> Optional[Path]:
+        entry = self._index().newest(under=project_dir)
+        return Path(entry.path) if entry is not None else None
 
     def _find_session_file(self) -> Optional[Path]:
         preferred = self._resolve_preferred_session()
@@ -96,24 +86,8 @@ class IFlowCommReader(BaseCommReader):
         if not root.exists():
             return None
 
-        latest_path: Optional[Path] = None
-        latest_mtime = -1.0
-
-        try:
-            for path in root.glob("*/session-*.jsonl"):
-                if not path.is_file():
-                    continue
-                try:
-                    mtime = path.stat().st_mtime
-                except OSError:
-                    continue
-                if mtime >= latest_mtime:
-                    latest_mtime = mtime
-                    latest_path = path
-        except OSError:
-            return None
-
-        return latest_path
+        entry = self._index().newest()
+        return Path(entry.path) if entry is not None else None
 
     def _extract_content_text(self, content: Any) -> str:
         if content is None:
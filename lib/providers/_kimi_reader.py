@@ -6,12 +6,15 @@ import json
 from pathlib import Path
 from typing import Any, List, Optional
 
-from .base import BaseCommReader, CommMessage
+from .base import TAIL_LINES, BaseCommReader, CommMessage
 
 
 class KimiCommReader(BaseCommReader):
     """Reader for Kimi CLI session logs."""
 
+    # Append-only JSONL: polls parse only newly written lines.
+    tail_mode = TAIL_LINES
+
     def __init__(self, home_dir: Optional[str] = None, work_dir: Optional[Path] = None):
         super().__init__("kimi", home_dir=home_dir)
         self.work_dir = Path(work_dir).resolve() if work_dir else Path.cwd().resolve()
@@ -59,28 +62,12 @@ class KimiCommReader(BaseCommReader):
 
         return None
 
-    def _latest_context_in_dir(self, directory: Path) -> Optional[Path]:
-        latest_file: Optional[Path] = None
-        latest_mtime = -1.0
-
-        try:
-            for session_dir in directory.iterdir():
-                if not session_dir.is_dir():
-                    continue
-                context_file = session_dir / "context.jsonl"
-                if not context_file.exists():
-                    continue
-                try:
-                    mtime = context_file.stat().st_mtime
-                except OSError:
-                    continue
-                if mtime >= latest_mtime:
-                    latest_mtime = mtime
-                    latest_file = context_file
-        except OSError:
-            return None
+    def _index(self):
+        return self._session_index("*/*/context.jsonl", root=self.sessions_root)
 
-        return latest_file
+    def _latest_context_in_dir(self, directory: Path) -> Optional[Path]:
+        entry = self._index().newest(under=directory)
+        return Path(entry.path) if entry is not None else None
 
     def _find_session_file(self) -> Optional[Path]:
         preferred = self._resolve_preferred_session()
@@ -97,24 +84,8 @@ class KimiCommReader(BaseCommReader):
         if not root.exists():
             return None
 
-        latest_file: Optional[Path] = None
-        latest_mtime = -1.0
-
-        try:
-            for context_file in root.glob("*/*/context.jsonl"):
-                if not context_file.is_file():
-                    continue
-                try:
-                    mtime = context_file.stat().st_mtime
-                except OSError:
-                    continue
-                if mtime >= latest_mtime:
-                    latest_mtime = mtime
-                    latest_file = context_file
-        except OSError:
-            return None
-
-        return latest_file
+        entry = self._index().newest()
+        return Path(entry.path) if entry is not None else None
 
     def _extract_content_text(self, content: Any) -> str:
         if content is None:
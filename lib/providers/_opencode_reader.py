@@ -4,14 +4,17 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from .base import BaseCommReader, CommMessage
+from .base import TAIL_DOCUMENT, BaseCommReader, CommMessage
 
 
 class OpenCodeCommReader(BaseCommReader):
     """Reader for OpenCode storage-backed session logs."""
 
+    # Messages live in separate message/part files; see _tail_signature.
+    tail_mode = TAIL_DOCUMENT
+
     def __init__(self, home_dir: Optional[str] = None, work_dir: Optional[Path] = None):
         super().__init__("opencode", home_dir=home_dir)
         self.work_dir = Path(work_dir).expanduser() if work_dir else Path.cwd()
@@ -137,36 +140,45 @@ class OpenCodeCommReader(BaseCommReader):
         if preferred is not None:
             return preferred
 
-        session_dir = self._session_dir()
-        if session_dir is not None:
-            try:
-                sessions = [path for path in session_dir.glob("ses_*.json") if path.is_file()]
-            except OSError:
-                sessions = []
-            if sessions:
-                sessions.sort(key=lambda path: path.stat().st_mtime)
-                return sessions[-1]
-
         if not self.session_root.exists():
             return None
 
-        latest: Optional[Path] = None
-        latest_mtime = -1.0
+        index = self._session_index("*/ses_*.json", root=self.session_root)
+        session_dir = self._session_dir()
+        entry = (index.newest(under=session_dir) if session_dir is not None else None) or index.newest()
+        return Path(entry.path) if entry is not None else None
+
+    def _tail_signature(self, session_file: Path, stat: os.stat_result) -> Tuple[Any, ...]:
+        """
+        Cheap change detector over the session's message store.
+
+        Covers the session file, the per-session message directory and its
+        files, and the part root; a part file rewritten in place without any
+        of those changing is picked up on the next message update.
+        """
+        signature: List[Any] = [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+        session_id = session_file.stem
+        nested_dir = self.message_root / session_id
         try:
-            for path in self.session_root.glob("*/ses_*.json"):
-                if not path.is_file():
-                    continue
-                try:
-                    mtime = path.stat().st_mtime
-                except OSError:
-                    continue
-                if mtime >= latest_mtime:
-                    latest_mtime = mtime
-                    latest = path
+            if nested_dir.is_dir():
+                with os.scandir(nested_dir) as entries:
+                    mtimes = [entry.stat().st_mtime_ns for entry in entries]
+                signature.extend((nested_dir.stat().st_mtime_ns, len(mtimes), max(mtimes, default=0)))
+            elif self.message_root.exists():
+                signature.append(self.message_root.stat().st_mtime_ns)
+            if self.part_root.exists():
+                signature.append(self.part_root.stat().st_mtime_ns)
         except OSError:
-            return None
-
-        return latest
+            signature.append(None)
+        return tuple(signature)
+
+    def _watch_paths(self, session_file: Optional[Path]) -> List[Path]:
+        """Replies land in the message and part stores, not the session file."""
+        paths = super()._watch_paths(session_file)
+        if session_file is not None:
+            paths.append(self.message_root / session_file.stem)
+        paths.extend([self.message_root, self.part_root])
+        return paths
 
     def _read_messages(self, session_id: str) -> List[Dict]:
         nested_dir = self.message_root / session_id
@@ -5,12 +5,15 @@ import json
 from pathlib import Path
 from typing import Any, List, Optional
 
-from .base import BaseCommReader, CommMessage
+from .base import TAIL_LINES, BaseCommReader, CommMessage
 
 
 class QwenCommReader(BaseCommReader):
     """Reader for Qwen CLI session logs."""
 
+    # Append-only JSONL: polls parse only newly written lines.
+    tail_mode = TAIL_LINES
+
     def __init__(self, home_dir: Optional[str] = None, work_dir: Optional[Path] = None):
         super().__init__("qwen", home_dir=home_dir)
         self.work_dir = Path(work_dir).expanduser() if work_dir else Path.cwd()
@@ -63,25 +66,12 @@ class QwenCommReader(BaseCommReader):
 
         return None
 
-    def _latest_session_in_dir(self, chats_dir: Path) -> Optional[Path]:
-        latest_file: Optional[Path] = None
-        latest_mtime = -1.0
-
-        try:
-            for path in chats_dir.glob("*.jsonl"):
-                if not path.is_file() or path.name.startswith("."):
-                    continue
-                try:
-                    mtime = path.stat().st_mtime
-                except OSError:
-                    continue
-                if mtime >= latest_mtime:
-                    latest_mtime = mtime
-                    latest_file = path
-        except OSError:
-            return None
+    def _index(self):
+        return self._session_index("*/chats/*.jsonl", root=self.projects_root)
 
-        return latest_file
+    def _latest_session_in_dir(self, chats_dir: Path) -> Optional[Path]:
+        entry = self._index().newest(under=chats_dir)
+        return Path(entry.path) if entry is not None else None
 
     def _find_session_file(self) -> Optional[Path]:
         preferred = self._resolve_preferred_session()
@@ -98,24 +88,8 @@ class QwenCommReader(BaseCommReader):
         if not root.exists():
             return None
 
-        latest_file: Optional[Path] = None
-        latest_mtime = -1.0
-
-        try:
-            for path in root.glob("*/chats/*.jsonl"):
-                if not path.is_file():
-                    continue
-                try:
-                    mtime = path.stat().st_mtime
-                except OSError:
-                    continue
-                if mtime >= latest_mtime:
-                    latest_mtime = mtime
-                    latest_file = path
-        except OSError:
-            return None
-
-        return latest_file
+        entry = self._index().newest()
+        return Path(entry.path) if entry is not None else None
 
     def _extract_content_text(self, content: Any) -> str:
         if content is None:
@@ -1,15 +1,23 @@
 """Base communication reader abstractions for provider session files."""
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import json
+import os
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from lib.common.logging import get_logger
 
+from .file_watch import create_watcher
+from .session_index import MetaExtractor, SessionIndex, get_session_index
+
 
 @dataclass
 class CommState:
@@ -31,14 +39,46 @@ class CommMessage:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+# Tail modes: append-only JSONL parsed from the last offset, or a document
+# that is rewritten in place and re-parsed only when its signature changes.
+TAIL_LINES = "lines"
+TAIL_DOCUMENT = "document"
+
+
+@dataclass
+class SessionTail:
+    """Incremental read position and parsed summary for one session file."""
+
+    path: str
+    dev: int = 0
+    ino: int = 0
+    offset: int = 0
+    signature: Tuple[Any, ...] = ()
+    mtime: float = 0.0
+    size: int = 0
+    message_count: int = 0
+    last_assistant: Optional[CommMessage] = None
+    recent: Deque[CommMessage] = field(default_factory=deque)
+
+
 class BaseCommReader(ABC):
     """Base class for provider communication log readers."""
 
+    # How session files are followed; subclasses with whole-document formats
+    # set TAIL_DOCUMENT.
+    tail_mode: str = TAIL_LINES
+    # Recent messages kept per session for latest_conversations().
+    recent_ring_size: int = 64
+    # Session files followed at once before the oldest state is dropped.
+    max_tailed_sessions: int = 16
+
     def __init__(self, provider_name: str, home_dir: Optional[str] = None):
         self.provider = provider_name
         self.home_dir = Path(home_dir or self._default_home()).expanduser()
         self.logger = get_logger(f"providers.{provider_name}")
         self._preferred_session: Optional[str] = None
+        self._tails: Dict[str, SessionTail] = {}
+        self._tail_lock = threading.Lock()
 
     @abstractmethod
     def _default_home(self) -> str:
@@ -60,6 +100,107 @@ class BaseCommReader(ABC):
             self.logger.debug("Failed reading session file %s: %s", session_file, exc)
             return []
 
+    def _session_index(
+        self,
+        pattern: str,
+        extract_meta: Optional[MetaExtractor] = None,
+        root: Optional[Path] = None,
+    ) -> SessionIndex:
+        """Shared discovery index for ``pattern`` under ``root`` (default: home_dir)."""
+        return get_session_index(root or self.home_dir, pattern, extract_meta)
+
+    def _tail_signature(self, session_file: Path, stat: os.stat_result) -> Tuple[Any, ...]:
+        """Change detector for TAIL_DOCUMENT readers."""
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _new_tail(self, session_file: Path, stat: os.stat_result) -> SessionTail:
+        if len(self._tails) >= self.max_tailed_sessions:
+            self._tails.pop(next(iter(self._tails)))
+        tail = SessionTail(
+            path=str(session_file),
+            dev=stat.st_dev,
+            ino=stat.st_ino,
+            recent=deque(maxlen=self.recent_ring_size),
+        )
+        self._tails[tail.path] = tail
+        return tail
+
+    def _absorb(self, tail: SessionTail, messages: List[CommMessage]) -> None:
+        if not messages:
+            return
+        tail.message_count += len(messages)
+        tail.recent.extend(messages)
+        for message in reversed(messages):
+            if message.role.lower() == "assistant":
+                tail.last_assistant = message
+                break
+
+    def _read_appended(self, tail: SessionTail, session_file: Path, size: int) -> None:
+        """Parse complete lines appended since ``tail.offset``."""
+        with session_file.open("rb") as handle:
+            handle.seek(tail.offset)
+            data = handle.read(max(0, size - tail.offset))
+
+        cut = data.rfind(b"\n") + 1
+        complete, remainder = data[:cut], data[cut:]
+        # A final record without a trailing newline counts once it is a whole
+        # JSON object; a half-written line fails to parse and waits.
+        stripped = remainder.strip()
+        if stripped.startswith(b"{") and stripped.endswith(b"}"):
+            try:
+                json.loads(stripped)
+                complete, remainder = data, b""
+            except ValueError:
+                pass
+
+        if not complete:
+            return
+        tail.offset += len(complete)
+        self._absorb(tail, self._parse_messages(complete.decode("utf-8", errors="replace")))
+
+    def _tail(self, session_file: Path) -> Optional[SessionTail]:
+        """
+        Bring the tail state for ``session_file`` up to date and return it.
+
+        Line-mode files are read from the remembered byte offset, so a poll
+        costs a ``stat`` plus whatever was appended.  A changed inode or a
+        file shorter than the offset (rotation/truncation) restarts from 0.
+        """
+        try:
+            stat = session_file.stat()
+        except OSError:
+            return None
+
+        with self._tail_lock:
+            key = str(session_file)
+            tail = self._tails.get(key)
+            try:
+                if self.tail_mode == TAIL_DOCUMENT:
+                    signature = self._tail_signature(session_file, stat)
+                    if tail is None or tail.signature != signature:
+                        self._tails.pop(key, None)
+                        tail = self._new_tail(session_file, stat)
+                        tail.signature = signature
+                        self._absorb(tail, self._read_session_messages(session_file))
+                else:
+                    if (
+                        tail is None
+                        or (tail.dev, tail.ino) != (stat.st_dev, stat.st_ino)
+                        or stat.st_size < tail.offset
+                    ):
+                        self._tails.pop(key, None)
+                        tail = self._new_tail(session_file, stat)
+                    if stat.st_size > tail.offset:
+                        self._read_appended(tail, session_file, stat.st_size)
+            except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError) as exc:
+                self.logger.debug("Failed tailing session file %s: %s", session_file, exc)
+                self._tails.pop(key, None)
+                return None
+
+            tail.mtime = stat.st_mtime
+            tail.size = stat.st_size
+            return tail
+
     def project_hash(self, path: str) -> str:
         """Compute stable project hash (SHA256/16)."""
         return hashlib.sha256(path.encode("utf-8")).hexdigest()[:16]
@@ -74,17 +215,15 @@ class BaseCommReader(ABC):
         if not session_file or not session_file.exists():
             return CommState()
 
-        try:
-            stat = session_file.stat()
-        except OSError:
+        tail = self._tail(session_file)
+        if tail is None:
             return CommState()
 
-        messages = self._read_session_messages(session_file)
         return CommState(
             session_id=session_file.stem,
-            last_mtime=stat.st_mtime,
-            last_size=stat.st_size,
-            message_count=len(messages),
+            last_mtime=tail.mtime,
+            last_size=tail.size,
+            message_count=tail.message_count,
         )
 
     def latest_message(self) -> Optional[str]:
@@ -93,12 +232,11 @@ class BaseCommReader(ABC):
         if not session_file or not session_file.exists():
             return None
 
-        messages = self._read_session_messages(session_file)
-        assistant_messages = [message for message in messages if message.role.lower() == "assistant"]
-        if not assistant_messages:
+        tail = self._tail(session_file)
+        if tail is None or tail.last_assistant is None:
             return None
 
-        content = assistant_messages[-1].content.strip()
+        content = tail.last_assistant.content.strip()
         return content or None
 
     def latest_conversations(self, n: int = 5) -> List[CommMessage]:
@@ -107,9 +245,14 @@ class BaseCommReader(ABC):
         if not session_file or not session_file.exists():
             return []
 
-        messages = self._read_session_messages(session_file)
         if n <= 0:
             return []
+
+        tail = self._tail(session_file)
+        if tail is not None and (n <= len(tail.recent) or tail.message_count == len(tail.recent)):
+            return list(tail.recent)[-n:]
+
+        messages = self._read_session_messages(session_file)
         return messages[-n:]
 
     def try_get_message(self, state: CommState) -> Optional[str]:
@@ -119,20 +262,73 @@ class BaseCommReader(ABC):
             return self.latest_message()
         return None
 
+    def _watch_paths(self, session_file: Optional[Path]) -> List[Path]:
+        """Paths whose changes can mean a new reply; readers with side stores extend this."""
+        if session_file is None:
+            return [self.home_dir]
+        return [session_file, session_file.parent]
+
+    def _rewatch(self, watcher: Any, watched: Any, max_wait: float) -> Tuple[Any, Any]:
+        """(Re)create the watcher when the session file it follows changes."""
+        session_file = self._find_session_file()
+        key = str(session_file) if session_file else None
+        if watcher is not None and key == watched:
+            return watcher, watched
+        if watcher is not None:
+            watcher.close()
+        return create_watcher(self._watch_paths(session_file), max_interval=max_wait), key
+
     def wait_for_message(
         self,
         state: CommState,
         timeout: float = 300.0,
         poll_interval: float = 2.0,
     ) -> Optional[str]:
-        """Wait until a new message arrives or timeout."""
-        deadline = time.time() + max(0.0, timeout)
-        effective_poll = max(0.02, poll_interval)
+        """
+        Wait until a new message arrives or timeout.
 
-        while time.time() < deadline:
-            new_message = self.try_get_message(state)
-            if new_message:
-                return new_message
-            time.sleep(effective_poll)
+        Sleeps on a file watcher over the session log and wakes as soon as it
+        changes.  ``poll_interval`` caps the time between re-checks, which is
+        how sessions appearing in unwatched directories are picked up.
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        max_wait = max(0.02, poll_interval)
+        watcher = watched = None
+        try:
+            while True:
+                new_message = self.try_get_message(state)
+                if new_message:
+                    return new_message
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                watcher, watched = self._rewatch(watcher, watched, max_wait)
+                watcher.wait(min(remaining, max_wait))
+        finally:
+            if watcher is not None:
+                watcher.close()
 
-        return None
+    async def wait_for_message_async(
+        self,
+        state: CommState,
+        timeout: float = 300.0,
+        poll_interval: float = 2.0,
+    ) -> Optional[str]:
+        """Asyncio counterpart of ``wait_for_message``; file reads run in a worker thread."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(0.0, timeout)
+        max_wait = max(0.02, poll_interval)
+        watcher = watched = None
+        try:
+            while True:
+                new_message = await asyncio.to_thread(self.try_get_message, state)
+                if new_message:
+                    return new_message
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                watcher, watched = await asyncio.to_thread(self._rewatch, watcher, watched, max_wait)
+                await watcher.wait_async(min(remaining, max_wait))
+        finally:
+            if watcher is not None:
+                watcher.close()
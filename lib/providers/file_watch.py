@@ -0,0 +1,231 @@
+"""
+File-change watching for provider reply waits.
+
+``create_watcher`` returns an inotify watcher on Linux (via ctypes, no extra
+dependency) and a stat poller elsewhere.  Both expose the same small API:
+
+- ``wait(timeout)``: block until a watched path changes or ``timeout`` passes;
+  returns True on change.
+- ``await wait_async(timeout)``: the same without blocking the event loop.
+- ``close()``.
+
+The poller starts at ``min_interval`` and doubles its sleep up to
+``max_interval`` while nothing changes, dropping back to ``min_interval`` on
+every change, so an active session is checked quickly and an idle one costs
+almost nothing.  Set ``CCB_FILE_WATCH=poll`` to force the poller.
+"""
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lib.common.logging import get_logger
+
+logger = get_logger("providers.file_watch")
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+FILE_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF
+DIR_MASK = FILE_MASK | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+
+DEFAULT_MIN_INTERVAL = 0.02
+DEFAULT_MAX_INTERVAL = 2.0
+
+_libc = None
+_inotify_checked = False
+
+
+def _inotify_libc():
+    """Return libc with inotify symbols, or None when unavailable."""
+    global _libc, _inotify_checked
+    if _inotify_checked:
+        return _libc
+    _inotify_checked = True
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        _libc = libc
+    except (OSError, AttributeError):
+        logger.debug("inotify unavailable; using polling file watcher", exc_info=True)
+        _libc = None
+    return _libc
+
+
+class PollingWatcher:
+    """Stat-based watcher with exponential backoff that resets on change."""
+
+    kind = "poll"
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+    ):
+        self.paths = [Path(p) for p in paths]
+        self.min_interval = max(0.001, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self._interval = self.min_interval
+        self._signature = self._snapshot()
+
+    def _snapshot(self) -> Tuple[Optional[Tuple[int, int, int]], ...]:
+        signature: List[Optional[Tuple[int, int, int]]] = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                signature.append((st.st_ino, st.st_size, st.st_mtime_ns))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _check(self) -> bool:
+        current = self._snapshot()
+        if current != self._signature:
+            self._signature = current
+            self._interval = self.min_interval
+            return True
+        self._interval = min(self._interval * 2, self.max_interval)
+        return False
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self._interval, remaining))
+            if self._check():
+                return True
+
+    async def wait_async(self, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(0.0, timeout)
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(self._interval, remaining))
+            if self._check():
+                return True
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher; directories also report creates and renames."""
+
+    kind = "inotify"
+
+    def __init__(self, paths: Iterable[Path]):
+        libc = _inotify_libc()
+        if libc is None:
+            raise OSError("inotify is not available")
+        self._libc = libc
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+        self.paths: List[Path] = []
+        self._wds: Dict[int, Path] = {}
+        for path in paths:
+            self.add(Path(path))
+        if not self._wds:
+            self.close()
+            raise OSError("no watchable paths")
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def add(self, path: Path) -> bool:
+        mask = DIR_MASK if path.is_dir() else FILE_MASK
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            logger.debug("inotify_add_watch failed for %s: %s", path, os.strerror(ctypes.get_errno()))
+            return False
+        self._wds[wd] = path
+        self.paths.append(path)
+        return True
+
+    def _drain(self) -> bool:
+        changed = False
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return changed
+            except OSError:
+                return changed
+            if not data:
+                return changed
+            changed = True
+
+    def wait(self, timeout: float) -> bool:
+        if self._drain():
+            return True
+        try:
+            ready, _, _ = select.select([self._fd], [], [], max(0.0, timeout))
+        except (OSError, ValueError):
+            return False
+        return bool(ready) and self._drain()
+
+    async def wait_async(self, timeout: float) -> bool:
+        if self._drain():
+            return True
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        loop.add_reader(self._fd, event.set)
+        try:
+            await asyncio.wait_for(event.wait(), max(0.0, timeout))
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            loop.remove_reader(self._fd)
+        return self._drain()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = -1
+
+
+def create_watcher(
+    paths: Iterable[Path],
+    min_interval: float = DEFAULT_MIN_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+):
+    """Best available watcher for ``paths`` (missing paths are skipped by inotify)."""
+    paths = [Path(p) for p in paths]
+    if os.environ.get("CCB_FILE_WATCH", "").strip().lower() != "poll":
+        existing = [p for p in paths if p.exists()]
+        if existing:
+            try:
+                return InotifyWatcher(existing)
+            except OSError:
+                logger.debug("Falling back to polling watcher for %s", existing, exc_info=True)
+    return PollingWatcher(paths, min_interval=min_interval, max_interval=max_interval)
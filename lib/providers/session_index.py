@@ -0,0 +1,396 @@
+"""
+Persistent discovery index for provider session files.
+
+Replaces per-poll recursive globs in the comm readers.  An index covers one
+root directory and one glob pattern; it remembers every matching file's
+``(path, mtime, size, cwd, session_id)`` plus the mtime of every directory it
+walked.  A refresh only re-lists directories whose mtime changed (new or
+removed files), re-stats the most recently active files (appends do not touch
+the directory mtime), and falls back to a full re-stat every
+``full_restat_s``.  The newest session per working directory and per parent
+directory is maintained on refresh, so lookups are dictionary hits.
+
+Indexes are shared process-wide through ``get_session_index`` and persisted
+as JSON so a fresh process starts warm.
+"""
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import heapq
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from lib.common.logging import get_logger
+
+logger = get_logger("providers.session_index")
+
+# (cwd, session_id) read once per new file, and again as the file grows
+# while neither is known yet; must depend only on the file.
+MetaExtractor = Callable[[Path], Tuple[Optional[str], Optional[str]]]
+
+INDEX_VERSION = 2
+
+
+@dataclass
+class SessionEntry:
+    """One indexed session file."""
+
+    path: str
+    mtime: float
+    size: int
+    ino: int = 0
+    cwd: Optional[str] = None
+    session_id: Optional[str] = None
+
+    @property
+    def parent(self) -> str:
+        return os.path.dirname(self.path)
+
+
+class SessionIndex:
+    """Incrementally refreshed index of session files under ``root``."""
+
+    def __init__(
+        self,
+        root: Path,
+        pattern: str,
+        extract_meta: Optional[MetaExtractor] = None,
+        *,
+        cache_path: Optional[Path] = None,
+        min_refresh_s: float = 0.25,
+        hot_files: int = 32,
+        full_restat_s: float = 60.0,
+    ):
+        self.root = Path(root)
+        self.pattern = pattern
+        self.extract_meta = extract_meta
+        self.cache_path = cache_path
+        self.min_refresh_s = min_refresh_s
+        self.hot_files = hot_files
+        self.full_restat_s = full_restat_s
+
+        self._recursive = pattern.startswith("**/")
+        self._file_pattern = pattern[3:] if self._recursive else pattern
+        self._parts = PurePosixPath(self._file_pattern).parts
+        self._depth = len(self._parts)
+
+        self._entries: Dict[str, SessionEntry] = {}
+        # directory -> (mtime_ns, subdirectories) as of its last listing
+        self._dirs: Dict[str, Tuple[int, List[str]]] = {}
+        self._files_by_dir: Dict[str, Set[str]] = {}
+        self._newest_by_cwd: Dict[str, SessionEntry] = {}
+        self._newest_by_parent: Dict[str, SessionEntry] = {}
+        self._by_stem: Dict[str, str] = {}
+        self._hot: List[str] = []
+        self._lock = threading.RLock()
+        self._last_refresh = 0.0
+        self._last_full_restat = 0.0
+        # Set when files appear or disappear; mtime/size updates are applied
+        # to the views in place and re-verified on load.
+        self._dirty = False
+        self.stats = {"refreshes": 0, "dirs_listed": 0, "files_stat": 0, "meta_reads": 0}
+
+        self._load()
+
+    # ------------------------------------------------------------------ walk
+
+    def _matches(self, dir_parts: Tuple[str, ...], name: str) -> bool:
+        if name.startswith("."):
+            return False
+        if self._recursive:
+            if self._depth == 1:
+                return fnmatch.fnmatchcase(name, self._parts[0])
+            return PurePosixPath(*dir_parts, name).match(self._file_pattern)
+        parts = dir_parts + (name,)
+        return len(parts) == self._depth and all(
+            fnmatch.fnmatchcase(part, pat) for part, pat in zip(parts, self._parts)
+        )
+
+    def _list_dir(self, directory: str, mtime_ns: int) -> List[str]:
+        """Re-list ``directory``; returns its subdirectories."""
+        self.stats["dirs_listed"] += 1
+        rel = os.path.relpath(directory, self.root)
+        dir_parts = () if rel == "." else tuple(rel.split(os.sep))
+        can_descend = self._recursive or len(dir_parts) < self._depth - 1
+        subdirs: List[str] = []
+        seen: Dict[str, os.stat_result] = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if can_descend and not entry.name.startswith("."):
+                                subdirs.append(entry.path)
+                        elif entry.is_file() and self._matches(dir_parts, entry.name):
+                            seen[entry.path] = entry.stat()
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+        for path in self._files_by_dir.get(directory, set()) - seen.keys():
+            self._remove(path)
+        for path, st in seen.items():
+            self._upsert(path, st)
+        self._dirs[directory] = (mtime_ns, subdirs)
+        return subdirs
+
+    def _remove(self, path: str) -> None:
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return
+        files = self._files_by_dir.get(entry.parent)
+        if files is not None:
+            files.discard(path)
+            if not files:
+                del self._files_by_dir[entry.parent]
+        self._dirty = True
+
+    def _read_meta(self, path: str) -> Tuple[Optional[str], Optional[str]]:
+        if self.extract_meta is None:
+            return None, None
+        self.stats["meta_reads"] += 1
+        try:
+            return self.extract_meta(Path(path))
+        except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError):
+            logger.debug("Session metadata extraction failed for %s", path, exc_info=True)
+            return None, None
+
+    def _upsert(self, path: str, st: os.stat_result) -> None:
+        entry = self._entries.get(path)
+        self.stats["files_stat"] += 1
+        if entry is not None and entry.ino == st.st_ino and st.st_size >= entry.size:
+            if entry.mtime != st.st_mtime or entry.size != st.st_size:
+                grew = st.st_size > entry.size
+                entry.mtime = st.st_mtime
+                entry.size = st.st_size
+                # Indexed before its metadata line was written: retry as it grows.
+                if grew and entry.cwd is None and entry.session_id is None:
+                    entry.cwd, entry.session_id = self._read_meta(path)
+                    if entry.cwd is not None or entry.session_id is not None:
+                        self._dirty = True
+                self._note(entry)
+            return
+
+        cwd, session_id = self._read_meta(path)
+        entry = SessionEntry(
+            path=path,
+            mtime=st.st_mtime,
+            size=st.st_size,
+            ino=st.st_ino,
+            cwd=cwd,
+            session_id=session_id,
+        )
+        self._entries[path] = entry
+        self._files_by_dir.setdefault(entry.parent, set()).add(path)
+        self._dirty = True
+
+    def _note(self, entry: SessionEntry) -> None:
+        """Fold a newer mtime into the per-cwd and per-directory views."""
+        if entry.cwd:
+            current = self._newest_by_cwd.get(entry.cwd)
+            if current is None or entry.mtime >= current.mtime:
+                self._newest_by_cwd[entry.cwd] = entry
+        current = self._newest_by_parent.get(entry.parent)
+        if current is None or entry.mtime >= current.mtime:
+            self._newest_by_parent[entry.parent] = entry
+
+    def _restat(self, paths: Iterable[str]) -> None:
+        for path in list(paths):
+            try:
+                st = os.stat(path)
+            except OSError:
+                self._remove(path)
+                continue
+            self._upsert(path, st)
+
+    def refresh(self, force: bool = False) -> None:
+        """Bring the index up to date with the filesystem."""
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_refresh < self.min_refresh_s:
+                return
+            self._last_refresh = now
+            self.stats["refreshes"] += 1
+
+            root = str(self.root)
+            if not os.path.isdir(root):
+                if self._entries or self._dirs:
+                    self._entries.clear()
+                    self._dirs.clear()
+                    self._files_by_dir.clear()
+                    self._dirty = True
+            else:
+                self._walk(root)
+
+            if now - self._last_full_restat >= self.full_restat_s:
+                self._last_full_restat = now
+                self._restat(self._entries)
+            else:
+                self._restat(self._hot)
+
+            if self._dirty:
+                self._rebuild_views()
+                self._save()
+
+    def _walk(self, root: str) -> None:
+        pending = [root]
+        visited: Set[str] = set()
+        while pending:
+            directory = pending.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            visited.add(directory)
+            known = self._dirs.get(directory)
+            if known is not None and known[0] == mtime_ns:
+                pending.extend(known[1])
+            else:
+                pending.extend(self._list_dir(directory, mtime_ns))
+
+        for directory in set(self._dirs) - visited:
+            del self._dirs[directory]
+            for path in list(self._files_by_dir.get(directory, ())):
+                self._remove(path)
+            self._dirty = True
+
+    def _rebuild_views(self) -> None:
+        self._newest_by_cwd = {}
+        self._newest_by_parent = {}
+        self._by_stem = {}
+        for entry in self._entries.values():
+            self._note(entry)
+            self._by_stem[Path(entry.path).stem] = entry.path
+        self._hot = [
+            e.path for e in heapq.nlargest(self.hot_files, self._entries.values(), key=lambda e: e.mtime)
+        ]
+
+    # ---------------------------------------------------------------- lookup
+
+    def newest(
+        self,
+        cwd: Optional[str] = None,
+        under: Optional[Path] = None,
+        cwd_match: Optional[Callable[[str], bool]] = None,
+    ) -> Optional[SessionEntry]:
+        """
+        Newest session overall, for an exact ``cwd``, for cwds accepted by
+        ``cwd_match``, or below the directory ``under``.
+        """
+        self.refresh()
+        with self._lock:
+            if cwd is not None:
+                return self._newest_by_cwd.get(cwd)
+            if cwd_match is not None:
+                candidates = [e for c, e in self._newest_by_cwd.items() if cwd_match(c)]
+            elif under is not None:
+                base = str(under).rstrip(os.sep)
+                prefix = base + os.sep
+                candidates = [
+                    e for parent, e in self._newest_by_parent.items()
+                    if parent == base or parent.startswith(prefix)
+                ]
+            else:
+                candidates = list(self._newest_by_parent.values())
+        return max(candidates, key=lambda e: e.mtime, default=None)
+
+    def find(self, session_id: str) -> Optional[SessionEntry]:
+        """Newest session whose file stem or recorded id contains ``session_id``."""
+        if not session_id:
+            return None
+        self.refresh()
+        with self._lock:
+            path = self._by_stem.get(session_id)
+            if path is not None:
+                return self._entries.get(path)
+            matches = [
+                e for e in self._entries.values()
+                if session_id in Path(e.path).stem or e.session_id == session_id
+            ]
+        return max(matches, key=lambda e: e.mtime, default=None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ----------------------------------------------------------- persistence
+
+    def _load(self) -> None:
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_VERSION or data.get("root") != str(self.root):
+                return
+            self._dirs = {k: (int(v[0]), list(v[1])) for k, v in data.get("dirs", {}).items()}
+            for item in data.get("entries", []):
+                entry = SessionEntry(**item)
+                self._entries[entry.path] = entry
+                self._files_by_dir.setdefault(entry.parent, set()).add(entry.path)
+        except (RuntimeError, ValueError, TypeError, KeyError, AttributeError, OSError, IndexError):
+            logger.debug("Ignoring unreadable session index %s", self.cache_path, exc_info=True)
+            self._dirs, self._entries, self._files_by_dir = {}, {}, {}
+            return
+        # File mtimes may be stale; the first refresh re-stats everything.
+        self._last_full_restat = -self.full_restat_s
+        self._rebuild_views()
+
+    def _save(self) -> None:
+        self._dirty = False
+        if self.cache_path is None:
+            return
+        payload = {
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "pattern": self.pattern,
+            "dirs": self._dirs,
+            "entries": [asdict(e) for e in self._entries.values()],
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            logger.debug("Failed to persist session index %s", self.cache_path, exc_info=True)
+
+
+_INDEXES: Dict[Tuple[str, str], SessionIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def default_index_dir() -> Path:
+    """Directory holding persisted session indexes."""
+    override = os.environ.get("CCB_SESSION_INDEX_DIR", "").strip()
+    if override:
+        return Path(override).expanduser()
+    from lib.common.paths import data_dir
+
+    return data_dir() / "session_index"
+
+
+def get_session_index(
+    root: Path,
+    pattern: str,
+    extract_meta: Optional[MetaExtractor] = None,
+) -> SessionIndex:
+    """Return the process-wide index for ``(root, pattern)``, creating it once."""
+    key = (str(Path(root).expanduser()), pattern)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            digest = hashlib.sha1(f"{key[0]}\0{pattern}".encode("utf-8")).hexdigest()[:16]
+            index = SessionIndex(
+                Path(key[0]),
+                pattern,
+                extract_meta,
+                cache_path=default_index_dir() / f"{digest}.json",
+            )
+            _INDEXES[key] = index
+        return index
@@ -1,14 +1,34 @@
 from __future__ import annotations
 import os
 import re
+import shlex
 import subprocess
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 
 try:
-    from .terminal_utils import HANDLED_EXCEPTIONS, TerminalBackend, _run
+    from .terminal_tmux_control import PaneOutputStream, TmuxControlClient, TmuxControlError, control_env
+    from .terminal_utils import HANDLED_EXCEPTIONS, TerminalBackend, _default_shell, _env_float, _run
 except ImportError:  # pragma: no cover - script mode
-    from terminal_utils import HANDLED_EXCEPTIONS, TerminalBackend, _run
+    from terminal_tmux_control import PaneOutputStream, TmuxControlClient, TmuxControlError, control_env
+    from terminal_utils import HANDLED_EXCEPTIONS, TerminalBackend, _default_shell, _env_float, _run
+
+# Commands that need no `-t` target to mean the same thing from a control
+# client as from the caller's own tmux client.
+_CONTROL_UNTARGETED = {
+    "delete-buffer": None,
+    "set-buffer": None,
+    "list-sessions": None,
+    "list-panes": "-a",
+    "show-option": "-g",
+    "show-options": "-g",
+}
+# Never routed through the control client.
+_CONTROL_EXCLUDED = {"attach", "attach-session", "new-session", "kill-server"}
+# Larger buffers go through `load-buffer -` on stdin instead of a command line.
+_CONTROL_MAX_INLINE = 64 * 1024
 
 
 class TmuxBackend(TerminalBackend):
@@ -22,13 +42,26 @@ class TmuxBackend(TerminalBackend):
         - If target starts with `%` or contains `:`/`.` it is treated as a tmux target (pane/window/session:win.pane).
         - Otherwise it is treated as a tmux session name (single-pane session legacy behavior).
     - Uses tmux pane_id (`%xx`) + pane title marker for daemon rediscovery.
+
+    Commands go over one persistent control-mode client (`tmux -C`) when the server is
+    running, instead of one `tmux` process each; `CCB_TMUX_CONTROL=0` (or
+    `control_mode=False`) keeps the subprocess path.
     """
 
     _ANSI_RE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
+    _CONTROL_RETRY_S = 30.0
 
-    def __init__(self, *, socket_name: str | None = None):
+    def __init__(self, *, socket_name: str | None = None, control_mode: bool | None = None):
         # Optional tmux server socket isolation (like `tmux -L <name>`). Useful for daemon mode.
         self._socket_name = (socket_name or os.environ.get("CCB_TMUX_SOCKET") or "").strip() or None
+        if control_mode is None:
+            control_mode = (os.environ.get("CCB_TMUX_CONTROL") or "1").strip().lower() not in ("0", "false", "no", "off")
+        self._control_enabled = control_mode
+        self._control: TmuxControlClient | None = None
+        self._control_lock = threading.Lock()
+        self._control_retry_at = 0.0
+        # session name -> read-only control client streaming that session's %output
+        self._watchers: dict[str, TmuxControlClient] = {}
 
     def _tmux_base(self) -> list[str]:
         cmd = ["tmux"]
@@ -50,8 +83,155 @@ class TmuxBackend(TerminalBackend):
             kwargs["input"] = input_bytes
         if timeout is not None:
             kwargs["timeout"] = timeout
+        if self._control_enabled:
+            control_args = self._control_args(args, input_bytes)
+            client = self._control_client() if control_args is not None else None
+            if client is not None:
+                try:
+                    ok, lines = client.command(control_args, timeout=timeout)
+                except TmuxControlError:
+                    pass  # not sent; the subprocess path below runs it
+                else:
+                    return self._control_result(args, ok, lines, check=check, capture=capture)
         return _run([*self._tmux_base(), *args], check=check, **kwargs)
 
+    # --- control mode -------------------------------------------------------------------
+
+    @staticmethod
+    def _control_args(args: list[str], input_bytes: bytes | None) -> list[str] | None:
+        """`args` rewritten for the control client, or None to use a subprocess."""
+        if not args or args[0] in _CONTROL_EXCLUDED:
+            return None
+        if input_bytes is not None:
+            # `load-buffer -b NAME -` reads stdin, which control commands do not have.
+            if args[0] != "load-buffer" or args[-1] != "-" or len(input_bytes) > _CONTROL_MAX_INLINE:
+                return None
+            try:
+                text = input_bytes.decode("utf-8")
+            except UnicodeDecodeError:
+                return None
+            return ["set-buffer", *args[1:-1], text]
+        if "-t" in args:
+            return list(args)
+        if args[0] in _CONTROL_UNTARGETED:
+            flag = _CONTROL_UNTARGETED[args[0]]
+            if flag is None or any(a.startswith(flag) for a in args[1:]):
+                return list(args)
+        # Untargeted commands resolve against the calling client (e.g. `display-message -p`).
+        return None
+
+    def _control_result(self, args: list[str], ok: bool, lines: list[str], *, check: bool,
+                        capture: bool) -> subprocess.CompletedProcess:
+        text = "".join(line + "\n" for line in lines)
+        stdout, stderr = (text, "") if ok else ("", text)
+        cmd = [*self._tmux_base(), *args]
+        if check and not ok:
+            raise subprocess.CalledProcessError(1, cmd, output=stdout, stderr=stderr)
+        if not capture:
+            stdout = stderr = None
+        return subprocess.CompletedProcess(cmd, 0 if ok else 1, stdout, stderr)
+
+    def _control_argv(self) -> list[str]:
+        cmd = ["tmux"]
+        if self._socket_name:
+            cmd.extend(["-L", self._socket_name])
+        else:
+            # The control process runs with $TMUX unset (it must attach), so pin the
+            # caller's server socket explicitly.
+            socket_path = (os.environ.get("TMUX") or "").split(",", 1)[0]
+            if socket_path:
+                cmd.extend(["-S", socket_path])
+        return cmd
+
+    def _server_socket(self) -> Path:
+        socket_path = (os.environ.get("TMUX") or "").split(",", 1)[0]
+        if socket_path and not self._socket_name:
+            return Path(socket_path)
+        tmpdir = os.environ.get("TMUX_TMPDIR") or "/tmp"
+        return Path(tmpdir) / f"tmux-{os.getuid()}" / (self._socket_name or "default")
+
+    def _control_client(self) -> TmuxControlClient | None:
+        client = self._control
+        if client is not None and client.alive:
+            return client
+        with self._control_lock:
+            client = self._control
+            if client is not None and client.alive:
+                return client
+            self._control = None
+            now = time.time()
+            if now < self._control_retry_at:
+                return None
+            self._control_retry_at = now + self._CONTROL_RETRY_S
+            # Never start a tmux server just to answer a query.
+            if not hasattr(os, "getuid") or not self._server_socket().exists():
+                return None
+            session = f"ccb-ctl-{os.getpid()}-{id(self) & 0xffff:x}"
+            argv = [
+                *self._control_argv(), "-C",
+                # A cheap placeholder process; the session dies with this client.
+                "new-session", "-s", session, "cat", ";",
+                "set-option", "-t", session, "destroy-unattached", "on",
+            ]
+            try:
+                self._control = TmuxControlClient(argv, env=control_env()).start()
+            except (TmuxControlError, OSError):
+                return None
+            self._control_retry_at = 0.0
+            return self._control
+
+    def open_output_stream(self, pane_id: str, *, strip_ansi: bool = True) -> Optional[PaneOutputStream]:
+        """
+        Stream a pane's output as tmux emits it (`%output`), instead of polling `capture-pane`.
+
+        Returns None when control mode is unavailable; callers then keep polling
+        `get_pane_content`.
+        """
+        if not self._control_enabled or not self._looks_like_pane_id(pane_id):
+            return None
+        cp = self._tmux_run(["display-message", "-p", "-t", pane_id, "#{session_name}"], capture=True, timeout=2.0)
+        session = (cp.stdout or "").strip()
+        if cp.returncode != 0 or not session:
+            return None
+        with self._control_lock:
+            watcher = self._watchers.get(session)
+            if watcher is None or not watcher.alive:
+                # Read-only and sizeless: does not affect the user's layout or input.
+                argv = [*self._control_argv(), "-C", "attach-session", "-r", "-t", session]
+                try:
+                    watcher = TmuxControlClient(argv, env=control_env()).start()
+                except (TmuxControlError, OSError):
+                    return None
+                self._watchers[session] = watcher
+
+        def _release(stream: PaneOutputStream) -> None:
+            watcher.remove_output_listener(pane_id, stream.feed)
+            with self._control_lock:
+                if not watcher.has_listeners() and self._watchers.get(session) is watcher:
+                    del self._watchers[session]
+                    watcher.close()
+
+        stream = PaneOutputStream(pane_id, strip_ansi=strip_ansi, on_close=_release)
+        watcher.add_output_listener(pane_id, stream.feed)
+        return stream
+
+    def get_control_stats(self) -> dict:
+        client = self._control
+        return {
+            "enabled": self._control_enabled,
+            "client": client.get_stats() if client is not None else None,
+            "watchers": {name: w.get_stats() for name, w in self._watchers.items()},
+        }
+
+    def close(self) -> None:
+        """Stop the control-mode clients (the subprocess path keeps working)."""
+        with self._control_lock:
+            clients = [c for c in (self._control, *self._watchers.values()) if c is not None]
+            self._control = None
+            self._watchers.clear()
+        for client in clients:
+            client.close()
+
     @staticmethod
     def _looks_like_pane_id(value: str) -> bool:
         v = (value or "").strip()
@@ -0,0 +1,316 @@
+"""
+tmux control-mode (``tmux -C``) client.
+
+One long-lived ``tmux -C`` process carries any number of commands.  Each
+command is written as a line and answered, in order, by a
+``%begin``/``%end`` (or ``%error``) block.  Lines outside blocks are
+notifications; ``%output`` lines carry pane output and feed per-pane
+listeners, so output can be consumed as a stream instead of polled with
+``capture-pane``.
+"""
+from __future__ import annotations
+
+import codecs
+import os
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    from .terminal_utils import HANDLED_EXCEPTIONS
+except ImportError:  # pragma: no cover - script mode
+    from terminal_utils import HANDLED_EXCEPTIONS
+
+
+_ANSI_RE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
+_OCTAL_RE = re.compile(rb"\\([0-7]{3})")
+_BLOCK_RE = re.compile(rb"^%(begin|end|error) (\d+) (\d+) (\d+)")
+
+
+class TmuxControlError(RuntimeError):
+    """The control client could not run a command (not started or gone)."""
+
+
+def quote_tmux_arg(arg: str) -> str:
+    """
+    Quote one argument for tmux's command parser.
+
+    Single-quoted text is taken literally (no ``$``/``~``/``#`` handling);
+    quotes and line breaks, which cannot appear inside it, are spliced in
+    as adjacent double-quoted words.
+    """
+    if arg == "":
+        return "''"
+    parts = []
+    for piece in re.split(r"(['\n\r])", arg):
+        if piece == "'":
+            parts.append('"\'"')
+        elif piece == "\n":
+            parts.append('"\\n"')
+        elif piece == "\r":
+            parts.append('"\\r"')
+        elif piece:
+            parts.append(f"'{piece}'")
+    return "".join(parts)
+
+
+def format_command(args: List[str]) -> str:
+    return " ".join(quote_tmux_arg(str(a)) for a in args)
+
+
+def decode_output(payload: bytes) -> bytes:
+    """Undo the octal escaping tmux applies to ``%output`` data."""
+    if b"\\" not in payload:
+        return payload
+    return _OCTAL_RE.sub(lambda m: bytes((int(m.group(1), 8),)), payload)
+
+
+class _Pending:
+    __slots__ = ("event", "ok", "lines")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.ok = False
+        self.lines: List[str] = []
+
+
+class TmuxControlClient:
+    """
+    A ``tmux -C`` process plus a reader thread.
+
+    ``command()`` is thread-safe; replies are matched to callers in the
+    order the commands were written.
+    """
+
+    def __init__(self, argv: List[str], *, env: Optional[Dict[str, str]] = None):
+        self.argv = list(argv)
+        self._env = env
+        self._process: Optional[subprocess.Popen] = None
+        self._reader: Optional[threading.Thread] = None
+        self._write_lock = threading.Lock()
+        self._pending: Deque[_Pending] = deque()
+        self._ready = threading.Event()
+        self._closed = False
+        self._listeners: Dict[str, List[Callable[[bytes], None]]] = {}
+        self._listeners_lock = threading.Lock()
+        self.commands = 0
+        self.errors = 0
+        self.notifications = 0
+        self.output_bytes = 0
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed and self._process is not None and self._process.poll() is None
+
+    def start(self, timeout: float = 5.0) -> "TmuxControlClient":
+        """Spawn ``tmux -C`` and wait until it is attached to its session."""
+        self._process = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=self._env,
+        )
+        self._reader = threading.Thread(target=self._read_loop, name="tmux-control", daemon=True)
+        self._reader.start()
+        # Commands written before the attach completes run without a session.
+        if not self._ready.wait(timeout) or not self.alive:
+            self.close()
+            raise TmuxControlError(f"tmux control mode did not start: {' '.join(self.argv)}")
+        return self
+
+    def command(self, args: List[str], timeout: Optional[float] = None) -> Tuple[bool, List[str]]:
+        """
+        Run one tmux command and return ``(ok, output_lines)``.
+
+        Raises TmuxControlError if the command could not be sent (the
+        caller may retry elsewhere) and ``subprocess.TimeoutExpired`` if no
+        reply arrived in time.  A client that dies after sending yields
+        ``(False, [...])`` so the command is never run twice.
+        """
+        pending = _Pending()
+        line = (format_command(args) + "\n").encode("utf-8", errors="surrogateescape")
+        with self._write_lock:
+            if not self.alive:
+                raise TmuxControlError("tmux control client is not running")
+            self._pending.append(pending)
+            try:
+                self._process.stdin.write(line)
+                self._process.stdin.flush()
+            except HANDLED_EXCEPTIONS as e:
+                self._pending.remove(pending)
+                raise TmuxControlError(f"tmux control write failed: {e}") from e
+            self.commands += 1
+        if not pending.event.wait(timeout):
+            raise subprocess.TimeoutExpired(["tmux", *args], timeout)
+        return pending.ok, pending.lines
+
+    def add_output_listener(self, pane_id: str, callback: Callable[[bytes], None]) -> None:
+        with self._listeners_lock:
+            self._listeners.setdefault(pane_id, []).append(callback)
+
+    def remove_output_listener(self, pane_id: str, callback: Callable[[bytes], None]) -> None:
+        with self._listeners_lock:
+            callbacks = self._listeners.get(pane_id, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self._listeners.pop(pane_id, None)
+
+    def has_listeners(self) -> bool:
+        with self._listeners_lock:
+            return bool(self._listeners)
+
+    def _read_loop(self) -> None:
+        stdout = self._process.stdout
+        block: Optional[Tuple[bytes, bool]] = None  # (command number, ours)
+        lines: List[str] = []
+        try:
+            for raw in stdout:
+                raw = raw.rstrip(b"\r\n")
+                if block is not None:
+                    m = _BLOCK_RE.match(raw)
+                    if m and m.group(1) != b"begin" and m.group(3) == block[0]:
+                        if block[1]:
+                            self._resolve(m.group(1) == b"end", lines)
+                        else:
+                            # The attach command itself; the session is up.
+                            self._ready.set()
+                        block, lines = None, []
+                    else:
+                        lines.append(raw.decode("utf-8", errors="replace"))
+                    continue
+                m = _BLOCK_RE.match(raw)
+                if m and m.group(1) == b"begin":
+                    block = (m.group(3), bool(int(m.group(4)) & 1))
+                    continue
+                self._notify(raw)
+        except HANDLED_EXCEPTIONS:
+            pass
+        finally:
+            self._closed = True
+            self._ready.set()
+            with self._write_lock:
+                while self._pending:
+                    pending = self._pending.popleft()
+                    pending.lines = ["tmux control client exited"]
+                    pending.event.set()
+
+    def _resolve(self, ok: bool, lines: List[str]) -> None:
+        with self._write_lock:
+            if not self._pending:
+                return
+            pending = self._pending.popleft()
+        if not ok:
+            self.errors += 1
+        pending.ok, pending.lines = ok, lines
+        pending.event.set()
+
+    def _notify(self, raw: bytes) -> None:
+        self.notifications += 1
+        if raw.startswith(b"%output "):
+            pane_id, _, payload = raw[8:].partition(b" ")
+            pane = pane_id.decode("ascii", errors="replace")
+            with self._listeners_lock:
+                callbacks = list(self._listeners.get(pane, ()))
+            if callbacks:
+                data = decode_output(payload)
+                self.output_bytes += len(data)
+                for callback in callbacks:
+                    try:
+                        callback(data)
+                    except HANDLED_EXCEPTIONS:
+                        pass
+        elif raw.startswith((b"%session-changed", b"%client-session-changed")):
+            self._ready.set()
+        elif raw.startswith(b"%exit"):
+            self._closed = True
+
+    def get_stats(self) -> dict:
+        return {
+            "alive": self.alive,
+            "commands": self.commands,
+            "errors": self.errors,
+            "in_flight": len(self._pending),
+            "notifications": self.notifications,
+            "output_bytes": self.output_bytes,
+        }
+
+    def close(self) -> None:
+        """Detach (EOF on stdin) and reap the process."""
+        self._closed = True
+        process = self._process
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except HANDLED_EXCEPTIONS:
+            pass
+        try:
+            process.wait(timeout=2.0)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+class PaneOutputStream:
+    """
+    Output of one pane, pushed by a control client's ``%output`` lines.
+
+    ``read()`` returns whatever arrived since the previous call, waiting up
+    to ``timeout`` for the first byte.
+    """
+
+    def __init__(self, pane_id: str, *, strip_ansi: bool = True,
+                 on_close: Optional[Callable[["PaneOutputStream"], None]] = None):
+        self.pane_id = pane_id
+        self.strip_ansi = strip_ansi
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._chunks: List[str] = []
+        self._cond = threading.Condition()
+        self._on_close = on_close
+        self.closed = False
+        self.bytes_received = 0
+        self.last_output_at = 0.0
+
+    def feed(self, data: bytes) -> None:
+        text = self._decoder.decode(data)
+        with self._cond:
+            self.bytes_received += len(data)
+            self.last_output_at = time.time()
+            if text:
+                self._chunks.append(text)
+                self._cond.notify_all()
+
+    def read(self, timeout: Optional[float] = None) -> str:
+        with self._cond:
+            if not self._chunks and not self.closed:
+                self._cond.wait(timeout)
+            text, self._chunks = "".join(self._chunks), []
+        return _ANSI_RE.sub("", text) if self.strip_ansi else text
+
+    def close(self) -> None:
+        with self._cond:
+            if self.closed:
+                return
+            self.closed = True
+            self._cond.notify_all()
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def __enter__(self) -> "PaneOutputStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def control_env() -> Dict[str, str]:
+    """Environment for ``tmux -C``: outside any tmux client, so it may attach."""
+    env = dict(os.environ)
+    env.pop("TMUX", None)
+    env.pop("TMUX_PANE", None)
+    return env
@@ -44,7 +44,7 @@ class MCPAggregatorServer:
             elif method == "tools/list":
                 return self._handle_tools_list(request_id, params)
             elif method == "tools/call":
-                return self._handle_tools_call(request_id, params)
+                return await self._handle_tools_call(request_id, params)
             elif method == "resources/list":
                 return self._handle_resources_list(request_id, params)
             elif method == "ccb/servers/list":
@@ -155,7 +155,7 @@ class MCPAggregatorServer:
             },
         }
 
-    def _handle_tools_call(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_tools_call(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle tools/call request."""
         tool_name = params.get("name", "")
         arguments = params.get("arguments", {})
@@ -198,6 +198,7 @@ class MCPAggregatorServer:
                                     "status": h.status.value,
                                     "latency_ms": h.latency_ms,
                                     "error": h.error,
+                                    "cache": h.cache,
                                 }
                                 for name, h in health.items()
                             }, indent=2),
@@ -251,7 +252,7 @@ class MCPAggregatorServer:
             }
 
         # Route to aggregated server
-        result = self.aggregator.route_tool_call(tool_name, arguments)
+        result = await self.aggregator.route_tool_call_async(tool_name, arguments)
 
         if result.success:
             return {
@@ -299,6 +300,8 @@ class MCPAggregatorServer:
             args=params.get("args", []),
             transport=MCPTransport(params.get("transport", "stdio")),
             enabled=params.get("enabled", True),
+            idempotent_tools=params.get("idempotent_tools", []),
+            cache_ttl_s=params.get("cache_ttl_s", {}),
         )
         self.aggregator.register_server(config)
         return {
@@ -324,6 +327,7 @@ class MCPAggregatorServer:
                         "latency_ms": h.latency_ms,
                         "error": h.error,
                         "tool_count": h.tool_count,
+                        "cache": h.cache,
                     }
                     for name, h in health.items()
                 },
@@ -351,6 +355,14 @@ class MCPAggregatorServer:
             asyncio.streams.FlowControlMixin, sys.stdout
         )
         writer = asyncio.StreamWriter(writer_transport, writer_protocol, None, asyncio.get_event_loop())
+        in_flight = set()
+
+        async def respond(request: Dict[str, Any]) -> None:
+            response = await self.handle_request(request)
+            if request.get("id") is None:
+                return  # notifications get no response
+            writer.write((json.dumps(response) + "\n").encode())
+            await writer.drain()
 
         while True:
             try:
@@ -359,10 +371,10 @@ class MCPAggregatorServer:
                     break
 
                 request = json.loads(line.decode())
-                response = await self.handle_request(request)
-
-                writer.write((json.dumps(response) + "\n").encode())
-                await writer.drain()
+                # Requests are served concurrently; responses carry their id.
+                task = asyncio.create_task(respond(request))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
 
             except json.JSONDecodeError:
                 continue
@@ -371,6 +383,9 @@ class MCPAggregatorServer:
                 writer.write((json.dumps(error_response) + "\n").encode())
                 await writer.drain()
 
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
 
 async def main():
     """Main entry point."""
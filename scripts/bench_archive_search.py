@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: searching 24 monthly conversation archives.
+
+Builds ``--months`` months of synthetic conversations (``--rows`` per month)
+twice: as legacy whole-database ``archive_*.db.gz`` files, and as the
+monthly tier (block-compressed rows, trigram FTS5, bloom-filter manifest).
+Then times ``search_archives`` for:
+
+- common:  a word present in every month (newest-first early exit)
+- rare:    a token present in a single month (bloom filters skip the rest)
+- absent:  a token in no archive
+- range:   a common word restricted to one quarter
+
+Usage:
+    python scripts/bench_archive_search.py [--months 24] [--rows 2000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from memory.memory_archive import CCBMemoryArchive  # noqa: E402
+
+LEGACY_SCHEMA = """
+    CREATE TABLE conversations (
+        id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, provider TEXT NOT NULL,
+        question TEXT NOT NULL, answer TEXT NOT NULL, metadata TEXT, tokens INTEGER DEFAULT 0
+    )
+"""
+
+
+def _months(count: int):
+    year, month = 2023, 1
+    for _ in range(count):
+        yield f"{year}-{month:02d}"
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+
+
+def _records(months, rows: int):
+    rng = random.Random(9)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(3000)]
+    next_id = 1
+    for index, month in enumerate(months):
+        batch = []
+        for i in range(rows):
+            question = " ".join(rng.choice(words) for _ in range(20)) + " gateway"
+            answer = " ".join(rng.choice(words) for _ in range(150))
+            if index == 5 and i == rows // 2:
+                answer += " zyxwvquux"
+            ts = f"{month}-{1 + i * 27 // rows:02d}T{i % 24:02d}:00:00"
+            batch.append((next_id, ts, "codex", question, answer, "{}", 0))
+            next_id += 1
+        yield month, batch
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        months = list(_months(args.months))
+        setups = {}
+        for name in ("legacy", "tier"):
+            os.environ["HOME"] = str(tmp / name)
+            archive = CCBMemoryArchive()
+            for month, batch in _records(months, args.rows):
+                if name == "tier":
+                    archive.tier.append(batch)
+                    continue
+                path = archive.archive_dir / f"archive_{month.replace('-', '')}.db"
+                conn = sqlite3.connect(path)
+                conn.execute(LEGACY_SCHEMA)
+                conn.executemany("INSERT INTO conversations VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                conn.commit()
+                conn.close()
+                with open(path, "rb") as src, gzip.open(f"{path}.gz", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                path.unlink()
+            size = sum(f.stat().st_size for f in archive.archive_dir.rglob("*") if f.is_file())
+            setups[name] = (archive, size)
+
+        queries = {
+            "common": dict(keyword="gateway"),
+            "rare": dict(keyword="zyxwvquux"),
+            "absent": dict(keyword="qqqjjjxxx"),
+            "range": dict(keyword="gateway", since=f"{months[3]}-01", until=f"{months[5]}-31"),
+        }
+        legacy, tier = setups["legacy"][0], setups["tier"][0]
+        print(f"{args.months} months x {args.rows} rows; on disk: "
+              f"legacy {setups['legacy'][1] / 1e6:.1f} MB, tier {setups['tier'][1] / 1e6:.1f} MB")
+        print(f"{'query':<8} {'legacy ms':>10} {'tier ms':>9} {'speedup':>8}")
+        for label, query in queries.items():
+            expected = legacy.search_archives(**query)
+            assert tier.search_archives(**query) == expected, label
+            before = _time(lambda: legacy.search_archives(**query), args.repeat)
+            after = _time(lambda: tier.search_archives(**query), args.repeat)
+            print(f"{label:<8} {before:>10.1f} {after:>9.2f} {before / after:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
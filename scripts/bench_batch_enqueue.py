@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-item enqueue vs RequestQueue.enqueue_many.
+
+Usage:
+    python scripts/bench_batch_enqueue.py [--sizes 10,1000,10000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from gateway.models import GatewayRequest  # noqa: E402
+from gateway.request_queue import RequestQueue  # noqa: E402
+from gateway.state_store import StateStore  # noqa: E402
+
+
+def _make_requests(n: int) -> list:
+    return [
+        GatewayRequest.create(provider="kimi", message=f"prompt {i % 50}", priority=i % 100)
+        for i in range(n)
+    ]
+
+
+def _run(n: int, bulk: bool) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StateStore(str(Path(tmp) / "bench.db"))
+        queue = RequestQueue(store, max_size=n + 1)
+        requests = _make_requests(n)
+        start = time.perf_counter()
+        if bulk:
+            queue.enqueue_many(requests)
+        else:
+            for request in requests:
+                queue.enqueue(request)
+        elapsed = time.perf_counter() - start
+        assert queue.get_queue_depth() == n
+        return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10,1000,10000")
+    args = parser.parse_args()
+
+    print(f"{'items':>8} {'loop (ms)':>12} {'bulk (ms)':>12} {'speedup':>9}")
+    for n in [int(x) for x in args.sizes.split(",") if x]:
+        loop_s = _run(n, bulk=False)
+        bulk_s = _run(n, bulk=True)
+        print(f"{n:>8} {loop_s * 1000:>12.1f} {bulk_s * 1000:>12.1f} {loop_s / bulk_s:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
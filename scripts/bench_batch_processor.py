@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: BatchProcessor end to end against a stub provider command.
+
+Every task runs ``--command`` (default ``cat``, which echoes the message)
+as its provider.  For each batch size:
+
+- legacy: the previous engine (thread pool, ``bash -c "<cmd> <<'EOF'"``
+          per task, linear scan for the finished task and a full
+          ``_save_job`` rewrite of every task row after each completion)
+- async:  ``execute_batch`` (subprocess_exec without a shell, batched
+          row updates)
+
+Legacy runs are capped at ``--legacy-max`` tasks because their cost grows
+quadratically.
+
+Usage:
+    python scripts/bench_batch_processor.py [--tasks 1000 2000 10000] [--concurrency 16] [--legacy-max 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import shlex
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from batch_processor import BatchProcessor, BatchStatus  # noqa: E402
+
+
+class LegacyBatchProcessor(BatchProcessor):
+    """The pre-rework execution path, kept here for comparison."""
+
+    def _legacy_save_job(self, job) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO batch_jobs (id, status, default_provider, created_at, completed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job.id, job.status.value, job.default_provider, job.created_at, job.completed_at),
+            )
+            for task in job.tasks:
+                conn.execute(
+                    "INSERT OR REPLACE INTO batch_tasks "
+                    "(id, job_id, message, provider, status, result, error, latency_ms) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (task.id, job.id, task.message, task.provider, task.status.value,
+                     task.result, task.error, task.latency_ms),
+                )
+            conn.commit()
+
+    def _legacy_execute_task(self, task):
+        start_time = time.time()
+        cmd = f"{shlex.join(self._task_argv('stub'))} <<'EOF'\n{task.message}\nEOF"
+        try:
+            result = subprocess.run(["bash", "-c", cmd], capture_output=True, text=True, timeout=self.timeout_s)
+            if result.returncode == 0:
+                task.status, task.result = BatchStatus.COMPLETED, result.stdout
+            else:
+                task.status, task.error = BatchStatus.FAILED, result.stderr
+        except subprocess.TimeoutExpired:
+            task.status, task.error = BatchStatus.FAILED, "Timeout"
+        task.latency_ms = (time.time() - start_time) * 1000
+        return task
+
+    def legacy_execute_batch(self, job):
+        job.status = BatchStatus.RUNNING
+        self._legacy_save_job(job)
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+            futures = [executor.submit(self._legacy_execute_task, task) for task in job.tasks]
+            for future in as_completed(futures):
+                done = future.result()
+                for i, t in enumerate(job.tasks):
+                    if t.id == done.id:
+                        job.tasks[i] = done
+                        break
+                self._legacy_save_job(job)
+        job.status = BatchStatus.COMPLETED
+        job.completed_at = time.time()
+        self._legacy_save_job(job)
+        return job
+
+
+def _run(mode: str, n: int, args, tmp_dir: str) -> str:
+    cls = LegacyBatchProcessor if mode == "legacy" else BatchProcessor
+    processor = cls(
+        max_concurrent=args.concurrency,
+        default_provider="stub",
+        db_path=str(Path(tmp_dir) / f"{mode}-{n}.db"),
+        provider_commands={"stub": args.command},
+    )
+    job = processor.create_batch([f"task {i} " + "x" * args.message_bytes for i in range(n)])
+    started = time.perf_counter()
+    if mode == "legacy":
+        job = processor.legacy_execute_batch(job)
+    else:
+        job = processor.execute_batch(job)
+    elapsed = time.perf_counter() - started
+    assert job.successful_count == n, job.tasks[0].error
+
+    reloaded = BatchProcessor(db_path=processor.db_path).get_job(job.id)
+    assert reloaded.successful_count == n
+    return f"{n:>6} {mode:<7} {elapsed:>9.2f} {n / elapsed:>8.0f} {elapsed / n * 1e3:>8.2f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 2000, 10000])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--legacy-max", type=int, default=2000)
+    parser.add_argument("--message-bytes", type=int, default=200)
+    parser.add_argument("--command", default="cat")
+    args = parser.parse_args()
+
+    print(f"stub command {args.command!r}, concurrency {args.concurrency}")
+    print(f"{'tasks':>6} {'mode':<7} {'total s':>9} {'tasks/s':>8} {'ms/task':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n in args.tasks:
+            if n <= args.legacy_max:
+                print(_run("legacy", n, args, tmp_dir), flush=True)
+            print(_run("async", n, args, tmp_dir), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: archiving a synthetic corpus of Claude sessions.
+
+Generates ``--sessions`` session files (``~/.claude/projects/<proj>/<id>.jsonl``
+layout, a few dozen turns each) and archives them three ways into fresh
+databases:
+
+- sequential:  ``ContextSaver.save_session`` per file (one connection and
+               commit per session)
+- bulk:        ``BulkArchiver`` with ``--workers`` parser processes and one
+               batched writer
+- bulk rerun:  the same corpus again; the ledger skips every file
+
+Usage:
+    python scripts/bench_bulk_archive.py [--sessions 5000] [--workers N] [--turns 40]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from memory.context_saver import ContextSaver  # noqa: E402
+from memory.context_saver_bulk import BulkArchiver  # noqa: E402
+
+
+def _generate(root: Path, sessions: int, turns: int) -> int:
+    rng = random.Random(11)
+    filler = "lorem ipsum dolor sit amet " * 12
+    total = 0
+    for i in range(sessions):
+        path = root / f"-work-project-{i % 40}" / f"{uuid.UUID(int=rng.getrandbits(128))}.jsonl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = []
+        for t in range(rng.randint(turns // 2, turns)):
+            ts = f"2024-01-01T{t // 60:02d}:{t % 60:02d}:00Z"
+            lines.append({"type": "user", "uuid": f"{i}-u{t}", "timestamp": ts, "cwd": "/work",
+                          "message": {"role": "user", "content": f"task {t}: {filler}"}})
+            lines.append({"type": "progress", "data": {"output": filler * 3}})
+            lines.append({"type": "assistant", "uuid": f"{i}-a{t}", "timestamp": ts, "message": {
+                "role": "assistant", "model": "bench", "content": [
+                    {"type": "text", "text": f"## Step {t}\n{filler * 2}"},
+                    {"type": "tool_use", "name": "Edit", "input": {"file_path": f"/work/f{t % 17}.py"}},
+                ]}})
+        data = "".join(json.dumps(line, separators=(",", ":")) + "\n" for line in lines)
+        path.write_text(data, encoding="utf-8")
+        total += len(data)
+    return total
+
+
+def _saver(tmp: Path, name: str) -> ContextSaver:
+    return ContextSaver(archive_dir=tmp / "archive", db_path=tmp / f"{name}.db")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--turns", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        corpus = tmp / "projects"
+        size = _generate(corpus, args.sessions, args.turns)
+        files = sorted(corpus.rglob("*.jsonl"))
+        print(f"{len(files)} sessions, {size / 1024 / 1024:.0f} MB, {args.workers} workers")
+
+        saver = _saver(tmp, "sequential")
+        start = time.perf_counter()
+        for path in files:
+            saver.save_session(path)
+        sequential = time.perf_counter() - start
+
+        saver = _saver(tmp, "bulk")
+        bulk = BulkArchiver(saver, workers=args.workers).run([corpus])
+        rerun = BulkArchiver(saver, workers=args.workers).run([corpus])
+        assert bulk.archived == len(files) and rerun.skipped_unchanged == len(files)
+
+    print(f"{'run':<12} {'seconds':>9} {'sessions/s':>11} {'MB/s':>8}")
+    mb = size / 1024 / 1024
+    for name, seconds in (("sequential", sequential), ("bulk", bulk.elapsed_s), ("bulk rerun", rerun.elapsed_s)):
+        print(f"{name:<12} {seconds:>9.2f} {len(files) / seconds:>11.0f} {mb / seconds:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
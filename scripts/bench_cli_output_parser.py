@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: incremental CLI output parsing.
+
+Two measurements:
+
+- first text: time until the first response text is available.  ``execute``
+  parses stdout after the process exits; ``execute_stream`` feeds stdout to
+  ``CLIOutputParser`` as it arrives and yields text deltas.  Uses the stub
+  CLI in ``test/stubs/provider_stub.py --stdio json``, which prints one
+  Codex ``exec --json`` event every ``--delay`` seconds.
+- parse cost: MB/s for the parser fed ``--chunk`` byte chunks vs. the whole
+  output at once (what ``clean_cli_output`` does), on ~``--mb`` MB of JSON
+  events and of plain text with reasoning tags.
+
+Usage:
+    python scripts/bench_cli_output_parser.py [--delay 0.2] [--runs 5] [--mb 10] [--chunk 1024]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+import gateway.stream_output as stream_output  # noqa: E402
+from gateway.backends.cli import CLIBackend  # noqa: E402
+from gateway.backends.extractors.cli_output import CLIOutputParser  # noqa: E402
+from gateway.gateway_config import ProviderConfig  # noqa: E402
+from gateway.models import BackendType, GatewayRequest  # noqa: E402
+
+STUB = ROOT / "test" / "stubs" / "provider_stub.py"
+
+
+async def _first_text(backend: CLIBackend, runs: int):
+    batch, streamed = [], []
+    for i in range(runs):
+        started = time.perf_counter()
+        result = await backend.execute(GatewayRequest.create(provider="stub", message=f"q{i}", timeout_s=60))
+        assert result.success and result.response, result
+        batch.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        first = None
+        async for chunk in backend.execute_stream(GatewayRequest.create(provider="stub", message=f"q{i}", timeout_s=60)):
+            if first is None and chunk.content:
+                first = time.perf_counter() - started
+        streamed.append(first)
+    return batch, streamed
+
+
+def _json_workload(target: int) -> str:
+    lines, size, i = [], 0, 0
+    while size < target:
+        item = (
+            {"type": "agent_message", "text": f"paragraph {i} " + "lorem ipsum dolor sit amet " * 8}
+            if i % 3 else {"type": "command_execution", "command": f"grep -rn pattern{i} src/", "exit_code": 0}
+        )
+        line = json.dumps({"type": "item.completed", "item": item})
+        lines.append(line)
+        size += len(line) + 1
+        i += 1
+    lines.append(json.dumps({"type": "turn.completed", "usage": {"input_tokens": 10, "output_tokens": 5}}))
+    return "\n".join(lines) + "\n"
+
+
+def _plain_workload(target: int) -> str:
+    block = (
+        "<thinking>weigh the options\nthen decide</thinking>\n"
+        "Here is the answer, with some detail about the change.\n"
+        "\n"
+        "- first point of the explanation\n"
+        "- second point of the explanation\n"
+    )
+    return block * max(1, target // len(block))
+
+
+def _parse_mb_s(text: str, chunk: int, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        parser = CLIOutputParser("codex")
+        started = time.perf_counter()
+        if chunk:
+            for start in range(0, len(text), chunk):
+                parser.feed(text[start:start + chunk])
+        else:
+            parser.feed(text)
+        parser.finish()
+        best = min(best, time.perf_counter() - started)
+    return len(text.encode("utf-8")) / best / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--mb", type=float, default=10.0)
+    parser.add_argument("--chunk", type=int, default=1024)
+    args = parser.parse_args()
+
+    os.environ["STUB_DELAY"] = str(args.delay)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stream_output._manager = stream_output.StreamOutputManager(Path(tmp_dir))
+        backend = CLIBackend(ProviderConfig(
+            name="stub", backend_type=BackendType.CLI_EXEC,
+            cli_command=sys.executable, cli_args=[str(STUB), "--stdio", "json"],
+        ))
+        batch, streamed = asyncio.run(_first_text(backend, args.runs))
+    print(f"first text, {args.delay}s between events, {args.runs} runs")
+    print(f"  execute (parse at exit)   p50 {statistics.median(batch) * 1000:>7.0f} ms")
+    print(f"  execute_stream (deltas)   p50 {statistics.median(streamed) * 1000:>7.0f} ms")
+
+    target = int(args.mb * 1_000_000)
+    print(f"parse throughput, ~{args.mb:g} MB")
+    print(f"  {'workload':<8} {'whole MB/s':>11} {f'{args.chunk}B MB/s':>11}")
+    for name, text in (("json", _json_workload(target)), ("plain", _plain_workload(target))):
+        print(f"  {name:<8} {_parse_mb_s(text, 0):>11.1f} {_parse_mb_s(text, args.chunk):>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start CLI execution vs. a warm interactive worker pool.
+
+Uses the stub CLI in ``test/stubs/provider_stub.py``, which sleeps
+``--startup`` seconds at boot (standing in for runtime start and auth
+checks) and ``--delay`` seconds per reply:
+
+- cold:  ``CLIBackend.execute`` spawns ``provider_stub.py --stdio once``
+         per request
+- warm:  ``InteractiveCLIBackend`` serving ``--stdio repl`` workers from a
+         pool pre-spawned with ``min_size`` workers and capped at
+         ``--max-size``
+
+Each concurrency level sends ``--requests`` requests.
+
+Usage:
+    python scripts/bench_cli_pool.py [--concurrency 1 2 4 8 16] [--requests 32]
+                                     [--startup 0.5] [--delay 0.05] [--max-size 8]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from gateway.backends.cli import CLIBackend  # noqa: E402
+from gateway.backends.interactive_cli_backend import InteractiveCLIBackend  # noqa: E402
+from gateway.gateway_config import CLIPoolConfig, ProviderConfig  # noqa: E402
+from gateway.models import BackendType, GatewayRequest  # noqa: E402
+
+STUB = ROOT / "test" / "stubs" / "provider_stub.py"
+
+
+async def _drive(backend, concurrency: int, requests: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            result = await backend.execute(GatewayRequest.create(provider="stub", message=f"q{i}", timeout_s=60))
+            assert result.success and f"q{i}" in (result.response or ""), result
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies, time.perf_counter() - started
+
+
+async def _run(args) -> None:
+    cold = CLIBackend(ProviderConfig(
+        name="stub", backend_type=BackendType.CLI_EXEC,
+        cli_command=sys.executable, cli_args=[str(STUB), "--stdio", "once"],
+    ))
+    print(f"startup {args.startup}s, reply {args.delay}s, {args.requests} requests per level, "
+          f"pool max {args.max_size}")
+    print(f"{'conc':>4} {'mode':<5} {'p50 ms':>8} {'p95 ms':>8} {'req/s':>7}")
+    for concurrency in args.concurrency:
+        warm = InteractiveCLIBackend(
+            ProviderConfig(
+                name="stub", backend_type=BackendType.CLI_EXEC, cli_command=sys.executable,
+                interactive=True, interactive_args=[str(STUB), "--stdio", "repl"],
+            ),
+            pool_config=CLIPoolConfig(min_size=min(concurrency, args.max_size), max_size=args.max_size,
+                                      health_check_interval_s=0),
+        )
+        await warm.start()
+        for mode, backend in (("cold", cold), ("warm", warm)):
+            latencies, elapsed = await _drive(backend, concurrency, args.requests)
+            latencies.sort()
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(f"{concurrency:>4} {mode:<5} {statistics.median(latencies) * 1000:>8.0f} "
+                  f"{p95 * 1000:>8.0f} {args.requests / elapsed:>7.1f}")
+        await warm.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--startup", type=float, default=0.5)
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--max-size", type=int, default=8)
+    args = parser.parse_args()
+
+    os.environ["STUB_STARTUP_DELAY"] = str(args.startup)
+    os.environ["STUB_DELAY"] = str(args.delay)
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
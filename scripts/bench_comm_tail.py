@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of one reply-wait poll versus Codex session file size.
+
+A poll is what ``wait_for_message`` does each interval: ``capture_state`` and
+``latest_message``.  "full" re-reads and re-parses the whole file twice (the
+previous behaviour); "tail" uses the offset-based tail engine, with one new
+line appended before each poll.
+
+Usage:
+    python scripts/bench_comm_tail.py [--sizes-mb 1,10,50] [--polls 20]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from providers._codex_reader import CodexCommReader  # noqa: E402
+
+
+def _line(i: int) -> str:
+    role = "assistant" if i % 2 else "user"
+    kind = "output_text" if role == "assistant" else "input_text"
+    text = f"message {i} " + "lorem ipsum dolor sit amet " * 12
+    return json.dumps({
+        "type": "response_item",
+        "timestamp": 1700000000 + i,
+        "payload": {"type": "message", "role": role, "content": [{"type": kind, "text": text}]},
+    }) + "\n"
+
+
+def _write_session(path: Path, size_mb: int) -> int:
+    target = size_mb * 1024 * 1024
+    written = 0
+    count = 0
+    with path.open("w", encoding="utf-8") as handle:
+        while written < target:
+            line = _line(count)
+            handle.write(line)
+            written += len(line)
+            count += 1
+    return count
+
+
+def _full_poll(reader: CodexCommReader, session: Path) -> None:
+    # Previous implementation: both calls read and parse the entire file.
+    for _ in range(2):
+        messages = reader._parse_messages(session.read_text(encoding="utf-8"))
+        [m for m in messages if m.role == "assistant"]
+
+
+def _bench(size_mb: int, polls: int) -> tuple:
+    with tempfile.TemporaryDirectory() as tmp:
+        session = Path(tmp) / "rollout-bench.jsonl"
+        lines = _write_session(session, size_mb)
+        reader = CodexCommReader(home_dir=tmp, work_dir=Path(tmp))
+        reader.set_preferred_session(str(session))
+
+        start = time.perf_counter()
+        for _ in range(polls):
+            _full_poll(reader, session)
+        full_ms = (time.perf_counter() - start) * 1000 / polls
+
+        start = time.perf_counter()
+        reader.capture_state()
+        first_ms = (time.perf_counter() - start) * 1000
+
+        elapsed = 0.0
+        for i in range(polls):
+            with session.open("a", encoding="utf-8") as handle:
+                handle.write(_line(lines + i))
+            start = time.perf_counter()
+            reader.capture_state()
+            reader.latest_message()
+            elapsed += time.perf_counter() - start
+        tail_ms = elapsed * 1000 / polls
+        return lines, full_ms, first_ms, tail_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes-mb", default="1,10,50")
+    parser.add_argument("--polls", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'lines':>8} {'full/poll (ms)':>15} {'tail first (ms)':>16} {'tail/poll (ms)':>15} {'speedup':>9}")
+    for size_mb in [int(x) for x in args.sizes_mb.split(",") if x]:
+        lines, full_ms, first_ms, tail_ms = _bench(size_mb, args.polls)
+        print(f"{size_mb:>4}MB {lines:>8} {full_ms:>15.2f} {first_ms:>16.2f} {tail_ms:>15.3f} "
+              f"{full_ms / tail_ms:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Ebbinghaus decay over ``memory_importance``.
+
+Builds a legacy-schema table with ``--rows`` tracked memories (one or more
+sizes) and measures:
+
+- legacy:       the old per-row loop (``datetime.fromisoformat`` +
+                ``math.exp``) over every row, computing stats only
+- migration:    adding the epoch/decay columns and backfilling them
+- full:         ``DecayEngine`` full pass, including the write-back
+- incremental:  one hour later after re-accessing ``--touch`` of the rows
+
+Usage:
+    python scripts/bench_decay_engine.py [--rows 1000000 10000000] [--touch 0.01]
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from memory.decay_engine import DecayEngine, ensure_decay_schema  # noqa: E402
+
+LEGACY_SCHEMA = """
+    CREATE TABLE memory_importance (
+        memory_id TEXT PRIMARY KEY,
+        memory_type TEXT NOT NULL,
+        importance_score REAL DEFAULT 0.5,
+        score_source TEXT DEFAULT 'default',
+        last_accessed_at TEXT,
+        access_count INTEGER DEFAULT 0,
+        decay_rate REAL DEFAULT 0.1,
+        created_at TEXT,
+        updated_at TEXT
+    )
+"""
+
+
+def _generate(db: Path, rows: int, now: datetime) -> None:
+    rng = random.Random(5)
+    conn = sqlite3.connect(db)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(LEGACY_SCHEMA)
+
+    def records():
+        for i in range(rows):
+            accessed = now - timedelta(seconds=rng.randrange(0, 90 * 86400))
+            yield (f"m{i:09d}", rng.random(), accessed.isoformat(), rng.choice((0.1, 0.05, 0.01, None)))
+
+    conn.executemany(
+        "INSERT INTO memory_importance (memory_id, memory_type, importance_score, last_accessed_at, decay_rate) "
+        "VALUES (?, 'message', ?, ?, ?)",
+        records(),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _legacy(db: Path, now: datetime, decay_lambda: float = 0.1, min_score: float = 0.01) -> dict:
+    conn = sqlite3.connect(db)
+    stats = {"processed": 0, "decayed": 0, "flagged_for_forget": 0}
+    cursor = conn.execute(
+        "SELECT memory_id, memory_type, importance_score, last_accessed_at, decay_rate "
+        "FROM memory_importance WHERE last_accessed_at IS NOT NULL"
+    )
+    while True:
+        rows = cursor.fetchmany(10000)
+        if not rows:
+            break
+        for _, _, importance, last_accessed, decay_rate in rows:
+            stats["processed"] += 1
+            dt = datetime.fromisoformat(last_accessed.replace("Z", "+00:00"))
+            hours = (now - dt.replace(tzinfo=None)).total_seconds() / 3600
+            decayed = importance * math.exp(-(decay_rate or decay_lambda) * hours)
+            if decayed < importance * 0.9:
+                stats["decayed"] += 1
+            if decayed < min_score:
+                stats["flagged_for_forget"] += 1
+    conn.close()
+    return stats
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--touch", type=float, default=0.01, help="Share of rows re-accessed before the incremental run")
+    args = parser.parse_args()
+
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    now_ts = (now - datetime(1970, 1, 1)).total_seconds()
+    print(f"{'rows':>10} {'legacy s':>9} {'migrate s':>10} {'full s':>8} {'incr s':>8} "
+          f"{'incr rows':>10} {'legacy r/s':>11} {'full r/s':>10}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db = Path(tmp_dir) / "mem.db"
+            _generate(db, rows, now)
+
+            legacy, legacy_s = _timed(lambda: _legacy(db, now))
+
+            def migrate():
+                conn = sqlite3.connect(db)
+                ensure_decay_schema(conn)
+                conn.commit()
+                conn.close()
+
+            _, migrate_s = _timed(migrate)
+            engine = DecayEngine(db)
+            full = engine.run(now=now_ts, incremental=False)
+            assert (full["processed"], full["decayed"], full["flagged_for_forget"]) == (
+                legacy["processed"], legacy["decayed"], legacy["flagged_for_forget"])
+
+            conn = sqlite3.connect(db)
+            step = max(1, int(1 / args.touch)) if args.touch > 0 else rows + 1
+            conn.execute(
+                "UPDATE memory_importance SET last_accessed_at = ? WHERE rowid % ? = 0",
+                ((now + timedelta(hours=1)).isoformat(), step),
+            )
+            conn.commit()
+            conn.close()
+            incr = engine.run(now=now_ts + 3600)
+
+        print(f"{rows:>10} {legacy_s:>9.2f} {migrate_s:>10.2f} {full['elapsed_s']:>8.2f} "
+              f"{incr['elapsed_s']:>8.2f} {incr['processed']:>10} "
+              f"{rows / legacy_s:>11.0f} {rows / full['elapsed_s']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
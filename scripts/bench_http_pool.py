@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark: request latency with and without shared, pre-warmed HTTP pools.
+
+A local aiohttp stub answers OpenAI-style chat completions.  A small TCP
+proxy in front of it sleeps ``--connect-delay-ms`` on every new connection to
+stand in for the TCP+TLS handshake to a remote API.  Three setups run the same
+request mix across ``--backends`` provider profiles sharing one base URL:
+
+- no-reuse:     connection closed after every request
+- per-backend:  one session per HTTPBackend (the previous behaviour)
+- shared:       HTTPClientManager pool, pre-warmed before the first request
+
+Usage:
+    python scripts/bench_http_pool.py [--requests 200] [--backends 4] [--connect-delay-ms 40]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+import aiohttp  # noqa: E402
+from aiohttp import web  # noqa: E402
+
+from gateway.backends.http import HTTPBackend  # noqa: E402
+from gateway.backends.http_client import HTTPClientManager  # noqa: E402
+from gateway.gateway_config import HTTPPoolConfig, ProviderConfig  # noqa: E402
+from gateway.models import BackendType, GatewayRequest  # noqa: E402
+
+
+async def _start_stub() -> tuple:
+    async def chat(_request):
+        return web.json_response({
+            "choices": [{"message": {"content": "ok"}}],
+            "usage": {"total_tokens": 3},
+        })
+
+    async def options(_request):
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", chat)
+    app.router.add_route("OPTIONS", "/", options)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+async def _start_handshake_proxy(upstream_port: int, delay_s: float):
+    async def pipe(reader, writer):
+        try:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle(client_reader, client_writer):
+        await asyncio.sleep(delay_s)
+        up_reader, up_writer = await asyncio.open_connection("127.0.0.1", upstream_port)
+        await asyncio.gather(pipe(client_reader, up_writer), pipe(up_reader, client_writer))
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def _backends(port: int, count: int, manager=None) -> list:
+    return [
+        HTTPBackend(
+            ProviderConfig(
+                name=f"profile{i}",
+                backend_type=BackendType.HTTP_API,
+                api_base_url=f"http://127.0.0.1:{port}/v1",
+                api_key_env="sk-bench",
+                model="stub",
+            ),
+            client_manager=manager,
+        )
+        for i in range(count)
+    ]
+
+
+async def _drive(backends: list, total: int, concurrency: int) -> list:
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        backend = backends[i % len(backends)]
+        async with sem:
+            start = time.perf_counter()
+            result = await backend.execute(GatewayRequest.create(provider=backend.config.name, message="hi"))
+            latencies.append(time.perf_counter() - start)
+            assert result.success, result.error
+
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return latencies
+
+
+async def _run(args) -> None:
+    runner, stub_port = await _start_stub()
+    proxy, port = await _start_handshake_proxy(stub_port, args.connect_delay_ms / 1000)
+    rows = []
+
+    # no-reuse: every request opens a fresh connection
+    backends = _backends(port, args.backends)
+    for backend in backends:
+        backend._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(force_close=True))
+    rows.append(("no-reuse", await _drive(backends, args.requests, args.concurrency), None))
+    for backend in backends:
+        await backend.shutdown()
+
+    # per-backend: legacy lazily created session per backend
+    backends = _backends(port, args.backends)
+    rows.append(("per-backend", await _drive(backends, args.requests, args.concurrency), None))
+    for backend in backends:
+        await backend.shutdown()
+
+    # shared: one pool per origin, pre-warmed to the concurrency level
+    manager = HTTPClientManager(HTTPPoolConfig(prewarm_connections=args.concurrency))
+    await manager.prewarm([f"http://127.0.0.1:{port}/v1"])
+    backends = _backends(port, args.backends, manager)
+    latencies = await _drive(backends, args.requests, args.concurrency)
+    pool = next(iter(manager.get_stats()["pools"].values()))
+    rows.append(("shared+prewarm", latencies, pool))
+    await manager.close()
+
+    proxy.close()
+    await runner.cleanup()
+
+    print(f"{args.requests} requests, {args.backends} profiles on one origin, "
+          f"concurrency {args.concurrency}, simulated handshake {args.connect_delay_ms:.0f} ms")
+    print(f"{'setup':<16} {'p50 (ms)':>10} {'p95 (ms)':>10} {'max (ms)':>10} {'total new conns':>16}")
+    for name, values, pool in rows:
+        ordered = sorted(values)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        conns = str(pool["new_connections"]) if pool else "-"
+        print(f"{name:<16} {statistics.median(values) * 1000:>10.2f} {p95 * 1000:>10.2f} "
+              f"{ordered[-1] * 1000:>10.2f} {conns:>16}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--backends", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--connect-delay-ms", type=float, default=40.0)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak RSS and throughput of Claude session parsing.
+
+Writes ``--size-mb`` of synthetic session log (progress updates and file
+history snapshots mixed with user/assistant turns, roughly the shape of a
+long agentic session) and parses it in a fresh subprocess per mode so peak
+RSS is measured in isolation:
+
+- legacy:  read_text().splitlines(), json.loads on every line, every record
+           accumulated before de-duplication (the previous ``parse``)
+- parse:   ``ClaudeJsonlParser.parse`` on the streaming reader (still
+           collects every message)
+- stream:  ``ClaudeJsonlParser.stream`` into ``SessionDigestSink`` (what
+           ``ContextSaver.save_session`` now does)
+
+Usage:
+    python scripts/bench_jsonl_parser.py [--size-mb 1024]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+
+def _generate(path: Path, size_mb: int) -> int:
+    target = size_mb * 1024 * 1024
+    filler = "lorem ipsum dolor sit amet " * 40
+    written = 0
+    turn = 0
+    with path.open("w", encoding="utf-8") as handle:
+        while written < target:
+            ts = f"2024-01-01T{(turn // 60) % 24:02d}:{turn % 60:02d}:00Z"
+            entries = [
+                {"type": "user", "uuid": f"u{turn}", "timestamp": ts, "cwd": "/proj", "sessionId": "bench",
+                 "message": {"role": "user", "content": f"request {turn}: " + filler[:200]}},
+                {"type": "assistant", "uuid": f"a{turn}", "timestamp": ts, "message": {
+                    "role": "assistant", "model": "bench-model", "content": [
+                        {"type": "text", "text": f"## Reply {turn}\n" + filler},
+                        {"type": "tool_use", "name": "Edit", "input": {"file_path": f"/proj/f{turn % 200}.py"}},
+                    ]}},
+            ]
+            entries += [{"type": "progress", "toolUseID": f"t{turn}", "data": {"output": filler * 2}}] * 6
+            entries.append({"type": "file-history-snapshot", "snapshot": {"files": [filler] * 4}})
+            for entry in entries:
+                line = json.dumps(entry, separators=(",", ":")) + "\n"
+                handle.write(line)
+                written += len(line)
+            turn += 1
+    return written
+
+
+CHILD = r"""
+import json, resource, sys, time
+from pathlib import Path
+sys.path.insert(0, sys.argv[3]); sys.path.insert(0, sys.argv[3] + "/lib")
+from memory.jsonl_parser import ClaudeJsonlParser
+from memory.session_digest import SessionDigestSink
+
+mode, path = sys.argv[1], Path(sys.argv[2])
+parser = ClaudeJsonlParser()
+start = time.perf_counter()
+if mode == "legacy":
+    messages, tools = [], []
+    for line in path.read_text().splitlines():
+        if not line.strip():
+            continue
+        obj = json.loads(line)
+        if obj.get("type") in ("file-history-snapshot", "progress"):
+            continue
+        if obj.get("type") == "user":
+            msg = parser._extract_user_message(obj)
+            if msg:
+                messages.append(msg)
+        elif obj.get("type") == "assistant":
+            msg, found = parser._extract_assistant_message(obj)
+            if msg:
+                messages.append(msg)
+            tools.extend(found)
+    count = len(parser._deduplicate_messages(messages))
+elif mode == "parse":
+    count = len(parser.parse(path).messages)
+else:
+    sink = SessionDigestSink()
+    count = parser.stream(path, sink).message_count
+elapsed = time.perf_counter() - start
+print(json.dumps({"messages": count, "seconds": elapsed,
+                  "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--modes", default="legacy,parse,stream")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "session.jsonl"
+        start = time.perf_counter()
+        size = _generate(path, args.size_mb)
+        print(f"generated {size / 1024 / 1024:.0f} MB in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'mode':<8} {'messages':>9} {'seconds':>9} {'MB/s':>8} {'peak RSS (MB)':>14}")
+        for mode in args.modes.split(","):
+            out = subprocess.run(
+                [sys.executable, "-c", CHILD, mode, str(path), str(ROOT)],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(out)
+            mb_s = size / 1024 / 1024 / result["seconds"]
+            print(f"{mode:<8} {result['messages']:>9} {result['seconds']:>9.2f} {mb_s:>8.0f} "
+                  f"{result['peak_rss_mb']:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MCPAggregator tool calls against a local echo MCP server.
+
+Uses ``test/stubs/mcp_echo_server.py``; each ``echo`` call takes ``--delay``
+seconds of server-side work.  For every concurrency level, ``--calls``
+calls are issued:
+
+- legacy: the old blocking path (write ``"id": 2``, ``select`` +
+          ``readline``), serialized with a lock because a second in-flight
+          call would read the first one's response
+- sync:   ``route_tool_call`` from a thread pool of ``concurrency`` threads
+- async:  ``route_tool_call_async`` with ``concurrency`` tasks on one loop
+
+Usage:
+    python scripts/bench_mcp_aggregator.py [--concurrency 1 4 16 64] [--calls 256] [--delay 0.01]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import select
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from mcp_aggregator import MCPAggregator, MCPServerConfig  # noqa: E402
+
+STUB = ROOT / "test" / "stubs" / "mcp_echo_server.py"
+
+
+class LegacyCaller:
+    """The pre-multiplexing request path, kept here for comparison."""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, str(STUB)], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+        self.process.stdout.readline()  # startup banner
+        self.lock = threading.Lock()
+
+    def call(self, args: dict, timeout_s: float = 30.0) -> dict:
+        with self.lock:
+            request = {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "echo", "arguments": args}}
+            self.process.stdin.write((json.dumps(request) + "\n").encode())
+            self.process.stdin.flush()
+            while True:
+                ready, _, _ = select.select([self.process.stdout], [], [], timeout_s)
+                if not ready:
+                    raise TimeoutError
+                response = json.loads(self.process.stdout.readline().decode())
+                if "id" in response:  # the old code broke on the progress notification
+                    return response
+
+    def close(self) -> None:
+        self.process.terminate()
+        self.process.wait()
+
+
+def _timed_threads(fn, concurrency: int, calls: int):
+    latencies = []
+
+    def one(i: int) -> None:
+        started = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(one, range(calls)))
+    return latencies, time.perf_counter() - started
+
+
+def _timed_async(aggregator: MCPAggregator, concurrency: int, calls: int):
+    latencies = []
+
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(i: int) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                result = await aggregator.route_tool_call_async("echo", {"i": i})
+                assert result.success, result.error
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(one(i) for i in range(calls)))
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    return latencies, time.perf_counter() - started
+
+
+def _row(concurrency: int, mode: str, latencies, elapsed: float, calls: int) -> str:
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return (f"{concurrency:>4} {mode:<6} {statistics.median(latencies) * 1000:>8.1f} "
+            f"{p95 * 1000:>8.1f} {calls / elapsed:>8.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--calls", type=int, default=256)
+    parser.add_argument("--delay", type=float, default=0.01)
+    args = parser.parse_args()
+
+    os.environ["MCP_ECHO_DELAY"] = str(args.delay)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        aggregator = MCPAggregator(
+            db_path=str(Path(tmp_dir) / "mcp.db"),
+            config={"echo": MCPServerConfig(name="echo", command=sys.executable, args=[str(STUB)])},
+        )
+        aggregator.discover_tools("echo")
+        legacy = LegacyCaller()
+        print(f"server work {args.delay * 1000:.0f} ms per call, {args.calls} calls per level")
+        print(f"{'conc':>4} {'mode':<6} {'p50 ms':>8} {'p95 ms':>8} {'calls/s':>8}")
+        try:
+            for concurrency in args.concurrency:
+                lat, elapsed = _timed_threads(lambda i: legacy.call({"i": i}), concurrency, args.calls)
+                print(_row(concurrency, "legacy", lat, elapsed, args.calls))
+
+                def sync_call(i: int) -> None:
+                    result = aggregator.route_tool_call("echo", {"i": i})
+                    assert result.success, result.error
+
+                lat, elapsed = _timed_threads(sync_call, concurrency, args.calls)
+                print(_row(concurrency, "sync", lat, elapsed, args.calls))
+                lat, elapsed = _timed_async(aggregator, concurrency, args.calls)
+                print(_row(concurrency, "async", lat, elapsed, args.calls))
+            print(f"max in flight: {aggregator.get_transport_stats()['echo']['max_in_flight']}")
+        finally:
+            legacy.close()
+            aggregator.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: raw ``metrics`` scans vs ``metrics_rollup`` reads.
+
+Fills a throwaway gateway DB with synthetic metric rows spread over the
+last 7 days, builds the rollups, then times the monitor-dashboard query
+(every provider, 24h and 168h windows) both ways.
+
+Usage:
+    python scripts/bench_metrics_rollup.py [--rows 10000000] [--providers 10]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from gateway.state_store import StateStore  # noqa: E402
+from gateway.state_store_rollups import init_rollup_tables_impl  # noqa: E402
+
+RAW_QUERY = """
+    SELECT COUNT(*) as total, SUM(success) as successes, AVG(latency_ms) as avg_latency,
+           MAX(latency_ms) as max_latency, MIN(latency_ms) as min_latency
+    FROM metrics
+    WHERE provider = ? AND timestamp > ?
+"""
+
+
+def _populate(store: StateStore, rows: int, providers: list) -> None:
+    now = time.time()
+    span = 168 * 3600
+    rng = random.Random(42)
+    chunk = 200_000
+    with store._get_connection() as conn:
+        for start in range(0, rows, chunk):
+            batch = [
+                (
+                    rng.choice(providers),
+                    "request_completed",
+                    rng.expovariate(1 / 2000.0),
+                    1 if rng.random() < 0.95 else 0,
+                    now - rng.random() * span,
+                )
+                for _ in range(min(chunk, rows - start))
+            ]
+            conn.executemany(
+                "INSERT INTO metrics (provider, event_type, latency_ms, success, timestamp) "
+                "VALUES (?, ?, ?, ?, ?)",
+                batch,
+            )
+        conn.execute("DELETE FROM metrics_rollup")
+        build_start = time.perf_counter()
+        init_rollup_tables_impl(store, conn)
+        print(f"rollup backfill: {time.perf_counter() - build_start:.1f}s")
+
+
+def _time(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--providers", type=int, default=10)
+    args = parser.parse_args()
+
+    providers = [f"provider{i}" for i in range(args.providers)]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = StateStore(str(Path(tmp) / "bench.db"))
+        print(f"populating {args.rows:,} metric rows...")
+        _populate(store, args.rows, providers)
+
+        for hours in (24, 168):
+            cutoff = time.time() - hours * 3600
+
+            def raw():
+                with store._get_connection() as conn:
+                    for p in providers:
+                        conn.execute(RAW_QUERY, (p, cutoff)).fetchone()
+
+            def rollup():
+                store.get_all_provider_metrics(hours=hours, providers=providers)
+
+            raw_s = _time(raw)
+            rollup_s = _time(rollup)
+            print(
+                f"{hours:>4}h window: raw {raw_s * 1000:9.1f} ms   "
+                f"rollup {rollup_s * 1000:7.2f} ms   speedup {raw_s / rollup_s:7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
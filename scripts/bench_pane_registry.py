@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pane registry lookups with N session files in the run dir.
+
+For each size, in a temporary HOME:
+
+- legacy:   the pre-index lookup (glob + sort + parse every file)
+- migrate:  first lookup on a directory with no index (imports every file)
+- cold:     a fresh RegistryIndex per lookup, like a short-lived ``ask``
+- warm:     repeated lookups in one long-lived process (memoized)
+- rescan:   a lookup right after another process replaced one file
+
+Pane liveness is stubbed (always alive) so only registry cost is timed.
+
+Usage:
+    python scripts/bench_pane_registry.py [--files 100 1000 5000] [--lookups 200]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+import pane_registry  # noqa: E402
+
+
+class _Alive:
+    def is_alive(self, pane_id: str) -> bool:
+        return True
+
+
+def _legacy_by_project(project_id: str, provider: str):
+    best, best_ts = None, -1
+    for path in pane_registry._iter_registry_files():
+        data = pane_registry._load_registry_file(path)
+        if not data:
+            continue
+        updated_at = pane_registry._coerce_updated_at(data.get("updated_at"), path)
+        if pane_registry._is_stale(updated_at) or (data.get("ccb_project_id") or "") != project_id:
+            continue
+        if pane_registry._provider_pane_alive(data, provider) and updated_at > best_ts:
+            best, best_ts = data, updated_at
+    return best
+
+
+def _record(i: int, now: int) -> dict:
+    return {
+        "ccb_session_id": f"s{i}",
+        "ccb_project_id": f"project-{i}",
+        "work_dir": f"/home/user/src/project-{i}",
+        "terminal": "tmux",
+        "updated_at": now - i,
+        "providers": {p: {"pane_id": f"%{i}{p[0]}", "pane_title_marker": f"CCB-{p}-{i}",
+                          f"{p}_session_path": f"/home/user/.{p}/sessions/{i}.jsonl"}
+                      for p in ("codex", "gemini", "claude")},
+    }
+
+
+def _per_lookup_ms(fn, n: int) -> float:
+    started = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return (time.perf_counter() - started) / n * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    pane_registry.get_backend_for_session = lambda _rec: _Alive()
+    print(f"{'files':>6} {'legacy ms':>10} {'migrate ms':>11} {'cold ms':>9} {'warm ms':>9} {'rescan ms':>10}")
+    for n in args.files:
+        with tempfile.TemporaryDirectory() as home:
+            os.environ["HOME"] = home
+            run_dir = Path(home) / ".ccb" / "run"
+            run_dir.mkdir(parents=True)
+            now = int(time.time())
+            for i in range(n):
+                (run_dir / f"ccb-session-s{i}.json").write_text(json.dumps(_record(i, now), indent=2))
+            os.utime(run_dir, ns=(0, time.time_ns() - 10**10))  # settled: outside the racy window
+            target = lambda i: f"project-{(i * 7919) % n}"  # noqa: E731
+
+            legacy_n = max(1, min(args.lookups, 20000 // n))
+            legacy = _per_lookup_ms(lambda i: _legacy_by_project(target(i), "codex"), legacy_n)
+
+            started = time.perf_counter()
+            assert pane_registry.load_registry_by_project_id(target(0), "codex")
+            migrate = (time.perf_counter() - started) * 1000
+            os.utime(run_dir, ns=(0, time.time_ns() - 10**10))  # creating .index/ touched it
+
+            def cold(i: int) -> None:
+                pane_registry._INDEXES.clear()
+                assert pane_registry.load_registry_by_project_id(target(i), "codex")
+
+            cold_ms = _per_lookup_ms(cold, args.lookups)
+            warm = _per_lookup_ms(lambda i: pane_registry.load_registry_by_project_id(target(i % 10), "codex"),
+                                  args.lookups)
+
+            def rescan(i: int) -> None:
+                path = run_dir / f"ccb-session-s{i % n}.json"
+                tmp = path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(_record(i % n, now)))
+                os.replace(tmp, path)
+                os.utime(run_dir, ns=(0, time.time_ns() - 10**10 + i))
+                pane_registry.load_registry_by_project_id(target(i), "codex")
+
+            rescan_ms = _per_lookup_ms(rescan, min(args.lookups, 50))
+            print(f"{n:>6} {legacy:>10.2f} {migrate:>11.1f} {cold_ms:>9.3f} {warm:>9.3f} {rescan_ms:>10.2f}",
+                  flush=True)
+            pane_registry._INDEXES.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark: searching 36 monthly partitions with CCBPartitionedMemory.
+
+Builds ``--partitions`` months of synthetic conversations (``--rows`` per
+month): the newest month in the live database, the rest as monthly archives.
+The same rows are also loaded into one unified database, which is what the
+previous ``search_conversations`` queried.  Timed queries:
+
+- common:  a word in every row (newest partitions satisfy ``limit``)
+- rare:    a token in a single old month (other archives skipped)
+- sparse:  a token in one row per month (``limit`` needs most partitions)
+- window:  a common word limited to the last 6 months
+
+Usage:
+    python scripts/bench_partition_search.py [--partitions 36] [--rows 3000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from memory.memory_partitioned import CCBPartitionedMemory  # noqa: E402
+
+
+def _rows(partitions: int, rows: int):
+    rng = random.Random(4)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(3000)]
+    now = datetime.now()
+    next_id = 1
+    for age in range(partitions):
+        month_start = (now - timedelta(days=30 * age)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        batch = []
+        for i in range(rows):
+            ts = month_start + timedelta(minutes=i * 27 * 24 * 60 // rows)
+            answer = " ".join(rng.choice(words) for _ in range(120))
+            if age == partitions - 3 and i == rows // 2:
+                answer += " zyxwvquux"
+            if i == rows // 3:
+                answer += " monthlyreport"
+            question = " ".join(rng.choice(words) for _ in range(15)) + " gateway"
+            batch.append((next_id, ts.isoformat(), "codex", question, answer, "{}", 0))
+            next_id += 1
+        yield age, batch
+
+
+def _unified_search(db: Path, keyword: str, limit: int, months: int):
+    conn = sqlite3.connect(db)
+    rows = conn.execute(
+        """
+        SELECT c.timestamp, c.provider, c.question, c.answer
+        FROM conversations c
+        JOIN conversations_fts fts ON c.id = fts.rowid
+        WHERE conversations_fts MATCH ? AND c.timestamp >= ?
+        ORDER BY c.timestamp DESC
+        LIMIT ?
+    """,
+        (keyword, CCBPartitionedMemory._cutoff_days(months), limit),
+    ).fetchall()
+    conn.close()
+    return [r[0] for r in rows]
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--partitions", type=int, default=36)
+    parser.add_argument("--rows", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        for name in ("partitioned", "unified"):
+            (tmp / name).mkdir()
+        os.environ["HOME"] = str(tmp / "partitioned")
+        memory = CCBPartitionedMemory()
+        unified_db = tmp / "unified.db"
+        os.environ["HOME"] = str(tmp / "unified")
+        unified = CCBPartitionedMemory()
+        unified.db_path = unified_db
+        unified._init_db(unified_db)
+
+        for age, batch in _rows(args.partitions, args.rows):
+            targets = [unified_db] + ([memory.db_path] if age == 0 else [])
+            for db in targets:
+                conn = sqlite3.connect(db)
+                conn.executemany("INSERT INTO conversations VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                conn.executemany(
+                    "INSERT INTO conversations_fts(rowid, question, answer, provider) VALUES (?, ?, ?, ?)",
+                    [(r[0], r[3], r[4], r[2]) for r in batch],
+                )
+                conn.commit()
+                conn.close()
+            if age:
+                memory.archive_tier.append(batch)
+
+        queries = {
+            "common": ("gateway", 36),
+            "rare": ("zyxwvquux", 36),
+            "sparse": ("monthlyreport", 36),
+            "window": ("gateway", 6),
+        }
+        print(f"{args.partitions} partitions x {args.rows} rows, limit {args.limit}, {os.cpu_count()} CPU")
+        print(f"{'query':<8} {'unified ms':>11} {'serial ms':>10} {'fan-out ms':>11} {'partitions':>11}")
+        for label, (keyword, months) in queries.items():
+            expected = _unified_search(unified_db, keyword, args.limit, months)
+            got = memory.search_conversations(keyword, limit=args.limit, months=months)
+            assert [r["timestamp"] for r in got] == expected, label
+            searched = len(memory.partitions(keyword, since=memory._cutoff_days(months)))
+            before = _time(lambda: _unified_search(unified_db, keyword, args.limit, months), args.repeat)
+            serial = _time(lambda: memory.search_conversations(keyword, args.limit, months, workers=1), args.repeat)
+            fanout = _time(lambda: memory.search_conversations(keyword, args.limit, months), args.repeat)
+            print(f"{label:<8} {before:>11.1f} {serial:>10.1f} {fanout:>11.1f} {searched:>11}")
+        memory.close()
+        unified.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: provider prompt cache hits with the legacy vs prefix-stable layout.
+
+Replays ``--requests`` memory-augmented requests per provider against the
+local stub API (``test/stubs/llm_api_stub.py``), which emulates Anthropic
+``cache_control`` breakpoints and OpenAI-style automatic prefix caching and
+charges simulated prefill time per uncached token.
+
+Each request carries the same provider/MCP context, one of ``--topics``
+relevant-skill blocks, fresh memories and a fresh question:
+
+- legacy: system context (provider, skills, MCP) + memories + skill
+  recommendations, sent as one string
+- layout: ``layout_prompt`` (provider/MCP, skills, recommendations, memories)
+  with cache breakpoints for Anthropic
+
+Runs once per ``--stable-chars`` size.  Breakpoints only cover the stable and
+session tiers, so with a typical small provider/MCP context (the first size)
+the prefix is under the provider minimum and nothing is cached; the gain
+shows up once that context is large (many MCP tools).
+
+Usage:
+    python scripts/bench_prompt_cache.py [--requests 60] [--stable-chars 600 6000] [--ms-per-token 0.02]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+sys.path.insert(0, str(ROOT / "test" / "stubs"))
+
+from gateway.backends.http import HTTPBackend  # noqa: E402
+from gateway.gateway_config import ProviderConfig  # noqa: E402
+from gateway.middleware.prompt_layout import SESSION, STABLE, VOLATILE, layout_prompt  # noqa: E402
+from gateway.models import BackendType, GatewayRequest  # noqa: E402
+from llm_api_stub import PromptCacheStub, start_stub  # noqa: E402
+
+
+def _text(rng: random.Random, chars: int) -> str:
+    words = ("gateway", "provider", "memory", "skill", "context", "cache", "request", "网关", "记忆", "工具")
+    out = []
+    while sum(len(w) + 1 for w in out) < chars:
+        out.append(rng.choice(words))
+    return " ".join(out)
+
+
+def _workload(args, stable_chars: int, rng: random.Random) -> list:
+    provider = "## 🤖 Current Provider\n- **claude**: " + _text(rng, stable_chars // 2) + "\n"
+    mcp = "## 🔌 MCP Tools Available\n" + _text(rng, stable_chars // 2) + "\n"
+    topics = [f"## 🛠️ Relevant Skills\n- **skill-{t}**: " + _text(rng, 1500) for t in range(args.topics)]
+    requests = []
+    for i in range(args.requests):
+        topic = rng.randrange(args.topics)
+        requests.append({
+            "provider": provider,
+            "mcp": mcp,
+            "skills": topics[topic],
+            "recs": f"## 💡 Skill recommendations\n- /skill-{topic}",
+            "memories": f"## 💭 Memories\n- ({i}) " + _text(rng, 2000),
+            "question": f"question {i}: " + _text(rng, 200),
+        })
+    return requests
+
+
+def _legacy(item: dict) -> GatewayRequest:
+    system = "\n".join((item["provider"], item["skills"], item["mcp"]))
+    context = "\n\n".join((system, item["memories"], item["recs"]))
+    message = f"# 系统上下文\n\n{context}\n\n---\n\n# 用户请求\n{item['question']}\n"
+    return GatewayRequest.create(provider="bench", message=message, metadata={})
+
+
+def _layout(item: dict) -> GatewayRequest:
+    layout = layout_prompt(
+        [(STABLE, "\n".join((item["provider"], item["mcp"]))), (SESSION, item["skills"]),
+         (VOLATILE, item["memories"]), (SESSION, item["recs"])],
+        item["question"],
+    )
+    return GatewayRequest.create(provider="bench", message=layout.message,
+                                 metadata={"_prompt_segments": layout.segments})
+
+
+async def _run(kind: str, build, workload: list, args) -> dict:
+    stub = PromptCacheStub(min_cache_tokens=1024, base_ms=args.base_ms, ms_per_token=args.ms_per_token)
+    runner, port = await start_stub(stub)
+    backend = HTTPBackend(ProviderConfig(
+        name=kind, backend_type=BackendType.HTTP_API, api_base_url=f"http://127.0.0.1:{port}/v1",
+        api_key_env="sk-bench", model="m",
+    ))
+    try:
+        latencies = []
+        for item in workload:
+            result = await backend.execute(build(item))
+            assert result.success, result.error
+            latencies.append(result.latency_ms)
+        stats = backend.get_prompt_cache_stats()
+        stats["avg_latency_ms"] = sum(latencies) / len(latencies)
+        return stats
+    finally:
+        await backend.shutdown()
+        await runner.cleanup()
+
+
+async def _main(args) -> None:
+    for stable_chars in args.stable_chars:
+        workload = _workload(args, stable_chars, random.Random(7))
+        print(f"\n{args.requests} requests, {args.topics} skill topics, ~{stable_chars} chars stable context")
+        print(f"{'provider':<10} {'layout':<7} {'read ratio':>10} {'hits':>5} {'avg ms':>8} {'hit ms':>8} {'miss ms':>8}")
+        for kind in ("anthropic", "openai"):
+            for label, build in (("legacy", _legacy), ("layout", _layout)):
+                s = await _run(kind, build, workload, args)
+                hit = f"{s['avg_latency_hit_ms']:.1f}" if s["avg_latency_hit_ms"] is not None else "-"
+                miss = f"{s['avg_latency_miss_ms']:.1f}" if s["avg_latency_miss_ms"] is not None else "-"
+                print(f"{kind:<10} {label:<7} {s['cache_read_ratio']:>10.1%} {s['hit_requests']:>5} "
+                      f"{s['avg_latency_ms']:>8.1f} {hit:>8} {miss:>8}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--topics", type=int, default=4)
+    parser.add_argument("--stable-chars", type=int, nargs="+", default=[600, 6000])
+    parser.add_argument("--base-ms", type=float, default=2.0)
+    parser.add_argument("--ms-per-token", type=float, default=0.02)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
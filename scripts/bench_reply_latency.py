@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: reply-detection latency of ``wait_for_message``.
+
+A stub writer process appends an assistant reply to a Codex session log after
+a random delay and reports the wall-clock time of the write.  Latency is the
+time from that write until the waiter returns the reply.
+
+- fixed:    the previous loop, ``time.sleep(poll_interval)`` between checks
+- poll:     backoff poller (``CCB_FILE_WATCH=poll``)
+- inotify:  inotify watcher, blocking wait
+- async:    inotify watcher through ``await wait_for_message_async``
+
+Usage:
+    python scripts/bench_reply_latency.py [--trials 10] [--poll-interval 2.0]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from providers._codex_reader import CodexCommReader  # noqa: E402
+
+WRITER = r"""
+import json, sys, time
+path, delay, text = sys.argv[1], float(sys.argv[2]), sys.argv[3]
+time.sleep(delay)
+payload = {"type": "message", "role": "assistant", "content": [{"type": "output_text", "text": text}]}
+with open(path, "a", encoding="utf-8") as handle:
+    handle.write(json.dumps({"type": "response_item", "payload": payload}) + "\n")
+print(time.time(), flush=True)
+"""
+
+
+def _fixed_wait(reader: CodexCommReader, state, timeout: float, poll_interval: float):
+    # Previous implementation, kept here for comparison.
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        message = reader.try_get_message(state)
+        if message:
+            return message
+        time.sleep(poll_interval)
+    return None
+
+
+def _trial(mode: str, session: Path, poll_interval: float, rng: random.Random) -> float:
+    reader = CodexCommReader(home_dir=str(session.parent), work_dir=session.parent)
+    reader.set_preferred_session(str(session))
+    state = reader.capture_state()
+    text = f"reply-{rng.random()}"
+    writer = subprocess.Popen(
+        [sys.executable, "-c", WRITER, str(session), f"{rng.uniform(0.2, 1.5):.3f}", text],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    if mode == "fixed":
+        message = _fixed_wait(reader, state, 30, poll_interval)
+    elif mode == "async":
+        message = asyncio.run(reader.wait_for_message_async(state, timeout=30, poll_interval=poll_interval))
+    else:
+        message = reader.wait_for_message(state, timeout=30, poll_interval=poll_interval)
+    returned_at = time.time()
+    written_at = float(writer.communicate()[0].strip())
+    assert message == text, message
+    return (returned_at - written_at) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trials", type=int, default=10)
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["CCB_SESSION_INDEX_DIR"] = str(Path(tmp) / "index")
+        session = Path(tmp) / "rollout-bench.jsonl"
+        session.write_text("", encoding="utf-8")
+        for mode in ("fixed", "poll", "inotify", "async"):
+            if mode == "poll":
+                os.environ["CCB_FILE_WATCH"] = "poll"
+            else:
+                os.environ.pop("CCB_FILE_WATCH", None)
+            latencies = [_trial(mode, session, args.poll_interval, rng) for _ in range(args.trials)]
+            rows.append((mode, latencies))
+
+    print(f"{args.trials} replies per mode, poll_interval {args.poll_interval:.1f} s")
+    print(f"{'mode':<9} {'p50 (ms)':>10} {'mean (ms)':>10} {'max (ms)':>10}")
+    for mode, values in rows:
+        print(f"{mode:<9} {statistics.median(values):>10.1f} {statistics.mean(values):>10.1f} {max(values):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Codex session discovery with and without the session index.
+
+Generates ``--files`` synthetic rollout files spread over date directories
+(the ``~/.codex/sessions/YYYY/MM/DD`` layout), each starting with a
+``session_meta`` line naming one of ``--projects`` working directories.
+
+- glob:          recursive glob + stat + first-line read of every file
+                 (the previous ``_find_session_file``)
+- index cold:    first lookup, building the index from scratch
+- index reload:  first lookup in a new process, from the persisted index
+- index poll:    steady-state lookup while one session is being appended to
+
+Usage:
+    python scripts/bench_session_index.py [--files 10000] [--projects 50] [--polls 50]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from providers import session_index  # noqa: E402
+from providers._codex_reader import CodexCommReader  # noqa: E402
+
+
+def _generate(home: Path, files: int, projects: int) -> Path:
+    base = 1_700_000_000
+    for i in range(files):
+        day = home / "2024" / f"{1 + (i // 900) % 12:02d}" / f"{1 + (i // 30) % 28:02d}"
+        day.mkdir(parents=True, exist_ok=True)
+        path = day / f"rollout-{i:06d}.jsonl"
+        meta = {"type": "session_meta", "payload": {"cwd": f"/work/project-{i % projects}"}}
+        path.write_text(json.dumps(meta) + "\n", encoding="utf-8")
+        os.utime(path, (base + i, base + i))
+    return home
+
+
+def _legacy_find(reader: CodexCommReader) -> Path:
+    # Previous implementation, kept here for comparison.
+    expected = reader._normalize_work_dir()
+    latest_match, latest_match_mtime = None, -1.0
+    latest_any, latest_any_mtime = None, -1.0
+    for path in reader.home_dir.glob("**/*.jsonl"):
+        if not path.is_file():
+            continue
+        mtime = path.stat().st_mtime
+        if mtime >= latest_any_mtime:
+            latest_any_mtime, latest_any = mtime, path
+        cwd = reader._extract_cwd_from_log(path)
+        if cwd and cwd == expected and mtime >= latest_match_mtime:
+            latest_match_mtime, latest_match = mtime, path
+    return latest_match or latest_any
+
+
+def _timed(fn) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--polls", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["CCB_SESSION_INDEX_DIR"] = str(Path(tmp) / "index")
+        home = _generate(Path(tmp) / "sessions", args.files, args.projects)
+        work = Path("/work/project-7")
+        reader = CodexCommReader(home_dir=str(home), work_dir=work)
+
+        expected, legacy_ms = _timed(lambda: _legacy_find(reader))
+        found, cold_ms = _timed(reader._find_session_file)
+        assert found == expected, (found, expected)
+
+        session_index._INDEXES.clear()
+        reader = CodexCommReader(home_dir=str(home), work_dir=work)
+        found, reload_ms = _timed(reader._find_session_file)
+        assert found == expected
+
+        index = reader._index()
+        index.min_refresh_s = 0
+        poll_ms = 0.0
+        for i in range(args.polls):
+            with found.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps({"type": "response_item", "n": i}) + "\n")
+            result, elapsed = _timed(reader._find_session_file)
+            assert result == found
+            poll_ms += elapsed
+        poll_ms /= args.polls
+
+    print(f"{args.files} session files, {args.projects} projects")
+    print(f"{'lookup':<14} {'ms':>10} {'speedup':>9}")
+    for name, value in (
+        ("glob", legacy_ms),
+        ("index cold", cold_ms),
+        ("index reload", reload_ms),
+        ("index poll", poll_ms),
+    ):
+        print(f"{name:<14} {value:>10.2f} {legacy_ms / value:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: grouping near-duplicate memories for ``merge_similar_memories``.
+
+Generates ``N`` synthetic observations (sentences over a few thousand words,
+``--dup-rate`` of them lightly edited copies of earlier ones) and times:
+
+- pairwise:  the previous all-pairs ``SequenceMatcher`` grouping; above
+             ``--pairwise-max`` items it is timed on that many items and
+             extrapolated quadratically (marked ``~``)
+- lsh cold:  MinHash/LSH candidates + exact verification, signatures
+             computed and stored
+- lsh warm:  the same run again with every signature loaded from SQLite
+
+Usage:
+    python scripts/bench_similarity_groups.py [--sizes 1000 10000 100000] [--threshold 0.9]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from memory.consolidator_heuristics_runtime import ConsolidatorHeuristicsRuntimeMixin  # noqa: E402
+
+
+def _corpus(n: int, dup_rate: float, seed: int = 5):
+    rng = random.Random(seed)
+    vocab = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(4000)]
+    items = []
+    for i in range(n):
+        if items and rng.random() < dup_rate:
+            words = rng.choice(items)[1].split()
+            words[rng.randrange(len(words))] = rng.choice(vocab)
+            text = " ".join(words)
+        else:
+            text = " ".join(rng.choice(vocab) for _ in range(rng.randint(10, 40)))
+        items.append((f"obs-{i}", text, "note"))
+    return items
+
+
+def _pairwise(items, threshold):
+    groups, used = [], set()
+    for i, a in enumerate(items):
+        if i in used:
+            continue
+        group = [a]
+        used.add(i)
+        for j, b in enumerate(items):
+            if j not in used and j != i and SequenceMatcher(None, a[1], b[1]).ratio() >= threshold:
+                group.append(b)
+                used.add(j)
+        if len(group) >= 2:
+            groups.append(group)
+    return groups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--dup-rate", type=float, default=0.2)
+    parser.add_argument("--pairwise-max", type=int, default=1000)
+    args = parser.parse_args()
+
+    mixin = ConsolidatorHeuristicsRuntimeMixin()
+    # The corpus generator is prefix-stable, so one pairwise run serves every size.
+    measured = {}
+    print(f"{'items':>8} {'pairwise s':>12} {'lsh cold s':>11} {'lsh warm s':>11} {'groups':>7} {'recall':>7}")
+    for size in args.sizes:
+        items = _corpus(size, args.dup_rate)
+
+        sample = items[:min(size, args.pairwise_max)]
+        if len(sample) not in measured:
+            start = time.perf_counter()
+            measured[len(sample)] = (_pairwise(sample, args.threshold), time.perf_counter() - start)
+        baseline, elapsed = measured[len(sample)]
+        pairwise = elapsed * (size / len(sample)) ** 2
+        approx = "~" if len(sample) < size else " "
+
+        conn = sqlite3.connect(":memory:")
+        start = time.perf_counter()
+        groups = mixin._find_similar_groups(items, args.threshold, conn)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        mixin._find_similar_groups(items, args.threshold, conn)
+        warm = time.perf_counter() - start
+
+        lsh_sample = mixin._find_similar_groups(sample, args.threshold)
+        found = {(g[0][0], x[0]) for g in lsh_sample for x in g[1:]}
+        expected = {(g[0][0], x[0]) for g in baseline for x in g[1:]}
+        recall = len(found & expected) / len(expected) if expected else 1.0
+        print(f"{size:>8} {approx}{pairwise:>11.2f} {cold:>11.2f} {warm:>11.2f} {len(groups):>7} {recall:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark: syncing ~/.ccb/streams/*.jsonl into stream_entries.
+
+Creates ``--files`` stream files of ``--lines`` entries and compares the
+previous per-file sync (COUNT(*) check, one connection and commit per file,
+grown files skipped) with the ledger-based incremental sync:
+
+- initial:  first sync of every file
+- growth:   ``--grow`` of the files get 5 more lines
+- idle:     nothing changed
+
+Then runs ``run_stream_sync`` in the background while a writer appends
+``--rate`` lines/s across the files, and reports commit lag and throughput.
+
+Usage:
+    python scripts/bench_stream_sync.py [--files 2000] [--lines 50] [--rate 2000] [--seconds 3]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from memory.memory_v2 import CCBMemoryV2  # noqa: E402
+
+
+def _line(kind: str = "chunk") -> str:
+    return json.dumps({"ts": time.time(), "type": kind, "content": "token " * 20, "meta": {"i": 1}}) + "\n"
+
+
+def _legacy_sync_all(db_path: Path, stream_dir: Path) -> dict:
+    """The previous sync_all_streams: skip any request that has rows."""
+    stats = {"synced": 0, "skipped": 0, "total_entries": 0}
+    for stream_file in stream_dir.glob("*.jsonl"):
+        request_id = stream_file.stem
+        conn = sqlite3.connect(db_path)
+        existing = conn.execute("SELECT COUNT(*) FROM stream_entries WHERE request_id = ?", (request_id,)).fetchone()[0]
+        if existing:
+            stats["skipped"] += 1
+            conn.close()
+            continue
+        entries = []
+        with open(stream_file, "r", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line.strip())
+                entries.append((request_id, entry.get("type", "unknown"), entry.get("ts", 0),
+                                entry.get("content", ""), json.dumps(entry.get("meta", {}))))
+        conn.executemany("INSERT INTO stream_entries (request_id, entry_type, timestamp, content, metadata) "
+                         "VALUES (?, ?, ?, ?, ?)", entries)
+        conn.commit()
+        conn.close()
+        stats["synced"] += 1
+        stats["total_entries"] += len(entries)
+    return stats
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=50)
+    parser.add_argument("--grow", type=float, default=0.2)
+    parser.add_argument("--rate", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--interval", type=float, default=0.1)
+    args = parser.parse_args()
+    rng = random.Random(2)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        os.environ["HOME"] = str(tmp)
+        streams = tmp / ".ccb" / "streams"
+        streams.mkdir(parents=True)
+        files = [streams / f"req-{i:05d}.jsonl" for i in range(args.files)]
+        for path in files:
+            path.write_text("".join(_line() for _ in range(args.lines)))
+        legacy = CCBMemoryV2(db_path=str(tmp / "legacy.db"))
+        memory = CCBMemoryV2(db_path=str(tmp / "ledger.db"))
+
+        rows = []
+        legacy_t, legacy_stats = _timed(lambda: _legacy_sync_all(legacy.db_path, streams))
+        ledger_t, ledger_stats = _timed(memory.sync_all_streams)
+        rows.append(("initial", legacy_t, legacy_stats["total_entries"], ledger_t, ledger_stats["total_entries"]))
+
+        grown = rng.sample(files, int(len(files) * args.grow))
+        for path in grown:
+            with open(path, "a") as f:
+                f.write("".join(_line() for _ in range(5)))
+        legacy_t, legacy_stats = _timed(lambda: _legacy_sync_all(legacy.db_path, streams))
+        ledger_t, ledger_stats = _timed(memory.sync_all_streams)
+        rows.append(("growth", legacy_t, legacy_stats["total_entries"], ledger_t, ledger_stats["total_entries"]))
+
+        legacy_t, legacy_stats = _timed(lambda: _legacy_sync_all(legacy.db_path, streams))
+        ledger_t, ledger_stats = _timed(memory.sync_all_streams)
+        rows.append(("idle", legacy_t, legacy_stats["total_entries"], ledger_t, ledger_stats["total_entries"]))
+
+        print(f"{args.files} files x {args.lines} lines; growth appends 5 lines to {len(grown)} files")
+        print(f"{'pass':<8} {'legacy s':>9} {'entries':>8} {'ledger s':>9} {'entries':>8}")
+        for name, lt, le, nt, ne in rows:
+            print(f"{name:<8} {lt:>9.3f} {le:>8} {nt:>9.3f} {ne:>8}")
+
+        passes = []
+
+        async def continuous() -> int:
+            stop = asyncio.Event()
+            task = asyncio.create_task(memory.run_stream_sync(args.interval, stop, passes.append))
+            hot = files[:200]
+            written = 0
+            deadline = time.perf_counter() + args.seconds
+            while time.perf_counter() < deadline:
+                for _ in range(max(1, args.rate // 100)):
+                    with open(rng.choice(hot), "a") as f:
+                        f.write(_line())
+                    written += 1
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(args.interval * 3)
+            stop.set()
+            await task
+            return written
+
+        start = time.perf_counter()
+        written = asyncio.run(continuous())
+        elapsed = time.perf_counter() - start
+        synced = sum(p["total_entries"] for p in passes)
+        lags = [p["avg_lag_s"] for p in passes]
+        print(f"\ncontinuous: wrote {written} lines in {args.seconds:.0f}s, synced {synced} "
+              f"({synced / elapsed:.0f} entries/s) over {len(passes)} passes, interval {args.interval}s")
+        print(f"lag: mean {statistics.mean(lags) * 1000:.0f} ms, "
+              f"max {max(p['max_lag_s'] for p in passes) * 1000:.0f} ms; "
+              f"pass time p50 {statistics.median(p['elapsed_s'] for p in passes) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time to first token, streaming fast path vs queued /api/ask.
+
+A local aiohttp stub speaks the OpenAI chat-completions protocol and emits
+``--tokens`` deltas with a fixed per-token delay (the non-streaming variant
+sleeps for the same total before replying).  The queued path enqueues the
+request and waits for the scheduler to finish it; the fast path relays chunks
+from ``HTTPBackend.execute_stream`` as they arrive.
+
+Usage:
+    python scripts/bench_stream_ttft.py [--runs 20] [--tokens 40] [--token-delay-ms 25]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from aiohttp import web  # noqa: E402
+
+from gateway import server_requests, server_streaming  # noqa: E402
+from gateway.backends.http import HTTPBackend  # noqa: E402
+from gateway.gateway_config import GatewayConfig, ProviderConfig  # noqa: E402
+from gateway.metrics import GatewayMetrics  # noqa: E402
+from gateway.models import BackendType, GatewayRequest  # noqa: E402
+from gateway.request_queue import AsyncRequestQueue, RequestQueue  # noqa: E402
+from gateway.state_store import StateStore  # noqa: E402
+
+
+def _make_stub_app(tokens: int, token_delay_s: float, first_token_s: float) -> web.Application:
+    async def chat(request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        words = [f"tok{i} " for i in range(tokens)]
+        if not body.get("stream"):
+            await asyncio.sleep(first_token_s + token_delay_s * tokens)
+            return web.json_response({
+                "choices": [{"message": {"content": "".join(words)}}],
+                "usage": {"total_tokens": tokens},
+            })
+
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+        await asyncio.sleep(first_token_s)
+        for word in words:
+            delta = {"choices": [{"delta": {"content": word}}]}
+            await resp.write(f"data: {json.dumps(delta)}\n\n".encode())
+            await asyncio.sleep(token_delay_s)
+        await resp.write(b"data: [DONE]\n\n")
+        await resp.write_eof()
+        return resp
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", chat)
+    return app
+
+
+class _BenchServer:
+    """Just enough of GatewayServer to drive both request paths."""
+
+    process_request = server_requests.process_request
+    _process_single_request = server_requests._process_single_request
+    _apply_memory_pre_request = server_requests._apply_memory_pre_request
+    _handle_failure = server_requests._handle_failure
+    stream_request = server_streaming.stream_request
+
+    def __init__(self, store: StateStore, backend: HTTPBackend):
+        self.config = GatewayConfig()
+        self.config.retry.enabled = False
+        self.store = store
+        self.queue = RequestQueue(store)
+        self.metrics = GatewayMetrics(use_prometheus_client=False)
+        self.backends = {"stub": backend}
+        self.retry_executor = None
+        self.memory_middleware = None
+        self.cache_manager = None
+        self._app = None
+        self.done: dict = {}
+
+    async def _handle_success(self, request, result, latency_ms, retry_info=None):
+        await server_requests._handle_success(self, request, result, latency_ms, retry_info)
+        event = self.done.get(request.id)
+        if event:
+            event.set()
+
+
+async def _run(args) -> None:
+    runner = web.AppRunner(_make_stub_app(args.tokens, args.token_delay_ms / 1000, args.first_token_ms / 1000))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    pconfig = ProviderConfig(
+        name="stub",
+        backend_type=BackendType.HTTP_API,
+        api_base_url=f"http://127.0.0.1:{port}/v1",
+        api_key_env="sk-bench",
+        model="stub-model",
+    )
+    backend = HTTPBackend(pconfig)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = _BenchServer(StateStore(str(Path(tmp) / "bench.db")), backend)
+        async_queue = AsyncRequestQueue(server.queue)
+        await async_queue.start(server.process_request)
+
+        queued, fast_ttft, fast_total = [], [], []
+        for _ in range(args.runs):
+            request = GatewayRequest.create(provider="stub", message="bench")
+            server.done[request.id] = asyncio.Event()
+            start = time.perf_counter()
+            server.queue.enqueue(request)
+            await server.done[request.id].wait()
+            queued.append(time.perf_counter() - start)
+
+            request = GatewayRequest.create(provider="stub", message="bench")
+            start = time.perf_counter()
+            first = None
+            async for _chunk in server.stream_request(request):
+                if first is None:
+                    first = time.perf_counter() - start
+            fast_total.append(time.perf_counter() - start)
+            fast_ttft.append(first)
+
+        await async_queue.stop()
+        await asyncio.gather(*list(server_streaming._pending_finalizers))
+        await backend.shutdown()
+    await runner.cleanup()
+
+    def ms(values, q=None):
+        if q is None:
+            return statistics.median(values) * 1000
+        return sorted(values)[min(len(values) - 1, int(q * len(values)))] * 1000
+
+    print(f"stub: {args.tokens} tokens, first token {args.first_token_ms:.0f} ms, "
+          f"{args.token_delay_ms:.0f} ms/token, {args.runs} runs")
+    print(f"{'path':<28} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+    print(f"{'queued: first byte = full':<28} {ms(queued):>10.1f} {ms(queued, 0.95):>10.1f}")
+    print(f"{'fast path: TTFT':<28} {ms(fast_ttft):>10.1f} {ms(fast_ttft, 0.95):>10.1f}")
+    print(f"{'fast path: full stream':<28} {ms(fast_total):>10.1f} {ms(fast_total, 0.95):>10.1f}")
+    print(f"recorded TTFT summary: {server.metrics.get_ttft_summary().get('stub')}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--tokens", type=int, default=40)
+    parser.add_argument("--token-delay-ms", type=float, default=25.0)
+    parser.add_argument("--first-token-ms", type=float, default=150.0)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SystemContextBuilder.get_relevant_context per request.
+
+Builds a synthetic inventory of ``--skills`` skills and replays
+``--requests`` requests whose keyword sets are drawn (Zipf-like) from a
+pool of ``--distinct`` sets across a few providers:
+
+- legacy:  the previous linear ``_find_relevant_skills`` scan + formatting
+- indexed: the keyword index with an empty fragment cache (every request misses)
+- cached:  the fragment cache as used by the gateway (repeats hit)
+
+Usage:
+    python scripts/bench_system_context.py [--skills 100 1000] [--requests 5000] [--distinct 200]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+import gateway.middleware.system_context as system_context  # noqa: E402
+
+_WORDS = ("react", "pdf", "sql", "note", "ask", "plan", "test", "deploy", "docker", "api", "graph", "data",
+          "前端", "后端", "数据库", "文档", "测试", "部署", "review", "design", "markdown", "excel", "slides")
+_PROVIDERS = ("gemini", "kimi", "codex", "claude")
+
+
+class _Registry:
+    skills: list = []
+
+    def scan_skills(self):
+        return self.skills
+
+    def scan_providers(self):
+        return [{"name": name, "models": ["a", "b", "c"], "description": f"{name} provider"} for name in _PROVIDERS]
+
+    def scan_mcp_servers(self):
+        return [{"name": f"mcp-{i}", "tools": ["t"] * i} for i in range(4)]
+
+
+def _skills(n: int, rng: random.Random) -> list:
+    return [{
+        "name": f"{rng.choice(_WORDS)}-{rng.choice(_WORDS)}-{i}",
+        "description": " ".join(rng.choices(_WORDS, k=12)) + " helper for everyday work",
+        "triggers": rng.sample(_WORDS, 3),
+    } for i in range(n)]
+
+
+def _legacy(builder, keywords, provider) -> str:
+    cache = builder.context_cache
+    relevant = []
+    for skill in cache["skills"]:
+        name = skill.get("name", "").lower()
+        description = skill.get("description", "").lower()
+        triggers = [t.lower() for t in skill.get("triggers", [])]
+        score = 0
+        for keyword in keywords:
+            kw_lower = keyword.lower()
+            if kw_lower in name:
+                score += 3
+            if kw_lower in description:
+                score += 2
+            if any(kw_lower in trigger for trigger in triggers):
+                score += 1
+        if score > 0:
+            skill["_relevance_score"] = score
+            relevant.append(skill)
+    relevant.sort(key=lambda x: x.get("_relevance_score", 0), reverse=True)
+    info = next((p for p in cache["providers"] if p.get("name") == provider), None)
+    parts = ["## 🤖 Current Provider"]
+    if info:
+        parts.append(f"- **{provider}**: {info.get('description', '')}")
+        parts.append(f"- Available models: {', '.join(info.get('models', [])[:5])}")
+    parts.append("")
+    if relevant:
+        parts.append("## 🛠️ Relevant Skills")
+        parts.extend(f"- **{s.get('name', 'unknown')}**: {s.get('description', '')}" for s in relevant[:5])
+        parts.append("")
+    parts.append("## 🔌 MCP Tools Available")
+    parts.extend(f"- {s.get('name', 'unknown')}: {len(s.get('tools', []))} tools" for s in cache["mcp_servers"][:3])
+    parts.append("")
+    return "\n".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skills", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--distinct", type=int, default=200)
+    args = parser.parse_args()
+
+    system_context.CCBRegistry = _Registry
+    print(f"{args.requests} requests, {args.distinct} distinct keyword sets")
+    print(f"{'skills':>6} {'legacy us':>10} {'indexed us':>11} {'cached us':>10} {'hit rate':>9} {'avg bytes':>10}")
+    for n in args.skills:
+        rng = random.Random(n)
+        _Registry.skills = _skills(n, rng)
+        pool = [rng.sample(_WORDS, rng.randint(2, 6)) for _ in range(args.distinct)]
+        weights = [1 / (rank + 1) for rank in range(args.distinct)]
+        requests = [(rng.choices(pool, weights)[0], rng.choice(_PROVIDERS)) for _ in range(args.requests)]
+
+        builder = system_context.SystemContextBuilder()
+        for keywords, provider in requests[:50]:
+            assert builder.get_relevant_context(keywords, provider) == _legacy(builder, keywords, provider)
+
+        started = time.perf_counter()
+        for keywords, provider in requests:
+            _legacy(builder, keywords, provider)
+        legacy = (time.perf_counter() - started) / len(requests) * 1e6
+
+        builder.reload()
+        started = time.perf_counter()
+        for keywords, provider in requests:
+            builder._fragments.clear()
+            builder.get_relevant_context(keywords, provider)
+        indexed = (time.perf_counter() - started) / len(requests) * 1e6
+
+        builder.reload()
+        builder._assembly_stats.update(requests=0, cache_hits=0, total_ms=0.0, total_bytes=0)
+        started = time.perf_counter()
+        for keywords, provider in requests:
+            builder.get_relevant_context(keywords, provider)
+        cached = (time.perf_counter() - started) / len(requests) * 1e6
+        stats = builder.get_assembly_stats()
+        print(f"{n:>6} {legacy:>10.1f} {indexed:>11.1f} {cached:>10.1f} "
+              f"{stats['cache_hits'] / stats['requests']:>9.1%} {stats['avg_bytes']:>10.0f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
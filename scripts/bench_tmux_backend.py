@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: TmuxBackend pane operations, subprocess vs control mode.
+
+Starts a private tmux server (``-L``) with ``--panes`` panes running
+``cat`` and, for each mode, runs a daemon-style polling loop for
+``--seconds``: per pane, ``pane_exists``, ``is_alive``,
+``get_pane_content`` and ``set_pane_title``.  Reports ops/s and CPU per op
+for this process (including child ``tmux`` processes) and for the tmux
+server.
+
+Then measures how quickly a line written to a pane is seen: polling
+``get_pane_content`` every ``--poll-ms`` vs reading ``open_output_stream``.
+
+Usage:
+    python scripts/bench_tmux_backend.py [--panes 8] [--seconds 3] [--poll-ms 50]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from terminal_tmux_backend import TmuxBackend  # noqa: E402
+
+
+def _server_cpu(pid: int) -> float:
+    fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _self_cpu() -> float:
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _poll_loop(backend: TmuxBackend, panes: list, seconds: float, server_pid: int) -> str:
+    ops = 0
+    cpu0, srv0 = _self_cpu(), _server_cpu(server_pid)
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        for i, pane in enumerate(panes):
+            assert backend.pane_exists(pane)
+            assert backend.is_alive(pane)
+            backend.get_pane_content(pane, lines=40)
+            backend.set_pane_title(pane, f"CCB-{i}")
+            ops += 4
+    elapsed = time.perf_counter() - started
+    cpu, srv = _self_cpu() - cpu0, _server_cpu(server_pid) - srv0
+    return f"{ops / elapsed:>9.0f} {cpu / ops * 1e3:>12.3f} {srv / ops * 1e3:>12.3f}"
+
+
+def _latency(backend: TmuxBackend, pane: str, rounds: int, poll_ms: float, stream: bool) -> list:
+    samples = []
+    reader = backend.open_output_stream(pane) if stream else None
+    try:
+        for i in range(rounds):
+            token = f"tok{i}x{os.getpid()}"
+            if reader is not None:
+                reader.read(timeout=0)
+            sent = time.perf_counter()
+            backend.send_key(pane, token)
+            backend.send_key(pane, "Enter")
+            while True:
+                if reader is not None:
+                    seen = token in reader.read(timeout=1.0)
+                else:
+                    time.sleep(poll_ms / 1000)
+                    seen = token in (backend.get_pane_content(pane, lines=5) or "")
+                if seen:
+                    samples.append((time.perf_counter() - sent) * 1000)
+                    break
+    finally:
+        if reader is not None:
+            reader.close()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--panes", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--poll-ms", type=float, default=50.0)
+    parser.add_argument("--rounds", type=int, default=30)
+    args = parser.parse_args()
+
+    socket = f"ccb-bench-{os.getpid()}"
+    tmux = ["tmux", "-L", socket]
+    subprocess.run([*tmux, "new-session", "-d", "-s", "bench", "-x", "200", "-y", "60", "cat"], check=True)
+    try:
+        for _ in range(args.panes - 1):
+            subprocess.run([*tmux, "split-window", "-t", "bench", "cat"], check=True)
+            subprocess.run([*tmux, "select-layout", "-t", "bench", "tiled"], check=True)
+        panes = subprocess.run([*tmux, "list-panes", "-t", "bench", "-F", "#{pane_id}"],
+                               capture_output=True, text=True, check=True).stdout.split()
+        server_pid = int(subprocess.run([*tmux, "display-message", "-p", "#{pid}"],
+                                        capture_output=True, text=True, check=True).stdout)
+
+        backends = {
+            "subprocess": TmuxBackend(socket_name=socket, control_mode=False),
+            "control": TmuxBackend(socket_name=socket, control_mode=True),
+        }
+        backends["control"].pane_exists(panes[0])  # start the control client outside the timing
+
+        print(f"{len(panes)} panes, {args.seconds:.0f}s polling loop per mode")
+        print(f"{'mode':<11} {'ops/s':>9} {'cpu ms/op':>12} {'server ms/op':>12}")
+        for mode, backend in backends.items():
+            print(f"{mode:<11} {_poll_loop(backend, panes, args.seconds, server_pid)}", flush=True)
+
+        print(f"\noutput visibility latency over {args.rounds} lines")
+        print(f"{'mode':<22} {'p50 ms':>8} {'p95 ms':>8}")
+        for label, backend, stream in (
+            (f"poll {args.poll_ms:.0f}ms subprocess", backends["subprocess"], False),
+            (f"poll {args.poll_ms:.0f}ms control", backends["control"], False),
+            ("%output stream", backends["control"], True),
+        ):
+            samples = sorted(_latency(backend, panes[0], args.rounds, args.poll_ms, stream))
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            print(f"{label:<22} {statistics.median(samples):>8.2f} {p95:>8.2f}", flush=True)
+        backends["control"].close()
+    finally:
+        subprocess.run([*tmux, "kill-server"], capture_output=True)
+
+
+if __name__ == "__main__":
+    main()
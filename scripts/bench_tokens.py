@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: token estimation speed and accuracy on English/Chinese/mixed text.
+
+For each corpus:
+
+- findall:  the previous estimator (``len(re.findall(cjk))``)
+- heuristic: ``estimate_tokens`` without memoization (first sight of a text)
+- memoized: ``estimate_tokens`` on a segment seen before (repeated system
+  context / memory blocks)
+
+Accuracy is reported against an exact tokenizer when one is available
+locally (``--tokenizer tiktoken:o200k_base`` or
+``tokenizers:/path/to/tokenizer.json``, or ``CCB_TOKENIZER``).
+
+Usage:
+    python scripts/bench_tokens.py [--chars 30000] [--rounds 200] [--tokenizer SPEC]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "lib"))
+
+from lib.common import tokens  # noqa: E402
+
+_OLD_CJK = re.compile(r"[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af]")
+
+_ENGLISH = (
+    "The gateway routes each request to the provider with the best recent latency, "
+    "retrying on rate limits and caching idempotent responses. "
+)
+_CHINESE = "网关会把每个请求路由到最近延迟最低的服务商，在限流时重试，并缓存幂等的响应结果。"
+_CODE = "def handle(request):\n    return {\"status\": 200, \"body\": request.json()}\n"
+
+
+def _corpora(chars: int) -> dict:
+    def fill(unit: str) -> str:
+        return (unit * (chars // len(unit) + 1))[:chars]
+
+    mixed = fill(_ENGLISH + _CHINESE + _CODE + "请检查 `config.yaml` 里的 timeout 设置。\n")
+    return {"english": fill(_ENGLISH), "code": fill(_CODE), "chinese": fill(_CHINESE), "mixed": mixed}
+
+
+def _old_estimate(text: str) -> int:
+    cjk = len(_OLD_CJK.findall(text))
+    return int(cjk / 1.5 + (len(text) - cjk) / 4)
+
+
+def _ms(fn, text: str, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(text)
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chars", type=int, default=30000)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--tokenizer", default=os.environ.get("CCB_TOKENIZER", ""))
+    args = parser.parse_args()
+
+    exact = tokens._load_tokenizer(args.tokenizer) if args.tokenizer else None
+    tokens.set_tokenizer(None)
+    corpora = _corpora(args.chars)
+
+    print(f"{args.chars} chars per text, {args.rounds} rounds")
+    print(f"{'corpus':<8} {'findall ms':>11} {'heuristic ms':>13} {'memoized ms':>12} {'estimate':>9} {'exact':>7} {'error':>7}")
+    for name, text in corpora.items():
+        assert tokens.estimate_tokens(text) == _old_estimate(text)
+        old = _ms(_old_estimate, text, args.rounds)
+        new = _ms(tokens._heuristic_tokens, text, args.rounds)
+        tokens.estimate_tokens(text)
+        memo = _ms(tokens.estimate_tokens, text, args.rounds)
+        estimate = tokens.estimate_tokens(text)
+        if exact is not None:
+            true = exact[1](text)
+            accuracy = f"{true:>7} {(estimate - true) / true * 100:>+6.1f}%"
+        else:
+            accuracy = f"{'-':>7} {'-':>7}"
+        print(f"{name:<8} {old:>11.3f} {new:>13.3f} {memo:>12.4f} {estimate:>9} {accuracy}", flush=True)
+    if exact is None:
+        print("\naccuracy: no exact tokenizer available locally (pass --tokenizer)")
+    else:
+        print(f"\naccuracy vs {exact[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 
@@ -9,3 +11,5 @@ def pytest_configure() -> None:
     lib_dir = repo_root / "lib"
     sys.path.insert(0, str(lib_dir))
 
+    # Keep persisted provider session indexes out of the repo's data dir.
+    os.environ.setdefault("CCB_SESSION_INDEX_DIR", tempfile.mkdtemp(prefix="ccb-session-index-"))
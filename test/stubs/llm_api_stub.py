@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Local LLM API stub with provider-side prompt caching, for HTTP backend tests
+and benchmarks.
+
+Routes (under ``/v1``):
+
+- ``POST /messages``: Anthropic Messages API.  Prefixes ending at a block
+  with ``cache_control`` are cached; a later request whose breakpoint
+  prefix matches one reads it from the cache (``cache_read_input_tokens``),
+  new breakpoint prefixes are written (``cache_creation_input_tokens``).
+- ``POST /chat/completions``: OpenAI-compatible.  Automatic prefix caching
+  in ``CHUNK_CHARS`` increments, reported as
+  ``usage.prompt_tokens_details.cached_tokens``.
+
+Prefixes shorter than ``min_cache_tokens`` are never cached.  Each response
+is delayed by ``base_ms + uncached_tokens * ms_per_token`` (cached tokens cost
+a tenth), standing in for prefill time.  Tokens are counted as UTF-8 bytes / 4.
+
+Usage:
+    python test/stubs/llm_api_stub.py [--port 8765] [--ms-per-token 0.02]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Tuple
+
+from aiohttp import web
+
+CHUNK_CHARS = 512
+
+
+def count_tokens(text: str) -> int:
+    return len(text.encode("utf-8")) // 4
+
+
+def _key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class PromptCacheStub:
+    def __init__(self, *, min_cache_tokens: int = 1024, base_ms: float = 2.0, ms_per_token: float = 0.02):
+        self.min_cache_tokens = min_cache_tokens
+        self.base_ms = base_ms
+        self.ms_per_token = ms_per_token
+        self.cache: Dict[str, int] = {}
+        self.requests: List[Dict[str, Any]] = []
+
+    async def _delay(self, prompt_tokens: int, cached_tokens: int) -> None:
+        cost = (prompt_tokens - cached_tokens) + cached_tokens / 10
+        await asyncio.sleep((self.base_ms + cost * self.ms_per_token) / 1000)
+
+    def _anthropic_usage(self, blocks: List[Dict[str, Any]]) -> Tuple[str, Dict[str, int]]:
+        text, read, written = "", 0, 0
+        for block in blocks:
+            text += block.get("text", "")
+            if not block.get("cache_control"):
+                continue
+            tokens = count_tokens(text)
+            if tokens < self.min_cache_tokens:
+                continue
+            key = _key(text)
+            if key in self.cache:
+                read = tokens
+            else:
+                self.cache[key] = tokens
+                written = tokens
+        total = count_tokens(text)
+        written = max(0, written - read)
+        return text, {
+            "input_tokens": total - read - written,
+            "cache_read_input_tokens": read,
+            "cache_creation_input_tokens": written,
+        }
+
+    async def messages(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        content = payload["messages"][-1]["content"]
+        blocks = content if isinstance(content, list) else [{"type": "text", "text": content}]
+        text, usage = self._anthropic_usage(blocks)
+        self.requests.append({"api": "anthropic", "payload": payload})
+        prompt = usage["input_tokens"] + usage["cache_read_input_tokens"] + usage["cache_creation_input_tokens"]
+        await self._delay(prompt, usage["cache_read_input_tokens"])
+        usage["output_tokens"] = 5
+        return web.json_response({
+            "model": payload.get("model"),
+            "content": [{"type": "text", "text": f"ok {len(text)}"}],
+            "stop_reason": "end_turn",
+            "usage": usage,
+        })
+
+    async def chat(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        text = payload["messages"][-1]["content"]
+        self.requests.append({"api": "openai", "payload": payload})
+        cached = 0
+        for end in range(CHUNK_CHARS, len(text) + 1, CHUNK_CHARS):
+            prefix = text[:end]
+            tokens = count_tokens(prefix)
+            if tokens < self.min_cache_tokens:
+                continue
+            key = _key(prefix)
+            if key in self.cache:
+                cached = tokens
+            else:
+                self.cache[key] = tokens
+        total = count_tokens(text)
+        await self._delay(total, cached)
+        return web.json_response({
+            "model": payload.get("model"),
+            "choices": [{"message": {"content": f"ok {len(text)}"}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": total,
+                "completion_tokens": 5,
+                "total_tokens": total + 5,
+                "prompt_tokens_details": {"cached_tokens": cached},
+            },
+        })
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v1/messages", self.messages)
+        app.router.add_post("/v1/chat/completions", self.chat)
+        return app
+
+
+async def start_stub(stub: PromptCacheStub, port: int = 0) -> Tuple[web.AppRunner, int]:
+    runner = web.AppRunner(stub.app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--min-cache-tokens", type=int, default=1024)
+    parser.add_argument("--base-ms", type=float, default=2.0)
+    parser.add_argument("--ms-per-token", type=float, default=0.02)
+    args = parser.parse_args()
+    stub = PromptCacheStub(
+        min_cache_tokens=args.min_cache_tokens, base_ms=args.base_ms, ms_per_token=args.ms_per_token,
+    )
+    web.run_app(stub.app(), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
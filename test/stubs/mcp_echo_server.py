@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Echo MCP server over stdio for aggregator tests and benchmarks.
+
+Requests are handled concurrently, so responses come back in completion
+order rather than request order.  Tools:
+
+- ``echo``: returns its arguments after ``delay`` seconds (default
+  ``MCP_ECHO_DELAY``), preceded by a ``notifications/progress`` line;
+  ``_meta.call`` numbers the upstream calls and ``tool_error: true``
+  returns an ``isError`` result
+- ``fail``: returns a JSON-RPC error
+
+``MCP_ECHO_NO_INIT=1`` makes ``initialize`` fail like a pre-handshake server.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+
+
+def _default_delay() -> float:
+    try:
+        return max(0.0, float(os.environ.get("MCP_ECHO_DELAY", "0")))
+    except ValueError:
+        return 0.0
+
+
+TOOLS = [
+    {"name": "echo", "description": "Echo the arguments back", "inputSchema": {"type": "object"}},
+    {"name": "fail", "description": "Always fails", "inputSchema": {"type": "object"}},
+]
+
+
+CALLS = {"echo": 0}
+
+
+async def _handle(message: dict, write, cancelled: set) -> None:
+    method = message.get("method")
+    request_id = message.get("id")
+    params = message.get("params") or {}
+    if method == "initialize" and os.environ.get("MCP_ECHO_NO_INIT") != "1":
+        write({"jsonrpc": "2.0", "id": request_id, "result": {
+            "protocolVersion": params.get("protocolVersion", "2024-11-05"),
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "mcp-echo", "version": "1.0.0"},
+        }})
+    elif method == "ping":
+        write({"jsonrpc": "2.0", "id": request_id, "result": {}})
+    elif method == "tools/list":
+        write({"jsonrpc": "2.0", "id": request_id, "result": {"tools": TOOLS}})
+    elif method == "tools/call" and params.get("name") == "echo":
+        arguments = params.get("arguments") or {}
+        CALLS["echo"] += 1
+        call = CALLS["echo"]
+        write({"jsonrpc": "2.0", "method": "notifications/progress",
+               "params": {"progressToken": request_id, "progress": 0}})
+        await asyncio.sleep(float(arguments.get("delay", _default_delay())))
+        if request_id in cancelled:
+            return
+        write({"jsonrpc": "2.0", "id": request_id, "result": {
+            "content": [{"type": "text", "text": json.dumps(arguments, sort_keys=True)}],
+            "isError": bool(arguments.get("tool_error")),
+            "_meta": {"call": call},
+        }})
+    elif request_id is not None:
+        write({"jsonrpc": "2.0", "id": request_id, "error": {"code": -32601, "message": f"no such method: {method}"}})
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    cancelled: set = set()
+    tasks: set = set()
+
+    def write(message: dict) -> None:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+    print("mcp-echo starting", flush=True)  # non-JSON noise the client must skip
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if message.get("method") == "notifications/cancelled":
+            cancelled.add((message.get("params") or {}).get("requestId"))
+            continue
+        task = asyncio.create_task(_handle(message, write, cancelled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -248,11 +248,60 @@ def _handle_droid(req_id: str, prompt: str, delay_s: float, session_path: Path,
     _append_jsonl(session_path, assistant_entry)
 
 
+def _startup_delay() -> float:
+    raw = os.environ.get("STUB_STARTUP_DELAY")
+    try:
+        return max(0.0, float(raw)) if raw else 0.0
+    except ValueError:
+        return 0.0
+
+
+def _stdio_main(prompt_args: list[str], mode: str) -> int:
+    """Gateway CLI stub: pays STUB_STARTUP_DELAY once, then answers on stdout."""
+    startup = _startup_delay()
+    if startup:
+        time.sleep(startup)
+    delay_s = _delay("stdio")
+    if mode == "json":
+        # Codex ``exec --json`` style event stream, one event per delay step.
+        events = [
+            {"type": "thread.started", "thread_id": "stub"},
+            {"type": "item.completed", "item": {"id": "item_0", "type": "reasoning", "text": "thinking it over"}},
+            {"type": "item.completed", "item": {"id": "item_1", "type": "command_execution", "command": "true"}},
+            {"type": "item.completed", "item": {"id": "item_2", "type": "agent_message", "text": "stub reply:"}},
+            {"type": "item.completed", "item": {"id": "item_3", "type": "agent_message", "text": " ".join(prompt_args)}},
+            {"type": "turn.completed", "usage": {"input_tokens": 12, "cached_input_tokens": 4, "output_tokens": 7}},
+        ]
+        for event in events:
+            if delay_s:
+                time.sleep(delay_s)
+            print(json.dumps(event), flush=True)
+        return 0
+    if mode == "once":
+        if delay_s:
+            time.sleep(delay_s)
+        print(f"stub reply: {' '.join(prompt_args)}", flush=True)
+        return 0
+
+    print("stub ready", flush=True)
+    print("> ", flush=True)
+    for line in sys.stdin:
+        if delay_s:
+            time.sleep(delay_s)
+        print(f"stub reply: {line.rstrip()}", flush=True)
+        print("> ", flush=True)
+    return 0
+
+
 def main(argv: list[str]) -> int:
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument("--provider", default="")
+    parser.add_argument("--stdio", choices=("once", "repl", "json"), default="")
     args, _unknown = parser.parse_known_args(argv[1:])
 
+    if args.stdio:
+        return _stdio_main(_unknown, args.stdio)
+
     provider = (args.provider or Path(argv[0]).name).strip().lower()
     if provider not in ("codex", "gemini", "claude", "opencode", "droid"):
         print(f"[stub] unknown provider: {provider}", file=sys.stderr)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from batch_processor import BatchProcessor, BatchStatus
+
+# Echoes stdin upper-cased with its start/end times; "fail" exits 1, "sleep N" sleeps.
+STUB = """
+import sys, time
+message = sys.stdin.read().strip()
+started = time.time()
+if message.startswith("sleep"):
+    time.sleep(float(message.split()[1]))
+if message == "fail":
+    sys.stderr.write("boom")
+    sys.exit(1)
+print(message.upper(), started, time.time())
+"""
+
+
+def _processor(tmp_path: Path, **kwargs) -> BatchProcessor:
+    commands = {name: [sys.executable, "-c", STUB] for name in ("stub", "slow")}
+    return BatchProcessor(
+        db_path=str(tmp_path / "batch.db"),
+        default_provider="stub",
+        provider_commands=commands,
+        **kwargs,
+    )
+
+
+def _span(task) -> tuple:
+    started, ended = task.result.split()[-2:]
+    return float(started), float(ended)
+
+
+def test_tasks_run_without_a_shell_and_results_persist(tmp_path: Path) -> None:
+    processor = _processor(tmp_path, max_concurrent=4)
+    messages = ["hello", "it's $HOME `x`", "fail", "<<'EOF'\nEOF"]
+    job = processor.create_batch(messages)
+    seen = []
+    job = processor.execute_batch(job, lambda j, t: seen.append(t.id))
+
+    assert job.status == BatchStatus.COMPLETED
+    assert sorted(seen) == sorted(t.id for t in job.tasks)
+    assert job.tasks[1].result.split()[0] == "IT'S"  # passed verbatim, no expansion
+    assert job.get_task(job.tasks[2].id).error == "boom"
+    assert job.successful_count == 3 and job.failed_count == 1
+
+    reloaded = _processor(tmp_path).get_job(job.id)
+    assert [t.status for t in reloaded.tasks] == [t.status for t in job.tasks]
+    assert [t.result for t in reloaded.tasks] == [t.result for t in job.tasks]
+
+
+def test_provider_limits_and_timeouts(tmp_path: Path) -> None:
+    processor = _processor(tmp_path, max_concurrent=4, provider_limits={"slow": 1}, timeout_s=1.5)
+    job = processor.create_batch(["sleep 0.3"] * 3, provider="slow")
+    job.tasks.append(type(job.tasks[0])(id=f"{job.id}-fast", message="fast", provider="stub"))
+    job = processor.execute_batch(job)
+
+    slow = sorted(_span(t) for t in job.tasks[:3])
+    assert all(prev[1] <= nxt[0] for prev, nxt in zip(slow, slow[1:]))  # never overlap
+    assert _span(job.tasks[3])[1] < slow[-1][0]  # other providers are not held up
+
+    hung = processor.create_batch(["sleep 30"])
+    started = time.monotonic()
+    hung = processor.execute_batch(hung)
+    assert hung.tasks[0].error == "Timeout" and time.monotonic() - started < 5
+    assert hung.status == BatchStatus.FAILED
+
+
+def test_interrupted_jobs_resume_only_unfinished_tasks(tmp_path: Path) -> None:
+    crashed = _processor(tmp_path)
+    job = crashed.create_batch(["a", "b", "c", "d"])
+    # Simulate a crash after the first two results were flushed.
+    job.status = BatchStatus.RUNNING
+    crashed._save_job_status(job)
+    crashed._save_task_updates([
+        (BatchStatus.COMPLETED.value, "done before crash", None, 1.0, "stub", job.tasks[0].id),
+        (BatchStatus.FAILED.value, None, "failed before crash", 1.0, "stub", job.tasks[1].id),
+    ])
+
+    processor = _processor(tmp_path)
+    assert processor.find_interrupted_jobs() == [job.id]
+    resumed = processor.resume_batch(job.id)
+
+    assert [t.result.split()[0] if t.result else t.error for t in resumed.tasks] == [
+        "done", "failed before crash", "C", "D",
+    ]
+    assert resumed.status == BatchStatus.COMPLETED
+    assert processor.find_interrupted_jobs() == []
+    with sqlite3.connect(processor.db_path) as conn:
+        statuses = [r[0] for r in conn.execute("SELECT status FROM batch_tasks ORDER BY rowid")]
+    assert statuses == ["completed", "failed", "completed", "completed"]
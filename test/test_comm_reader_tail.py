@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from providers._codex_reader import CodexCommReader
+from providers._gemini_reader import GeminiCommReader
+
+
+def _codex_line(role: str, text: str) -> str:
+    kind = "output_text" if role == "assistant" else "input_text"
+    entry = {
+        "type": "response_item",
+        "payload": {"type": "message", "role": role, "content": [{"type": kind, "text": text}]},
+    }
+    return json.dumps(entry) + "\n"
+
+
+def _codex_reader(tmp_path: Path) -> tuple[CodexCommReader, Path]:
+    session = tmp_path / "sessions" / "rollout-abc.jsonl"
+    session.parent.mkdir(parents=True)
+    session.write_text(_codex_line("user", "hi") + _codex_line("assistant", "first"), encoding="utf-8")
+    reader = CodexCommReader(home_dir=str(session.parent), work_dir=tmp_path)
+    reader.set_preferred_session(str(session))
+    return reader, session
+
+
+def test_tail_parses_only_appended_complete_lines(tmp_path: Path) -> None:
+    reader, session = _codex_reader(tmp_path)
+    state = reader.capture_state()
+    assert state.message_count == 2
+    assert reader.latest_message() == "first"
+    offset = reader._tails[str(session)].offset
+
+    line = _codex_line("assistant", "second")
+    with session.open("a", encoding="utf-8") as handle:
+        handle.write(line[:20])
+    assert reader.try_get_message(state) is None
+    assert reader._tails[str(session)].offset == offset
+
+    with session.open("a", encoding="utf-8") as handle:
+        handle.write(line[20:])
+    assert reader.try_get_message(state) == "second"
+    assert [m.content for m in reader.latest_conversations(2)] == ["first", "second"]
+
+
+def test_tail_restarts_after_truncation_or_rotation(tmp_path: Path) -> None:
+    reader, session = _codex_reader(tmp_path)
+    assert reader.capture_state().message_count == 2
+
+    session.write_text(_codex_line("assistant", "rewritten"), encoding="utf-8")
+    assert reader.capture_state().message_count == 1
+    assert reader.latest_message() == "rewritten"
+
+    rotated = session.with_suffix(".tmp")
+    rotated.write_text(
+        _codex_line("assistant", "a") + _codex_line("assistant", "b") + _codex_line("assistant", "rotated"),
+        encoding="utf-8",
+    )
+    rotated.replace(session)
+    assert reader.capture_state().message_count == 3
+    assert reader.latest_message() == "rotated"
+
+
+def test_document_reader_reparses_only_on_change(tmp_path: Path, monkeypatch) -> None:
+    session = tmp_path / "session-1.json"
+    session.write_text(json.dumps({"messages": [{"type": "gemini", "content": "one"}]}), encoding="utf-8")
+    reader = GeminiCommReader(home_dir=str(tmp_path), work_dir=tmp_path)
+    reader.set_preferred_session(str(session))
+
+    calls = []
+    original = reader._parse_messages
+    monkeypatch.setattr(reader, "_parse_messages", lambda content: calls.append(1) or original(content))
+
+    assert reader.latest_message() == "one"
+    assert reader.capture_state().message_count == 1
+    assert len(calls) == 1
+
+    session.write_text(
+        json.dumps({"messages": [{"type": "gemini", "content": "one"}, {"type": "gemini", "content": "two"}]}),
+        encoding="utf-8",
+    )
+    assert reader.latest_message() == "two"
+    assert len(calls) == 2
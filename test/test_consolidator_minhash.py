@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import random
+import sqlite3
+from difflib import SequenceMatcher
+
+from memory.consolidator_heuristics_runtime import ConsolidatorHeuristicsRuntimeMixin
+from memory.consolidator_minhash import LSHIndex, MinHasher, SignatureStore, choose_bands
+
+
+def _brute_force(items, threshold):
+    groups, used = [], set()
+    for i, a in enumerate(items):
+        if i in used:
+            continue
+        group = [a]
+        used.add(i)
+        for j, b in enumerate(items):
+            if j not in used and SequenceMatcher(None, a[1], b[1]).ratio() >= threshold:
+                group.append(b)
+                used.add(j)
+        if len(group) >= 2:
+            groups.append(group)
+    return groups
+
+
+def _corpus(n: int, seed: int = 3):
+    rng = random.Random(seed)
+    words = ["cache", "provider", "session", "retry", "timeout", "gateway", "memory", "index", "tmux", "pane"]
+    items = []
+    for i in range(n):
+        if items and rng.random() < 0.3:
+            base = list(rng.choice(items)[1])
+            pos = rng.randrange(len(base))
+            base[pos] = "X"
+            text = "".join(base)
+        else:
+            text = " ".join(rng.choice(words) for _ in range(rng.randint(8, 20)))
+        items.append((f"obs-{i}", text, "note"))
+    return items
+
+
+def test_lsh_grouping_matches_pairwise_baseline() -> None:
+    items = _corpus(150)
+    mixin = ConsolidatorHeuristicsRuntimeMixin()
+    for threshold in (0.9, 0.8):
+        assert mixin._find_similar_groups(items, threshold) == _brute_force(items, threshold)
+
+
+def test_lsh_candidates_include_near_duplicates() -> None:
+    hasher = MinHasher()
+    texts = ["the gateway retries the provider after a timeout", "The gateway  retries the provider after a timeout!",
+             "completely unrelated note about tmux panes"]
+    index = LSHIndex(hasher.signatures(texts), *choose_bands(0.5, hasher.num_perm))
+    assert index.candidates(0) == [1]
+    assert index.candidates(2) == []
+
+
+def test_signatures_are_persisted_and_refreshed_on_edit() -> None:
+    conn = sqlite3.connect(":memory:")
+    store = SignatureStore(conn, MinHasher())
+    items = [("a", "first memory text"), ("b", "second memory text")]
+    first, recomputed = store.signatures_for(items)
+    assert recomputed == 2
+    again, recomputed = store.signatures_for(items)
+    assert recomputed == 0 and (again == first).all()
+    _, recomputed = store.signatures_for([("a", "first memory text, edited"), ("b", "second memory text")])
+    assert recomputed == 1
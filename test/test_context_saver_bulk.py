@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+from memory.context_saver import ContextSaver
+from memory.context_saver_bulk import BulkArchiver
+
+
+def _write_session(path: Path, turns: int, tag: str = "") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = []
+    for i in range(turns):
+        lines.append({"type": "user", "uuid": f"{path.stem}-u{i}", "timestamp": f"2024-01-01T10:{i:02d}:00Z",
+                      "message": {"role": "user", "content": f"question {i} about {path.stem} {tag}"}})
+        lines.append({"type": "assistant", "uuid": f"{path.stem}-a{i}", "timestamp": f"2024-01-01T10:{i:02d}:30Z",
+                      "message": {"role": "assistant", "content": [{"type": "text", "text": f"answer {i}"}]}})
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+    return path
+
+
+def _archive_count(db: Path) -> int:
+    return sqlite3.connect(db).execute("SELECT COUNT(*) FROM session_archives").fetchone()[0]
+
+
+def test_bulk_archive_uses_ledger_to_skip_unchanged(tmp_path: Path) -> None:
+    root = tmp_path / "projects"
+    for i in range(5):
+        _write_session(root / f"proj{i % 2}" / f"s{i:04d}aaaa.jsonl", turns=3)
+    _write_session(root / "proj0" / "tinyaaaa.jsonl", turns=0)
+    saver = ContextSaver(archive_dir=tmp_path / "archive", db_path=tmp_path / "mem.db")
+
+    first = BulkArchiver(saver, workers=2, batch_size=2).run([root])
+    assert (first.discovered, first.archived, first.trivial, first.failed) == (6, 5, 1, 0)
+    assert _archive_count(tmp_path / "mem.db") == 5
+
+    second = BulkArchiver(saver, workers=1).run([root])
+    assert second.skipped_unchanged == 6 and second.archived == 0
+
+    changed = _write_session(root / "proj1" / "s0001aaaa.jsonl", turns=4, tag="edited")
+    touched = root / "proj0" / "s0000aaaa.jsonl"
+    os.utime(touched, (1, 1))
+    third = BulkArchiver(saver, workers=1).run([root])
+    assert third.archived == 1 and third.skipped_unchanged == 5
+    assert _archive_count(tmp_path / "mem.db") == 5
+
+    status = dict(sqlite3.connect(tmp_path / "mem.db").execute(
+        "SELECT path, status FROM session_archive_ledger"
+    ).fetchall())
+    assert status[str(changed)] == "archived"
+    assert status[str(touched)] == "archived"
+    assert status[str(root / "proj0" / "tinyaaaa.jsonl")] == "trivial"
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import math
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from memory.decay_engine import DecayEngine, naive_now_ts
+
+LEGACY_SCHEMA = """
+    CREATE TABLE memory_importance (
+        memory_id TEXT PRIMARY KEY,
+        memory_type TEXT NOT NULL,
+        importance_score REAL DEFAULT 0.5,
+        score_source TEXT DEFAULT 'default',
+        last_accessed_at TEXT,
+        access_count INTEGER DEFAULT 0,
+        decay_rate REAL DEFAULT 0.1,
+        created_at TEXT,
+        updated_at TEXT
+    )
+"""
+
+
+def _db(tmp_path: Path, now: datetime) -> Path:
+    db = tmp_path / "mem.db"
+    conn = sqlite3.connect(db)
+    conn.execute(LEGACY_SCHEMA)
+    rows = [
+        ("fresh", 0.8, (now - timedelta(hours=1)).isoformat(), 0.1),
+        ("stale", 0.5, (now - timedelta(hours=100)).isoformat(), None),
+        ("slow", 0.5, (now - timedelta(hours=20)).isoformat(), 0.05),
+        ("garbage", 0.9, "not a date", 0.1),
+        ("untracked", 0.9, None, 0.1),
+    ]
+    conn.executemany(
+        "INSERT INTO memory_importance (memory_id, memory_type, importance_score, last_accessed_at, decay_rate) "
+        "VALUES (?, 'message', ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+    return db
+
+
+def _flags(db: Path) -> dict:
+    return dict(sqlite3.connect(db).execute("SELECT memory_id, forget_flag FROM memory_importance").fetchall())
+
+
+def test_full_pass_matches_closed_form_and_persists_flags(tmp_path: Path) -> None:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    db = _db(tmp_path, now)
+    now_ts = (now - datetime(1970, 1, 1)).total_seconds()
+
+    stats = DecayEngine(db).run(default_rate=0.1, min_score=0.01, now=now_ts)
+
+    assert stats["mode"] == "full"
+    assert stats["processed"] == 4
+    # Only "fresh" stays within 10% of its importance; "stale" and "garbage" (168h) cross 0.01.
+    assert stats["decayed"] == 3
+    assert stats["flagged_for_forget"] == stats["newly_flagged"] == stats["total_flagged"] == 2
+    assert _flags(db) == {"fresh": 0, "stale": 1, "slow": 0, "garbage": 1, "untracked": 0}
+
+    scores = dict(sqlite3.connect(db).execute("SELECT memory_id, decayed_score FROM memory_importance").fetchall())
+    assert math.isclose(scores["slow"], 0.5 * math.exp(-0.05 * 20), rel_tol=1e-9)
+    assert scores["untracked"] is None
+
+
+def test_incremental_pass_only_revisits_changed_and_crossing_rows(tmp_path: Path) -> None:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    db = _db(tmp_path, now)
+    now_ts = (now - datetime(1970, 1, 1)).total_seconds()
+    engine = DecayEngine(db, chunk_rows=1)
+    engine.run(now=now_ts)
+
+    # "slow" crosses 0.01 after ln(50)/0.05 ≈ 78.2h since access; "fresh" after ≈ 44.8h.
+    later = engine.run(now=now_ts + 40 * 3600)
+    assert later["mode"] == "incremental" and later["processed"] == 0
+
+    later = engine.run(now=now_ts + 50 * 3600)
+    assert later["processed"] == 1 and later["newly_flagged"] == 1
+    assert _flags(db)["fresh"] == 1
+
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "UPDATE memory_importance SET last_accessed_at = ? WHERE memory_id = 'stale'",
+        ((now + timedelta(hours=50)).isoformat(),),
+    )
+    conn.commit()
+    conn.close()
+    touched = engine.run(now=now_ts + 50 * 3600)
+    assert touched["processed"] == 1 and touched["total_flagged"] == 2
+    assert _flags(db)["stale"] == 0
+
+    # Changing the threshold invalidates the watermark.
+    assert engine.run(min_score=0.02, now=now_ts + 50 * 3600)["mode"] == "full"
+
+
+def test_naive_now_matches_sqlite_epoch_of_isoformat() -> None:
+    stamp = datetime.now().isoformat()
+    epoch = sqlite3.connect(":memory:").execute(
+        "SELECT (julianday(?) - 2440587.5) * 86400.0", (stamp,)
+    ).fetchone()[0]
+    assert abs(naive_now_ts() - epoch) < 5
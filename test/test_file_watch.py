@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from providers._codex_reader import CodexCommReader
+from providers.file_watch import InotifyWatcher, PollingWatcher, _inotify_libc, create_watcher
+
+
+def _assistant_line(text: str) -> str:
+    payload = {"type": "message", "role": "assistant", "content": [{"type": "output_text", "text": text}]}
+    return json.dumps({"type": "response_item", "payload": payload}) + "\n"
+
+
+def _append_later(path: Path, text: str, delay: float) -> threading.Thread:
+    def run() -> None:
+        time.sleep(delay)
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(text)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_polling_watcher_backs_off_and_resets_on_change(tmp_path: Path) -> None:
+    target = tmp_path / "log.jsonl"
+    target.write_text("", encoding="utf-8")
+    watcher = PollingWatcher([target], min_interval=0.01, max_interval=0.08)
+
+    assert watcher.wait(0.1) is False
+    assert watcher._interval == 0.08
+
+    _append_later(target, "x\n", 0.0).join()
+    assert watcher.wait(1.0) is True
+    assert watcher._interval == 0.01
+
+
+@pytest.mark.skipif(_inotify_libc() is None, reason="inotify not available")
+def test_inotify_watcher_wakes_on_append_and_create(tmp_path: Path) -> None:
+    target = tmp_path / "log.jsonl"
+    target.write_text("", encoding="utf-8")
+    watcher = create_watcher([target, tmp_path])
+    assert isinstance(watcher, InotifyWatcher)
+    try:
+        assert watcher.wait(0.05) is False
+        _append_later(target, "x\n", 0.05)
+        start = time.monotonic()
+        assert watcher.wait(5.0) is True
+        assert time.monotonic() - start < 1.0
+
+        (tmp_path / "new.jsonl").write_text("", encoding="utf-8")
+        assert watcher.wait(1.0) is True
+    finally:
+        watcher.close()
+
+
+def test_wait_for_message_wakes_before_poll_interval(tmp_path: Path) -> None:
+    session = tmp_path / "rollout-1.jsonl"
+    session.write_text(_assistant_line("old"), encoding="utf-8")
+    reader = CodexCommReader(home_dir=str(tmp_path), work_dir=tmp_path)
+    reader.set_preferred_session(str(session))
+    state = reader.capture_state()
+
+    _append_later(session, _assistant_line("sync reply"), 0.1)
+    start = time.monotonic()
+    assert reader.wait_for_message(state, timeout=10, poll_interval=5.0) == "sync reply"
+    assert time.monotonic() - start < 2.0
+
+    state = reader.capture_state()
+    _append_later(session, _assistant_line("async reply"), 0.1)
+    start = time.monotonic()
+    message = asyncio.run(reader.wait_for_message_async(state, timeout=10, poll_interval=5.0))
+    assert message == "async reply"
+    assert time.monotonic() - start < 2.0
+
+
+def test_wait_for_message_times_out(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("CCB_FILE_WATCH", "poll")
+    session = tmp_path / "rollout-1.jsonl"
+    session.write_text(_assistant_line("old"), encoding="utf-8")
+    reader = CodexCommReader(home_dir=str(tmp_path), work_dir=tmp_path)
+    reader.set_preferred_session(str(session))
+    assert reader.wait_for_message(reader.capture_state(), timeout=0.2, poll_interval=0.05) is None
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+from memory.context_saver import ContextSaver
+from memory.jsonl_parser import BoundedSet, ClaudeJsonlParser, SessionSink
+
+
+def _user(uuid: str, text: str, ts: str) -> dict:
+    return {"type": "user", "uuid": uuid, "timestamp": ts, "cwd": "/proj", "sessionId": "abcdef123",
+            "message": {"role": "user", "content": text}}
+
+
+def _assistant(uuid: str, text: str, ts: str, tools=()) -> dict:
+    content = [{"type": "text", "text": text}]
+    content += [{"type": "tool_use", "name": name, "input": {"file_path": path}} for name, path in tools]
+    return {"type": "assistant", "uuid": uuid, "timestamp": ts,
+            "message": {"role": "assistant", "model": "m-1", "content": content}}
+
+
+def _write(path: Path, entries: list) -> Path:
+    path.write_text("".join(json.dumps(e, separators=(",", ":")) + "\n" for e in entries), encoding="utf-8")
+    return path
+
+
+def _session(tmp_path: Path) -> Path:
+    long_reply = "## Plan\n" + "step " * 80 + "\n发现：the cache key must include the provider name"
+    return _write(tmp_path / "abc.jsonl", [
+        {"type": "progress", "data": {"message": {"type": "user"}}},
+        _user("u1", "Please fix the flaky cache test. It fails on CI.", "2024-01-01T10:00:00Z"),
+        {"type": "file-history-snapshot", "snapshot": {"files": ["a"] * 50}},
+        _assistant("a1", long_reply, "2024-01-01T10:05:00Z", [("Read", "/p/a.py"), ("Edit", "/p/a.py")]),
+        _assistant("a1", long_reply, "2024-01-01T10:05:00Z"),
+        _user("u2", "x" * 60, "2024-01-01T10:06:00Z"),
+        _assistant("a2", "done", "2024-01-01T10:30:00Z", [("Read", "/p/b.py")]),
+    ])
+
+
+def test_stream_matches_parse_and_skips_noise(tmp_path: Path) -> None:
+    path = _session(tmp_path)
+    parser = ClaudeJsonlParser()
+
+    class Counter(SessionSink):
+        def __init__(self) -> None:
+            self.messages = []
+
+        def on_message(self, session, message) -> None:
+            self.messages.append(message.uuid)
+
+    counter = Counter()
+    streamed = parser.stream(path, counter)
+    parsed = parser.parse(path)
+
+    assert counter.messages == ["u1", "a1", "u2", "a2"]
+    assert [m.uuid for m in parsed.messages] == counter.messages
+    assert streamed.messages == []
+    assert streamed.message_count == 4 and streamed.tool_call_count == 3
+    assert len(parsed.tool_calls) == 3
+    assert {(fc.file_path, fc.action) for fc in parsed.file_changes} == {("/p/a.py", "modified"), ("/p/b.py", "read")}
+    assert (streamed.start_time, streamed.end_time, streamed.model) == ("2024-01-01T10:00:00Z", "2024-01-01T10:30:00Z", "m-1")
+
+
+def test_iter_lines_handles_chunk_boundaries(tmp_path: Path) -> None:
+    path = tmp_path / "lines.jsonl"
+    path.write_bytes(b'{"a":1}\n{"b":"\xe4\xbd\xa0"}\n{"c":3}')
+    assert list(ClaudeJsonlParser().iter_lines(path, chunk_size=3)) == [b'{"a":1}', b'{"b":"\xe4\xbd\xa0"}', b'{"c":3}']
+
+
+def test_bounded_set_forgets_oldest() -> None:
+    seen = BoundedSet(maxsize=2)
+    assert seen.add("a") and seen.add("b") and not seen.add("a")
+    assert seen.add("c")
+    assert seen.add("b")
+
+
+def test_save_session_streams_digest_into_archive(tmp_path: Path) -> None:
+    saver = ContextSaver(archive_dir=tmp_path / "archive", db_path=tmp_path / "mem.db")
+    session_path = _session(tmp_path)
+    legacy = saver.parser.parse(session_path)
+
+    assert saver.save_session(session_path)
+    row = sqlite3.connect(tmp_path / "mem.db").execute(
+        "SELECT message_count, tool_call_count, task_summary, learnings, tool_usage FROM session_archives"
+    ).fetchone()
+    assert row[0] == 4 and row[1] == 3
+    assert row[2] == saver._extract_task_summary(legacy) == "Please fix the flaky cache test"
+    assert json.loads(row[3]) == saver._extract_learnings(legacy)
+    assert json.loads(row[4]) == {"Read": 2, "Edit": 1}
+    assert saver.generate_markdown_for(session_path).split("---")[0] == saver._generate_markdown(legacy).split("---")[0]
+
+
+def test_clean_content_still_strips_noise_blocks() -> None:
+    parser = ClaudeJsonlParser()
+    text = "keep\n\n\n\n<System-Reminder>drop</system-reminder>Important: drop too\n\nkept"
+    assert parser._clean_content(text) == "keep\n\nkept"
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from mcp_aggregator import MCPAggregator, MCPServerConfig
+from mcp_aggregator_transport import MCPStdioClient
+
+STUB = Path(__file__).resolve().parent / "stubs" / "mcp_echo_server.py"
+
+
+def _config(**env) -> MCPServerConfig:
+    return MCPServerConfig(name="echo", command=sys.executable, args=[str(STUB)], env=env, timeout_s=10.0)
+
+
+def _aggregator(tmp_path: Path, **env) -> MCPAggregator:
+    return MCPAggregator(db_path=str(tmp_path / "mcp.db"), config={"echo": _config(**env)})
+
+
+def test_concurrent_calls_are_multiplexed_and_matched_by_id(tmp_path: Path) -> None:
+    aggregator = _aggregator(tmp_path)
+    seen = []
+    aggregator.add_notification_handler(lambda server, method, params: seen.append((server, method)))
+    try:
+        assert [t.name for t in aggregator.discover_tools("echo")] == ["echo", "fail"]
+        # Later calls finish first, so responses arrive out of order.
+        delays = [0.4, 0.3, 0.2, 0.1, 0.0]
+        started = time.monotonic()
+        with ThreadPoolExecutor(len(delays)) as pool:
+            results = list(pool.map(lambda d: aggregator.route_tool_call("echo", {"delay": d, "tag": d}), delays))
+        elapsed = time.monotonic() - started
+
+        assert all(r.success for r in results)
+        assert [json.loads(r.result["content"][0]["text"])["tag"] for r in results] == delays
+        assert elapsed < 0.9  # side by side, not 1.0s of serialized calls
+        assert ("echo", "notifications/progress") in seen
+
+        failed = aggregator.route_tool_call("fail", {})
+        assert not failed.success and "no such method" in failed.error
+
+        stats = aggregator.get_transport_stats()["echo"]
+        assert stats["starts"] == 1 and stats["max_in_flight"] >= 4 and stats["in_flight"] == 0
+    finally:
+        aggregator.shutdown()
+
+
+def test_timeouts_cancel_the_remote_request_and_keep_the_server_warm(tmp_path: Path) -> None:
+    aggregator = _aggregator(tmp_path)
+    try:
+        aggregator.discover_tools("echo")
+        slow = aggregator.route_tool_call("echo", {"delay": 1.0}, timeout_s=0.1)
+        assert not slow.success and slow.error == "Timeout waiting for response"
+
+        fast = aggregator.route_tool_call("echo", {"n": 1})
+        assert fast.success and json.loads(fast.result["content"][0]["text"]) == {"n": 1}
+
+        time.sleep(1.1)  # the cancelled call's reply must not surface anywhere
+        stats = aggregator.get_transport_stats()["echo"]
+        assert stats["timeouts"] == 1 and stats["late_responses"] == 0 and stats["starts"] == 1
+        assert aggregator.get_server_health("echo")["echo"].status.value == "healthy"
+    finally:
+        aggregator.shutdown()
+
+
+def test_async_calls_from_another_loop_and_restart_after_exit(tmp_path: Path) -> None:
+    aggregator = _aggregator(tmp_path, MCP_ECHO_NO_INIT="1")
+    try:
+        aggregator.discover_tools("echo")
+
+        async def many():
+            return await asyncio.gather(*(aggregator.route_tool_call_async("echo", {"i": i}) for i in range(32)))
+
+        results = asyncio.run(many())
+        assert [json.loads(r.result["content"][0]["text"])["i"] for r in results] == list(range(32))
+        assert threading.current_thread() is threading.main_thread()
+
+        client = aggregator._clients["echo"]
+        aggregator._io.run(_kill(client))
+        again = aggregator.route_tool_call("echo", {"after": True})
+        assert again.success
+        assert aggregator.get_transport_stats()["echo"]["starts"] == 2
+    finally:
+        aggregator.shutdown()
+
+
+async def _kill(client: MCPStdioClient) -> None:
+    client._process.kill()
+    await client._process.wait()
+    await asyncio.sleep(0.05)
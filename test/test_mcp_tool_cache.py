@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+from mcp_aggregator import MCPAggregator, MCPServerConfig
+from mcp_aggregator_cache import cache_key, canonical_args, tool_cache_ttl
+
+STUB = Path(__file__).resolve().parent / "stubs" / "mcp_echo_server.py"
+
+
+def _config(**cache) -> MCPServerConfig:
+    return MCPServerConfig(name="echo", command=sys.executable, args=[str(STUB)], timeout_s=10.0, **cache)
+
+
+def _aggregator(db: Path, **cache) -> MCPAggregator:
+    aggregator = MCPAggregator(db_path=str(db), config={"echo": _config(**cache)})
+    aggregator.discover_tools("echo")
+    return aggregator
+
+
+def _call_no(result) -> int:
+    return result.result["_meta"]["call"]
+
+
+def test_ttl_resolution_and_canonical_keys() -> None:
+    config = _config(idempotent_tools=["echo"], cache_ttl_s={"echo": 5})
+    assert tool_cache_ttl(config, "echo") == 5
+    assert tool_cache_ttl(config, "fail") == 0
+    assert tool_cache_ttl(_config(idempotent_tools=["*"], cache_ttl_s={"*": 7}), "fail") == 7
+    assert tool_cache_ttl(_config(), "echo") == 0  # opt-in only
+
+    assert canonical_args({"b": 1, "a": [1, {"y": 2, "x": 1}]}) == '{"a":[1,{"x":1,"y":2}],"b":1}'
+    assert cache_key("s", "t", {"a": 1, "b": 2}) == cache_key("s", "t", {"b": 2, "a": 1})
+    assert cache_key("s", "t", {"a": 1}) != cache_key("s2", "t", {"a": 1})
+
+
+def test_hits_skip_the_server_and_survive_restart(tmp_path: Path) -> None:
+    db = tmp_path / "mcp.db"
+    aggregator = _aggregator(db, idempotent_tools=["echo"], cache_ttl_s={"echo": 60})
+    try:
+        first = aggregator.route_tool_call("echo", {"q": "react", "page": 1})
+        again = aggregator.route_tool_call("echo", {"page": 1, "q": "react"})
+        other = aggregator.route_tool_call("echo", {"q": "vue", "page": 1})
+        bypass = aggregator.route_tool_call("echo", {"q": "react", "page": 1}, use_cache=False)
+        broken = [aggregator.route_tool_call("echo", {"tool_error": True}) for _ in range(2)]
+
+        assert not first.cached and again.cached and not other.cached and not bypass.cached
+        assert _call_no(again) == _call_no(first)
+        assert _call_no(bypass) == 3
+        assert [_call_no(r) for r in broken] == [4, 5]  # isError results are not cached
+
+        again.result["_meta"]["call"] = -1  # callers get copies
+        assert _call_no(aggregator.route_tool_call("echo", {"q": "react", "page": 1})) == 1
+
+        cache = aggregator.get_server_health("echo")["echo"].cache
+        assert cache["hits"] == 2 and cache["misses"] == 4 and cache["stores"] == 2
+    finally:
+        aggregator.shutdown()
+
+    reopened = _aggregator(db, idempotent_tools=["echo"], cache_ttl_s={"echo": 60})
+    try:
+        warm = reopened.route_tool_call("echo", {"q": "vue", "page": 1})
+        assert warm.cached and _call_no(warm) == 2
+        assert reopened.invalidate_tool_cache(server="echo") == 2
+        assert not reopened.route_tool_call("echo", {"q": "vue", "page": 1}).cached
+    finally:
+        reopened.shutdown()
+
+
+def test_entries_expire_after_their_ttl(tmp_path: Path) -> None:
+    aggregator = _aggregator(tmp_path / "mcp.db", idempotent_tools=["echo"], cache_ttl_s={"echo": 0.2})
+    try:
+        first = aggregator.route_tool_call("echo", {"x": 1})
+        assert aggregator.route_tool_call("echo", {"x": 1}).cached
+        time.sleep(0.3)
+        fresh = aggregator.route_tool_call("echo", {"x": 1})
+        assert not fresh.cached and _call_no(fresh) == _call_no(first) + 1
+    finally:
+        aggregator.shutdown()
+
+
+def test_concurrent_identical_calls_share_one_upstream_call(tmp_path: Path) -> None:
+    aggregator = _aggregator(tmp_path / "mcp.db", idempotent_tools=["echo"])
+    try:
+        async def burst():
+            return await asyncio.gather(*(
+                aggregator.route_tool_call_async("echo", {"q": "same", "delay": 0.3}) for _ in range(8)
+            ))
+
+        results = asyncio.run(burst())
+        assert all(r.success for r in results)
+        assert {_call_no(r) for r in results} == {1}
+        assert sum(not r.cached for r in results) == 1
+        assert sum(r.coalesced for r in results) == 7
+
+        assert aggregator.get_transport_stats()["echo"]["requests"] == 3  # initialize, tools/list, one call
+        cache = aggregator.get_server_health("echo")["echo"].cache
+        assert cache["coalesced"] == 7 and cache["stores"] == 1
+    finally:
+        aggregator.shutdown()
+
+
+def test_followers_of_a_tool_error_are_marked_coalesced(tmp_path: Path) -> None:
+    aggregator = _aggregator(tmp_path / "mcp.db", idempotent_tools=["echo"])
+    try:
+        async def burst():
+            return await asyncio.gather(*(
+                aggregator.route_tool_call_async("echo", {"tool_error": True, "delay": 0.3}) for _ in range(3)
+            ))
+
+        results = asyncio.run(burst())
+        assert {_call_no(r) for r in results} == {1}
+        assert sum(r.coalesced for r in results) == 2
+        assert sum(r.cached for r in results) == 2
+    finally:
+        aggregator.shutdown()
+
+
+def test_sqlite_io_runs_off_the_client_loop(tmp_path: Path, monkeypatch) -> None:
+    from mcp_aggregator_cache import ToolResultCache
+
+    threads = []
+    for name in ("_load", "_store"):
+        original = getattr(ToolResultCache, name)
+
+        def spy(self, *args, _original=original):
+            threads.append(threading.current_thread().name)
+            return _original(self, *args)
+
+        monkeypatch.setattr(ToolResultCache, name, spy)
+
+    aggregator = _aggregator(tmp_path / "mcp.db", idempotent_tools=["echo"])
+    try:
+        aggregator.route_tool_call("echo", {"x": 1})
+        aggregator._result_cache._entries.clear()
+        assert aggregator.route_tool_call("echo", {"x": 1}).cached
+    finally:
+        aggregator.shutdown()
+    assert len(threads) == 3
+    assert aggregator._io.name not in threads
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import gzip
+import sqlite3
+from pathlib import Path
+
+from memory.memory_archive import CCBMemoryArchive
+from memory.memory_archive_tier import BloomFilter, query_trigrams
+from memory.memory_lite import CCBLightMemory
+
+
+def _seed(conn: sqlite3.Connection, rows) -> None:
+    for ts, question, answer in rows:
+        cur = conn.execute(
+            "INSERT INTO conversations (timestamp, provider, question, answer, metadata) VALUES (?, 'codex', ?, ?, '{}')",
+            (ts, question, answer),
+        )
+        conn.execute(
+            "INSERT INTO conversations_fts(rowid, question, answer, provider) VALUES (?, ?, ?, 'codex')",
+            (cur.lastrowid, question, answer),
+        )
+    conn.commit()
+
+
+def test_bloom_filter_and_trigrams() -> None:
+    bloom = BloomFilter.for_capacity(100)
+    bloom.add("abc")
+    assert "abc" in bloom and "xyz" not in bloom
+    assert query_trigrams("Cache") == {"cac", "ach", "che"}
+    assert query_trigrams("db") is None
+
+
+def test_archive_moves_rows_into_monthly_tier(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    memory = CCBLightMemory()
+    conn = sqlite3.connect(memory.ccb_memory_db)
+    _seed(conn, [
+        ("2023-01-05T10:00:00", "How do I tune the Redis cache?", "Raise maxmemory."),
+        ("2023-01-20T10:00:00", "gateway retries", "Use exponential backoff for the cache."),
+        ("2023-03-02T10:00:00", "tmux pane layout", "Split horizontally."),
+        ("2099-01-01T10:00:00", "recent cache question", "kept in the live db"),
+    ])
+    archive = CCBMemoryArchive()
+    archive.archive_old_data(days_to_keep=30)
+
+    live = conn.execute("SELECT question FROM conversations").fetchall()
+    assert live == [("recent cache question",)]
+    assert conn.execute("SELECT rowid FROM conversations_fts WHERE conversations_fts MATCH 'cache'").fetchall() != []
+    assert conn.execute("SELECT COUNT(*) FROM conversations_fts WHERE conversations_fts MATCH 'redis'").fetchone()[0] == 0
+
+    assert sorted(p.name for p in archive.tier.files()) == ["archive_2023-01.db", "archive_2023-03.db"]
+    hits = archive.search_archives("CACHE")
+    assert [h["timestamp"] for h in hits] == ["2023-01-20T10:00:00", "2023-01-05T10:00:00"]
+    assert hits[1]["answer"] == "Raise maxmemory."
+    assert [e.month for e in archive.tier.candidates("pane layout")] == ["2023-03"]
+    assert archive.search_archives("cache", since="2023-02-01") == []
+    assert archive.search_archives("db") == []
+    assert [h["question"] for h in archive.search_archives("ux")] == ["tmux pane layout"]
+
+    # Re-appending the same rows (an interrupted run) does not duplicate them.
+    assert archive.tier.append([(1, "2023-01-05T10:00:00", "codex", "q", "a", "{}", 0)]) == {"2023-01": 0}
+
+
+def test_legacy_archives_are_searched_and_migrated(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    archive = CCBMemoryArchive()
+    legacy = archive.archive_dir / "archive_202301.db"
+    conn = sqlite3.connect(legacy)
+    conn.execute("""CREATE TABLE conversations (id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, provider TEXT NOT NULL,
+                    question TEXT NOT NULL, answer TEXT NOT NULL, metadata TEXT, tokens INTEGER DEFAULT 0)""")
+    conn.execute("INSERT INTO conversations VALUES (7, '2022-12-01T00:00:00', 'gemini', 'legacy question', 'old answer', '{}', 0)")
+    conn.commit()
+    conn.close()
+    with open(legacy, "rb") as src, gzip.open(f"{legacy}.gz", "wb") as dst:
+        dst.write(src.read())
+    legacy.unlink()
+
+    assert [h["question"] for h in archive.search_archives("legacy")] == ["legacy question"]
+    assert archive.migrate_legacy_archives() == 1
+    assert not list(archive.archive_dir.glob("archive_*.db.gz"))
+    assert [h["provider"] for h in archive.search_archives("legacy")] == ["gemini"]
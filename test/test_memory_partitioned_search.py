@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from memory.memory_partitioned import CCBPartitionedMemory
+
+
+def _month_rows(start_id: int, month_start: datetime, words: str, count: int = 3):
+    return [
+        (start_id + i, (month_start + timedelta(days=i)).isoformat(), "codex", f"{words} question {i}", "answer", "{}", 0)
+        for i in range(count)
+    ]
+
+
+def test_search_fans_out_across_live_and_archived_partitions(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    memory = CCBPartitionedMemory()
+    memory.record_conversation("claude", "live cache question", "fresh")
+    now = datetime.now()
+    next_id = 100
+    for age in range(1, 7):
+        month_start = (now - timedelta(days=31 * age)).replace(day=1)
+        memory.archive_tier.append(_month_rows(next_id, month_start, "cache" if age != 4 else "tmux"))
+        next_id += 10
+
+    partitions = memory.partitions("cache", since=memory._cutoff_days(12))
+    assert partitions[0].name == "live"
+    assert len(partitions) == 6  # the tmux-only month is skipped by its bloom filter
+
+    hits = memory.search_conversations("cache", limit=5, months=12)
+    assert [h["timestamp"] for h in hits] == sorted((h["timestamp"] for h in hits), reverse=True)
+    assert hits[0]["partition"] == "live" and len(hits) == 5
+    assert memory.search_conversations("cache", limit=5, months=12, workers=1) == hits
+
+    everything = memory.search_conversations("cache", limit=100, months=12)
+    assert len(everything) == 1 + 5 * 3
+    assert all(h["partition"] != (now - timedelta(days=31 * 4)).strftime("%Y-%m") for h in everything)
+    assert memory.search_conversations("cache", limit=100, months=1) == everything[:len(
+        [h for h in everything if h["timestamp"] >= memory._cutoff_days(1)]
+    )]
+
+    stats = memory.get_stats()
+    assert sum(1 for p in stats["partitions"] if p.get("archived")) == 6
+
+    executor = memory._executor
+    memory.close()
+    assert memory._executor is None and executor._shutdown
+    assert memory.search_conversations("cache", limit=5, months=12) == hits
+    memory.close()
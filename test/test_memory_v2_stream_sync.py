@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from memory.memory_v2 import CCBMemoryV2
+
+
+def _line(ts: float, kind: str = "chunk", content: str = "x") -> str:
+    return json.dumps({"ts": ts, "type": kind, "content": content, "meta": {}}) + "\n"
+
+
+def _count(db: Path, request_id: str) -> int:
+    return sqlite3.connect(db).execute(
+        "SELECT COUNT(*) FROM stream_entries WHERE request_id = ?", (request_id,)
+    ).fetchone()[0]
+
+
+def test_sync_appends_only_new_lines(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    streams = tmp_path / ".ccb" / "streams"
+    streams.mkdir(parents=True)
+    memory = CCBMemoryV2(db_path=str(tmp_path / "mem.db"))
+
+    grow = streams / "req-a.jsonl"
+    grow.write_text(_line(1.0) + _line(2.0) + '{"ts": 3.0, "type": "chu')
+    (streams / "req-b.jsonl").write_text(_line(5.0, "thinking", "hmm"))
+
+    first = memory.sync_all_streams()
+    assert (first["synced"], first["total_entries"]) == (2, 3)
+    assert memory.sync_all_streams()["skipped"] == 2
+
+    # Finish the partial line and keep growing: only the new entries land.
+    with open(grow, "a") as f:
+        f.write('nk", "content": "y"}\n' + _line(4.0))
+    again = memory.sync_all_streams()
+    assert (again["synced"], again["total_entries"]) == (1, 2)
+    assert [e["timestamp"] for e in memory.get_stream_entries("req-a")] == [1.0, 2.0, 3.0, 4.0]
+
+    assert memory.sync_all_streams(force=True)["total_entries"] == 5
+    assert _count(tmp_path / "mem.db", "req-a") == 4
+
+
+def test_sync_skips_rows_already_written_by_gateway(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    streams = tmp_path / ".ccb" / "streams"
+    streams.mkdir(parents=True)
+    db = tmp_path / "mem.db"
+    memory = CCBMemoryV2(db_path=str(db))
+    (streams / "req-c.jsonl").write_text("".join(_line(float(i)) for i in range(1, 6)))
+    conn = sqlite3.connect(db)
+    conn.executemany(
+        "INSERT INTO stream_entries (request_id, entry_type, timestamp, content, metadata) VALUES ('req-c', 'chunk', ?, 'x', '{}')",
+        [(1.0,), (2.0,), (3.0,)],
+    )
+    conn.commit()
+
+    assert memory.sync_stream_file("req-c") == 2
+    assert _count(db, "req-c") == 5
+
+
+def test_background_sync_reports_lag(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    streams = tmp_path / ".ccb" / "streams"
+    streams.mkdir(parents=True)
+    memory = CCBMemoryV2(db_path=str(tmp_path / "mem.db"))
+    seen = []
+
+    async def scenario() -> None:
+        stop = asyncio.Event()
+        task = asyncio.create_task(memory.run_stream_sync(interval=0.02, stop_event=stop, on_stats=seen.append))
+        (streams / "req-d.jsonl").write_text(_line(time.time()))
+        for _ in range(200):
+            if seen:
+                break
+            await asyncio.sleep(0.01)
+        stop.set()
+        await task
+
+    asyncio.run(scenario())
+    assert seen and seen[0]["total_entries"] == 1
+    assert 0.0 <= seen[0]["max_lag_s"] < 5.0
+
+
+def test_interleaved_gateway_writes_and_syncs_do_not_duplicate(tmp_path: Path, monkeypatch) -> None:
+    from gateway.stream_output import StreamOutput
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    streams = tmp_path / ".ccb" / "streams"
+    streams.mkdir(parents=True)
+    db = tmp_path / "mem.db"
+    memory = CCBMemoryV2(db_path=str(db))
+
+    # Frozen clock: entries only stay distinct through StreamOutput's monotonic timestamps.
+    monkeypatch.setattr("gateway.stream_output.time.time", lambda: 100.0)
+    stream = StreamOutput("req-e", "codex", stream_dir=streams, db_path=db, buffer_size=2)
+    for i in range(4):
+        stream.chunk(f"part {i}")
+        memory.sync_all_streams()
+    stream.complete(response="done")
+    memory.sync_all_streams()
+    stream.close()
+    memory.sync_all_streams()
+
+    lines = (streams / "req-e.jsonl").read_text().splitlines()
+    assert len(lines) == 6
+    assert _count(db, "req-e") == 6
+
+
+def test_upgrade_removes_only_exact_duplicate_stream_rows(tmp_path: Path) -> None:
+    legacy = (
+        "CREATE TABLE stream_entries (id INTEGER PRIMARY KEY AUTOINCREMENT, request_id TEXT NOT NULL, "
+        "entry_type TEXT NOT NULL, timestamp REAL NOT NULL, content TEXT, metadata TEXT, "
+        "created_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+    )
+    db = tmp_path / "old.db"
+    conn = sqlite3.connect(db)
+    conn.execute(legacy)
+    conn.executemany(
+        "INSERT INTO stream_entries (request_id, entry_type, timestamp, content) VALUES (?, ?, ?, ?)",
+        [("r", "chunk", 1.0, "first"), ("r", "chunk", 1.0, "second"), ("r", "chunk", 1.0, "first"),
+         ("r", "status", 1.0, None), ("r", "status", 1.0, None)],
+    )
+    conn.commit()
+    conn.close()
+
+    CCBMemoryV2(db_path=str(db))
+    rows = sqlite3.connect(db).execute(
+        "SELECT entry_type, content FROM stream_entries ORDER BY id"
+    ).fetchall()
+    assert rows == [("chunk", "first"), ("chunk", "second"), ("status", None)]
+
+    # Databases that already have the content-less unique index move to the new key.
+    db = tmp_path / "indexed.db"
+    conn = sqlite3.connect(db)
+    conn.execute(legacy)
+    conn.execute("CREATE UNIQUE INDEX idx_stream_entry_unique ON stream_entries(request_id, timestamp, entry_type)")
+    conn.commit()
+    conn.close()
+    CCBMemoryV2(db_path=str(db))
+    conn = sqlite3.connect(db)
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "idx_stream_entry_dedupe" in indexes and "idx_stream_entry_unique" not in indexes
+    conn.execute("INSERT INTO stream_entries (request_id, entry_type, timestamp, content) VALUES ('r', 'chunk', 1.0, 'a')")
+    conn.execute("INSERT INTO stream_entries (request_id, entry_type, timestamp, content) VALUES ('r', 'chunk', 1.0, 'b')")
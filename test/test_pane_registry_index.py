@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+import pane_registry
+import pane_registry_index
+from pane_registry import (
+    load_registry_by_claude_pane,
+    load_registry_by_project_id,
+    load_registry_by_session_id,
+    rebuild_registry_index,
+    registry_index,
+    upsert_registry,
+)
+
+
+class _AliveBackend:
+    def is_alive(self, pane_id: str) -> bool:
+        return not pane_id.endswith("dead")
+
+
+def _write(run_dir: Path, session_id: str, **payload) -> Path:
+    payload.setdefault("ccb_session_id", session_id)
+    payload.setdefault("updated_at", int(time.time()))
+    path = run_dir / f"ccb-session-{session_id}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(tmp, path)  # how every writer in the repo saves records
+    return path
+
+
+@pytest.fixture
+def run_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    monkeypatch.setattr(pane_registry, "get_backend_for_session", lambda _rec: _AliveBackend())
+    # Trust directory stamps immediately; the racy window is exercised separately.
+    monkeypatch.setattr(pane_registry_index, "RACY_WINDOW_NS", -10**18)
+    path = tmp_path / ".ccb" / "run"
+    path.mkdir(parents=True)
+    return path
+
+
+def test_existing_files_are_imported_and_looked_up_by_key(run_dir: Path) -> None:
+    now = int(time.time())
+    for i in range(50):
+        _write(run_dir, f"s{i}", ccb_project_id=f"p{i % 5}", updated_at=now - i,
+               providers={"codex": {"pane_id": f"%{i}"}, "claude": {"pane_id": f"%c{i}"}})
+    _write(run_dir, "legacy", ccb_project_id="p9", claude_pane_id="%legacy", codex_pane_id="%9")
+    _write(run_dir, "old", ccb_project_id="p9", updated_at=now - 8 * 24 * 3600,
+           providers={"codex": {"pane_id": "%old"}})
+    (run_dir / "ccb-session-broken.json").write_text("{not json", encoding="utf-8")
+
+    assert rebuild_registry_index() == 52
+    index = registry_index()
+    parsed = index.get_stats()["files_parsed"]
+
+    assert load_registry_by_session_id("s7")["providers"]["codex"]["pane_id"] == "%7"
+    assert load_registry_by_session_id("old") is None  # stale
+    assert load_registry_by_project_id("p3", "codex")["ccb_session_id"] == "s3"  # newest of s3, s8, ...
+    assert load_registry_by_project_id("p9", "codex")["ccb_session_id"] == "legacy"
+    assert load_registry_by_claude_pane("%c12")["ccb_session_id"] == "s12"
+    assert load_registry_by_claude_pane("%legacy")["ccb_session_id"] == "legacy"
+    assert load_registry_by_claude_pane("%nope") is None
+
+    stats = index.get_stats()
+    assert stats["files_parsed"] == parsed and stats["memoized"] >= 5  # no re-reads
+
+
+def test_directory_changes_are_picked_up_incrementally(run_dir: Path) -> None:
+    _write(run_dir, "a", ccb_project_id="p", updated_at=int(time.time()) - 5, providers={"codex": {"pane_id": "%a"}})
+    assert load_registry_by_project_id("p", "codex")["ccb_session_id"] == "a"
+    index = registry_index()
+    parsed = index.get_stats()["files_parsed"]
+
+    # Another process adds a newer record, then the first one's pane dies.
+    time.sleep(0.01)
+    _write(run_dir, "b", ccb_project_id="p", providers={"codex": {"pane_id": "%b"}})
+    assert load_registry_by_project_id("p", "codex")["ccb_session_id"] == "b"
+    time.sleep(0.01)
+    _write(run_dir, "b", ccb_project_id="p", providers={"codex": {"pane_id": "%b-dead"}})
+    assert load_registry_by_project_id("p", "codex")["ccb_session_id"] == "a"
+    assert index.get_stats()["files_parsed"] == parsed + 2  # only the changed file
+
+    time.sleep(0.01)
+    (run_dir / "ccb-session-a.json").unlink()
+    assert load_registry_by_project_id("p", "codex") is None
+
+    # Our own writes are indexed directly, without a rescan.
+    rescans = index.get_stats()["rescans"]
+    assert upsert_registry({"ccb_session_id": "c", "ccb_project_id": "p", "providers": {"codex": {"pane_id": "%c"}}})
+    assert load_registry_by_project_id("p", "codex")["ccb_session_id"] == "c"
+    assert index.get_stats()["rescans"] == rescans
+    assert json.loads((run_dir / "ccb-session-c.json").read_text())["providers"]["codex"]["pane_id"] == "%c"
+
+
+def test_racy_stamps_are_reverified(run_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(pane_registry_index, "RACY_WINDOW_NS", 60 * 10**9)
+    _write(run_dir, "a", ccb_project_id="p", providers={"codex": {"pane_id": "%a"}})
+    assert load_registry_by_session_id("a") is not None
+    stamp = os.stat(run_dir).st_mtime_ns
+    _write(run_dir, "b", ccb_project_id="q", providers={"codex": {"pane_id": "%b"}})
+    os.utime(run_dir, ns=(stamp, stamp))  # same clock tick: the mtime did not move
+    assert load_registry_by_project_id("q", "codex")["ccb_session_id"] == "b"
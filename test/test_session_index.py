@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from providers._codex_reader import CodexCommReader
+from providers.session_index import SessionIndex
+
+
+def _session(path: Path, cwd: str, mtime: float) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = {"type": "session_meta", "payload": {"cwd": cwd}}
+    path.write_text(json.dumps(meta) + "\n", encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _meta(path: Path) -> tuple:
+    lines = path.read_text(encoding="utf-8").splitlines()
+    if not lines:
+        return None, None
+    first = json.loads(lines[0])
+    return first["payload"]["cwd"], None
+
+
+def test_index_tracks_newest_per_cwd_and_relists_only_changed_dirs(tmp_path: Path) -> None:
+    root = tmp_path / "sessions"
+    _session(root / "2024" / "01" / "a.jsonl", "/proj/a", 1000)
+    _session(root / "2024" / "01" / "b.jsonl", "/proj/b", 2000)
+    _session(root / "2024" / "02" / "c.jsonl", "/proj/a", 3000)
+    index = SessionIndex(root, "**/*.jsonl", _meta, min_refresh_s=0)
+
+    assert index.newest(cwd="/proj/a").path.endswith("c.jsonl")
+    assert index.newest(cwd="/proj/b").path.endswith("b.jsonl")
+    assert index.newest().path.endswith("c.jsonl")
+    assert index.stats["meta_reads"] == 3
+
+    listed = index.stats["dirs_listed"]
+    index.refresh(force=True)
+    assert index.stats["dirs_listed"] == listed
+    assert index.stats["meta_reads"] == 3
+
+    # Appending to an active file updates ordering without a directory change.
+    older = root / "2024" / "01" / "a.jsonl"
+    os.utime(older, (4000, 4000))
+    assert index.newest(cwd="/proj/a").path.endswith("a.jsonl")
+
+    _session(root / "2024" / "03" / "d.jsonl", "/proj/b", 5000)
+    (root / "2024" / "02" / "c.jsonl").unlink()
+    assert index.newest(cwd="/proj/b").path.endswith("d.jsonl")
+    assert index.find("c") is None
+    assert index.stats["meta_reads"] == 4
+
+
+def test_index_persists_and_reloads(tmp_path: Path) -> None:
+    root = tmp_path / "sessions"
+    cache = tmp_path / "index.json"
+    _session(root / "x" / "rollout-1.jsonl", "/proj", 1000)
+    SessionIndex(root, "**/*.jsonl", _meta, cache_path=cache, min_refresh_s=0).refresh()
+    assert cache.exists()
+
+    reloaded = SessionIndex(root, "**/*.jsonl", _meta, cache_path=cache, min_refresh_s=0)
+    assert reloaded.newest(cwd="/proj").path.endswith("rollout-1.jsonl")
+    assert reloaded.stats["meta_reads"] == 0
+    assert reloaded.stats["dirs_listed"] == 0
+
+
+def test_index_reads_meta_once_the_file_grows_it(tmp_path: Path) -> None:
+    root = tmp_path / "sessions"
+    _session(root / "x" / "other.jsonl", "/proj/other", 1000)
+    fresh = root / "x" / "fresh.jsonl"
+    fresh.write_text("", encoding="utf-8")
+    os.utime(fresh, (2000, 2000))
+    index = SessionIndex(root, "**/*.jsonl", _meta, min_refresh_s=0)
+    assert index.newest(cwd="/proj/mine") is None
+    assert index.newest().path.endswith("fresh.jsonl")
+
+    meta = {"type": "session_meta", "payload": {"cwd": "/proj/mine"}}
+    fresh.write_text(json.dumps(meta) + "\n", encoding="utf-8")
+    os.utime(fresh, (3000, 3000))
+    assert index.newest(cwd="/proj/mine").path.endswith("fresh.jsonl")
+    reads = index.stats["meta_reads"]
+
+    # Once known, appends do not re-read the metadata.
+    with fresh.open("a", encoding="utf-8") as handle:
+        handle.write("{}\n")
+    os.utime(fresh, (4000, 4000))
+    index.refresh(force=True)
+    assert index.stats["meta_reads"] == reads
+
+
+def test_codex_reader_uses_index_for_cwd_and_preferred_lookup(tmp_path: Path) -> None:
+    home = tmp_path / "codex"
+    work = tmp_path / "work"
+    work.mkdir()
+    _session(home / "2024" / "rollout-mine.jsonl", str(work), 1000)
+    _session(home / "2024" / "rollout-other.jsonl", str(tmp_path / "elsewhere"), 2000)
+
+    reader = CodexCommReader(home_dir=str(home), work_dir=work)
+    assert reader._find_session_file().name == "rollout-mine.jsonl"
+
+    reader.set_preferred_session("other")
+    assert reader._find_session_file().name == "rollout-other.jsonl"
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from terminal_tmux_backend import TmuxBackend
+from terminal_tmux_control import decode_output, format_command, quote_tmux_arg
+
+pytestmark = pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux not installed")
+
+
+@pytest.fixture
+def tmux_socket():
+    name = f"ccb-test-{os.getpid()}"
+    subprocess.run(["tmux", "-L", name, "new-session", "-d", "-s", "work", "-x", "100", "-y", "30", "cat"], check=True)
+    try:
+        yield name
+    finally:
+        subprocess.run(["tmux", "-L", name, "kill-server"], capture_output=True)
+
+
+def _pane(name: str) -> str:
+    out = subprocess.run(["tmux", "-L", name, "list-panes", "-t", "work", "-F", "#{pane_id}"],
+                         capture_output=True, text=True, check=True).stdout
+    return out.split()[0]
+
+
+def _sessions(name: str) -> list:
+    return subprocess.run(["tmux", "-L", name, "list-sessions", "-F", "#{session_name}"],
+                          capture_output=True, text=True).stdout.split()
+
+
+def test_quoting_and_output_decoding() -> None:
+    assert quote_tmux_arg("") == "''"
+    assert quote_tmux_arg("it's") == "'it'\"'\"'s'"
+    assert format_command(["send-keys", "-t", "%1", "a\nb"]) == "'send-keys' '-t' '%1' 'a'\"\\n\"'b'"
+    assert decode_output(b"a\\015\\012\\134x") == b"a\r\n\\x"
+
+
+def test_commands_share_one_control_client_and_match_subprocess(tmux_socket: str) -> None:
+    pane = _pane(tmux_socket)
+    control = TmuxBackend(socket_name=tmux_socket, control_mode=True)
+    plain = TmuxBackend(socket_name=tmux_socket, control_mode=False)
+    try:
+        tricky = "it's $HOME ~ #{pane_id}; \\ \"q\"\nline2 é"
+        control._tmux_run(["load-buffer", "-b", "t", "-"], check=True, input_bytes=tricky.encode())
+        assert plain._tmux_run(["show-buffer", "-b", "t"], capture=True).stdout == tricky
+
+        for _ in range(20):
+            assert control.pane_exists(pane) and control.is_alive(pane)
+        assert not control.pane_exists("%9999")
+        control.set_pane_title(pane, "CCB-marker x")
+        assert control.find_pane_by_title_marker("CCB-marker") == pane
+        assert control.get_pane_content(pane, lines=5) == plain.get_pane_content(pane, lines=5)
+        assert not control.is_alive("no-such-session")
+        with pytest.raises(subprocess.CalledProcessError):
+            control._tmux_run(["kill-pane", "-t", "%9999"], check=True)
+
+        stats = control.get_control_stats()["client"]
+        assert stats["alive"] and stats["commands"] >= 45 and stats["errors"] == 2
+    finally:
+        control.close()
+    deadline = time.time() + 2
+    while time.time() < deadline and _sessions(tmux_socket) != ["work"]:
+        time.sleep(0.05)
+    assert _sessions(tmux_socket) == ["work"]  # the control session is destroyed with its client
+
+
+def test_output_stream_and_fallbacks(tmux_socket: str) -> None:
+    pane = _pane(tmux_socket)
+    backend = TmuxBackend(socket_name=tmux_socket, control_mode=True)
+    try:
+        with backend.open_output_stream(pane) as stream:
+            backend.send_key(pane, "hello")
+            backend.send_key(pane, "Enter")
+            seen = ""
+            deadline = time.time() + 5
+            while "hello\r\nhello" not in seen and time.time() < deadline:
+                seen += stream.read(timeout=0.5)  # tty echo, then cat's copy
+            assert "hello\r\nhello" in seen
+        assert backend.get_control_stats()["watchers"] == {}
+    finally:
+        backend.close()
+
+    assert TmuxBackend(socket_name=tmux_socket, control_mode=False).open_output_stream(pane) is None
+    # No server on this socket: answered by the subprocess path, no server is started.
+    missing = TmuxBackend(socket_name=f"{tmux_socket}-missing", control_mode=True)
+    assert not missing.pane_exists("%0")
+    assert missing.get_control_stats()["client"] is None
@@ -0,0 +1,53 @@
+"""Tests for bulk batch submission."""
+from types import SimpleNamespace
+
+from gateway.gateway_config import ProviderConfig
+from gateway.models import BackendType, GatewayRequest, RequestStatus
+from gateway.models_api import AskRequest
+from gateway.request_queue import RequestQueue
+from gateway.routes.batch import plan_batch
+
+
+def test_enqueue_many_persists_in_one_pass_and_respects_capacity(store):
+    queue = RequestQueue(store, max_size=3)
+    woke = []
+    queue.set_notifier(lambda: woke.append(True))
+
+    requests = [
+        GatewayRequest.create(provider="kimi", message=f"m{i}", priority=i)
+        for i in range(5)
+    ]
+    accepted = queue.enqueue_many(requests)
+
+    assert accepted == [True, True, True, False, False]
+    assert woke == [True]
+    assert queue.get_queue_depth() == 3
+    assert len(store.list_requests(status=RequestStatus.QUEUED)) == 3
+    # Highest priority first
+    assert queue.peek(1)[0].id == requests[2].id
+
+
+def test_plan_batch_reuses_routing_and_dedupes(config):
+    config.providers["kimi"] = ProviderConfig(name="kimi", backend_type=BackendType.CLI_EXEC)
+    calls = []
+
+    def router_func(message):
+        calls.append(message)
+        return SimpleNamespace(provider="kimi")
+
+    reqs = [
+        AskRequest(message="same"),
+        AskRequest(message="same"),
+        AskRequest(message="other", provider="nope"),
+        AskRequest(message="same", priority=90),
+    ]
+
+    plans, dedup_of, errors = plan_batch(config, reqs, router_func)
+    assert calls == ["same"]
+    assert [p["index"] for p in plans] == [0, 1, 3]
+    assert dedup_of == {}
+    assert errors[0]["index"] == 2
+
+    plans, dedup_of, errors = plan_batch(config, reqs, router_func, dedupe=True)
+    assert [p["index"] for p in plans] == [0, 3]
+    assert dedup_of == {1: 0}
@@ -0,0 +1,147 @@
+"""Tests for the incremental CLI output parser and CLI streaming."""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import gateway.stream_output as stream_output
+from gateway.backends.cli import CLIBackend
+from gateway.backends.extractors.cli_output import CLIOutputParser, clean_cli_output, process_cli_output
+from gateway.gateway_config import ProviderConfig
+from gateway.models import BackendType, GatewayRequest
+
+STUB = Path(__file__).resolve().parent.parent / "test" / "stubs" / "provider_stub.py"
+
+CODEX_EVENTS = "\n".join(json.dumps(event) for event in [
+    {"type": "thread.started", "thread_id": "t1"},
+    {"type": "item.completed", "item": {"type": "reasoning", "text": "consider the ask"}},
+    {"type": "item.completed", "item": {"type": "command_execution", "command": "ls", "exit_code": 0}},
+    {"type": "item.completed", "item": {"type": "agent_message", "text": "Héllo 世界"}},
+    {"type": "item.completed", "item": {"type": "agent_message", "text": "done"}},
+    {"type": "turn.completed", "usage": {"input_tokens": 100, "cached_input_tokens": 60, "output_tokens": 9}},
+]) + "\n"
+
+PLAIN = (
+    "Loaded cached credentials.\n"
+    "<thinking>step one\nstep two</thinking>\n"
+    "\n"
+    "The answer is 42.\n"
+    "\n"
+    "Second paragraph.\n"
+)
+
+
+def _chunked(text: str, size: int, provider: str = "codex"):
+    parser = CLIOutputParser(provider)
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return parser, events, parser.finish()
+
+
+def test_chunked_feed_matches_batch_cleaner_for_any_split():
+    for text in (CODEX_EVENTS, PLAIN, '{\n  "response": "from a document",\n  "stats": {}\n}\n'):
+        expected = clean_cli_output(text, provider_name="codex")
+        for size in (1, 3, 17, len(text)):
+            assert _chunked(text, size)[2] == expected, (text, size)
+
+
+def test_json_events_are_typed_and_usage_is_real():
+    parser, events, (response, thinking) = _chunked(CODEX_EVENTS, 5)
+
+    assert [e.kind for e in events] == ["thinking", "tool_call", "text", "text", "usage"]
+    assert "".join(e.text for e in events if e.kind == "text") == response == "Héllo 世界\ndone"
+    assert thinking == "consider the ask"
+    assert parser.tool_calls[0]["name"] == "command_execution"
+    assert parser.tool_calls[0]["data"]["command"] == "ls"
+
+    result = process_cli_output(
+        stdout=CODEX_EVENTS, stderr="", returncode=0, latency_ms=1.0, input_text="hi",
+        provider_name="codex", parser=parser,
+    )
+    assert result.tokens_used == 109
+    assert result.metadata["tokens_estimated"] is False
+    assert result.metadata["cached_tokens"] == 60
+    assert result.metadata["tool_calls"] == 1
+
+
+def test_plain_text_streams_deltas_without_reasoning_or_banners():
+    _, events, (response, thinking) = _chunked(PLAIN, 4, provider="gemini")
+    assert "".join(e.text for e in events if e.kind == "text") == response
+    assert response == "The answer is 42.\n\nSecond paragraph."
+    assert thinking == "step one\nstep two"
+
+
+def test_execute_stream_yields_text_before_process_exit(tmp_path, monkeypatch):
+    monkeypatch.setattr(stream_output, "_manager", stream_output.StreamOutputManager(tmp_path))
+    monkeypatch.setenv("STUB_DELAY", "0.2")
+    backend = CLIBackend(ProviderConfig(
+        name="stub", backend_type=BackendType.CLI_EXEC,
+        cli_command=sys.executable, cli_args=[str(STUB), "--stdio", "json"],
+    ))
+    request = GatewayRequest.create(provider="stub", message="ping", timeout_s=10)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        chunks = []
+        async for chunk in backend.execute_stream(request):
+            chunks.append((loop.time() - started, chunk))
+        return chunks
+
+    chunks = asyncio.run(run())
+    texts = [(at, c.content) for at, c in chunks if c.content]
+    final_at, final = chunks[-1]
+
+    assert [content for _, content in texts] == ["stub reply:", "\nping"]
+    assert final.is_final and final.tokens_used == 19 and final.metadata == {"thinking": "thinking it over"}
+    # The first text arrives while the process still has two events to print.
+    assert final_at - texts[0][0] > 0.3
+    events = [c.metadata["event"] for _, c in chunks if c.metadata and "event" in c.metadata]
+    assert events == ["thinking", "tool_call", "usage"]
+
+    logged = [json.loads(line)["type"] for line in (tmp_path / f"{request.id}.jsonl").read_text().splitlines()]
+    assert logged.count("text_delta") == 2 and "usage" in logged and logged[-1] == "complete"
+
+
+def test_inline_json_response_is_extracted():
+    assert clean_cli_output('Result: {"response": "inline"} trailing', provider_name="codex") == ("inline", None)
+    assert _chunked('noise {x}\nResult: {"response": "inline"} trailing\n', 4)[2] == ("inline", None)
+
+
+def test_json_in_plain_answers_is_kept_and_streamed():
+    answers = {
+        '{"name": "Alice", "age": 30}\n': '{"name": "Alice", "age": 30}',
+        'Here is the config:\n{"port": 8080, "debug": true}\nUse it.\n':
+            'Here is the config:\n{"port": 8080, "debug": true}\nUse it.',
+        '{\n  "name": "Alice",\n  "tags": {"a": 1}\n}\n': '{\n  "name": "Alice",\n  "tags": {"a": 1}\n}',
+        '```json\n{\n  "port": 8080\n}\n```\n': '```json\n{\n  "port": 8080\n}\n```',
+    }
+    for text, expected in answers.items():
+        assert clean_cli_output(text, provider_name="gemini") == (expected, None)
+        for size in (1, 7, len(text)):
+            _, events, (response, _) = _chunked(text, size, provider="gemini")
+            assert response == expected, (text, size)
+            assert "".join(e.text for e in events if e.kind == "text") == expected
+
+
+def test_execute_stream_replaces_text_that_is_not_a_prefix(tmp_path, monkeypatch):
+    monkeypatch.setattr(stream_output, "_manager", stream_output.StreamOutputManager(tmp_path))
+    script = (
+        "import json, sys\n"
+        "print('Booting agent v1', flush=True)\n"
+        "print(json.dumps({'type': 'item.completed', 'item': {'type': 'agent_message', 'text': 'answer'}}))\n"
+    )
+    backend = CLIBackend(ProviderConfig(
+        name="stub", backend_type=BackendType.CLI_EXEC, cli_command=sys.executable, cli_args=["-c", script],
+    ))
+    request = GatewayRequest.create(provider="stub", message="ping", timeout_s=10)
+
+    async def run():
+        return [chunk async for chunk in backend.execute_stream(request)]
+
+    chunks = asyncio.run(run())
+    final = chunks[-1]
+    assert "".join(c.content for c in chunks[:-1]).startswith("Booting agent v1")
+    assert final.is_final and final.content == ""
+    assert final.metadata["replace"] is True and final.metadata["response"] == "answer"
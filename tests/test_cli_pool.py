@@ -0,0 +1,141 @@
+"""Tests for the warm interactive CLI worker pool."""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from gateway.backends import cli_pool
+from gateway.backends.interactive_cli_backend import InteractiveCLIBackend
+from gateway.gateway_config import CLIPoolConfig, ProviderConfig
+from gateway.models import BackendType, GatewayRequest
+
+STUB = Path(__file__).resolve().parent.parent / "test" / "stubs" / "provider_stub.py"
+
+
+def _backend(**pool) -> InteractiveCLIBackend:
+    config = ProviderConfig(
+        name="stub",
+        backend_type=BackendType.CLI_EXEC,
+        cli_command=sys.executable,
+        interactive=True,
+        interactive_args=[str(STUB), "--stdio", "repl"],
+        cli_pool=pool,
+    )
+    return InteractiveCLIBackend(config, pool_config=CLIPoolConfig(health_check_interval_s=0))
+
+
+def _request(message: str, timeout_s: float = 10.0) -> GatewayRequest:
+    return GatewayRequest.create(provider="stub", message=message, timeout_s=timeout_s)
+
+
+def test_pool_serves_requests_concurrently_on_warm_workers(monkeypatch):
+    monkeypatch.setenv("STUB_DELAY", "0.3")
+    backend = _backend(min_size=1, max_size=3)
+
+    async def run():
+        assert await backend.start() == 1
+        started = time.monotonic()
+        results = await asyncio.gather(*(backend.execute(_request(f"q{i}")) for i in range(3)))
+        elapsed = time.monotonic() - started
+        again = await backend.execute(_request("q3"))
+        stats = backend.get_pool_stats()
+        await backend.shutdown()
+        return results, elapsed, again, stats
+
+    results, elapsed, again, stats = asyncio.run(run())
+    assert [r.response for r in results] == ["stub reply: q0", "stub reply: q1", "stub reply: q2"]
+    assert again.success and again.response == "stub reply: q3"
+    # Three 0.3s replies side by side, not queued behind one process.
+    assert elapsed < 0.85
+    assert stats["spawned"] == 3 and stats["size"] == 3 and stats["idle"] == 3
+    assert stats["checkouts"] == 4
+
+
+def test_workers_recycle_after_max_requests_and_unfinished_replies(monkeypatch):
+    monkeypatch.setenv("STUB_DELAY", "0.2")
+    backend = _backend(min_size=1, max_size=1, max_requests=2)
+
+    async def run():
+        await backend.start()
+        first = [await backend.execute(_request(f"q{i}")) for i in range(2)]
+        timed_out = await backend.execute(_request("slow", timeout_s=0.05))
+        await asyncio.sleep(0.5)  # let the background top-up spawn a replacement
+        after = await backend.execute(_request("after"))
+        stats = backend.get_pool_stats()
+        await backend.shutdown()
+        return first, timed_out, after, stats
+
+    first, timed_out, after, stats = asyncio.run(run())
+    assert all(r.success for r in first)
+    assert timed_out.response == ""
+    assert after.response == "stub reply: after"
+    assert stats["retired"] == {"max_requests": 1, "unusable": 1}
+    assert stats["spawned"] == 3
+
+
+def test_shutdown_waits_for_background_top_up(monkeypatch):
+    backend = _backend(min_size=1, max_size=1, max_requests=1)
+
+    async def run():
+        await backend.start()
+        assert (await backend.execute(_request("q0"))).success
+        pool = backend._pool
+        pending = set(pool._background)
+        await backend.shutdown()
+        return pool, pending
+
+    pool, pending = asyncio.run(run())
+    assert pending and all(task.done() for task in pending)
+    assert not pool._background
+    # The replacement spawned after the recycle was terminated, not leaked.
+    assert pool.size == 0
+
+
+def test_cancelled_cold_spawn_releases_its_slot_and_process(monkeypatch):
+    monkeypatch.setenv("STUB_STARTUP_DELAY", "1.0")
+    backend = _backend(min_size=0, max_size=1)
+    spawned = []
+    original = cli_pool.CLIWorker
+
+    def record(process, worker_id):
+        spawned.append(process)
+        return original(process, worker_id)
+
+    monkeypatch.setattr(cli_pool, "CLIWorker", record)
+
+    async def run():
+        try:
+            await asyncio.wait_for(backend.execute(_request("q0")), timeout=0.3)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            raise AssertionError("expected the cold spawn to be cancelled")
+        await asyncio.sleep(0.05)
+        stats = backend.get_pool_stats()
+        after = await backend.execute(_request("q1"))
+        await backend.shutdown()
+        return stats, after
+
+    stats, after = asyncio.run(run())
+    assert stats["spawning"] == 0 and stats["size"] == 0
+    assert spawned[0].returncode is not None  # the half-started CLI was terminated
+    assert after.success and after.response == "stub reply: q1"
+
+
+def test_health_check_replaces_dead_idle_workers():
+    backend = _backend(min_size=2, max_size=2)
+
+    async def run():
+        await backend.start()
+        pool = backend._get_pool()
+        victim = next(iter(pool._idle))
+        victim.process.kill()
+        await victim.process.wait()
+        report = await pool.health_check()
+        stats = backend.get_pool_stats()
+        await backend.shutdown()
+        return report, stats
+
+    report, stats = asyncio.run(run())
+    assert report == {"retired": 1, "spawned": 1}
+    assert stats["size"] == 2 and stats["retired"] == {"exited": 1}
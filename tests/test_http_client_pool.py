@@ -0,0 +1,73 @@
+"""Tests for the shared HTTP client pools."""
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+
+from gateway.backends.http import HTTPBackend  # noqa: E402
+from gateway.backends.http_client import HTTPClientManager, origin_of  # noqa: E402
+from gateway.gateway_config import HTTPPoolConfig, ProviderConfig  # noqa: E402
+from gateway.models import BackendType, GatewayRequest  # noqa: E402
+
+
+async def _start_stub():
+    async def chat(_request):
+        return web.json_response({"choices": [{"message": {"content": "ok"}}]})
+
+    async def root(_request):
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", chat)
+    app.router.add_route("OPTIONS", "/", root)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+def _backend(name, port, manager):
+    return HTTPBackend(
+        ProviderConfig(
+            name=name,
+            backend_type=BackendType.HTTP_API,
+            api_base_url=f"http://127.0.0.1:{port}/v1",
+            api_key_env="sk-test",
+            model="m",
+        ),
+        client_manager=manager,
+    )
+
+
+def test_origin_normalization():
+    assert origin_of("https://API.example.com/v1") == "https://api.example.com:443"
+    assert origin_of("http://localhost:8080/x") == "http://localhost:8080"
+
+
+def test_backends_share_pool_and_reuse_connections():
+    async def run():
+        runner, port = await _start_stub()
+        manager = HTTPClientManager(HTTPPoolConfig(prewarm_connections=1))
+        try:
+            opened = await manager.prewarm([f"http://127.0.0.1:{port}/v1"])
+            first, second = _backend("a", port, manager), _backend("b", port, manager)
+            for backend in (first, second, first, second):
+                result = await backend.execute(GatewayRequest.create(provider=backend.config.name, message="hi"))
+                assert result.success, result.error
+            return opened, manager.get_stats()
+        finally:
+            await manager.close()
+            await runner.cleanup()
+
+    opened, stats = asyncio.run(run())
+    assert list(opened.values()) == [1]
+    assert len(stats["pools"]) == 1
+    pool = next(iter(stats["pools"].values()))
+    assert pool["requests"] == 5
+    assert pool["new_connections"] == 1
+    assert pool["reused_connections"] == 4
+    assert pool["in_use"] == 0
+    assert pool["idle"] == 1
@@ -0,0 +1,70 @@
+"""Tests for pre-aggregated metric rollups."""
+import time
+
+from gateway.state_store import StateStore
+
+
+def test_rollups_match_raw_metrics(store):
+    latencies = [50.0, 120.0, 800.0, 4000.0]
+    for i, latency in enumerate(latencies):
+        store.record_metric("kimi", "request_completed", latency_ms=latency, success=i != 2)
+    store.record_metric("qwen", "request_failed", latency_ms=None, success=False)
+
+    kimi = store.get_provider_metrics("kimi", hours=24)
+    assert kimi["total_requests"] == 4
+    assert kimi["successful_requests"] == 3
+    assert kimi["avg_latency_ms"] == sum(latencies) / 4
+    assert kimi["min_latency_ms"] == 50.0
+    assert kimi["max_latency_ms"] == 4000.0
+    assert sum(kimi["latency_histogram"].values()) == 4
+
+    all_metrics = store.get_all_provider_metrics(hours=24, providers=["kimi", "qwen", "gemini"])
+    assert all_metrics["qwen"]["total_requests"] == 1
+    assert all_metrics["qwen"]["avg_latency_ms"] == 0.0
+    assert all_metrics["gemini"]["total_requests"] == 0
+    assert all_metrics["gemini"]["success_rate"] == 1.0
+
+
+def test_cost_endpoints_read_rollups(store):
+    store.record_token_cost("kimi", input_tokens=100, output_tokens=300)
+    store.record_token_cost("kimi", input_tokens=10, output_tokens=30)
+
+    summary = store.get_cost_summary(days=1)
+    assert summary["total_input_tokens"] == 110
+    assert summary["total_output_tokens"] == 330
+    assert summary["total_requests"] == 2
+
+    by_provider = store.get_cost_by_provider(days=1)
+    assert by_provider == [{
+        "provider": "kimi",
+        "total_input_tokens": 110,
+        "total_output_tokens": 330,
+        "total_cost_usd": 0.0,
+        "request_count": 2,
+    }]
+    assert store.get_cost_by_day(days=1)[0]["request_count"] == 2
+
+
+def test_existing_raw_rows_are_backfilled(temp_db):
+    store = StateStore(temp_db)
+    now = time.time()
+    with store._get_connection() as conn:
+        conn.execute("DELETE FROM metrics_rollup")
+        conn.executemany(
+            "INSERT INTO metrics (provider, event_type, latency_ms, success, timestamp) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [("codex", "request_completed", 200.0, 1, now - i * 600) for i in range(6)],
+        )
+
+    reopened = StateStore(temp_db)
+    assert reopened.get_provider_metrics("codex", hours=2)["total_requests"] == 6
+
+
+def test_compaction_keeps_aggregates(store):
+    store.record_metric("kimi", "request_completed", latency_ms=10.0)
+    with store._get_connection() as conn:
+        conn.execute("UPDATE metrics SET timestamp = timestamp - 3 * 86400")
+
+    removed = store.compact_metrics()
+    assert removed["raw_metrics"] == 1
+    assert store.get_provider_metrics("kimi", hours=1)["total_requests"] == 1
@@ -0,0 +1,119 @@
+"""Tests for the prefix-stable prompt layout and provider prompt cache tracking."""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from gateway.backends.executors.http_request import anthropic_message_content  # noqa: E402
+from gateway.backends.extractors import AnthropicExtractor, GeminiExtractor, OpenAIExtractor  # noqa: E402
+from gateway.backends.http import HTTPBackend  # noqa: E402
+from gateway.gateway_config import ProviderConfig  # noqa: E402
+from gateway.middleware.prompt_layout import SESSION, STABLE, VOLATILE, layout_prompt  # noqa: E402
+from gateway.models import BackendType, GatewayRequest  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "test" / "stubs"))
+from llm_api_stub import PromptCacheStub, start_stub  # noqa: E402
+
+STABLE_CTX = "## 🤖 Current Provider\n- **claude**: tools\n" + "- tool listing line\n" * 300
+SKILLS_CTX = "## 🛠️ Relevant Skills\n- **pdf**: Read PDFs\n"
+
+
+def _request(provider, layout):
+    return GatewayRequest.create(provider=provider, message=layout.message,
+                                 metadata={"_prompt_segments": layout.segments})
+
+
+def test_layout_orders_by_stability_and_marks_breakpoints():
+    layout = layout_prompt(
+        [(STABLE, STABLE_CTX), (VOLATILE, "## Memories\n- yesterday"), (SESSION, SKILLS_CTX), (SESSION, "")],
+        "What is 2 + 2?",
+    )
+    message = layout.message
+    assert message.startswith("# 系统上下文\n\n## 🤖 Current Provider")
+    assert message.index("Relevant Skills") < message.index("## Memories") < message.index("# 用户请求\nWhat is 2 + 2?")
+    assert "".join(segment["text"] for segment in layout.segments) == message
+    # Stable and session tiers end in a breakpoint once the prefix is long enough;
+    # memories and the request never do.
+    assert [segment["cache"] for segment in layout.segments] == [True, True, False, False]
+
+    short = layout_prompt([(STABLE, "tiny"), (VOLATILE, "memo")], "hi")
+    assert short.breakpoints == 0
+    assert short.message == "# 系统上下文\n\ntiny\n\nmemo\n\n---\n\n# 用户请求\nhi\n"
+    assert layout_prompt([], "hi").message == "hi"
+
+
+def test_volatile_tier_never_gets_a_breakpoint():
+    # Small stable/session tiers followed by a large memory tier: the only
+    # prefix past the minimum ends in memories, which never repeat.
+    layout = layout_prompt(
+        [(STABLE, "## 🤖 Current Provider\n- **claude**"), (SESSION, SKILLS_CTX),
+         (VOLATILE, "## Memories\n" + "- remembered detail\n" * 400)],
+        "hi",
+    )
+    assert layout.breakpoints == 0
+    assert anthropic_message_content(_request("anthropic", layout)) == layout.message
+
+
+def test_anthropic_content_blocks_follow_segments():
+    layout = layout_prompt([(STABLE, STABLE_CTX), (VOLATILE, "memo")], "hi")
+    blocks = anthropic_message_content(_request("anthropic", layout))
+    assert [block.get("cache_control") for block in blocks] == [{"type": "ephemeral"}, None, None]
+    assert "".join(block["text"] for block in blocks) == layout.message
+
+    rewritten = _request("anthropic", layout)
+    rewritten.message = "something else"
+    assert anthropic_message_content(rewritten) == "something else"
+
+
+def test_extractors_report_cached_tokens():
+    assert AnthropicExtractor().extract_usage({"usage": {
+        "input_tokens": 10, "cache_read_input_tokens": 1000, "cache_creation_input_tokens": 5, "output_tokens": 7,
+    }}) == {"input_tokens": 1015, "output_tokens": 7, "cached_tokens": 1000, "cache_creation_tokens": 5}
+    assert OpenAIExtractor().extract_usage({"usage": {
+        "prompt_tokens": 2000, "completion_tokens": 3, "prompt_tokens_details": {"cached_tokens": 1536},
+    }})["cached_tokens"] == 1536
+    assert GeminiExtractor().extract_usage({"usageMetadata": {
+        "promptTokenCount": 900, "cachedContentTokenCount": 800,
+    }})["cached_tokens"] == 800
+
+
+def test_stable_prefix_is_read_from_provider_cache():
+    async def run():
+        stub = PromptCacheStub(min_cache_tokens=256, base_ms=0, ms_per_token=0)
+        runner, port = await start_stub(stub)
+        backends = {
+            kind: HTTPBackend(ProviderConfig(
+                name=kind, backend_type=BackendType.HTTP_API, api_base_url=f"http://127.0.0.1:{port}/v1",
+                api_key_env="sk-test", model="m",
+            ))
+            for kind in ("anthropic", "openai")
+        }
+        try:
+            for kind, backend in backends.items():
+                for i in range(3):
+                    layout = layout_prompt(
+                        [(STABLE, STABLE_CTX), (SESSION, SKILLS_CTX), (VOLATILE, f"## Memories\n- note {i}")],
+                        f"question {i}",
+                        min_cache_tokens=256,
+                    )
+                    result = await backend.execute(_request(kind, layout))
+                    assert result.success, result.error
+                    assert result.metadata["input_tokens"] == result.metadata["usage"]["input_tokens"] > 0
+            return stub, {kind: backend.get_prompt_cache_stats() for kind, backend in backends.items()}
+        finally:
+            for backend in backends.values():
+                await backend.shutdown()
+            await runner.cleanup()
+
+    stub, stats = asyncio.run(run())
+    sent = stub.requests[0]["payload"]["messages"][0]["content"]
+    assert isinstance(sent, list) and sent[0]["cache_control"] == {"type": "ephemeral"}
+    assert isinstance(stub.requests[-1]["payload"]["messages"][0]["content"], str)
+    for kind in ("anthropic", "openai"):
+        assert stats[kind]["requests"] == 3
+        assert stats[kind]["hit_requests"] == 2
+        assert 0.5 < stats[kind]["cache_read_ratio"] < 1
+    assert stats["anthropic"]["cache_creation_tokens"] > 0
@@ -0,0 +1,95 @@
+"""Tests for the streaming fast path that bypasses the request queue."""
+import asyncio
+import json
+
+import pytest
+
+from gateway import server_requests, server_streaming
+from gateway.metrics import GatewayMetrics
+from gateway.models import GatewayRequest, RequestStatus
+from gateway.request_queue import RequestQueue
+from gateway.streaming import StreamChunk
+
+
+class _StubStreamBackend:
+    def __init__(self, parts, delay_s=0.0):
+        self.parts = parts
+        self.delay_s = delay_s
+
+    async def execute_stream(self, request):
+        for index, part in enumerate(self.parts):
+            await asyncio.sleep(self.delay_s)
+            yield StreamChunk(request_id=request.id, content=part, chunk_index=index)
+        yield StreamChunk(
+            request_id=request.id,
+            content="",
+            chunk_index=len(self.parts),
+            is_final=True,
+            tokens_used=7,
+            provider="stub",
+        )
+
+
+class _Server:
+    """Minimal stand-in exposing what the fast path touches on GatewayServer."""
+
+    _apply_memory_pre_request = server_requests._apply_memory_pre_request
+    _handle_success = server_requests._handle_success
+    _handle_failure = server_requests._handle_failure
+    supports_fast_stream = server_streaming.supports_fast_stream
+    stream_request = server_streaming.stream_request
+
+    def __init__(self, store, backend):
+        self.store = store
+        self.queue = RequestQueue(store)
+        self.metrics = GatewayMetrics(use_prometheus_client=False)
+        self.backends = {"stub": backend}
+        self.memory_middleware = None
+        self.cache_manager = None
+        self._app = None
+
+
+async def _drain_finalizers():
+    while server_streaming._pending_finalizers:
+        await asyncio.gather(*list(server_streaming._pending_finalizers))
+
+
+def test_fast_stream_persists_and_records_ttft(store):
+    server = _Server(store, _StubStreamBackend(["Hel", "lo"]))
+    request = GatewayRequest.create(provider="stub", message="hi")
+
+    async def run():
+        events = [chunk async for chunk in server.stream_request(request)]
+        await _drain_finalizers()
+        return events
+
+    events = asyncio.run(run())
+    payloads = [json.loads(e[len("data: "):]) for e in events]
+    assert [p["type"] for p in payloads] == ["chunk", "chunk", "done"]
+
+    assert server.supports_fast_stream("stub")
+    assert server.queue.get_processing_count() == 0
+    assert store.get_request(request.id).status == RequestStatus.COMPLETED
+    response = store.get_response(request.id)
+    assert response.response == "Hello"
+    assert response.metadata["streamed"] is True
+    assert "ttft_ms" in response.metadata
+    assert server.metrics.get_ttft_summary()["stub"]["count"] == 1
+
+
+def test_fast_stream_client_disconnect_marks_failed(store):
+    server = _Server(store, _StubStreamBackend(["a", "b", "c"]))
+    request = GatewayRequest.create(provider="stub", message="hi")
+
+    async def run():
+        stream = server.stream_request(request)
+        first = await stream.__anext__()
+        await stream.aclose()
+        await _drain_finalizers()
+        return first
+
+    first = asyncio.run(run())
+    assert json.loads(first[len("data: "):])["content"] == "a"
+    assert server.queue.get_processing_count() == 0
+    assert store.get_request(request.id).status == RequestStatus.FAILED
+    assert store.get_response(request.id).metadata["client_disconnected"] is True
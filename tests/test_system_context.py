@@ -0,0 +1,79 @@
+"""Tests for SystemContextBuilder's relevant-context cache and keyword index."""
+import pytest
+
+import gateway.middleware.system_context as system_context
+from gateway.middleware.system_context import SystemContextBuilder
+
+SKILLS = [
+    {"name": "frontend-design", "description": "Build React UI components", "triggers": ["react", "前端"]},
+    {"name": "pdf", "description": "Read and write PDF documents", "triggers": ["pdf"]},
+    {"name": "ccb-ask", "description": "Ask another provider for a second opinion", "triggers": ["ask"]},
+    {"name": "sql-helper", "description": "Write SQL for React dashboards", "triggers": []},
+    {"name": "obsidian-note", "description": "Save notes to Obsidian", "triggers": ["note", "前端笔记"]},
+]
+
+
+class _Registry:
+    skills = SKILLS
+
+    def scan_skills(self):
+        return [dict(skill) for skill in self.skills]
+
+    def scan_providers(self):
+        return [{"name": "gemini", "models": ["3f", "3p"], "description": "frontend"},
+                {"name": "kimi", "models": ["thinking"]}]
+
+    def scan_mcp_servers(self):
+        return [{"name": "filesystem", "tools": ["read", "write"]}]
+
+
+@pytest.fixture
+def builder(monkeypatch):
+    monkeypatch.setattr(system_context, "CCBRegistry", _Registry)
+    return SystemContextBuilder()
+
+
+def _linear_relevant(keywords):
+    """The scoring the keyword index replaces."""
+    scored = []
+    for skill in SKILLS:
+        score = 0
+        for keyword in keywords:
+            kw = keyword.lower()
+            score += 3 * (kw in skill["name"].lower()) + 2 * (kw in skill["description"].lower())
+            score += any(kw in t.lower() for t in skill["triggers"])
+        if score:
+            scored.append((score, skill["name"]))
+    return [name for _, name in sorted(scored, key=lambda item: -item[0])]
+
+
+def test_keyword_index_matches_linear_scan(builder):
+    for keywords in (["React"], ["前端", "react"], ["note", "ask", "pdf"], ["write", "write"], ["e"], [], ["zzz"]):
+        found = [skill["name"] for skill in builder._find_relevant_skills(keywords)]
+        assert found == _linear_relevant(keywords)
+
+
+def test_fragments_are_memoized_per_provider_and_keyword_set(builder):
+    first = builder.build_relevant_context(["React", "pdf"], "gemini")
+    assert not first["cached"]
+    assert "**gemini**: frontend" in first["context"]
+    assert "frontend-design" in first["context"] and "filesystem: 2 tools" in first["context"]
+    assert first["bytes"] == len(first["context"].encode("utf-8"))
+
+    again = builder.build_relevant_context(["pdf", "react"], "gemini")
+    assert again["cached"] and again["context"] == first["context"]
+    assert not builder.build_relevant_context(["React", "pdf"], "kimi")["cached"]
+    assert builder.get_relevant_context(["React", "pdf"], "kimi").startswith("## 🤖 Current Provider\n- **kimi**")
+
+    stats = builder.get_assembly_stats()
+    assert (stats["requests"], stats["cache_hits"], stats["cached_fragments"]) == (4, 2, 2)
+    assert stats["total_bytes"] > 0 and stats["avg_ms"] >= 0
+
+
+def test_reload_invalidates_cache(builder, monkeypatch):
+    before = builder.get_relevant_context(["pdf"], "gemini")
+    monkeypatch.setattr(_Registry, "skills", [{"name": "pdf-v2", "description": "PDF tools", "triggers": []}])
+    builder.reload()
+    after = builder.build_relevant_context(["pdf"], "gemini")
+    assert not after["cached"]
+    assert "pdf-v2" in after["context"] and after["context"] != before
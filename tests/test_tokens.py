@@ -0,0 +1,71 @@
+"""Tests for token estimation: heuristic parity, memoization and pluggable tokenizers."""
+import re
+
+import pytest
+
+from lib.common import tokens
+
+_OLD_CJK = re.compile(r"[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af]")
+
+
+def _old_estimate(text: str) -> int:
+    if not text:
+        return 0
+    cjk = len(_OLD_CJK.findall(text))
+    return int(cjk / 1.5 + (len(text) - cjk) / 4)
+
+
+@pytest.fixture(autouse=True)
+def heuristic():
+    tokens.set_tokenizer(None)
+    tokens.clear_token_cache()
+    yield
+    tokens.set_tokenizer(None)
+    tokens.clear_token_cache()
+
+
+def test_heuristic_matches_previous_estimates():
+    samples = [
+        "",
+        "plain ascii text " * 40,
+        "你好世界，今天天气很好。" * 30,
+        "Mixed 中文 and English, カタカナ ひらがな 한국어 émoji 🚀 " * 20,
+        "\u4dff\u4e00\u9fff\ua000\u3040\u30ff\uac00\ud7af\ud7b0",  # range boundaries
+    ]
+    for text in samples:
+        assert tokens.estimate_tokens(text) == _old_estimate(text)
+        assert tokens.count_cjk(text) == len(_OLD_CJK.findall(text))
+
+    counts = tokens.estimate_input_output_tokens("hello world", "世界" * 300)
+    assert counts["total_tokens"] == counts["input_tokens"] + counts["output_tokens"] == 2 + 400
+
+
+def test_repeated_segments_are_memoized():
+    system = "系统提示：请用中文回答。" * 50
+    question = "What is 2 + 2?"
+    first = tokens.estimate_segments_tokens([system, question])
+    assert tokens.estimate_segments_tokens([system, "", question]) == first == _old_estimate(system + question)
+
+    stats = tokens.token_cache_stats()
+    # Short and ASCII-only segments are counted directly; the long CJK one once.
+    assert (stats["entries"], stats["misses"], stats["hits"]) == (1, 1, 1)
+
+
+def test_pluggable_tokenizer_is_cached_and_failures_fall_back():
+    calls = []
+
+    def by_words(text: str) -> int:
+        calls.append(text)
+        return len(text.split())
+
+    tokens.set_tokenizer(by_words, "words")
+    assert tokens.tokenizer_name() == "words"
+    assert tokens.estimate_tokens("one two three") == 3
+    assert tokens.estimate_tokens("one two three") == 3
+    assert len(calls) == 1
+
+    tokens.set_tokenizer(lambda text: 1 / 0, "broken")
+    assert tokens.estimate_tokens("abcd" * 10) == 10
+
+    assert tokens._load_tokenizer("tokenizers:/nonexistent/tokenizer.json") is None
+    assert tokens._load_tokenizer("heuristic") is None
@@ -0,0 +1,155 @@
+"""Tests for the WebSocket pub/sub fan-out hub."""
+import asyncio
+import json
+
+from gateway.ws_fanout import FanoutHub, SlowConsumerPolicy, TopicFilter
+
+
+class _Client:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.received = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def send_text(self, payload: str) -> None:
+        await self.gate.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append(json.loads(payload))
+
+
+def _event(event_type, **data):
+    return {"type": event_type, "data": data, "timestamp": 0.0}
+
+
+def test_topic_filter_matches_dimensions():
+    f = TopicFilter.from_message({
+        "channels": ["request"],
+        "providers": ["kimi"],
+    })
+    assert f.matches("request_completed", {"provider": "kimi", "request_id": "r1"})
+    assert not f.matches("request_completed", {"provider": "qwen"})
+    assert not f.matches("discussion_started", {"provider": "kimi"})
+    assert f.matches("request_processing", {"providers": ["qwen", "kimi"]})
+
+    f = TopicFilter.from_message({"discussion_ids": ["d1"]})
+    assert f.matches("discussion_round_completed", {"session_id": "d1"})
+    assert not f.matches("discussion_round_completed", {"session_id": "d2"})
+    assert not f.matches("request_completed", {"request_id": "r1"})
+
+    assert TopicFilter.from_message({"channels": ["*"]}).is_empty()
+
+
+def test_publish_does_not_wait_for_slow_client():
+    async def run():
+        hub = FanoutHub(max_queue=8)
+        slow, fast = _Client(), _Client()
+        slow.gate.clear()
+        hub.add("slow", slow.send_text)
+        hub.add("fast", fast.send_text)
+
+        for i in range(3):
+            assert hub.publish(_event("request_completed", request_id=str(i))) == 2
+        await asyncio.sleep(0.01)
+
+        assert [e["data"]["request_id"] for e in fast.received] == ["0", "1", "2"]
+        assert slow.received == []
+        slow.gate.set()
+        await asyncio.sleep(0.01)
+        assert len(slow.received) == 3
+
+    asyncio.run(run())
+
+
+def test_drop_oldest_policy_keeps_latest_events():
+    async def run():
+        hub = FanoutHub(max_queue=2, policy=SlowConsumerPolicy.DROP_OLDEST)
+        client = _Client()
+        client.gate.clear()
+        channel = hub.add("c", client.send_text)
+        await asyncio.sleep(0)  # writer parks on the gate with event 0 taken
+
+        for i in range(5):
+            hub.publish(_event("request_completed", request_id=str(i)))
+        client.gate.set()
+        await asyncio.sleep(0.01)
+
+        assert channel.dropped > 0
+        assert client.received[-1]["data"]["request_id"] == "4"
+        assert len(hub) == 1
+
+    asyncio.run(run())
+
+
+def test_disconnect_policy_removes_slow_client():
+    async def run():
+        hub = FanoutHub(max_queue=1, policy=SlowConsumerPolicy.DISCONNECT)
+        client = _Client()
+        client.gate.clear()
+        hub.add("c", client.send_text)
+        await asyncio.sleep(0)
+
+        for i in range(3):
+            hub.publish(_event("request_completed", request_id=str(i)))
+
+        assert len(hub) == 0
+        assert hub.get_stats()["disconnected_slow"] == 1
+        client.gate.set()
+
+    asyncio.run(run())
+
+
+def test_failed_send_triggers_close_callback():
+    async def run():
+        closed = []
+
+        async def broken(_payload):
+            raise RuntimeError("socket gone")
+
+        async def on_close(channel):
+            closed.append(channel)
+            hub.remove("c")
+
+        hub = FanoutHub()
+        hub.add("c", broken, on_close=on_close)
+        hub.publish(_event("request_completed", request_id="r"))
+        await asyncio.sleep(0.01)
+
+        assert len(closed) == 1
+        assert len(hub) == 0
+
+    asyncio.run(run())
+
+
+def test_manager_closes_socket_of_slow_consumer():
+    from gateway.models import WebSocketEvent
+    from gateway.routes.websocket import WebSocketManager
+
+    class _Socket:
+        def __init__(self):
+            self.close_codes = []
+            self.stuck = asyncio.Event()
+
+        async def accept(self):
+            pass
+
+        async def send_text(self, _payload):
+            await self.stuck.wait()
+
+        async def close(self, code=1000):
+            self.close_codes.append(code)
+
+    async def run():
+        manager = WebSocketManager(max_queue=1, slow_consumer_policy="disconnect")
+        socket = _Socket()
+        await manager.connect(socket)
+        for i in range(3):
+            await manager.broadcast(WebSocketEvent(type="request_completed", data={"request_id": str(i)}))
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+
+        assert socket.close_codes == [1013]
+        assert not manager.active_connections
+
+    asyncio.run(run())